@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# admission.py - Admission control for on-chain writes
+#
+#   admission = AdmissionController(max_in_flight=32, per_signer=8)
+#   try:
+#       with admission.admit(signer_address):
+#           txn_id = client.register_document_hash(...)
+#   except Overloaded as e:
+#       return jsonify(...), 429, {"Retry-After": str(e.retry_after)}
+#
+# Writes are counted while they are submitted and confirmed. A new write is
+# turned away at once, instead of queueing behind a struggling node, when:
+#
+# - the writes in flight reach the current limit,
+# - its signer already has `per_signer` writes in flight, or
+# - the node recently answered with an overload error: 429, 503, or a full
+#   transaction pool or transaction backlog. Other failures (a rejected
+#   transaction, a timeout, a refused connection) say nothing about load.
+#
+# The limit adapts (AIMD): every overload error halves it and starts a
+# cooldown during which new writes are shed; consecutive errors double the
+# cooldown. Each write that confirms within `latency_target` seconds raises
+# the limit again by 1 / limit; slower ones lower it by one.
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_MAX_IN_FLIGHT = 32
+DEFAULT_PER_SIGNER = 8
+DEFAULT_LATENCY_TARGET = 10.0   # Seconds; a write spans about two rounds when the node keeps up
+DEFAULT_COOLDOWN = 1.0
+DEFAULT_MAX_COOLDOWN = 30.0
+OVERLOAD_HTTP_CODES = (429, 503)
+# algod's answers when its transaction pool or the gossip backlog is full
+OVERLOAD_MESSAGES = ("transaction pool is full", "transaction pool have reached capacity", "backlog is full")
+
+
+class Overloaded(Exception):
+    """A write was shed; retry after `retry_after` seconds"""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(f"Write rejected ({reason}); retry after {retry_after} s")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+def is_overload(error):
+    """True for errors showing the node cannot take more writes right now"""
+    code = getattr(error, "code", None)
+    if isinstance(code, int) and code in OVERLOAD_HTTP_CODES:
+        return True
+    message = str(error).lower()
+    return any(text in message for text in OVERLOAD_MESSAGES)
+
+
+class AdmissionController:
+    def __init__(self, max_in_flight=DEFAULT_MAX_IN_FLIGHT, per_signer=DEFAULT_PER_SIGNER,
+                 latency_target=DEFAULT_LATENCY_TARGET, cooldown=DEFAULT_COOLDOWN,
+                 max_cooldown=DEFAULT_MAX_COOLDOWN):
+        self.max_in_flight = max_in_flight
+        self.per_signer = per_signer
+        self.latency_target = latency_target
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._lock = threading.Lock()
+        # None disables the overall or per-signer limit (cooldowns still apply)
+        self._limit = float(max_in_flight) if max_in_flight is not None else None
+        self._in_flight = 0
+        self._by_signer = {}
+        self._cooldown_until = 0.0
+        self._next_cooldown = cooldown
+        self._latency = None
+        self.admitted = 0
+        self.shed = {}
+
+    @contextmanager
+    def admit(self, signer):
+        """Count a write by `signer` for the duration of the block, or raise Overloaded"""
+        self._enter(signer)
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self._leave(signer, time.monotonic() - start, overloaded=is_overload(e))
+            raise
+        self._leave(signer, time.monotonic() - start, overloaded=False)
+
+    def _enter(self, signer):
+        with self._lock:
+            now = time.monotonic()
+            if now < self._cooldown_until:
+                self._reject("cooldown", self._cooldown_until - now)
+            if self._limit is not None and self._in_flight >= max(1, int(self._limit)):
+                self._reject("in_flight", self._latency or 1)
+            if self.per_signer is not None and self._by_signer.get(signer, 0) >= self.per_signer:
+                self._reject("signer", self._latency or 1)
+            self._in_flight += 1
+            self._by_signer[signer] = self._by_signer.get(signer, 0) + 1
+            self.admitted += 1
+
+    def _reject(self, reason, wait):
+        self.shed[reason] = self.shed.get(reason, 0) + 1
+        raise Overloaded(reason, max(1, math.ceil(wait)))
+
+    def _leave(self, signer, latency, overloaded):
+        with self._lock:
+            self._in_flight -= 1
+            self._by_signer[signer] -= 1
+            if not self._by_signer[signer]:
+                del self._by_signer[signer]
+
+            if overloaded:
+                if self._limit is not None:
+                    self._limit = max(1.0, self._limit / 2)
+                self._cooldown_until = time.monotonic() + self._next_cooldown
+                self._next_cooldown = min(self.max_cooldown, self._next_cooldown * 2)
+                return
+            self._next_cooldown = self.cooldown
+            self._latency = latency if self._latency is None else 0.8 * self._latency + 0.2 * latency
+            if self._limit is None:
+                return
+            if latency > self.latency_target:
+                self._limit = max(1.0, self._limit - 1)
+            else:
+                self._limit = min(float(self.max_in_flight), self._limit + 1 / self._limit)
+
+    def retry_after(self):
+        """Whole seconds until new writes are admitted again (at least 1)"""
+        with self._lock:
+            return max(1, math.ceil(self._cooldown_until - time.monotonic()))
+
+    def stats(self):
+        with self._lock:
+            return {"in_flight": self._in_flight, "limit": None if self._limit is None else int(self._limit),
+                    "cooling_down": time.monotonic() < self._cooldown_until,
+                    "latency_seconds": self._latency, "admitted": self.admitted, "shed": dict(self.shed)}
@@ -12,9 +12,11 @@ import base64
 from algosdk import account, mnemonic
 
 # Configuration
-API_BASE_URL = "http://localhost:5002"  # Make sure this matches your Flask app port
+API_BASE_URL = os.environ.get("API_BASE_URL", "http://localhost:5002")  # Make sure this matches your Flask app port
 ACCOUNTS_FILE = "compliance_test_accounts.json"
 SAMPLE_DOCUMENT = "sample_compliance_document.txt"
+# Writes answer 202 with a job for JSON clients (browsers are redirected)
+JSON_HEADERS = {"Accept": "application/json"}
 
 def generate_accounts():
     """Generate and save test accounts for admin and verifier"""
@@ -102,6 +104,27 @@ def create_sample_document():
     
     return document_content, doc_hash
 
+def wait_for_job(response, action, timeout=120):
+    """
+    On-chain writes are queued as background jobs (202 with a status URL);
+    poll the job and return its result, or None if it failed
+    """
+    if response.status_code != 202:
+        print(f"❌ {action} failed: {response.status_code}")
+        return None
+    
+    body = response.json()
+    job = body["job"]
+    deadline = time.time() + timeout
+    while not job["done"] and time.time() < deadline:
+        time.sleep(1)
+        job = requests.get(f"{API_BASE_URL}{body['status_url']}").json()["job"]
+    
+    if job["status"] != "succeeded":
+        print(f"❌ {action} error: {job.get('error') or 'job did not finish in time'}")
+        return None
+    return job["result"]
+
 def run_test():
     """Execute the full test workflow using the Flask API"""
     # Step 1: Check API connection
@@ -117,43 +140,23 @@ def run_test():
     document_content, doc_hash = create_sample_document()
     
     print("\n=== STEP 1: Creating Compliance Contract ===")
-    response = requests.post(f"{API_BASE_URL}/contracts")
-    if response.status_code != 200:
-        print(f"❌ Failed to create contract: {response.status_code}")
-        return False
-    
-    result = response.json()
-    if not result.get("success"):
-        print(f"❌ Contract creation error: {result.get('error', 'Unknown error')}")
+    response = requests.post(f"{API_BASE_URL}/contracts", headers=JSON_HEADERS)
+    result = wait_for_job(response, "Contract creation")
+    if result is None:
         return False
     
     app_id = result.get("app_id")
     print(f"✅ Contract created with App ID: {app_id}")
     
-    # Wait for transaction confirmation
-    print("Waiting for transaction confirmation...")
-    time.sleep(5)
-    
     print("\n=== STEP 2: Opt-In to Contract ===")
-    # Admin is automatically opted in during contract creation
-    print("✅ Admin automatically opted in during contract creation")
-    
-    # Opt-in verifier account
-    response = requests.post(f"{API_BASE_URL}/contracts/{app_id}/opt-in", json={
-        "address": verifier_address
-    })
+    # The admin is the creator and needs no local state; the verifier role is kept in the verifier's
+    response = requests.post(f"{API_BASE_URL}/contracts/{app_id}/opt-in", data={"role": "verifier"})
     
     if response.status_code != 200:
         print(f"❌ Failed to opt-in verifier: {response.status_code}")
         return False
     
-    result = response.json()
-    if not result.get("success"):
-        print(f"❌ Verifier opt-in error: {result.get('error', 'Unknown error')}")
-        return False
-    
     print(f"✅ Verifier opted in to contract")
-    time.sleep(5)
     
     print("\n=== STEP 3: Registering Document ===")
     with open(SAMPLE_DOCUMENT, 'rb') as f:
@@ -163,57 +166,34 @@ def run_test():
             data={
                 'document_name': 'Test Compliance Document',
                 'version': '1.0.0',
-                'expiration_days': '365'
+                'expiry_days': '365'
             },
-            files=files
+            files=files,
+            headers=JSON_HEADERS
         )
     
-    if response.status_code != 200:
-        print(f"❌ Failed to register document: {response.status_code}")
-        return False
-    
-    result = response.json()
-    if not result.get("success"):
-        print(f"❌ Document registration error: {result.get('error', 'Unknown error')}")
+    if wait_for_job(response, "Document registration") is None:
         return False
     
     print(f"✅ Document registered successfully")
-    time.sleep(5)
     
     print("\n=== STEP 4: Assigning Verifier ===")
-    response = requests.post(f"{API_BASE_URL}/contracts/{app_id}/verifiers", json={
+    response = requests.post(f"{API_BASE_URL}/contracts/{app_id}/verifiers", data={
         "verifier_address": verifier_address
-    })
+    }, headers=JSON_HEADERS)
     
-    if response.status_code != 200:
-        print(f"❌ Failed to assign verifier: {response.status_code}")
-        return False
-    
-    result = response.json()
-    if not result.get("success"):
-        print(f"❌ Verifier assignment error: {result.get('error', 'Unknown error')}")
+    if wait_for_job(response, "Verifier assignment") is None:
         return False
     
     print(f"✅ Verifier assigned successfully")
-    time.sleep(5)
     
     print("\n=== STEP 5: Marking Document as Compliant ===")
-    response = requests.post(f"{API_BASE_URL}/contracts/{app_id}/verify", json={
-        "address": verifier_address,
-        "document_hash": doc_hash
-    })
-    
-    if response.status_code != 200:
-        print(f"❌ Failed to mark document as compliant: {response.status_code}")
-        return False
+    response = requests.post(f"{API_BASE_URL}/contracts/{app_id}/verify", headers=JSON_HEADERS)
     
-    result = response.json()
-    if not result.get("success"):
-        print(f"❌ Compliance marking error: {result.get('error', 'Unknown error')}")
+    if wait_for_job(response, "Compliance marking") is None:
         return False
     
     print(f"✅ Document marked as compliant")
-    time.sleep(5)
     
     print("\n=== STEP 6: Retrieving Contract Details ===")
     response = requests.get(f"{API_BASE_URL}/contracts/{app_id}")
@@ -227,22 +207,20 @@ def run_test():
     print(f"✅ Successfully retrieved contract details")
     
     print("\n=== STEP 7: Checking Document Preview ===")
-    # Get the filename from the contracts endpoint
-    response = requests.get(f"{API_BASE_URL}/api/contract/{app_id}")
+    # Get the filenames from the document listing of this contract
+    response = requests.get(f"{API_BASE_URL}/api/documents", params={"app_id": app_id})
     if response.status_code != 200:
-        print(f"❌ Failed to retrieve contract API details: {response.status_code}")
+        print(f"❌ Failed to retrieve the contract's documents: {response.status_code}")
     else:
-        contract_data = response.json()
-        if contract_data.get("documents"):
-            for doc in contract_data.get("documents", []):
-                filename = doc.get("filename")
-                if filename:
-                    doc_preview_url = f"{API_BASE_URL}/documents/{filename}/preview"
-                    response = requests.get(doc_preview_url)
-                    if response.status_code == 200:
-                        print(f"✅ Successfully retrieved document preview for {filename}")
-                    else:
-                        print(f"❌ Failed to retrieve document preview: {response.status_code}")
+        for doc in response.json().get("items", []):
+            filename = doc.get("filename")
+            if filename:
+                doc_preview_url = f"{API_BASE_URL}/documents/{filename}/preview"
+                response = requests.get(doc_preview_url)
+                if response.status_code == 200:
+                    print(f"✅ Successfully retrieved document preview for {filename}")
+                else:
+                    print(f"❌ Failed to retrieve document preview: {response.status_code}")
     
     print("\n=== STEP 8: Checking Dashboard Stats ===")
     response = requests.get(f"{API_BASE_URL}/api/contract-stats")
@@ -278,7 +256,8 @@ def main():
         check_api_status()
         return
     
-    run_test()
+    if not run_test():
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# app_shards.py - Per-app compliance state cache and write distribution over app shards
+#
+#   states = AppStateCache(read_compliance_status)   # any app's state, re-read after APP_STATE_TTL
+#   shards = ShardSet(parse_app_ids("744059516,744053057"))
+#   with shards.acquire() as app_id:                  # the shard with fewest writes in flight
+#       client.register_document_hash(app_id, ...)
+#   states.invalidate(app_id)
+#
+# A compliance app holds one current document, and every registration
+# rewrites the same global state, so writes aimed at one hot app queue up
+# behind each other. Spreading new registrations over several apps lets
+# them proceed side by side; reads aggregate over all shards (DocumentIndex).
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+APP_STATE_TTL = 5     # Seconds a cached app state is served before it is re-read
+FETCH_WORKERS = 8     # Parallel state reads in get_many()
+
+
+def parse_app_ids(value):
+    """App ids from a comma-separated string such as COMPLIANCE_SHARDS ("" -> [])"""
+    app_ids = []
+    for part in (value or "").split(","):
+        part = part.strip()
+        if part:
+            if not part.isdigit() or int(part) == 0:
+                raise ValueError(f"Not an app id: {part!r}")
+            app_ids.append(int(part))
+    return list(dict.fromkeys(app_ids))
+
+
+class AppStateCache:
+    """
+    Compliance state of any number of apps, each cached for `ttl` seconds.
+
+    `fetch_status(app_id)` returns the state as
+    `ComplianceClient.get_compliance_status` does. Callers get a copy they
+    may modify; writes through this process should invalidate() the app.
+    """
+
+    def __init__(self, fetch_status, ttl=APP_STATE_TTL):
+        self.fetch_status = fetch_status
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # app_id -> (read at, state)
+        self._states = {}
+
+    def get(self, app_id):
+        with self._lock:
+            cached = self._states.get(app_id)
+        if cached is None or time.time() - cached[0] > self.ttl:
+            cached = (time.time(), self.fetch_status(app_id))
+            with self._lock:
+                self._states[app_id] = cached
+        return dict(cached[1])
+
+    def get_many(self, app_ids):
+        """{app_id: state, or None if it could not be read}, read in parallel"""
+        app_ids = list(dict.fromkeys(app_ids))
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+            return dict(zip(app_ids, pool.map(self._get_or_none, app_ids)))
+
+    def _get_or_none(self, app_id):
+        try:
+            return self.get(app_id)
+        except Exception as e:
+            print(f"Error reading compliance status of app {app_id}: {str(e)}")
+            return None
+
+    def invalidate(self, app_id=None):
+        """Forget one app's cached state, or every app's"""
+        with self._lock:
+            if app_id is None:
+                self._states.clear()
+            else:
+                self._states.pop(app_id, None)
+
+    def cached_app_ids(self):
+        with self._lock:
+            return sorted(self._states)
+
+
+class ShardSet:
+    """Apps new documents are spread over, by fewest registrations in flight"""
+
+    def __init__(self, app_ids):
+        self.app_ids = list(dict.fromkeys(app_ids))
+        self._lock = threading.Lock()
+        self._in_flight = {app_id: 0 for app_id in self.app_ids}
+        self._next = 0
+
+    def __contains__(self, app_id):
+        return app_id in self._in_flight
+
+    def __len__(self):
+        return len(self.app_ids)
+
+    def in_flight(self):
+        with self._lock:
+            return dict(self._in_flight)
+
+    def _pick(self):
+        # Least busy shard; ties go round robin so idle shards share the load
+        count = len(self.app_ids)
+        order = [self.app_ids[(self._next + i) % count] for i in range(count)]
+        app_id = min(order, key=lambda candidate: self._in_flight[candidate])
+        self._next = (self.app_ids.index(app_id) + 1) % count
+        return app_id
+
+    @contextmanager
+    def acquire(self, app_id=None):
+        """
+        Count a write in flight for the duration of the block. Without
+        `app_id`, the least busy shard is chosen and yielded; a given app
+        that is not a shard is yielded untracked.
+        """
+        with self._lock:
+            if app_id is None:
+                if not self.app_ids:
+                    raise LookupError("No app shards configured")
+                app_id = self._pick()
+            tracked = app_id in self._in_flight
+            if tracked:
+                self._in_flight[app_id] += 1
+        try:
+            yield app_id
+        finally:
+            if tracked:
+                with self._lock:
+                    self._in_flight[app_id] -= 1
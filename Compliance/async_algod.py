@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# async_algod.py - Non-blocking algod and indexer clients for the ASGI server
+#
+# Covers the REST calls the compliance clients make, with the same method
+# names and return values as algosdk's AlgodClient / IndexerClient, but as
+# coroutines on a shared httpx.AsyncClient connection pool. Transactions
+# are still built and signed with algosdk.
+
+import base64
+
+import httpx
+from algosdk import encoding, transaction
+from algosdk.error import AlgodHTTPError, IndexerHTTPError
+
+DEFAULT_TIMEOUT = 30.0
+
+
+class _AsyncRestClient:
+    token_header = "X-Algo-API-Token"
+    error_class = AlgodHTTPError
+
+    def __init__(self, token, address, headers=None, timeout=DEFAULT_TIMEOUT, max_connections=100):
+        request_headers = dict(headers or {})
+        if token:
+            request_headers[self.token_header] = token
+        self.http = httpx.AsyncClient(
+            base_url=address.rstrip("/") + "/v2", headers=request_headers, timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections))
+
+    async def request(self, method, path, params=None, data=None, headers=None):
+        response = await self.http.request(method, path, params=params, content=data, headers=headers)
+        if response.status_code >= 400:
+            try:
+                message = response.json().get("message", response.text)
+            except ValueError:
+                message = response.text
+            raise self.error_class(message, response.status_code)
+        return response.json()
+
+    async def aclose(self):
+        await self.http.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+class AsyncAlgodClient(_AsyncRestClient):
+    async def status(self):
+        return await self.request("GET", "/status")
+
+    async def status_after_block(self, block_num):
+        return await self.request("GET", f"/status/wait-for-block-after/{int(block_num)}")
+
+    async def suggested_params(self):
+        res = await self.request("GET", "/transactions/params")
+        return transaction.SuggestedParams(
+            res["fee"], res["last-round"], res["last-round"] + 1000, res["genesis-hash"],
+            res["genesis-id"], False, res["consensus-version"], res["min-fee"])
+
+    async def application_info(self, application_id):
+        return await self.request("GET", f"/applications/{int(application_id)}")
+
+    async def account_info(self, address):
+        return await self.request("GET", f"/accounts/{address}")
+
+    async def pending_transaction_info(self, transaction_id):
+        return await self.request("GET", f"/transactions/pending/{transaction_id}")
+
+    async def send_transaction(self, txn):
+        return await self.send_transactions([txn])
+
+    async def send_transactions(self, txns):
+        """Submit signed transactions (a group is sent in one request); returns the first txid"""
+        data = b"".join(base64.b64decode(encoding.msgpack_encode(txn)) for txn in txns)
+        res = await self.request("POST", "/transactions", data=data,
+                                 headers={"Content-Type": "application/x-binary"})
+        return res["txId"]
+
+
+class AsyncIndexerClient(_AsyncRestClient):
+    token_header = "X-Indexer-API-Token"
+    error_class = IndexerHTTPError
+
+    async def account_info(self, address):
+        return await self.request("GET", f"/accounts/{address}")
+
+
+async def wait_for_confirmation(client, transaction_id, timeout):
+    """Coroutine version of document_compliance_client.wait_for_confirmation"""
+    start_round = (await client.status())["last-round"] + 1
+    current_round = start_round
+
+    while current_round < start_round + timeout:
+        pending_txn = await client.pending_transaction_info(transaction_id)
+        if pending_txn.get("confirmed-round", 0) > 0:
+            return pending_txn
+        if pending_txn.get("pool-error"):
+            raise Exception(f"Pool error: {pending_txn['pool-error']}")
+
+        # Long-polls algod without holding a worker
+        await client.status_after_block(current_round)
+        current_round += 1
+
+    raise Exception(f"Transaction {transaction_id} not confirmed after {timeout} rounds")
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# async_compliance_client.py - ComplianceClient for the ASGI server
+#
+# Same calls and return values as document_compliance_client's
+# ComplianceClient, as coroutines over AsyncAlgodClient. Transactions are
+# built by the sync client (no I/O once the app's call encoding is known),
+# so the two cannot drift apart.
+
+try:
+    from .async_algod import wait_for_confirmation
+    from .compliance_abi import CALL_ENCODING_AUTO, program_call_encoding
+    from .document_compliance_client import ComplianceClient
+except ImportError:
+    from async_algod import wait_for_confirmation
+    from compliance_abi import CALL_ENCODING_AUTO, program_call_encoding
+    from document_compliance_client import ComplianceClient
+
+
+class AsyncComplianceClient:
+    def __init__(self, algod_client, private_key, **options):
+        self.algod_client = algod_client
+        # Builds and signs only; it is never given an algod client
+        self.builder = ComplianceClient(None, private_key, **options)
+        self.public_key = self.builder.public_key
+
+    async def _prepare(self, app_id):
+        """Suggested params, and the app's call encoding on first use"""
+        builder = self.builder
+        if builder.call_encoding == CALL_ENCODING_AUTO and app_id not in builder._call_encodings:
+            app_info = await self.algod_client.application_info(app_id)
+            builder._call_encodings[app_id] = program_call_encoding(
+                app_info.get("params", {}).get("approval-program") or b"")
+        return await self.algod_client.suggested_params()
+
+    async def _submit(self, txn):
+        signed_txn = txn.sign(self.builder.private_key)
+        tx_id = signed_txn.transaction.get_txid()
+        await self.algod_client.send_transaction(signed_txn)
+        await wait_for_confirmation(self.algod_client, tx_id, 5)
+        return tx_id
+
+    async def register_document_hash(self, app_id, doc_hash, version, expiry):
+        params = await self._prepare(app_id)
+        return await self._submit(self.builder.register_document_txn(app_id, doc_hash, version, expiry, params))
+
+    async def assign_verifier(self, app_id, verifier_address):
+        params = await self._prepare(app_id)
+        return await self._submit(self.builder.assign_verifier_txn(app_id, verifier_address, params))
+
+    async def verify_compliance(self, app_id, document_hash, is_compliant, attestation_date):
+        params = await self._prepare(app_id)
+        return await self._submit(self.builder.verify_compliance_txn(
+            app_id, document_hash, is_compliant, attestation_date, params))
+
+    async def get_compliance_status(self, app_id):
+        app_info = await self.algod_client.application_info(app_id)
+        return ComplianceClient.parse_compliance_status(app_info)
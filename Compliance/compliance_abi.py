@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# compliance_abi.py - Encode compliance contract calls from compliance_abi.json
+#
+# compliance_abi.json is generated with the TEAL by `python document_compliance.py`.
+# Apps deployed before the method router was added dispatch on the method
+# name instead ("legacy" calls); `detect_call_encoding` tells them apart.
+
+import base64
+import os
+
+from algosdk import abi
+
+ABI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "compliance_abi.json")
+
+CALL_ENCODING_ABI = "abi"        # 4-byte method selector, ARC-4 encoded arguments
+CALL_ENCODING_LEGACY = "legacy"  # Method name as args[0], raw arguments
+CALL_ENCODING_AUTO = "auto"      # Detect from the app's approval program
+
+# Only the legacy program contains the method names as byte constants
+_LEGACY_MARKER = b"assign_verifier"
+_REFERENCE_TYPES = (abi.ABIReferenceType.ACCOUNT, abi.ABIReferenceType.APPLICATION,
+                    abi.ABIReferenceType.ASSET)
+
+_contracts = {}
+
+
+def load_contract(path=ABI_PATH):
+    if path not in _contracts:
+        with open(path, "r") as f:
+            _contracts[path] = abi.Contract.from_json(f.read())
+    return _contracts[path]
+
+
+def encode_call(method_name, *values, contract=None):
+    """
+    App arguments of an ABI method call: the selector, then each argument
+    encoded as its declared type. Reference types (account, application,
+    asset) take the index into the transaction's foreign arrays.
+    """
+    method = (contract or load_contract()).get_method_by_name(method_name)
+    if len(values) != len(method.args):
+        raise ValueError(f"{method.get_signature()} takes {len(method.args)} arguments, got {len(values)}")
+
+    app_args = [method.get_selector()]
+    for arg, value in zip(method.args, values):
+        if arg.type in _REFERENCE_TYPES:
+            app_args.append(abi.UintType(8).encode(value))
+        else:
+            app_args.append(arg.type.encode(value))
+    return app_args
+
+
+def program_call_encoding(program):
+    """"abi" or "legacy" for a compiled approval program (bytes or base64)"""
+    if isinstance(program, str):
+        program = base64.b64decode(program)
+    return CALL_ENCODING_LEGACY if program and _LEGACY_MARKER in program else CALL_ENCODING_ABI
+
+
+def detect_call_encoding(algod_client, app_id):
+    """"abi" or "legacy" depending on the approval program the app runs"""
+    params = algod_client.application_info(app_id).get("params", {})
+    return program_call_encoding(params.get("approval-program") or b"")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# compliance_record.py - Packed global-state layout of the compliance contract
+#
+# With the "packed" layout the contract keeps its whole record in a single
+# global byte value under RECORD_KEY instead of one key per field:
+#
+#   offset  size  field
+#   0       32    document_hash     (raw SHA-256 digest, zeros until registered)
+#   32      8     expiration_date   (uint64, big-endian)
+#   40      8     attestation_date  (uint64)
+#   48      1     status            (registry_box.STATUS_CODES)
+#   49      0-73  version           (utf-8)
+#
+# Bytes 32 onwards are laid out like a v2 registry box, so the codecs are
+# shared. A global key and its value may hold 128 bytes together, which
+# leaves 73 bytes for the version.
+# The admin is the app creator and is not stored.
+
+import base64
+
+try:
+    from .registry_box import STATUS_OFFSET, VERSION_OFFSET, encode_box, decode_box
+    from .hash_encoding import digest_bytes
+except ImportError:
+    from registry_box import STATUS_OFFSET, VERSION_OFFSET, encode_box, decode_box
+    from hash_encoding import digest_bytes
+
+LAYOUT_KEYS = "keys"      # One global key per field (the original layout)
+LAYOUT_PACKED = "packed"  # One fixed-offset record under RECORD_KEY
+
+RECORD_KEY = b"record"
+HASH_OFFSET = 0
+RECORD_EXPIRY_OFFSET = 32
+RECORD_ATTESTATION_OFFSET = 40
+RECORD_STATUS_OFFSET = 32 + STATUS_OFFSET
+RECORD_VERSION_OFFSET = 32 + VERSION_OFFSET
+EMPTY_RECORD = bytes(RECORD_VERSION_OFFSET)
+MAX_RECORD_VERSION_LENGTH = 128 - len(RECORD_KEY) - RECORD_VERSION_OFFSET
+
+# Global schema of each layout: (uints, byte slices)
+GLOBAL_SCHEMAS = {LAYOUT_KEYS: (2, 5), LAYOUT_PACKED: (0, 1)}
+
+# Minimum balance the creator holds per app (microAlgos)
+APP_FLAT_MIN_BALANCE = 100000
+UINT_MIN_BALANCE = 25000 + 3500
+BYTES_MIN_BALANCE = 25000 + 25000
+
+
+def global_schema(layout=LAYOUT_KEYS):
+    # algosdk is loaded here so the layout constants import without it
+    from algosdk import transaction
+
+    num_uints, num_byte_slices = GLOBAL_SCHEMAS[layout]
+    return transaction.StateSchema(num_uints=num_uints, num_byte_slices=num_byte_slices)
+
+
+def app_min_balance(layout=LAYOUT_KEYS):
+    """Minimum balance one compliance app adds to its creator"""
+    num_uints, num_byte_slices = GLOBAL_SCHEMAS[layout]
+    return APP_FLAT_MIN_BALANCE + UINT_MIN_BALANCE * num_uints + BYTES_MIN_BALANCE * num_byte_slices
+
+
+def encode_record(document_hash, version, expiration_date, attestation_date=0, status="compliant"):
+    """Record bytes as the contract writes them on register"""
+    version = version.encode() if isinstance(version, str) else bytes(version)
+    if len(version) > MAX_RECORD_VERSION_LENGTH:
+        raise ValueError(f"Version must be at most {MAX_RECORD_VERSION_LENGTH} bytes")
+    header = encode_box(b"", expiration_date, attestation_date, status)
+    return digest_bytes(document_hash) + header + version
+
+
+def decode_record(value):
+    """
+    Decode a record (raw bytes or the base64 string algod returns). The
+    document fields are None until a document has been registered.
+    """
+    if isinstance(value, str):
+        value = base64.b64decode(value)
+    if len(value) < RECORD_VERSION_OFFSET:
+        raise ValueError(f"Compliance record is {len(value)} bytes, expected at least {RECORD_VERSION_OFFSET}")
+    digest = value[HASH_OFFSET:RECORD_EXPIRY_OFFSET]
+    record = decode_box(value[RECORD_EXPIRY_OFFSET:])
+    registered = digest != bytes(32)
+    return {
+        "document_hash": digest.hex() if registered else None,
+        "version": record["version"] if registered else None,
+        "attestation_date": record["attestation_date"],
+        "expiration_date": record["expiration_date"] or None,
+        "status": record["status"],
+    }
+
+
+def find_record(global_state):
+    """The base64 record value in an application_info global-state list, if packed"""
+    key = base64.b64encode(RECORD_KEY).decode()
+    for item in global_state:
+        if item["key"] == key:
+            return item["value"]["bytes"]
+    return None
@@ -0,0 +1,587 @@
+#!/usr/bin/env python3
+# contract_store.py - SQLite-backed store for deployed contracts and registered documents
+#
+# Replaces the flat contracts.json file. Command line usage:
+#   python contract_store.py import flask_app/contracts.json flask_app/contracts.db
+#   python contract_store.py check flask_app/contracts.db [--repair]
+
+import base64
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contracts (
+    app_id            INTEGER PRIMARY KEY,
+    created_at        REAL NOT NULL,
+    status            TEXT NOT NULL DEFAULT '',
+    expiry_timestamp  INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS documents (
+    id                INTEGER PRIMARY KEY AUTOINCREMENT,
+    app_id            INTEGER NOT NULL REFERENCES contracts(app_id),
+    hash              TEXT NOT NULL,
+    filename          TEXT,
+    version           TEXT,
+    registered_at     REAL NOT NULL,
+    expiry_timestamp  INTEGER,
+    digest_mode       TEXT,
+    changed_ranges    TEXT,
+    status            TEXT NOT NULL DEFAULT 'pending',
+    file_hash         TEXT,
+    verified_at       REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_documents_app_id ON documents (app_id, registered_at);
+CREATE INDEX IF NOT EXISTS idx_documents_hash ON documents (hash);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_documents_unique ON documents (app_id, hash, registered_at);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key    TEXT PRIMARY KEY,
+    value  TEXT
+);
+
+CREATE TABLE IF NOT EXISTS counters (
+    name   TEXT PRIMARY KEY,
+    value  INTEGER NOT NULL
+);
+"""
+
+# Created after _migrate, since older databases lack some of these columns.
+# Each listing sort is an index scan that starts at the cursor.
+LISTING_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_contracts_created ON contracts (created_at, app_id);
+CREATE INDEX IF NOT EXISTS idx_contracts_expiry ON contracts (expiry_timestamp, app_id);
+CREATE INDEX IF NOT EXISTS idx_contracts_status ON contracts (status, app_id);
+CREATE INDEX IF NOT EXISTS idx_documents_created ON documents (registered_at, id);
+CREATE INDEX IF NOT EXISTS idx_documents_expiry ON documents (COALESCE(expiry_timestamp, 0), id);
+CREATE INDEX IF NOT EXISTS idx_documents_status ON documents (status, id);
+CREATE INDEX IF NOT EXISTS idx_documents_app_expiry ON documents (app_id, COALESCE(expiry_timestamp, 0), id);
+CREATE INDEX IF NOT EXISTS idx_documents_app_status ON documents (app_id, status, id);
+CREATE INDEX IF NOT EXISTS idx_documents_file_hash ON documents (file_hash) WHERE file_hash IS NOT NULL;
+"""
+
+# Listing sort keys -> (SQL expression, tiebreak column). The contracts table
+# carries the status and expiry of each app's current document so contract
+# listings sort without joining.
+CONTRACT_SORTS = {
+    "created_at": "created_at",
+    "expiry": "expiry_timestamp",
+    "status": "status",
+}
+DOCUMENT_SORTS = {
+    "created_at": "registered_at",
+    "expiry": "COALESCE(expiry_timestamp, 0)",
+    "status": "status",
+}
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Document lifecycle: the contract marks a document compliant when it is
+# registered, and a verifier call flips it to expired once past its expiry.
+# Registering a new document on the same app supersedes the previous one.
+# Rows from before registrations were recorded this way may still be pending.
+DOCUMENT_STATUSES = ("pending", "compliant", "expired", "superseded")
+
+# Separately from its status, a current document awaits verification until a
+# verifier attests it (`verified_at`); the "unverified" counter counts those.
+
+# `hash` is the digest stored on-chain; for chunked digest modes that is the
+# Merkle root and `file_hash` keeps the plain SHA-256 of the file as well
+_DOCUMENT_COLUMNS = ("hash", "filename", "version", "registered_at",
+                     "expiry_timestamp", "digest_mode", "changed_ranges", "file_hash")
+_SELECT_COLUMNS = ", ".join(_DOCUMENT_COLUMNS + ("status",))
+_CONTRACT_COLUMNS = ("c.app_id, c.created_at, c.status, c.expiry_timestamp, "
+                     "(SELECT COUNT(*) FROM documents d WHERE d.app_id = c.app_id) AS document_count")
+
+
+class ContractStore:
+    """
+    Repository for contracts and their documents.
+
+    Each thread gets its own connection; the database runs in WAL mode so
+    readers never block the writer and several worker processes can share it.
+    Documents are returned as dicts with the same keys contracts.json used,
+    plus their status.
+
+    Dashboard aggregates are kept in the `counters` table and updated in the
+    same transaction as every change, so `get_stats` never scans.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+        self._migrate()
+        self._connection().executescript(LISTING_INDEXES)
+
+    def _migrate(self):
+        """Bring databases created before document statuses existed up to date"""
+        conn = self._connection()
+        columns = [row["name"] for row in conn.execute("PRAGMA table_info(documents)")]
+        contract_columns = [row["name"] for row in conn.execute("PRAGMA table_info(contracts)")]
+        with self._transaction() as conn:
+            if "status" not in columns:
+                conn.execute("ALTER TABLE documents ADD COLUMN status TEXT NOT NULL DEFAULT 'pending'")
+                _supersede_older_documents(conn)
+            if "file_hash" not in columns:
+                conn.execute("ALTER TABLE documents ADD COLUMN file_hash TEXT")
+            if "verified_at" not in columns:
+                conn.execute("ALTER TABLE documents ADD COLUMN verified_at REAL")
+                # Only a verifier moved documents out of pending before registrations were compliant
+                conn.execute("UPDATE documents SET verified_at = registered_at WHERE status != 'pending'")
+                _write_counters(conn, _recount(conn))
+            if "status" not in contract_columns:
+                conn.execute("ALTER TABLE contracts ADD COLUMN status TEXT NOT NULL DEFAULT ''")
+                conn.execute("ALTER TABLE contracts ADD COLUMN expiry_timestamp INTEGER NOT NULL DEFAULT 0")
+                _refresh_contract_summaries(conn)
+            if conn.execute("SELECT COUNT(*) FROM counters").fetchone()[0] == 0:
+                _write_counters(conn, _recount(conn))
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self):
+        return _Transaction(self._connection())
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # Contracts
+
+    def add_contract(self, app_id, created_at=None):
+        contract = {"app_id": app_id, "created_at": created_at or time.time()}
+        with self._transaction() as conn:
+            _insert_contract(conn, contract["app_id"], contract["created_at"])
+        return contract
+
+    def get_contract(self, app_id):
+        """Return the contract with its documents, or None"""
+        row = self._connection().execute(
+            "SELECT app_id, created_at FROM contracts WHERE app_id = ?", (app_id,)).fetchone()
+        if row is None:
+            return None
+        return dict(row, documents=self.get_documents(app_id))
+
+    def list_contracts(self):
+        """All contracts, oldest first, with a document_count instead of the documents"""
+        rows = self._connection().execute(
+            f"SELECT {_CONTRACT_COLUMNS} FROM contracts c ORDER BY c.created_at, c.app_id")
+        return [_contract_dict(row) for row in rows]
+
+    def page_contracts(self, sort="created_at", order="asc", cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        One page of contracts sorted by created_at, expiry or status.
+
+        Keyset pagination: `cursor` is the `next_cursor` of the previous page,
+        so every page costs the same however deep it is. Returns a dict with
+        the items and the cursor of the next page (None on the last page).
+        """
+        return self._page("contracts c", CONTRACT_SORTS, "app_id", _CONTRACT_COLUMNS, _contract_dict,
+                          sort, order, cursor, limit)
+
+    def _page(self, table, sorts, tiebreak, columns, to_dict, sort, order, cursor, limit,
+              where="", params=()):
+        if sort not in sorts:
+            raise ValueError(f"Unknown sort key: {sort} (expected one of {', '.join(sorts)})")
+        if order not in ("asc", "desc"):
+            raise ValueError(f"Unknown sort order: {order}")
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        key = sorts[sort]
+
+        ordering = f"ORDER BY {key} {order}, {tiebreak} {order} LIMIT {limit + 1}"
+
+        def query(*conditions):
+            conditions = [where] * bool(where) + list(conditions)
+            filters = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+            return f"SELECT {columns}, {key} AS sort_key FROM {table} {filters}{ordering}"
+
+        if cursor:
+            # SQLite only seeks on the first term of a row-value comparison, so
+            # the rows after the cursor are read as two index seeks: the rest
+            # of the cursor's sort key, then everything past it.
+            sort_value, last = decode_cursor(cursor)
+            op = ">" if order == "asc" else "<"
+            sql = (f"SELECT * FROM ({query(f'{key} = ?', f'{tiebreak} {op} ?')}) "
+                   f"UNION ALL SELECT * FROM ({query(f'{key} {op} ?')}) "
+                   f"ORDER BY sort_key {order}, {tiebreak} {order} LIMIT {limit + 1}")
+            params = list(params) + [sort_value, last] + list(params) + [sort_value]
+        else:
+            sql = query()
+
+        rows = self._connection().execute(sql, params).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["sort_key"], rows[-1][tiebreak])
+        items = []
+        for row in rows:
+            item = to_dict(row)
+            item.pop("sort_key", None)
+            items.append(item)
+        return {"items": items, "next_cursor": next_cursor, "sort": sort, "order": order}
+
+    def app_ids(self):
+        return [row[0] for row in self._connection().execute("SELECT app_id FROM contracts")]
+
+    def count_contracts(self):
+        return self._connection().execute("SELECT COUNT(*) FROM contracts").fetchone()[0]
+
+    # Documents
+
+    def add_document(self, app_id, document_info):
+        """
+        Record a registered document as compliant, as the contract does; the
+        contract row is created if missing and the app's previous document is
+        superseded.
+        """
+        values = _document_values(document_info)
+        with self._transaction() as conn:
+            _insert_contract(conn, app_id, time.time())
+            document_id = _insert_document(conn, app_id, values, "compliant")
+            if document_id is None:
+                return document_info
+            _bump(conn, "documents", 1)
+            _bump(conn, "compliant", 1)
+            _bump(conn, "unverified", 1)
+            conn.execute("UPDATE contracts SET status = 'compliant', expiry_timestamp = ? WHERE app_id = ?",
+                         (values[4] or 0, app_id))
+
+            previous = conn.execute(
+                "SELECT status, verified_at FROM documents WHERE app_id = ? AND status != 'superseded' AND id != ?",
+                (app_id, document_id)).fetchall()
+            for status, verified_at in previous:
+                _bump(conn, status, -1)
+                _bump(conn, "superseded", 1)
+                if verified_at is None:
+                    _bump(conn, "unverified", -1)
+            conn.execute("UPDATE documents SET status = 'superseded' "
+                         "WHERE app_id = ? AND status != 'superseded' AND id != ?", (app_id, document_id))
+        return document_info
+
+    def set_document_status(self, app_id, status):
+        """Change the status of an app's current document. Returns the old status."""
+        if status not in DOCUMENT_STATUSES:
+            raise ValueError(f"Unknown document status: {status}")
+        with self._transaction() as conn:
+            row = _current_document(conn, app_id)
+            if row is None:
+                return None
+            _change_status(conn, row, status)
+            return row["status"]
+
+    def mark_verified(self, app_id, now=None):
+        """
+        Record a verifier attestation for an app's current document, mirroring
+        the contract: compliant, or expired once past its expiry timestamp.
+        The document no longer awaits verification. Returns the new status,
+        or None if the app has no current document.
+        """
+        now = time.time() if now is None else now
+        with self._transaction() as conn:
+            row = _current_document(conn, app_id)
+            if row is None:
+                return None
+            expired = row["expiry_timestamp"] and row["expiry_timestamp"] < now
+            status = "expired" if expired else "compliant"
+            _change_status(conn, row, status)
+            if row["verified_at"] is None:
+                conn.execute("UPDATE documents SET verified_at = ? WHERE id = ?", (now, row["id"]))
+                _bump(conn, "unverified", -1)
+        return status
+
+    def get_documents(self, app_id):
+        rows = self._connection().execute(
+            f"SELECT {_SELECT_COLUMNS} FROM documents "
+            "WHERE app_id = ? ORDER BY registered_at, id", (app_id,))
+        return [_document_dict(row) for row in rows]
+
+    def page_documents(self, app_id=None, sort="created_at", order="asc", cursor=None,
+                       limit=DEFAULT_PAGE_SIZE):
+        """One page of documents, optionally of a single app; see `page_contracts`"""
+        where, params = ("app_id = ?", (app_id,)) if app_id is not None else ("", ())
+        return self._page("documents", DOCUMENT_SORTS, "id", f"id, app_id, {_SELECT_COLUMNS}",
+                          _document_dict, sort, order, cursor, limit, where, params)
+
+    def find_documents_by_hash(self, doc_hash):
+        """
+        Every registration of a hash, newest first, each with its app_id.
+        Matches the on-chain digest or, for chunked digests, the file's SHA-256.
+        """
+        doc_hash = doc_hash.lower()
+        rows = self._connection().execute(
+            f"SELECT app_id, {_SELECT_COLUMNS} FROM documents "
+            "WHERE hash = ? OR file_hash = ? ORDER BY registered_at DESC, id DESC", (doc_hash, doc_hash))
+        return [_document_dict(row) for row in rows]
+
+    def iter_documents(self):
+        """Yield (app_id, document) pairs for every registered document"""
+        rows = self._connection().execute(
+            f"SELECT app_id, {_SELECT_COLUMNS} FROM documents ORDER BY id")
+        for row in rows:
+            document = _document_dict(row)
+            yield document.pop("app_id"), document
+
+    def count_documents(self, app_id=None):
+        if app_id is None:
+            return self._connection().execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM documents WHERE app_id = ?", (app_id,)).fetchone()[0]
+
+    # Aggregates
+
+    def get_stats(self):
+        """Dashboard statistics read from the maintained counters"""
+        counters = dict(self._connection().execute("SELECT name, value FROM counters").fetchall())
+        return _stats_dict(counters)
+
+    def recount_stats(self):
+        """The same statistics computed by scanning every contract and document"""
+        return _stats_dict(_recount(self._connection()))
+
+    def check_consistency(self):
+        """Return (consistent, maintained stats, recounted stats)"""
+        with self._transaction():
+            stored, recounted = self.get_stats(), self.recount_stats()
+        return stored == recounted, stored, recounted
+
+    def rebuild_stats(self):
+        """Overwrite the counters with a full recount"""
+        with self._transaction() as conn:
+            _write_counters(conn, _recount(conn))
+        return self.get_stats()
+
+    # Meta
+
+    def get_meta(self, key, default=None):
+        row = self._connection().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # Import
+
+    def import_json(self, json_path):
+        """
+        Import a contracts.json file in a single transaction.
+
+        Safe to run more than once: contracts and documents that are already
+        present are skipped. Returns (contracts, documents) imported.
+        """
+        with open(json_path, "r") as f:
+            contracts = json.load(f)
+
+        before = (self.count_contracts(), self.count_documents())
+        with self._transaction() as conn:
+            for contract in contracts:
+                app_id = contract["app_id"]
+                conn.execute("INSERT OR IGNORE INTO contracts (app_id, created_at) VALUES (?, ?)",
+                             (app_id, contract.get("created_at") or time.time()))
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO documents (app_id, {', '.join(_DOCUMENT_COLUMNS)}) "
+                    f"VALUES (?, {', '.join('?' for _ in _DOCUMENT_COLUMNS)})",
+                    [(app_id,) + _document_values(doc) for doc in contract.get("documents", [])])
+            _supersede_older_documents(conn)
+            _refresh_contract_summaries(conn)
+            _write_counters(conn, _recount(conn))
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                         ("imported_json", os.path.abspath(json_path)))
+        return self.count_contracts() - before[0], self.count_documents() - before[1]
+
+
+class _Transaction:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
+
+
+def _insert_contract(conn, app_id, created_at):
+    cursor = conn.execute("INSERT OR IGNORE INTO contracts (app_id, created_at) VALUES (?, ?)",
+                          (app_id, created_at))
+    if cursor.rowcount:
+        _bump(conn, "contracts", 1)
+
+
+def _insert_document(conn, app_id, values, status):
+    cursor = conn.execute(
+        f"INSERT OR IGNORE INTO documents (app_id, {', '.join(_DOCUMENT_COLUMNS)}, status) "
+        f"VALUES (?, {', '.join('?' for _ in _DOCUMENT_COLUMNS)}, ?)",
+        (app_id,) + values + (status,))
+    return cursor.lastrowid if cursor.rowcount == 1 else None
+
+
+def _current_document(conn, app_id):
+    return conn.execute(
+        "SELECT id, app_id, status, expiry_timestamp, verified_at FROM documents "
+        "WHERE app_id = ? AND status != 'superseded' ORDER BY registered_at DESC, id DESC LIMIT 1",
+        (app_id,)).fetchone()
+
+
+def _change_status(conn, row, status):
+    if row["status"] != status:
+        conn.execute("UPDATE documents SET status = ? WHERE id = ?", (status, row["id"]))
+        conn.execute("UPDATE contracts SET status = ? WHERE app_id = ?", (status, row["app_id"]))
+        _bump(conn, row["status"], -1)
+        _bump(conn, status, 1)
+        if status == "superseded" and row["verified_at"] is None:
+            _bump(conn, "unverified", -1)
+
+
+def _supersede_older_documents(conn):
+    """Mark every document except the latest one of each app as superseded"""
+    conn.execute(
+        "UPDATE documents SET status = 'superseded' WHERE status != 'superseded' AND id NOT IN ("
+        "  SELECT (SELECT id FROM documents d WHERE d.app_id = c.app_id "
+        "          ORDER BY registered_at DESC, id DESC LIMIT 1) FROM contracts c)")
+
+
+def _refresh_contract_summaries(conn):
+    """Copy the status and expiry of each app's current document onto its contract row"""
+    conn.execute(
+        "UPDATE contracts SET "
+        "  status = COALESCE((SELECT status FROM documents d WHERE d.app_id = contracts.app_id "
+        "                     AND status != 'superseded' ORDER BY registered_at DESC, id DESC LIMIT 1), ''), "
+        "  expiry_timestamp = COALESCE((SELECT expiry_timestamp FROM documents d WHERE d.app_id = contracts.app_id "
+        "                     AND status != 'superseded' ORDER BY registered_at DESC, id DESC LIMIT 1), 0)")
+
+
+def _bump(conn, name, delta):
+    conn.execute("INSERT INTO counters (name, value) VALUES (?, ?) "
+                 "ON CONFLICT (name) DO UPDATE SET value = value + excluded.value", (name, delta))
+
+
+def _recount(conn):
+    counters = dict.fromkeys(("contracts", "documents") + DOCUMENT_STATUSES, 0)
+    counters["contracts"] = conn.execute("SELECT COUNT(*) FROM contracts").fetchone()[0]
+    counters["unverified"] = conn.execute(
+        "SELECT COUNT(*) FROM documents WHERE status != 'superseded' AND verified_at IS NULL").fetchone()[0]
+    for status, count in conn.execute("SELECT status, COUNT(*) FROM documents GROUP BY status"):
+        counters[status] = count
+        counters["documents"] += count
+    return counters
+
+
+def _write_counters(conn, counters):
+    conn.execute("DELETE FROM counters")
+    conn.executemany("INSERT INTO counters (name, value) VALUES (?, ?)", counters.items())
+
+
+def _stats_dict(counters):
+    stats = {
+        "total_contracts": counters.get("contracts", 0),
+        "total_documents": counters.get("documents", 0),
+        "unverified_documents": counters.get("unverified", 0),
+    }
+    for status in DOCUMENT_STATUSES:
+        stats[f"{status}_documents"] = counters.get(status, 0)
+    return stats
+
+
+def encode_cursor(sort_value, tiebreak):
+    """Opaque page cursor holding the sort key and id of the last row returned"""
+    payload = json.dumps([sort_value, tiebreak], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        sort_value, tiebreak = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid page cursor: {cursor!r}")
+    return sort_value, tiebreak
+
+
+def _contract_dict(row):
+    contract = dict(row)
+    contract["status"] = contract["status"] or None
+    contract["expiry_timestamp"] = contract["expiry_timestamp"] or None
+    return contract
+
+
+def _document_values(document_info):
+    changed_ranges = document_info.get("changed_ranges")
+    return (
+        document_info["hash"].lower(),
+        document_info.get("filename"),
+        document_info.get("version"),
+        document_info.get("registered_at") or time.time(),
+        document_info.get("expiry_timestamp"),
+        document_info.get("digest_mode"),
+        json.dumps(changed_ranges) if changed_ranges is not None else None,
+        (document_info.get("file_hash") or "").lower() or None,
+    )
+
+
+def _document_dict(row):
+    document = dict(row)
+    if document.get("changed_ranges") is not None:
+        document["changed_ranges"] = json.loads(document["changed_ranges"])
+    else:
+        document.pop("changed_ranges", None)
+    for optional in ("digest_mode", "file_hash"):
+        if document.get(optional) is None:
+            document.pop(optional, None)
+    return document
+
+
+def open_contract_store(db_path, json_path=None):
+    """Open the store, importing `json_path` the first time the database is created"""
+    store = ContractStore(db_path)
+    if json_path and os.path.exists(json_path) and store.get_meta("imported_json") is None:
+        store.import_json(json_path)
+    return store
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "import":
+        contracts, documents = ContractStore(sys.argv[3]).import_json(sys.argv[2])
+        print(f"Imported {contracts} contracts and {documents} documents into {sys.argv[3]}")
+        return 0
+
+    if len(sys.argv) in (3, 4) and sys.argv[1] == "check":
+        store = ContractStore(sys.argv[2])
+        consistent, stored, recounted = store.check_consistency()
+        for key in stored:
+            marker = "" if stored[key] == recounted[key] else "  <-- mismatch"
+            print(f"{key:<24}{stored[key]:>10}{recounted[key]:>10}{marker}")
+        if consistent:
+            print("Counters are consistent with a full recount")
+            return 0
+        if "--repair" in sys.argv:
+            store.rebuild_stats()
+            print("Counters rebuilt from a full recount")
+            return 0
+        print("Counters differ from a full recount (run with --repair to rebuild them)")
+        return 1
+
+    print("Usage: python contract_store.py import <contracts.json> <contracts.db>")
+    print("       python contract_store.py check <contracts.db> [--repair]")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
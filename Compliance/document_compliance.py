@@ -3,7 +3,26 @@
 
 from pyteal import *
 
-def approval_program():
+from compliance_record import (LAYOUT_KEYS, LAYOUT_PACKED, RECORD_KEY, EMPTY_RECORD, RECORD_EXPIRY_OFFSET,
+                               RECORD_STATUS_OFFSET, RECORD_VERSION_OFFSET)
+from registry_box import STATUS_COMPLIANT, STATUS_EXPIRED
+
+# ABI methods of the approval program (ARC-4 signatures). Arguments are
+# length-checked against their types; "account" is an index into Txn.accounts.
+METHODS = {
+    "register": ("register(byte[32],string,uint64)void",
+                 "Register a document: its SHA-256 digest, version and expiration timestamp"),
+    "assign_verifier": ("assign_verifier(account)void",
+                        "Give an account the verifier role"),
+    "verify": ("verify()void",
+               "Attest compliance as a verifier; marks the document expired once past its expiration date"),
+}
+
+def approval_program(layout=LAYOUT_KEYS):
+    """
+    Approval program storing the document in one global key per field, or
+    with layout="packed" as a single record (see compliance_record.py)
+    """
     # Global state (contract-wide)
     document_hash = Bytes("document_hash")         # Hash of the compliance document
     document_version = Bytes("document_version")   # Version number
@@ -15,61 +34,119 @@ def approval_program():
     # Local state (per-account)
     verifier_role = Bytes("verifier_role")         # Whether account is a verifier
     
+    # The admin is the creator and never changes, so check against the creator
+    # address instead of loading the admin global
+    is_admin = Txn.sender() == Global.creator_address()
+    
+    # Packed layout: the whole record in one value
+    record = Bytes(RECORD_KEY)
+    
     # On creation: initialize contract
-    on_creation = Seq([
-        App.globalPut(admin, Txn.sender()),
-        App.globalPut(compliance_status, Bytes("pending")),
-        Return(Int(1))
-    ])
+    if layout == LAYOUT_PACKED:
+        on_creation = Seq([
+            App.globalPut(record, Bytes(EMPTY_RECORD)),
+            Return(Int(1))
+        ])
+    else:
+        on_creation = Seq([
+            App.globalPut(admin, Txn.sender()),
+            App.globalPut(compliance_status, Bytes("pending")),
+            Return(Int(1))
+        ])
     
-    # Register document: store document hash, version and dates
-    register_document = Seq([
-        Assert(Txn.sender() == App.globalGet(admin)),
-        Assert(Txn.application_args.length() == Int(4)),
-        App.globalPut(document_hash, Txn.application_args[1]),
-        App.globalPut(document_version, Txn.application_args[2]),
-        App.globalPut(attestation_date, Global.latest_timestamp()),
-        App.globalPut(expiration_date, Btoi(Txn.application_args[3])),
-        App.globalPut(compliance_status, Bytes("compliant")),
-        Return(Int(1))
-    ])
+    # register(byte[32] hash, string version, uint64 expiry)
+    version = Txn.application_args[2]
+    checks = [
+        Assert(is_admin),
+        Assert(Len(Txn.application_args[1]) == Int(32)),
+        Assert(ExtractUint16(version, Int(0)) == Len(Suffix(version, Int(2)))),
+        Assert(Len(Txn.application_args[3]) == Int(8)),
+    ]
+    if layout == LAYOUT_PACKED:
+        register_document = Seq([
+            # A version longer than MAX_RECORD_VERSION_LENGTH does not fit
+            # in one global value, so the AVM rejects the put
+            *checks,
+            App.globalPut(record, Concat(
+                Txn.application_args[1],
+                Txn.application_args[3],
+                Itob(Global.latest_timestamp()),
+                Bytes("base16", f"{STATUS_COMPLIANT:02x}"),
+                Suffix(version, Int(2)),
+            )),
+            Return(Int(1))
+        ])
+    else:
+        register_document = Seq([
+            *checks,
+            App.globalPut(document_hash, Txn.application_args[1]),
+            App.globalPut(document_version, Suffix(version, Int(2))),
+            App.globalPut(attestation_date, Global.latest_timestamp()),
+            App.globalPut(expiration_date, Btoi(Txn.application_args[3])),
+            App.globalPut(compliance_status, Bytes("compliant")),
+            Return(Int(1))
+        ])
     
-    # Assign verifier role
+    # assign_verifier(account verifier)
     assign_verifier = Seq([
-        Assert(Txn.sender() == App.globalGet(admin)),
-        Assert(Txn.application_args.length() == Int(2)),
-        App.localPut(Txn.accounts[1], verifier_role, Int(1)),
+        Assert(is_admin),
+        Assert(Len(Txn.application_args[1]) == Int(1)),
+        App.localPut(Txn.accounts[Btoi(Txn.application_args[1])], verifier_role, Int(1)),
         Return(Int(1))
     ])
     
-    # Verify compliance status
+    # verify()
+    if layout == LAYOUT_PACKED:
+        mark_expired = If(Global.latest_timestamp() > ExtractUint64(App.globalGet(record), Int(RECORD_EXPIRY_OFFSET)),
+                          App.globalPut(record, SetByte(App.globalGet(record), Int(RECORD_STATUS_OFFSET),
+                                                        Int(STATUS_EXPIRED))))
+    else:
+        mark_expired = If(Global.latest_timestamp() > App.globalGet(expiration_date),
+                          App.globalPut(compliance_status, Bytes("expired")))
     verify_compliance = Seq([
-        Assert(App.localGet(Txn.sender(), verifier_role) == Int(1)),
-        If(Global.latest_timestamp() > App.globalGet(expiration_date),
-           App.globalPut(compliance_status, Bytes("expired")),
-           Return(Int(1))),
+        Assert(App.localGet(Txn.sender(), verifier_role)),
+        mark_expired,
         Return(Int(1))
     ])
     
-    # Handle opt-in
-    handle_optin = Return(Int(1))
+    # NoOp calls are routed by the 4-byte selector in args[0]
+    selector = Txn.application_args[0]
+    handlers = {"register": register_document, "verify": verify_compliance,
+                "assign_verifier": assign_verifier}
+    method_call = Cond(*[
+        [selector == MethodSignature(signature), handlers[name]]
+        for name, (signature, _) in METHODS.items()
+    ])
+    
+    # Only opt-in is accepted besides NoOp; args[0] is never read for it
+    other_call = Return(Txn.on_completion() == OnComplete.OptIn)
     
-    # Program logic
-    program = Cond(
-        [Txn.application_id() == Int(0), on_creation],
-        [Txn.on_completion() == OnComplete.OptIn, handle_optin],
-        [Txn.application_args[0] == Bytes("register"), register_document],
-        [Txn.application_args[0] == Bytes("assign_verifier"), assign_verifier],
-        [Txn.application_args[0] == Bytes("verify"), verify_compliance]
-    )
+    # Program logic: zero ApplicationID / OnCompletion values test as false,
+    # so creation and NoOp are each recognised with a single branch
+    program = If(Txn.application_id()).Then(
+        If(Txn.on_completion()).Then(other_call).Else(method_call)
+    ).Else(on_creation)
     
     return program
 
+def abi_contract():
+    """ARC-4 description of the approval program's methods"""
+    from algosdk import abi
+    
+    methods = []
+    for signature, description in METHODS.values():
+        method = abi.Method.from_signature(signature)
+        method.desc = description
+        methods.append(method)
+    return abi.Contract("DocumentCompliance", methods,
+                        desc="Compliance attestation of a single document")
+
 def clear_state_program():
     return Return(Int(1))
 
 # Compile to TEAL
 if __name__ == "__main__":
+    import json
     import os
     current_dir = os.path.dirname(os.path.abspath(__file__))
     
@@ -77,6 +154,14 @@ if __name__ == "__main__":
         compiled = compileTeal(approval_program(), Mode.Application, version=6)
         f.write(compiled)
     
+    with open(os.path.join(current_dir, "compliance_approval_packed.teal"), "w") as f:
+        compiled = compileTeal(approval_program(LAYOUT_PACKED), Mode.Application, version=6)
+        f.write(compiled)
+    
     with open(os.path.join(current_dir, "compliance_clear.teal"), "w") as f:
         compiled = compileTeal(clear_state_program(), Mode.Application, version=6)
         f.write(compiled)
+    
+    with open(os.path.join(current_dir, "compliance_abi.json"), "w") as f:
+        json.dump(abi_contract().dictify(), f, indent=4)
+        f.write("\n")
@@ -8,19 +8,87 @@ import base64
 import hashlib
 import time
 
+try:
+    from .hash_encoding import HASH_ENCODING_BINARY, digest_bytes, encode_document_hash, decode_document_hash
+    from .compliance_abi import (CALL_ENCODING_ABI, CALL_ENCODING_AUTO, encode_call,
+                                 detect_call_encoding, program_call_encoding)
+    from .compliance_record import LAYOUT_KEYS, decode_record, find_record, global_schema
+    from .tracing import traced
+except ImportError:
+    from hash_encoding import HASH_ENCODING_BINARY, digest_bytes, encode_document_hash, decode_document_hash
+    from compliance_abi import (CALL_ENCODING_ABI, CALL_ENCODING_AUTO, encode_call,
+                                detect_call_encoding, program_call_encoding)
+    from compliance_record import LAYOUT_KEYS, decode_record, find_record, global_schema
+    from tracing import traced
+
+@traced
+def wait_for_confirmation(client, transaction_id, timeout):
+    """
+    Wait until the transaction is confirmed or rejected, or until 'timeout'
+    number of rounds have passed.
+    
+    Args:
+        client (AlgodClient): The Algorand client
+        transaction_id (str): The transaction ID to wait for
+        timeout (int): Maximum number of rounds to wait
+        
+    Returns:
+        dict: Pending transaction information, or throws an error if the transaction
+            is not confirmed or rejected in the next timeout rounds
+    """
+    start_round = client.status()["last-round"] + 1
+    current_round = start_round
+
+    while current_round < start_round + timeout:
+        try:
+            pending_txn = client.pending_transaction_info(transaction_id)
+        except Exception:
+            return
+        
+        if pending_txn.get("confirmed-round", 0) > 0:
+            return pending_txn
+        elif pending_txn["pool-error"]:
+            raise Exception(f"Pool error: {pending_txn['pool-error']}")
+        
+        client.status_after_block(current_round)
+        current_round += 1
+    
+    raise Exception(f"Transaction {transaction_id} not confirmed after {timeout} rounds")
+
 class ComplianceClient:
-    def __init__(self, algod_client, private_key):
+    def __init__(self, algod_client, private_key, hash_encoding=HASH_ENCODING_BINARY,
+                 call_encoding=CALL_ENCODING_AUTO):
         self.algod_client = algod_client
         self.private_key = private_key
         self.public_key = account.address_from_private_key(private_key)
+        # "binary" (v2) sends the raw 32-byte digest, "hex" (v1) the 64-char hex string.
+        # Only legacy apps accept hex; ABI apps always take the binary digest.
+        self.hash_encoding = hash_encoding
+        # "abi" (method selectors, see compliance_abi.json), "legacy" (method
+        # names), or "auto" to detect it per app from its approval program
+        self.call_encoding = call_encoding
+        self._call_encodings = {}
+    
+    def call_encoding_for(self, app_id):
+        if self.call_encoding != CALL_ENCODING_AUTO:
+            return self.call_encoding
+        if app_id not in self._call_encodings:
+            self._call_encodings[app_id] = detect_call_encoding(self.algod_client, app_id)
+        return self._call_encodings[app_id]
     
     def compile_program(self, source_code):
         compile_response = self.algod_client.compile(source_code)
         return base64.b64decode(compile_response['result'])
     
-    def deploy_contract(self, approval_program, clear_program):
-        # Set schema for global & local state
-        global_schema = transaction.StateSchema(num_uints=2, num_byte_slices=5)
+    @traced
+    def deploy_contract(self, approval_program, clear_program, layout=LAYOUT_KEYS):
+        app_id, _ = self._create_application(approval_program, clear_program, layout)
+        return app_id
+    
+    def _create_application(self, approval_program, clear_program, layout):
+        """Create the app and return (app_id, tx_id)"""
+        # Set schema for global & local state; `layout` must match the one the
+        # approval program was compiled with (see compliance_record.py)
         local_schema = transaction.StateSchema(num_uints=1, num_byte_slices=0)
         
         # Get suggested parameters
@@ -33,7 +101,7 @@ class ComplianceClient:
             on_complete=transaction.OnComplete.NoOpOC,
             approval_program=approval_program,
             clear_program=clear_program,
-            global_schema=global_schema,
+            global_schema=global_schema(layout),
             local_schema=local_schema
         )
         
@@ -50,8 +118,11 @@ class ComplianceClient:
         # Get the new application ID
         transaction_response = self.algod_client.pending_transaction_info(tx_id)
         app_id = transaction_response["application-index"]
-        return app_id
+        self._call_encodings[app_id] = program_call_encoding(approval_program)
+        
+        return app_id, tx_id
     
+    @traced
     def opt_in(self, app_id):
         # Get suggested parameters
         params = self.algod_client.suggested_params()
@@ -72,24 +143,26 @@ class ComplianceClient:
         
         # Wait for confirmation
         wait_for_confirmation(self.algod_client, tx_id, 5)
+        
+        return tx_id
     
     def register_document(self, app_id, document_content, version):
         # Calculate document hash
         doc_hash = hashlib.sha256(document_content.encode()).hexdigest()
         
+        return self.register_document_hash(app_id, doc_hash, version)
+    
+    @traced
+    def register_document_hash(self, app_id, doc_hash, version, expiry=None):
         # Set expiration date to 1 year from now
-        expiry = int(time.time()) + 31536000  # 365 days in seconds
+        if expiry is None:
+            expiry = int(time.time()) + 31536000  # 365 days in seconds
         
         # Get suggested parameters
         params = self.algod_client.suggested_params()
         
         # Create unsigned transaction
-        txn = transaction.ApplicationNoOpTxn(
-            sender=self.public_key,
-            sp=params,
-            index=app_id,
-            app_args=[b"register", doc_hash.encode(), version.encode(), expiry.to_bytes(8, 'big')]
-        )
+        txn = self.register_document_txn(app_id, doc_hash, version, expiry, params)
         
         # Sign transaction
         signed_txn = txn.sign(self.private_key)
@@ -101,18 +174,35 @@ class ComplianceClient:
         # Wait for confirmation
         wait_for_confirmation(self.algod_client, tx_id, 5)
         
-    def assign_verifier(self, app_id, verifier_address):
-        # Get suggested parameters
-        params = self.algod_client.suggested_params()
+        # Return transaction ID
+        return tx_id
+    
+    def register_document_txn(self, app_id, doc_hash, version, expiry, params):
+        """Unsigned register call (also used by AsyncComplianceClient)"""
+        if self.call_encoding_for(app_id) == CALL_ENCODING_ABI:
+            app_args = encode_call("register", digest_bytes(doc_hash), version, int(expiry))
+        else:
+            app_args = [
+                b"register",
+                encode_document_hash(doc_hash, self.hash_encoding),
+                version.encode(),
+                int(expiry).to_bytes(8, 'big')
+            ]
         
-        # Create unsigned transaction
-        txn = transaction.ApplicationNoOpTxn(
+        return transaction.ApplicationNoOpTxn(
             sender=self.public_key,
             sp=params,
             index=app_id,
-            app_args=[b"assign_verifier", b"1"],  # Adding a second dummy argument to match contract expectation
-            accounts=[verifier_address]
+            app_args=app_args
         )
+    
+    @traced
+    def assign_verifier(self, app_id, verifier_address):
+        # Get suggested parameters
+        params = self.algod_client.suggested_params()
+        
+        # Create unsigned transaction
+        txn = self.assign_verifier_txn(app_id, verifier_address, params)
         
         # Sign transaction
         signed_txn = txn.sign(self.private_key)
@@ -123,18 +213,32 @@ class ComplianceClient:
         
         # Wait for confirmation
         wait_for_confirmation(self.algod_client, tx_id, 5)
+        
+        # Return transaction ID
+        return tx_id
     
-    def verify_compliance(self, app_id):
-        # Get suggested parameters
-        params = self.algod_client.suggested_params()
+    def assign_verifier_txn(self, app_id, verifier_address, params):
+        """Unsigned assign_verifier call"""
+        if self.call_encoding_for(app_id) == CALL_ENCODING_ABI:
+            app_args = encode_call("assign_verifier", 1)  # Txn.accounts[1]
+        else:
+            app_args = [b"assign_verifier", b"1"]  # Adding a second dummy argument to match contract expectation
         
-        # Create unsigned transaction
-        txn = transaction.ApplicationNoOpTxn(
+        return transaction.ApplicationNoOpTxn(
             sender=self.public_key,
             sp=params,
             index=app_id,
-            app_args=[b"verify"]
+            app_args=app_args,
+            accounts=[verifier_address]
         )
+    
+    @traced
+    def verify_compliance(self, app_id, document_hash=None, is_compliant=True, attestation_date=None):
+        # Get suggested parameters
+        params = self.algod_client.suggested_params()
+        
+        # Create unsigned transaction
+        txn = self.verify_compliance_txn(app_id, document_hash, is_compliant, attestation_date, params)
         
         # Sign transaction
         signed_txn = txn.sign(self.private_key)
@@ -145,61 +249,105 @@ class ComplianceClient:
         
         # Wait for confirmation
         wait_for_confirmation(self.algod_client, tx_id, 5)
+        
+        # Return transaction ID
+        return tx_id
+    
+    def verify_compliance_txn(self, app_id, document_hash, is_compliant, attestation_date, params):
+        """Unsigned verify call; legacy apps ignore any arguments after the method name"""
+        if self.call_encoding_for(app_id) == CALL_ENCODING_ABI:
+            # verify() takes no arguments: the contract attests the stored document
+            app_args = encode_call("verify")
+        elif document_hash is None:
+            app_args = [b"verify"]
+        else:
+            # Create arguments based on compliance status
+            app_args = [b"verify", encode_document_hash(document_hash, self.hash_encoding)]
+            if is_compliant:
+                app_args.append(b"compliant")
+            else:
+                app_args.append(b"non_compliant")
+                
+            # Add attestation date if provided
+            if attestation_date:
+                app_args.append(attestation_date.to_bytes(8, 'big'))
+        
+        return transaction.ApplicationNoOpTxn(
+            sender=self.public_key,
+            sp=params,
+            index=app_id,
+            app_args=app_args
+        )
     
+    @traced
     def get_compliance_status(self, app_id):
         # Get application information
         app_info = self.algod_client.application_info(app_id)
-        global_state = app_info['params']['global-state']
+        return self.parse_compliance_status(app_info)
+    
+    @staticmethod
+    def parse_compliance_status(app_info):
+        """Status dict of an application_info response"""
+        # Parse global state
+        global_state = app_info['params']['global-state'] if 'global-state' in app_info['params'] else []
         
-        # Extract and decode values
-        status = None
-        doc_hash = None
-        version = None
-        attestation_date = None
-        expiration_date = None
+        # Packed layout: one fixed-offset record, reported under the same keys
+        record = find_record(global_state)
+        if record is not None:
+            fields = decode_record(record)
+            status_dict = {
+                'status': fields['status'],
+                'document_hash': fields['document_hash'],
+                'hash_encoding': 'binary' if fields['document_hash'] else None,
+                'document_version': fields['version'],
+                'attestation_date': fields['attestation_date'],
+                'expiration_date': fields['expiration_date'],
+            }
+            return {key: value for key, value in status_dict.items() if value is not None}
         
+        # Convert global state to dictionary
+        status_dict = {}
         for item in global_state:
-            key = base64.b64decode(item['key']).decode()
-            if key == "status":
-                if item['value']['type'] == 1:  # bytes
-                    status = base64.b64decode(item['value']['bytes']).decode()
-            elif key == "document_hash":
-                if item['value']['type'] == 1:  # bytes
-                    doc_hash = base64.b64decode(item['value']['bytes']).decode()
-            elif key == "document_version":
-                if item['value']['type'] == 1:  # bytes
-                    version = base64.b64decode(item['value']['bytes']).decode()
-            elif key == "attestation_date":
-                if item['value']['type'] == 2:  # uint
-                    attestation_date = item['value']['uint']
-            elif key == "expiration_date":
-                if item['value']['type'] == 2:  # uint
-                    expiration_date = item['value']['uint']
-        
-        return {
-            "status": status,
-            "document_hash": doc_hash,
-            "version": version,
-            "attestation_date": attestation_date,
-            "expiration_date": expiration_date
-        }
-
-# Helper function to wait for confirmation
-def wait_for_confirmation(client, txid, timeout):
-    start_round = client.status()["last-round"] + 1
-    current_round = start_round
-    
-    while current_round < start_round + timeout:
-        try:
-            pending_txn = client.pending_transaction_info(txid)
-        except Exception:
-            return False
+            key = base64.b64decode(item['key']).decode('utf-8')
+            value = item['value']
             
-        if pending_txn.get("confirmed-round", 0) > 0:
-            return pending_txn
-            
-        params = client.suggested_params()
-        current_round = params.first
-        client.status_after_block(current_round)
-            
-    raise Exception(f"Transaction {txid} not confirmed after {timeout} rounds")
+            if value['type'] == 1:  # bytes
+                if key == 'document_hash':
+                    # Stored either as a raw 32-byte digest (v2) or a hex string (v1)
+                    status_dict[key], status_dict['hash_encoding'] = decode_document_hash(value['bytes'])
+                elif key == 'verifier_address':
+                    # These are special cases that need to be decoded differently
+                    try:
+                        val_decoded = base64.b64decode(value['bytes']).decode('utf-8')
+                        status_dict[key] = val_decoded
+                    except:
+                        # If it's not a valid UTF-8 string, keep the base64
+                        status_dict[key] = value['bytes']
+                else:
+                    # Normal string values
+                    try:
+                        status_dict[key] = base64.b64decode(value['bytes']).decode('utf-8')
+                    except:
+                        status_dict[key] = value['bytes']
+            else:  # uint
+                status_dict[key] = value['uint']
+        
+        return status_dict
+    
+    def migrate_hash_encoding(self, app_id):
+        """
+        Re-register the current document of an already deployed app with the
+        compact binary hash encoding, keeping its version and expiration date.
+        The attestation date is refreshed by the contract, and since "register"
+        marks a document compliant, only compliant apps are migrated. Returns
+        the transaction ID, or None if there is nothing to migrate.
+        """
+        status = self.get_compliance_status(app_id)
+        if not status.get('document_hash') or status.get('hash_encoding') != 'hex':
+            return None
+        if status.get('status') != 'compliant':
+            return None
+        
+        return self.register_document_hash(app_id, status['document_hash'],
+                                           status.get('document_version', ''),
+                                           status.get('expiration_date'))
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+# document_index.py - Digest -> registration lookup across all known compliance apps
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from .hash_encoding import digest_bytes
+except ImportError:
+    from hash_encoding import digest_bytes
+
+INDEX_TTL = 30        # Seconds before the on-chain state is re-read
+FETCH_WORKERS = 8     # Parallel application_info calls while rebuilding
+
+_UNREGISTERED = {
+    "registered": False,
+    "compliant": False,
+    "status": "unregistered",
+    "version": None,
+    "expiration_date": None,
+    "attestation_date": None,
+    "app_id": None,
+    "current": False,
+    "onchain_hash": None,
+}
+
+
+def normalize_digest(value):
+    """Return a lower-case hex digest, or None if `value` is not a SHA-256 digest"""
+    try:
+        return digest_bytes(value.strip()).hex()
+    except (ValueError, AttributeError):
+        return None
+
+
+class DocumentIndex:
+    """
+    In-memory index of registered document hashes.
+
+    Built from the current global state of every known app (one read per
+    app, not per digest) plus the per-document history kept locally, so a
+    list of digests is resolved with dictionary lookups. A document
+    registered with a chunked digest is found both by the Merkle root held
+    on-chain (`onchain_hash`) and by the SHA-256 of the file.
+
+    invalidate() marks the index stale after a write; the next ensure_fresh()
+    rebuilds it once while concurrent callers wait for that rebuild.
+
+    `fetch_status(app_id)` must return a dict with the keys produced by
+    `ComplianceClient.get_compliance_status` (document_hash, document_version
+    or version, status, attestation_date, expiration_date).
+    """
+
+    def __init__(self, fetch_status, ttl=INDEX_TTL):
+        self.fetch_status = fetch_status
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._entries = {}
+        self._built_at = 0
+        self._app_ids = ()
+        self._generation = 0          # Bumped by invalidate()
+        self._built_generation = -1
+
+    def refresh(self, app_ids, history=()):
+        """
+        Rebuild the index.
+
+        `history` is an iterable of (app_id, document dict) pairs for documents
+        registered earlier (as recorded in contracts.json); digests found only
+        there are reported as superseded.
+        """
+        with self._lock:
+            generation = self._generation
+        app_ids = sorted(set(app_id for app_id in app_ids if app_id))
+        entries = {}
+        file_hashes = {}    # (app_id, on-chain digest) -> SHA-256 of the file
+
+        for app_id, doc in history:
+            digest = normalize_digest(doc.get("hash", ""))
+            if not digest:
+                continue
+            entry = {
+                "app_id": app_id,
+                "status": "superseded",
+                "version": doc.get("version"),
+                "expiration_date": doc.get("expiry_timestamp"),
+                "attestation_date": None,
+                "current": False,
+                "onchain_hash": digest,
+            }
+            entries[digest] = entry
+            file_hash = normalize_digest(doc.get("file_hash") or "")
+            if file_hash:
+                entries[file_hash] = entry
+                file_hashes[(app_id, digest)] = file_hash
+
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+            statuses = list(pool.map(self._fetch, app_ids))
+
+        for app_id, status in zip(app_ids, statuses):
+            digest = normalize_digest((status or {}).get("document_hash") or "")
+            if not digest:
+                continue
+            entries[digest] = {
+                "app_id": app_id,
+                "status": status.get("status"),
+                "version": status.get("document_version", status.get("version")),
+                "expiration_date": status.get("expiration_date"),
+                "attestation_date": status.get("attestation_date"),
+                "current": True,
+                "onchain_hash": digest,
+            }
+            file_hash = file_hashes.get((app_id, digest))
+            if file_hash:
+                entries[file_hash] = entries[digest]
+
+        with self._lock:
+            self._entries = entries
+            self._built_at = time.time()
+            self._app_ids = tuple(app_ids)
+            self._built_generation = generation
+
+    def invalidate(self):
+        """Rebuild on the next ensure_fresh(), e.g. after a registration"""
+        with self._lock:
+            self._generation += 1
+
+    def _fetch(self, app_id):
+        try:
+            return self.fetch_status(app_id)
+        except Exception as e:
+            print(f"Error reading compliance status of app {app_id}: {str(e)}")
+            return None
+
+    def ensure_fresh(self, app_ids, history=()):
+        """Rebuild if the index is older than the TTL or the set of apps changed"""
+        app_ids = tuple(sorted(set(app_id for app_id in app_ids if app_id)))
+        if not self._is_stale(app_ids):
+            return
+        with self._refresh_lock:
+            # Another request may have rebuilt it while this one waited
+            if self._is_stale(app_ids):
+                self.refresh(app_ids, history)
+
+    def _is_stale(self, app_ids):
+        with self._lock:
+            return (time.time() - self._built_at > self.ttl or app_ids != self._app_ids
+                    or self._built_generation != self._generation)
+
+    def lookup(self, digest, now=None):
+        """Resolve one digest to its registration record"""
+        normalized = normalize_digest(digest) if isinstance(digest, str) else None
+        if not normalized:
+            return dict(_UNREGISTERED, document_hash=digest, status="invalid",
+                        error="Not a SHA-256 hex digest")
+
+        entry = self._entries.get(normalized)
+        if entry is None:
+            return dict(_UNREGISTERED, document_hash=normalized)
+
+        result = dict(entry, document_hash=normalized, registered=True)
+        now = time.time() if now is None else now
+        # The contract only flips to "expired" when a verifier calls it
+        if result["status"] == "compliant" and result["expiration_date"] and result["expiration_date"] < now:
+            result["status"] = "expired"
+        result["compliant"] = result["current"] and result["status"] == "compliant"
+        return result
+
+    def lookup_many(self, digests):
+        now = time.time()
+        for digest in digests:
+            yield self.lookup(digest, now)
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# document_registry.py - v2 compliance contract: one app, one box per document
+#
+# The v1 contract (document_compliance.py) keeps a single document in global
+# state, so every document needs its own app. Here each document is a box
+# keyed by its 32-byte digest (layout in registry_box.py), so one app holds
+# any number of documents. Boxes need AVM v8.
+
+from pyteal import *
+
+from registry_box import (EXPIRY_OFFSET, ATTESTATION_OFFSET, STATUS_OFFSET, MAX_VERSION_LENGTH,
+                          STATUS_PENDING, STATUS_COMPLIANT, STATUS_EXPIRED)
+
+TEAL_VERSION = 8
+
+# verify_batch takes up to this many digests: a transaction can reference
+# at most 8 boxes, so more arguments would not let one call attest more
+MAX_BATCH = 8
+
+
+def status_byte(code):
+    return Bytes("base16", f"{code:02x}")
+
+
+@Subroutine(TealType.none)
+def attest(digest):
+    """Attest a registered document now: compliant unless already past its expiry"""
+    box_exists = App.box_length(digest)
+    expiration_date = Btoi(App.box_extract(digest, Int(EXPIRY_OFFSET), Int(8)))
+    return Seq([
+        box_exists,
+        Assert(box_exists.hasValue()),
+        App.box_replace(digest, Int(ATTESTATION_OFFSET), Itob(Global.latest_timestamp())),
+        App.box_replace(digest, Int(STATUS_OFFSET), If(
+            Global.latest_timestamp() > expiration_date,
+            status_byte(STATUS_EXPIRED),
+            status_byte(STATUS_COMPLIANT),
+        )),
+    ])
+
+
+def approval_program():
+    # Global state (contract-wide)
+    admin = Bytes("admin")                         # Administrator address
+
+    # Local state (per-account)
+    verifier_role = Bytes("verifier_role")         # Whether account is a verifier
+
+    # Every document call names its box with args[1]
+    digest = Txn.application_args[1]
+    box_exists = App.box_length(digest)
+    expiration_date = Btoi(App.box_extract(digest, Int(EXPIRY_OFFSET), Int(8)))
+
+    # On creation: initialize contract
+    on_creation = Seq([
+        App.globalPut(admin, Txn.sender()),
+        Return(Int(1))
+    ])
+
+    # Register document: (re)create its box as pending
+    register_document = Seq([
+        Assert(Txn.sender() == App.globalGet(admin)),
+        Assert(Txn.application_args.length() == Int(4)),
+        Assert(Len(digest) == Int(32)),
+        Assert(Len(Txn.application_args[2]) <= Int(MAX_VERSION_LENGTH)),
+        Assert(Len(Txn.application_args[3]) == Int(8)),
+        # A re-registered document may change size, so replace the whole box
+        Pop(App.box_delete(digest)),
+        App.box_put(digest, Concat(
+            Txn.application_args[3],
+            Itob(Int(0)),
+            status_byte(STATUS_PENDING),
+            Txn.application_args[2],
+        )),
+        Return(Int(1))
+    ])
+
+    # Assign verifier role
+    assign_verifier = Seq([
+        Assert(Txn.sender() == App.globalGet(admin)),
+        Assert(Txn.application_args.length() == Int(2)),
+        App.localPut(Txn.accounts[1], verifier_role, Int(1)),
+        Return(Int(1))
+    ])
+
+    # Verify a document
+    verify_document = Seq([
+        Assert(App.localGet(Txn.sender(), verifier_role) == Int(1)),
+        Assert(Txn.application_args.length() == Int(2)),
+        attest(digest),
+        Return(Int(1))
+    ])
+
+    # Verify args[1..MAX_BATCH]; one unregistered document rejects the whole call
+    num_args = Txn.application_args.length()
+    verify_batch = Seq([
+        Assert(App.localGet(Txn.sender(), verifier_role) == Int(1)),
+        Assert(num_args >= Int(2)),
+        Assert(num_args <= Int(MAX_BATCH + 1)),
+        *[If(num_args > Int(i), attest(Txn.application_args[i])) for i in range(1, MAX_BATCH + 1)],
+        Return(Int(1))
+    ])
+
+    # Expire a document: the admin at any time, anyone once it is past its expiry
+    expire_document = Seq([
+        Assert(Txn.application_args.length() == Int(2)),
+        box_exists,
+        Assert(box_exists.hasValue()),
+        Assert(Or(Txn.sender() == App.globalGet(admin),
+                  Global.latest_timestamp() > expiration_date)),
+        App.box_replace(digest, Int(STATUS_OFFSET), status_byte(STATUS_EXPIRED)),
+        Return(Int(1))
+    ])
+
+    # Handle opt-in
+    handle_optin = Return(Int(1))
+
+    # Program logic
+    program = Cond(
+        [Txn.application_id() == Int(0), on_creation],
+        [Txn.on_completion() == OnComplete.OptIn, handle_optin],
+        [Txn.application_args[0] == Bytes("register"), register_document],
+        [Txn.application_args[0] == Bytes("assign_verifier"), assign_verifier],
+        [Txn.application_args[0] == Bytes("verify"), verify_document],
+        [Txn.application_args[0] == Bytes("expire"), expire_document],
+        [Txn.application_args[0] == Bytes("verify_batch"), verify_batch]
+    )
+
+    return program
+
+def clear_state_program():
+    return Return(Int(1))
+
+# Compile to TEAL
+if __name__ == "__main__":
+    import os
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+
+    with open(os.path.join(current_dir, "registry_approval.teal"), "w") as f:
+        compiled = compileTeal(approval_program(), Mode.Application, version=TEAL_VERSION)
+        f.write(compiled)
+
+    with open(os.path.join(current_dir, "registry_clear.teal"), "w") as f:
+        compiled = compileTeal(clear_state_program(), Mode.Application, version=TEAL_VERSION)
+        f.write(compiled)
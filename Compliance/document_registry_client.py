@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# document_registry_client.py - Client for the v2 box-based document registry
+
+from algosdk import constants, transaction
+from algosdk.error import AlgodHTTPError
+from algosdk.logic import get_application_address
+import base64
+import time
+
+try:
+    from .admission import is_overload
+    from .document_compliance_client import ComplianceClient, wait_for_confirmation
+    from .registry_box import box_name, box_min_balance, decode_box
+    from .tracing import traced
+except ImportError:
+    from admission import is_overload
+    from document_compliance_client import ComplianceClient, wait_for_confirmation
+    from registry_box import box_name, box_min_balance, decode_box
+    from tracing import traced
+
+APP_ACCOUNT_MIN_BALANCE = 100000  # An account must hold 0.1 Algo before it can hold boxes
+
+# verify_batch: digests (and box references) per app call, calls per atomic group
+BATCH_SIZE = 8
+MAX_GROUP_SIZE = constants.tx_group_limit
+
+
+def plan_verify_batches(doc_hashes, batch_size=BATCH_SIZE, group_size=MAX_GROUP_SIZE):
+    """
+    Split document hashes into atomic groups of verify_batch calls: a list of
+    groups, each a list of calls, each a list of box names. Duplicates are
+    dropped; malformed hashes raise ValueError before anything is sent.
+    """
+    names = list(dict.fromkeys(box_name(doc_hash) for doc_hash in doc_hashes))
+    calls = [names[i:i + batch_size] for i in range(0, len(names), batch_size)]
+    return [calls[i:i + group_size] for i in range(0, len(calls), group_size)]
+
+
+class ComplianceRegistryClient(ComplianceClient):
+    """
+    ComplianceClient for the v2 registry contract (document_registry.py).
+
+    Every document call takes the document hash; the box reference the
+    contract needs is derived from it, and registering a new document also
+    pays the box minimum balance into the app account in the same group.
+    Opt-in and assign_verifier are unchanged from v1.
+    """
+
+    @traced
+    def deploy_contract(self, approval_program, clear_program):
+        # Only the admin address lives in global state
+        global_schema = transaction.StateSchema(num_uints=0, num_byte_slices=1)
+        local_schema = transaction.StateSchema(num_uints=1, num_byte_slices=0)
+
+        params = self.algod_client.suggested_params()
+        txn = transaction.ApplicationCreateTxn(
+            sender=self.public_key,
+            sp=params,
+            on_complete=transaction.OnComplete.NoOpOC,
+            approval_program=approval_program,
+            clear_program=clear_program,
+            global_schema=global_schema,
+            local_schema=local_schema
+        )
+        signed_txn = txn.sign(self.private_key)
+        tx_id = signed_txn.transaction.get_txid()
+        self.algod_client.send_transaction(signed_txn)
+        wait_for_confirmation(self.algod_client, tx_id, 5)
+
+        app_id = self.algod_client.pending_transaction_info(tx_id)["application-index"]
+        self.fund_app(app_id, APP_ACCOUNT_MIN_BALANCE)
+        return app_id
+
+    @traced
+    def fund_app(self, app_id, amount):
+        params = self.algod_client.suggested_params()
+        txn = transaction.PaymentTxn(self.public_key, params, get_application_address(app_id), amount)
+        signed_txn = txn.sign(self.private_key)
+        tx_id = signed_txn.transaction.get_txid()
+        self.algod_client.send_transaction(signed_txn)
+        wait_for_confirmation(self.algod_client, tx_id, 5)
+        return tx_id
+
+    @traced
+    def register_document_hash(self, app_id, doc_hash, version, expiry=None):
+        """Create (or reset to pending) the box of a document. Returns the app call txid."""
+        if expiry is None:
+            expiry = int(time.time()) + 31536000  # 365 days in seconds
+        name = box_name(doc_hash)
+
+        # Top up the app account by what the box adds to its minimum balance
+        existing = self.get_document(app_id, doc_hash)
+        top_up = box_min_balance(version)
+        if existing is not None:
+            top_up -= box_min_balance(existing["version"])
+
+        params = self.algod_client.suggested_params()
+        call = transaction.ApplicationNoOpTxn(
+            sender=self.public_key,
+            sp=params,
+            index=app_id,
+            app_args=[b"register", name, version.encode(), int(expiry).to_bytes(8, 'big')],
+            boxes=[(app_id, name)]
+        )
+        txns = [call]
+        if top_up > 0:
+            txns.insert(0, transaction.PaymentTxn(self.public_key, params,
+                                                  get_application_address(app_id), top_up))
+        return self._send_group(txns)
+
+    @traced
+    def verify_document(self, app_id, doc_hash):
+        """Attest a document as a verifier. Returns the txid."""
+        return self._call_document(app_id, b"verify", doc_hash)
+
+    @traced
+    def expire_document(self, app_id, doc_hash):
+        """Mark a document expired (admin, or anyone once it is past its expiry). Returns the txid."""
+        return self._call_document(app_id, b"expire", doc_hash)
+
+    @traced
+    def verify_documents(self, app_id, doc_hashes):
+        """
+        Attest many documents as a verifier with verify_batch calls, one atomic
+        group at a time. The first call of each group pays the fee for the
+        whole group. An unregistered document rejects its group only, so the
+        result lists each group with its txid or error.
+
+        Failures of the node itself (overload, 5xx, network errors, a group
+        left unconfirmed) are raised instead, so the caller can back off and
+        retry; groups confirmed before then stay attested.
+        """
+        results = []
+        for group in plan_verify_batches(doc_hashes):
+            params = self.algod_client.suggested_params()
+            min_fee = params.min_fee or constants.min_txn_fee
+            txns = []
+            for names in group:
+                sp = transaction.SuggestedParams(0, params.first, params.last, params.gh, params.gen,
+                                                 flat_fee=True, min_fee=min_fee)
+                txns.append(transaction.ApplicationNoOpTxn(
+                    sender=self.public_key,
+                    sp=sp,
+                    index=app_id,
+                    app_args=[b"verify_batch"] + names,
+                    boxes=[(app_id, name) for name in names]
+                ))
+            txns[0].fee = min_fee * len(txns)
+
+            result = {"document_hashes": [name.hex() for names in group for name in names],
+                      "transactions": len(txns)}
+            try:
+                result["txn_id"] = self._send_group(txns)
+            except AlgodHTTPError as e:
+                if is_overload(e) or (e.code or 500) >= 500:
+                    raise
+                result["error"] = str(e)
+            results.append(result)
+        return results
+
+    @traced
+    def get_document(self, app_id, doc_hash):
+        """Read a document's box directly from algod; None if it is not registered"""
+        name = box_name(doc_hash)
+        try:
+            response = self.algod_client.application_box_by_name(app_id, name)
+        except AlgodHTTPError as e:
+            if e.code == 404:
+                return None
+            raise
+        return dict(decode_box(response["value"]), document_hash=name.hex(), app_id=app_id)
+
+    def list_document_hashes(self, app_id, limit=0):
+        """Hex digests of the documents registered in the app (all of them by default)"""
+        response = self.algod_client.application_boxes(app_id, limit=limit)
+        return [base64.b64decode(box["name"]).hex() for box in response.get("boxes", [])]
+
+    def _call_document(self, app_id, action, doc_hash):
+        name = box_name(doc_hash)
+        params = self.algod_client.suggested_params()
+        txn = transaction.ApplicationNoOpTxn(
+            sender=self.public_key,
+            sp=params,
+            index=app_id,
+            app_args=[action, name],
+            boxes=[(app_id, name)]
+        )
+        return self._send_group([txn])
+
+    def _send_group(self, txns):
+        """Sign and submit one or more transactions atomically; returns the last txid"""
+        if len(txns) > 1:
+            transaction.assign_group_id(txns)
+        signed_txns = [txn.sign(self.private_key) for txn in txns]
+        tx_id = signed_txns[-1].transaction.get_txid()
+        if len(signed_txns) > 1:
+            self.algod_client.send_transactions(signed_txns)
+        else:
+            self.algod_client.send_transaction(signed_txns[0])
+        wait_for_confirmation(self.algod_client, tx_id, 5)
+        return tx_id
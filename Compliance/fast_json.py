@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# fast_json.py - Pluggable JSON encoder and streaming list responses for the Flask apps
+#
+#   install_json_provider(app)           # every jsonify() goes through the fast encoder
+#   return list_response(items, key="transactions", fields={...})
+#
+# The encoder is chosen with JSON_ENCODER: "orjson", "json" (the standard
+# library, as Flask does by default) or "auto" (orjson when installed). Output
+# matches Flask's: compact, sorted keys, RFC 822 dates. List endpoints can
+# stream their bodies as a JSON array / object or, for clients sending
+# `Accept: application/x-ndjson`, as one JSON document per line, so a long
+# list is encoded a batch of items at a time instead of as one large string.
+
+import json
+import os
+
+from flask import Response, current_app, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+ENCODER_AUTO = "auto"
+STREAM_BATCH_SIZE = 100
+NDJSON_MIMETYPE = "application/x-ndjson"
+
+
+def _stdlib_dumps(obj):
+    return json.dumps(obj, default=DefaultJSONProvider.default, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _orjson_dumps(obj):
+    try:
+        return orjson.dumps(obj, default=DefaultJSONProvider.default,
+                            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+    except TypeError:
+        # Integers beyond 64 bits and other values orjson rejects
+        return _stdlib_dumps(obj)
+
+
+# name -> function of one object returning UTF-8 JSON bytes
+ENCODERS = {"json": _stdlib_dumps}
+if orjson is not None:
+    ENCODERS["orjson"] = _orjson_dumps
+
+
+def register_encoder(name, dumps):
+    """Make `dumps` (object -> JSON bytes) selectable with JSON_ENCODER=name"""
+    ENCODERS[name] = dumps
+
+
+def encoder_for(name=ENCODER_AUTO):
+    if name == ENCODER_AUTO:
+        name = "orjson" if "orjson" in ENCODERS else "json"
+    if name not in ENCODERS:
+        raise ValueError(f"Unknown JSON encoder: {name} (available: {', '.join(sorted(ENCODERS))})")
+    return ENCODERS[name]
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider that serializes with the selected encoder"""
+
+    encoder = ENCODER_AUTO
+
+    def __init__(self, app):
+        super().__init__(app)
+        self.dumps_bytes = encoder_for(self.encoder)
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            # Indented output for debugging stays with the standard library
+            return super().response(obj)
+        return self._app.response_class(self.dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
+
+
+def install_json_provider(app, encoder=None):
+    """Serialize every jsonify() of `app` with `encoder` (default: JSON_ENCODER or auto)"""
+    provider_class = type("FastJSONProvider", (FastJSONProvider,),
+                          {"encoder": encoder or os.environ.get("JSON_ENCODER", ENCODER_AUTO)})
+    app.json_provider_class = provider_class
+    app.json = provider_class(app)
+    return app.json
+
+
+def stream_ndjson(items, dumps=None, batch_size=STREAM_BATCH_SIZE):
+    """One JSON document per line, yielded `batch_size` items at a time"""
+    dumps = dumps or encoder_for()
+    batch = []
+    for item in items:
+        batch.append(dumps(item))
+        if len(batch) >= batch_size:
+            yield b"\n".join(batch) + b"\n"
+            batch = []
+    if batch:
+        yield b"\n".join(batch) + b"\n"
+
+
+def stream_json(items, key=None, fields=None, dumps=None, batch_size=STREAM_BATCH_SIZE):
+    """
+    A JSON array of `items`, or with `key` an object holding `fields` and the
+    array under `key`, yielded `batch_size` items at a time
+    """
+    dumps = dumps or encoder_for()
+    if key is None:
+        yield b"["
+    else:
+        head = dumps(dict(fields or {}))[:-1]
+        yield head + (b"," if len(head) > 1 else b"") + dumps(key) + b":["
+    # Each batch is encoded as one array, brackets stripped
+    first, batch = True, []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield (b"" if first else b",") + dumps(batch)[1:-1]
+            first, batch = False, []
+    if batch:
+        yield (b"" if first else b",") + dumps(batch)[1:-1]
+    yield b"]" if key is None else b"]}"
+
+
+def wants_ndjson():
+    return NDJSON_MIMETYPE in request.headers.get("Accept", "")
+
+
+def list_response(items, key=None, fields=None, headers=None, ndjson=None):
+    """
+    Streamed response for a list endpoint: NDJSON of the items when the client
+    accepts it (or `ndjson` is set), otherwise the JSON array / object
+    """
+    dumps = getattr(current_app.json, "dumps_bytes", None) or encoder_for("json")
+    if ndjson is None:
+        ndjson = wants_ndjson()
+    if ndjson:
+        return Response(stream_ndjson(items, dumps), mimetype=NDJSON_MIMETYPE, headers=headers)
+    return Response(stream_json(items, key, fields, dumps), mimetype="application/json", headers=headers)
@@ -10,14 +10,24 @@ import datetime
 # Add parent directory to path to import compliance modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from document_compliance_client import ComplianceClient
-from document_compliance import approval_program, clear_state_program, compileTeal, Mode
-from algosdk import account, mnemonic
-from algosdk.v2client import algod
+from upload_sessions import UploadSessionStore, UploadSessionError, UploadSessionNotFound
+from chunked_digest import ChunkHashCache, DIGEST_MODES, digest_document_version
+from contract_store import open_contract_store, DEFAULT_PAGE_SIZE
+from compliance_record import LAYOUT_KEYS, LAYOUT_PACKED
+from job_queue import JobQueue, DEFAULT_WORKERS, previous_submission, record_submissions
+from metrics import MetricsRegistry, instrument_client, instrument_flask
+from tracing import configure_from_env, trace_client, trace_flask
+from fast_json import install_json_provider, list_response
+from single_flight import SingleFlight, coalesce_client
+from lazy import Lazy
+from readiness import add_readiness_route, probe_from_env
 
 app = Flask(__name__)
 app.secret_key = "compliance_app_secret_key"  # For flash messages
 
+# jsonify() through the fast encoder (JSON_ENCODER=orjson|json|auto)
+install_json_provider(app)
+
 # Custom template filter for timestamps
 @app.template_filter('timestamp_to_date')
 def timestamp_to_date(timestamp):
@@ -30,9 +40,66 @@ UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'docume
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 
-# Connect to Algorand TestNet
-algod_address = "https://testnet-api.algonode.cloud"
-algod_client = algod.AlgodClient("", algod_address)
+# Staging area for resumable chunked uploads
+upload_sessions = UploadSessionStore(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'upload_sessions'))
+
+# Deployed contracts and registered documents (imported from contracts.json on first run;
+# CONTRACTS_DB and JOBS_DB move the databases, e.g. for offline runs against the stand-in)
+CONTRACTS_DB = os.environ.get('CONTRACTS_DB') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'contracts.db')
+CONTRACTS_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'contracts.json')
+contract_store = open_contract_store(CONTRACTS_DB, CONTRACTS_JSON)
+
+# Deploys and app calls run as background jobs (JOB_WORKERS=0 only enqueues)
+JOBS_DB = os.environ.get('JOBS_DB') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'jobs.db')
+job_queue = JobQueue(JOBS_DB, workers=int(os.environ.get('JOB_WORKERS', DEFAULT_WORKERS)))
+
+# Per-chunk hashes of the latest version of each document, for chunked digests
+chunk_cache = ChunkHashCache(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'chunk_cache'))
+
+# Algorand TestNet node, and the indexer retried jobs look their transactions up in
+algod_address = os.environ.get("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+indexer_address = os.environ.get("INDEXER_ADDRESS", "https://testnet-idx.algonode.cloud")
+
+# Request and algod call latency histograms, served at /metrics
+metrics = MetricsRegistry()
+instrument_flask(app, metrics)
+
+# Spans per request, client method and algod call (TRACE_FILE, TRACE_OTLP_ENDPOINT, TRACE_SAMPLE_RATE)
+tracer = configure_from_env()
+trace_flask(app)
+
+# Identical concurrent app/account reads share one node call. Writes run as
+# background jobs, so results are only held past the call with COALESCE_HOLD
+read_flights = SingleFlight(hold=float(os.environ.get('COALESCE_HOLD', '0')))
+
+# Connected on first use; algosdk and PyTeal are only loaded when needed
+def build_algod_client():
+    from algosdk.v2client import algod
+    client = algod.AlgodClient(os.environ.get("ALGOD_TOKEN", ""), algod_address)
+    instrument_client(client, "algod", metrics)
+    trace_client(client, "algod")
+    # Jobs note each txid before sending, so a retry never sends it twice
+    record_submissions(client)
+    return coalesce_client(client, "algod", read_flights, metrics)
+
+def build_indexer_client():
+    from algosdk.v2client import indexer
+    client = indexer.IndexerClient(os.environ.get("INDEXER_TOKEN", ""), indexer_address)
+    instrument_client(client, "indexer", metrics)
+    trace_client(client, "indexer")
+    return client
+
+algod_client = Lazy(build_algod_client)
+indexer_client = Lazy(build_indexer_client)
+
+# Node health, probed in the background and served at /readyz (READINESS_INTERVAL)
+readiness = probe_from_env({"algod": lambda: algod_client.get().status()})
+add_readiness_route(app, readiness)
+readiness.start()
+
+# Global-state layout of newly deployed contracts: "keys" (one global per
+# field) or "packed" (one record, smaller schema and minimum balance)
+STATE_LAYOUT = os.environ.get('COMPLIANCE_STATE_LAYOUT', LAYOUT_KEYS)
 
 # File path for accounts
 ACCOUNTS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'compliance_test_accounts.json')
@@ -50,46 +117,41 @@ def load_accounts():
 def get_client(role='admin'):
     accounts = load_accounts()
     if role in accounts and "private_key" in accounts[role]:
-        return ComplianceClient(algod_client, accounts[role]["private_key"])
+        from document_compliance_client import ComplianceClient
+        return ComplianceClient(algod_client.get(), accounts[role]["private_key"])
     return None
 
-# Deploy contract and generate TEAL files
+# Deploy contract and generate TEAL files; returns the new app ID
 def deploy_contract():
     admin_client = get_client('admin')
     if not admin_client:
-        return None, "Admin account not found or invalid"
+        raise ValueError("Admin account not found or invalid")
     
-    try:
-        # Generate TEAL files
-        current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        approval_path = os.path.join(current_dir, "compliance_approval.teal")
-        clear_path = os.path.join(current_dir, "compliance_clear.teal")
-        
-        # Generate TEAL from PyTeal
-        with open(approval_path, "w") as f:
-            compiled = compileTeal(approval_program(), Mode.Application, version=6)
-            f.write(compiled)
-        
-        with open(clear_path, "w") as f:
-            compiled = compileTeal(clear_state_program(), Mode.Application, version=6)
-            f.write(compiled)
-        
-        # Read compiled TEAL
-        with open(approval_path, "r") as f:
-            approval_source = f.read()
-        
-        with open(clear_path, "r") as f:
-            clear_source = f.read()
-        
-        # Compile programs
-        approval_program_compiled = admin_client.compile_program(approval_source)
-        clear_program_compiled = admin_client.compile_program(clear_source)
-        
-        # Deploy contract
-        app_id = admin_client.deploy_contract(approval_program_compiled, clear_program_compiled)
-        return app_id, None
-    except Exception as e:
-        return None, str(e)
+    from document_compliance import approval_program, clear_state_program, compileTeal, Mode
+
+    # Generate TEAL files
+    current_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    approval_name = "compliance_approval_packed.teal" if STATE_LAYOUT == LAYOUT_PACKED else "compliance_approval.teal"
+    approval_path = os.path.join(current_dir, approval_name)
+    clear_path = os.path.join(current_dir, "compliance_clear.teal")
+    
+    # Generate TEAL from PyTeal; the files are written for reference only, since
+    # concurrent deploy jobs may be rewriting them
+    approval_source = compileTeal(approval_program(STATE_LAYOUT), Mode.Application, version=6)
+    clear_source = compileTeal(clear_state_program(), Mode.Application, version=6)
+    with open(approval_path, "w") as f:
+        f.write(approval_source)
+    
+    with open(clear_path, "w") as f:
+        f.write(clear_source)
+    
+    # Compile programs
+    approval_program_compiled = admin_client.compile_program(approval_source)
+    clear_program_compiled = admin_client.compile_program(clear_source)
+    
+    # Deploy contract
+    app_id = admin_client.deploy_contract(approval_program_compiled, clear_program_compiled, STATE_LAYOUT)
+    return app_id
 
 # Calculate hash for a file
 def calculate_file_hash(file_path):
@@ -97,88 +159,150 @@ def calculate_file_hash(file_path):
         content = f.read()
         return hashlib.sha256(content).hexdigest()
 
+# Calculate the digest registered for a document version
+def calculate_document_digest(app_id, filename, file_path, version, digest_mode='sha256'):
+    """
+    Return (digest, changed_ranges, staged). The default mode is a plain
+    SHA-256 of the file; 'fixed' and 'cdc' use a chunk-level Merkle root and
+    report which byte ranges changed against the cached previous version.
+    Every chunk of the stored file is hashed here, so the registered root
+    always matches the file.
+    
+    The new chunk manifest is only staged: `staged` is the (key, token) pair
+    to hand to promote_chunk_manifest() once the digest is on-chain.
+    """
+    if digest_mode not in DIGEST_MODES:
+        raise ValueError(f"Unknown digest mode: {digest_mode}")
+    if digest_mode == 'sha256':
+        return calculate_file_hash(file_path), None, None
+    
+    key = f"{app_id}:{filename}"
+    manifest = digest_document_version(file_path, chunk_cache, key, mode=digest_mode, version=version, save=False)
+    return manifest['root'], manifest['changed_ranges'], [key, chunk_cache.stage(key, manifest)]
+
+def promote_chunk_manifest(staged):
+    if staged:
+        chunk_cache.promote(*staged)
+
+def describe_changed_ranges(changed_ranges):
+    if changed_ranges is None:
+        return ""
+    if not changed_ranges:
+        return " (no content changes since the previous version)"
+    changed_bytes = sum(end - start for start, end in changed_ranges)
+    shown = ", ".join(f"{start}-{end}" for start, end in changed_ranges[:5])
+    more = f" and {len(changed_ranges) - 5} more" if len(changed_ranges) > 5 else ""
+    return f" ({changed_bytes} bytes changed: {shown}{more})"
+
+def listing_args():
+    """Sort, order, cursor and page size of a paginated listing request"""
+    return {
+        "sort": request.args.get('sort', 'created_at'),
+        "order": request.args.get('order', 'asc'),
+        "cursor": request.args.get('cursor') or None,
+        "limit": request.args.get('limit', DEFAULT_PAGE_SIZE, type=int),
+    }
+
+# Background jobs for on-chain writes. Each handler takes the job payload,
+# raises on failure (transient algod errors are retried by the queue) and
+# returns the outcome shown to the user.
+
+def client_for(role):
+    client = get_client(role)
+    if not client:
+        raise ValueError(f"{role.capitalize()} account not found")
+    return client
+
+def already_sent():
+    """What an earlier attempt of the running job sent and was confirmed, else None"""
+    return previous_submission(algod_client.get(), indexer_client.get())
+
+def deploy_contract_job(payload):
+    sent = already_sent()
+    app_id = sent["application-index"] if sent else deploy_contract()
+    contract_store.add_contract(app_id)
+    return {"app_id": app_id, "message": f"Contract deployed successfully. App ID: {app_id}"}
+
+def register_document_job(payload):
+    record_document(client_for('admin'), payload["app_id"], payload["filename"], payload["file_hash"],
+                    payload["version"], payload["expiry_days"], payload["digest_mode"],
+                    payload["changed_ranges"], payload.get("file_sha256"), payload.get("registered_at"))
+    # Only now does the next version diff against this one
+    promote_chunk_manifest(payload.get("chunk_manifest"))
+    return {"message": "Document registered successfully" + describe_changed_ranges(payload["changed_ranges"])}
+
+def assign_verifier_job(payload):
+    if not already_sent():
+        client_for('admin').assign_verifier(payload["app_id"], payload["verifier_address"])
+    return {"message": f"Address {payload['verifier_address']} assigned as verifier"}
+
+def verify_compliance_job(payload):
+    if not already_sent():
+        client_for('verifier').verify_compliance(payload["app_id"])
+    contract_store.mark_verified(payload["app_id"])
+    return {"message": "Compliance verification completed"}
+
+job_queue.register('deploy_contract', deploy_contract_job)
+job_queue.register('register_document', register_document_job)
+job_queue.register('assign_verifier', assign_verifier_job)
+job_queue.register('verify_compliance', verify_compliance_job)
+if job_queue.workers:
+    job_queue.start()
+
+def job_accepted(job, message, redirect_to):
+    """202 with the job for JSON clients; browsers are redirected to a page that polls it"""
+    if request.accept_mimetypes.best == 'application/json':
+        return jsonify({"success": True, "job": job, "status_url": url_for('get_job', job_id=job["id"])}), 202
+    flash(f"{message} (job #{job['id']})", "info")
+    return redirect(redirect_to)
+
 # API Routes
 
 @app.route('/')
 def index():
-    # Load existing contracts
-    contracts_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'contracts.json')
-    contracts = []
-    if os.path.exists(contracts_file):
-        with open(contracts_file, 'r') as f:
-            contracts = json.load(f)
+    # Load one page of contracts
+    try:
+        page = contract_store.page_contracts(**listing_args())
+    except ValueError as e:
+        flash(str(e), "warning")
+        page = contract_store.page_contracts()
+    contracts = page["items"]
     
     # Load account addresses
     accounts = load_accounts()
     admin_address = accounts.get('admin', {}).get('address', 'Not found')
     verifier_address = accounts.get('verifier', {}).get('address', 'Not found')
     
-    # Calculate dashboard statistics
-    compliant_count = 0
-    pending_count = 0
+    # Dashboard statistics are maintained by the contract store on every change
+    stats = contract_store.get_stats()
+    compliant_count = stats["compliant_documents"]
+    unverified_count = stats["unverified_documents"]
     verifier_count = 1  # Default to at least one (the admin)
     
-    # Get compliance status for each contract if available
-    admin_client = get_client('admin')
-    if admin_client:
-        for contract in contracts:
-            app_id = contract.get("app_id")
-            if app_id:
-                try:
-                    status = admin_client.get_compliance_status(app_id)
-                    if status.get("is_compliant", False):
-                        compliant_count += 1
-                    else:
-                        pending_count += 1
-                except Exception:
-                    pending_count += 1
-            
-            # Check documents counts too
-            for doc in contract.get("documents", []):
-                if doc.get("is_compliant", False):
-                    compliant_count += 1
-                else:
-                    pending_count += 1
-    
     # Add deployment date for display in UI
     current_time = time.time()
     deployment_date = datetime.datetime.fromtimestamp(current_time).strftime('%Y-%m-%d')
     
     return render_template('index.html', 
                           contracts=contracts, 
+                          page=page, 
                           admin_address=admin_address,
                           verifier_address=verifier_address,
+                          total_contracts=stats["total_contracts"],
                           compliant_count=compliant_count,
-                          pending_count=pending_count,
+                          unverified_count=unverified_count,
                           verifier_count=verifier_count,
-                          deployment_date=deployment_date)
+                          deployment_date=deployment_date,
+                          jobs=job_queue.list_jobs(limit=5))
 
 @app.route('/contracts', methods=['POST'])
 def create_contract():
-    app_id, error = deploy_contract()
-    if error:
-        flash(f"Error deploying contract: {error}", "danger")
+    if not get_client('admin'):
+        flash("Admin account not found or invalid", "danger")
         return redirect(url_for('index'))
     
-    # Save contract ID to a file
-    contracts_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'contracts.json')
-    contracts = []
-    if os.path.exists(contracts_file):
-        with open(contracts_file, 'r') as f:
-            contracts = json.load(f)
-    
-    contract_info = {
-        "app_id": app_id,
-        "created_at": time.time(),
-        "documents": []
-    }
-    contracts.append(contract_info)
-    
-    with open(contracts_file, 'w') as f:
-        json.dump(contracts, f)
-    
-    flash(f"Contract deployed successfully. App ID: {app_id}", "success")
-    return redirect(url_for('index'))
+    job = job_queue.enqueue('deploy_contract')
+    return job_accepted(job, "Contract deployment queued", url_for('index'))
 
 @app.route('/contracts/<int:app_id>')
 def view_contract(app_id):
@@ -195,20 +319,21 @@ def view_contract(app_id):
         admin_address = accounts.get('admin', {}).get('address', 'Not found')
         verifier_address = accounts.get('verifier', {}).get('address', 'Not found')
         
-        # Load documents for this contract
-        contracts_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'contracts.json')
-        contracts = []
-        if os.path.exists(contracts_file):
-            with open(contracts_file, 'r') as f:
-                contracts = json.load(f)
-        
-        contract = next((c for c in contracts if c["app_id"] == app_id), None)
-        documents = contract.get("documents", []) if contract else []
+        # Load one page of documents for this contract
+        try:
+            page = contract_store.page_documents(app_id, **listing_args())
+        except ValueError as e:
+            flash(str(e), "warning")
+            page = contract_store.page_documents(app_id)
         
         return render_template('contract.html', app_id=app_id, status=status, 
                              admin_address=admin_address,
                              verifier_address=verifier_address,
-                             documents=documents,
+                             creator_address=admin_address,
+                             documents=page["items"],
+                             document_count=contract_store.count_documents(app_id),
+                             page=page,
+                             jobs=job_queue.list_jobs(app_id=app_id, limit=5),
                              explorer_url=f"https://testnet.explorer.perawallet.app/application/{app_id}")
     except Exception as e:
         flash(f"Error retrieving contract status: {str(e)}", "danger")
@@ -254,48 +379,169 @@ def register_document(app_id):
     file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
     file.save(file_path)
     
-    # Calculate file hash
-    file_hash = calculate_file_hash(file_path)
-    
     # Get document details
     version = request.form.get('version', '1.0.0')
     expiry_days = int(request.form.get('expiry_days', '365'))
-    expiry_timestamp = int(time.time()) + (expiry_days * 24 * 60 * 60)
+    digest_mode = request.form.get('digest_mode', 'sha256')
     
     try:
-        # Register document in the contract
-        admin_client.register_document(app_id, file_hash, version, expiry_timestamp)
-        
-        # Update contracts.json to include this document
-        contracts_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'contracts.json')
-        contracts = []
-        if os.path.exists(contracts_file):
-            with open(contracts_file, 'r') as f:
-                contracts = json.load(f)
-        
-        for contract in contracts:
-            if contract["app_id"] == app_id:
-                if "documents" not in contract:
-                    contract["documents"] = []
-                    
-                document_info = {
-                    "hash": file_hash,
-                    "filename": filename,
-                    "version": version,
-                    "registered_at": time.time(),
-                    "expiry_timestamp": expiry_timestamp
-                }
-                contract["documents"].append(document_info)
-                break
-        
-        with open(contracts_file, 'w') as f:
-            json.dump(contracts, f)
-        
-        flash('Document registered successfully', 'success')
+        # Calculate file hash
+        file_hash, changed_ranges, staged = calculate_document_digest(
+            app_id, filename, file_path, version, digest_mode)
+        file_sha256 = calculate_file_hash(file_path) if staged else None
     except Exception as e:
         flash(f'Error registering document: {str(e)}', 'danger')
+        return redirect(url_for('view_contract', app_id=app_id))
     
-    return redirect(url_for('view_contract', app_id=app_id))
+    job = job_queue.enqueue('register_document', {
+        "app_id": app_id,
+        "filename": filename,
+        "file_hash": file_hash,
+        "version": version,
+        "expiry_days": expiry_days,
+        "digest_mode": digest_mode,
+        "changed_ranges": changed_ranges,
+        "chunk_manifest": staged,
+        "file_sha256": file_sha256,
+        # Fixed here so a replayed job records the same expiry and row
+        "registered_at": time.time()
+    }, app_id=app_id)
+    return job_accepted(job, 'Document registration queued', url_for('view_contract', app_id=app_id))
+
+# Register a document on-chain and record it in the contract store
+def record_document(admin_client, app_id, filename, file_hash, version, expiry_days,
+                    digest_mode='sha256', changed_ranges=None, file_sha256=None, registered_at=None):
+    registered_at = registered_at or time.time()
+    expiry_timestamp = int(registered_at) + (expiry_days * 24 * 60 * 60)
+    
+    # Register document in the contract, unless a retried job already did
+    if not already_sent():
+        admin_client.register_document_hash(app_id, file_hash, version, expiry_timestamp)
+    
+    # Record the document for this contract
+    document_info = {
+        "hash": file_hash,
+        "filename": filename,
+        "version": version,
+        "registered_at": registered_at,
+        "expiry_timestamp": expiry_timestamp,
+        "digest_mode": digest_mode
+    }
+    if changed_ranges is not None:
+        document_info["changed_ranges"] = changed_ranges
+    # Chunked digests put a Merkle root on-chain; keep the plain file hash too
+    if file_sha256 and file_sha256 != file_hash:
+        document_info["file_hash"] = file_sha256
+    
+    contract_store.add_document(app_id, document_info)
+    
+    return document_info
+
+# Resumable upload API for large documents
+
+def upload_error_response(e):
+    if isinstance(e, UploadSessionNotFound):
+        return jsonify({"success": False, "error": str(e)}), 404
+    if isinstance(e, UploadSessionError):
+        return jsonify({"success": False, "error": str(e)}), 400
+    return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/contracts/<int:app_id>/uploads', methods=['POST'])
+def create_upload_session(app_id):
+    """Start a resumable upload of a document for this contract"""
+    data = request.get_json(silent=True) or {}
+    if not data.get('filename') or data.get('total_size') is None:
+        return jsonify({"success": False, "error": "filename and total_size are required"}), 400
+    
+    try:
+        session = upload_sessions.create(
+            data['filename'],
+            data['total_size'],
+            sha256=data.get('sha256'),
+            chunk_size=data.get('chunk_size'),
+            metadata={"app_id": app_id})
+        return jsonify({"success": True, "session": session}), 201
+    except Exception as e:
+        return upload_error_response(e)
+
+@app.route('/api/contracts/<int:app_id>/uploads/<session_id>', methods=['GET'])
+def get_upload_session(app_id, session_id):
+    """Report received and missing chunks so an interrupted upload can resume"""
+    try:
+        return jsonify({"success": True, "session": upload_sessions.status(session_id)})
+    except Exception as e:
+        return upload_error_response(e)
+
+@app.route('/api/contracts/<int:app_id>/uploads/<session_id>/chunks/<int:index>', methods=['PUT'])
+def put_upload_chunk(app_id, session_id, index):
+    """Store one numbered chunk of the document body"""
+    try:
+        chunk_hash = upload_sessions.write_chunk(
+            session_id, index, request.stream,
+            expected_sha256=request.headers.get('X-Chunk-SHA256'))
+        return jsonify({"success": True, "index": index, "sha256": chunk_hash})
+    except Exception as e:
+        return upload_error_response(e)
+
+@app.route('/api/contracts/<int:app_id>/uploads/<session_id>/commit', methods=['POST'])
+def commit_upload_session(app_id, session_id):
+    """Verify the final digest, store the document and queue its on-chain registration"""
+    admin_client = get_client('admin')
+    if not admin_client:
+        return jsonify({"success": False, "error": "Admin account not found"}), 400
+    
+    data = request.get_json(silent=True) or {}
+    try:
+        manifest = upload_sessions.load(session_id)
+        session_app_id = manifest.get('metadata', {}).get('app_id')
+        if session_app_id is not None and session_app_id != app_id:
+            return jsonify({"success": False,
+                            "error": f"Upload session {session_id} was opened for app {session_app_id}"}), 400
+        filename = secure_filename(manifest['filename']) or session_id
+        # Stored under the session id so a same-named document is never overwritten
+        stored_name = f"{session_id}_{filename}"
+        result = upload_sessions.commit(
+            session_id,
+            os.path.join(app.config['UPLOAD_FOLDER'], stored_name),
+            sha256=data.get('sha256'))
+    except Exception as e:
+        return upload_error_response(e)
+    
+    version = data.get('version', '1.0.0')
+    digest_mode = data.get('digest_mode', 'sha256')
+    try:
+        file_hash, changed_ranges, staged = result['sha256'], None, None
+        if digest_mode != 'sha256':
+            file_hash, changed_ranges, staged = calculate_document_digest(
+                app_id, filename, result['path'], version, digest_mode)
+        expiry_days = int(data.get('expiry_days', 365))
+    except Exception as e:
+        return jsonify({"success": False, "error": f"Error registering document: {str(e)}",
+                        "hash": result['sha256']}), 400
+    
+    # Registered on-chain by the job queue, like a form upload
+    job = job_queue.enqueue('register_document', {
+        "app_id": app_id,
+        "filename": stored_name,
+        "file_hash": file_hash,
+        "version": version,
+        "expiry_days": expiry_days,
+        "digest_mode": digest_mode,
+        "changed_ranges": changed_ranges,
+        "chunk_manifest": staged,
+        "file_sha256": result['sha256'],
+        "registered_at": time.time()
+    }, app_id=app_id)
+    return job_accepted(job, 'Document registration queued', url_for('view_contract', app_id=app_id))
+
+@app.route('/api/contracts/<int:app_id>/uploads/<session_id>', methods=['DELETE'])
+def delete_upload_session(app_id, session_id):
+    """Abandon an upload and delete its staged chunks"""
+    try:
+        upload_sessions.discard(session_id)
+        return jsonify({"success": True})
+    except Exception as e:
+        return upload_error_response(e)
 
 @app.route('/contracts/<int:app_id>/verifiers', methods=['POST'])
 def assign_verifier(app_id):
@@ -309,13 +555,9 @@ def assign_verifier(app_id):
         flash("Verifier address required", "danger")
         return redirect(url_for('view_contract', app_id=app_id))
     
-    try:
-        admin_client.assign_verifier(app_id, verifier_address)
-        flash(f"Address {verifier_address} assigned as verifier", "success")
-    except Exception as e:
-        flash(f"Error assigning verifier: {str(e)}", "danger")
-    
-    return redirect(url_for('view_contract', app_id=app_id))
+    job = job_queue.enqueue('assign_verifier', {"app_id": app_id, "verifier_address": verifier_address},
+                            app_id=app_id)
+    return job_accepted(job, "Verifier assignment queued", url_for('view_contract', app_id=app_id))
 
 @app.route('/contracts/<int:app_id>/verify', methods=['POST'])
 def verify_compliance(app_id):
@@ -324,13 +566,8 @@ def verify_compliance(app_id):
         flash("Verifier account not found", "danger")
         return redirect(url_for('view_contract', app_id=app_id))
     
-    try:
-        verifier_client.verify_compliance(app_id)
-        flash("Compliance verification completed", "success")
-    except Exception as e:
-        flash(f"Error verifying compliance: {str(e)}", "danger")
-    
-    return redirect(url_for('view_contract', app_id=app_id))
+    job = job_queue.enqueue('verify_compliance', {"app_id": app_id}, app_id=app_id)
+    return job_accepted(job, "Compliance verification queued", url_for('view_contract', app_id=app_id))
 
 @app.route('/documents/<filename>')
 def download_document(filename):
@@ -410,46 +647,51 @@ def get_transactions(app_id):
         }
     ]
     
-    return jsonify({"transactions": transactions})
+    return list_response(transactions, key="transactions")
+
+def page_response(page):
+    """Stream one listing page; NDJSON clients get the cursor in X-Next-Cursor"""
+    fields = {key: value for key, value in page.items() if key != "items"}
+    headers = {"X-Next-Cursor": page["next_cursor"]} if page["next_cursor"] else None
+    return list_response(page["items"], key="items", fields=fields, headers=headers)
+
+@app.route('/api/contracts')
+def list_contracts_api():
+    """Paginated contract listing: ?sort=created_at|expiry|status&order=asc|desc&cursor=&limit="""
+    try:
+        return page_response(contract_store.page_contracts(**listing_args()))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+@app.route('/api/documents')
+def list_documents_api():
+    """Paginated document listing, optionally filtered with ?app_id="""
+    try:
+        return page_response(contract_store.page_documents(request.args.get('app_id', type=int), **listing_args()))
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+@app.route('/api/jobs')
+def list_jobs_api():
+    """Recent background jobs, optionally filtered with ?app_id= and ?status="""
+    limit = min(request.args.get('limit', 20, type=int), 100)
+    return list_response(job_queue.list_jobs(request.args.get('app_id', type=int), request.args.get('status'), limit),
+                         key="jobs", fields={"counts": job_queue.counts()})
+
+@app.route('/api/jobs/<int:job_id>')
+def get_job(job_id):
+    """Status, attempts and outcome of one background job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({"success": False, "error": "Job not found"}), 404
+    return jsonify({"success": True, "job": job})
 
 @app.route('/api/contract-stats')
 def get_contract_stats():
     """API endpoint to fetch statistics for the compliance contracts dashboard"""
-    # Load existing contracts
-    contracts_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'contracts.json')
-    contracts = []
-    if os.path.exists(contracts_file):
-        with open(contracts_file, 'r') as f:
-            contracts = json.load(f)
-    
-    # Calculate statistics
-    total_contracts = len(contracts)
-    total_documents = sum(len(contract.get("documents", [])) for contract in contracts)
-    
-    # Count compliant documents
-    compliant_count = 0
-    pending_count = 0
-    admin_client = get_client('admin')
-    
-    if admin_client:
-        for contract in contracts:
-            app_id = contract.get("app_id")
-            if app_id:
-                try:
-                    status = admin_client.get_compliance_status(app_id)
-                    if status.get("is_compliant", False):
-                        compliant_count += 1
-                    else:
-                        pending_count += 1
-                except:
-                    pending_count += 1
-    
-    stats = {
-        "total_contracts": total_contracts,
-        "total_documents": total_documents,
-        "compliant_documents": compliant_count,
-        "pending_documents": pending_count
-    }
+    # Counters are updated on every deploy, registration and verification,
+    # so this is a single read instead of a scan of every contract
+    stats = contract_store.get_stats()
     
     return jsonify(stats)
 
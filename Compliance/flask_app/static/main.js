@@ -364,6 +364,39 @@ function setupDocumentPreview() {
     }
 }
 
+// Poll background jobs (deploys, registrations, verifications) until they finish
+function setupJobPolling() {
+    const rows = document.querySelectorAll('[data-job-id][data-job-done="false"]');
+    if (!rows.length) return;
+    
+    const badgeClasses = {succeeded: 'bg-success', failed: 'bg-danger', running: 'bg-primary', queued: 'bg-secondary'};
+    const timer = setInterval(() => {
+        const pending = document.querySelectorAll('[data-job-id][data-job-done="false"]');
+        if (!pending.length) {
+            clearInterval(timer);
+            // Reload once everything settled so contract lists and status reflect the outcome
+            window.location.reload();
+            return;
+        }
+        pending.forEach(row => {
+            fetch(`/api/jobs/${row.getAttribute('data-job-id')}`)
+                .then(response => response.json())
+                .then(data => {
+                    if (!data.success) return;
+                    const job = data.job;
+                    const badge = row.querySelector('.job-status');
+                    badge.className = `badge job-status ${badgeClasses[job.status] || 'bg-secondary'}`;
+                    badge.textContent = job.status;
+                    const outcome = job.status === 'succeeded' ? job.result.message : (job.error || '');
+                    row.querySelector('.job-outcome').textContent =
+                        outcome + (job.attempts > 1 ? ` (${job.attempts} attempts)` : '');
+                    row.setAttribute('data-job-done', job.done ? 'true' : 'false');
+                })
+                .catch(error => console.error('Error polling job:', error));
+        });
+    }, 2000);
+}
+
 // Initialize the application when DOM is fully loaded
 document.addEventListener('DOMContentLoaded', function() {
     // Initialize tooltips
@@ -393,6 +426,9 @@ document.addEventListener('DOMContentLoaded', function() {
     // Setup real-time transaction monitoring
     setupTransactionMonitoring();
     
+    // Follow queued on-chain operations
+    setupJobPolling();
+    
     // Setup form validation
     const forms = document.querySelectorAll('.needs-validation');
     forms.forEach(form => {
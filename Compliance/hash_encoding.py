@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# hash_encoding.py - On-chain encodings of document hashes
+#
+# v1 ("hex") sends and stores the 64-character hex string of the SHA-256
+# digest. v2 ("binary") sends and stores the raw 32-byte digest, halving the
+# app argument and the `document_hash` global. Readers detect the format.
+
+import base64
+import binascii
+
+HASH_ENCODING_HEX = "hex"        # v1
+HASH_ENCODING_BINARY = "binary"  # v2
+HASH_ENCODINGS = (HASH_ENCODING_HEX, HASH_ENCODING_BINARY)
+
+DIGEST_SIZE = 32
+
+_HEX_CHARS = set(b"0123456789abcdefABCDEF")
+
+
+def digest_bytes(doc_hash):
+    """Return the raw 32-byte digest of a hex string or bytes value"""
+    if isinstance(doc_hash, str):
+        try:
+            raw = binascii.unhexlify(doc_hash)
+        except (binascii.Error, ValueError):
+            raise ValueError(f"Document hash is not valid hex: {doc_hash!r}")
+    else:
+        raw = bytes(doc_hash)
+        if len(raw) == 2 * DIGEST_SIZE and set(raw) <= _HEX_CHARS:
+            raw = binascii.unhexlify(raw)
+
+    if len(raw) != DIGEST_SIZE:
+        raise ValueError(f"Document hash must be {DIGEST_SIZE} bytes, got {len(raw)}")
+    return raw
+
+
+def encode_document_hash(doc_hash, encoding=HASH_ENCODING_BINARY):
+    """Encode a document hash as an app argument"""
+    raw = digest_bytes(doc_hash)
+    if encoding == HASH_ENCODING_BINARY:
+        return raw
+    if encoding == HASH_ENCODING_HEX:
+        return raw.hex().encode()
+    raise ValueError(f"Unknown hash encoding: {encoding}")
+
+
+def decode_document_hash(value):
+    """
+    Decode a stored `document_hash` value into (hex_string, encoding).
+
+    Accepts the raw bytes or the base64 string algod returns for byte values.
+    Values that are neither a 32-byte digest nor a 64-character hex string
+    are returned as text with an encoding of None.
+    """
+    if isinstance(value, str):
+        value = base64.b64decode(value)
+
+    if len(value) == 2 * DIGEST_SIZE and set(value) <= _HEX_CHARS:
+        return value.decode().lower(), HASH_ENCODING_HEX
+    if len(value) == DIGEST_SIZE:
+        return value.hex(), HASH_ENCODING_BINARY
+    return value.decode("utf-8", errors="replace"), None
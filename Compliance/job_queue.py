@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+# job_queue.py - Durable SQLite job queue and worker pool for on-chain writes
+#
+# The dashboard enqueues deploys and app calls here instead of running them
+# inside the request. Jobs survive restarts, transient algod errors are
+# retried with exponential backoff, and every outcome is kept for polling.
+#
+# A job records the txid of a transaction before sending it (through an algod
+# client wrapped with record_submissions), so a retried job looks up what it
+# already sent with previous_submission() instead of sending it again.
+# Command line usage:
+#   python job_queue.py list flask_app/jobs.db [--status failed]
+
+import contextvars
+import functools
+import json
+import sqlite3
+import sys
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind         TEXT NOT NULL,
+    app_id       INTEGER,
+    payload      TEXT NOT NULL,
+    status       TEXT NOT NULL DEFAULT 'queued',
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    run_after    REAL NOT NULL,
+    lease_until  REAL,
+    result       TEXT,
+    error        TEXT,
+    created_at   REAL NOT NULL,
+    updated_at   REAL NOT NULL,
+    txid         TEXT,
+    last_valid   INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, run_after, id);
+CREATE INDEX IF NOT EXISTS idx_jobs_app_id ON jobs (app_id, id);
+"""
+
+# queued -> running -> succeeded | failed; a transient failure puts a running
+# job back to queued with a later run_after
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+DEFAULT_WORKERS = 2
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_BACKOFF = 2.0       # seconds before the first retry, doubled on each one
+DEFAULT_MAX_BACKOFF = 60.0
+# A running job whose lease has expired is assumed to belong to a worker that
+# died and is claimed again. Long enough for a submission plus confirmation.
+DEFAULT_LEASE = 300.0
+POLL_INTERVAL = 1.0
+
+# algod answers these when it is overloaded or briefly unavailable
+TRANSIENT_HTTP_CODES = (408, 429, 500, 502, 503, 504)
+
+# The job the current worker thread is running, for record_submissions()
+_running_job = contextvars.ContextVar("running_job", default=None)
+
+
+class UnknownJobKind(Exception):
+    """Raised when enqueuing a job no handler is registered for"""
+
+
+class SubmissionPending(Exception):
+    """A transaction an earlier attempt sent may still confirm; look again later"""
+
+
+def is_transient(error):
+    """True for errors worth retrying: algod overload / 5xx and network failures"""
+    from algosdk.error import AlgodHTTPError
+
+    if isinstance(error, AlgodHTTPError):
+        return error.code in TRANSIENT_HTTP_CODES
+    # URLError, ConnectionError, socket timeouts
+    return isinstance(error, OSError)
+
+
+def is_rejection(error):
+    """True when algod refused a transaction outright, so it can never confirm"""
+    from algosdk.error import AlgodHTTPError
+
+    return isinstance(error, AlgodHTTPError) and error.code not in TRANSIENT_HTTP_CODES
+
+
+def record_submissions(client):
+    """
+    Wrap send_transaction(s) of one algod client instance so a running job
+    records each transaction's txid before it is sent. For a group, the last
+    transaction stands for the whole group, which confirms or fails as one.
+    """
+    for name in ("send_transaction", "send_transactions"):
+        method = getattr(client, name, None)
+        if method is not None:
+            setattr(client, name, _recorded(method))
+    return client
+
+
+def _recorded(method):
+    @functools.wraps(method)
+    def send(txns, *args, **kwargs):
+        running = _running_job.get()
+        if running is not None:
+            last = txns[-1] if isinstance(txns, (list, tuple)) else txns
+            running.record(last.transaction.get_txid(), last.transaction.last_valid_round)
+        return method(txns, *args, **kwargs)
+
+    return send
+
+
+def previous_submission(algod_client, indexer_client=None):
+    """
+    For the running job: the confirmed transaction info of what an earlier
+    attempt sent, with its "application-index" for app creations. None if
+    nothing was sent, or if it can no longer confirm, so sending is safe.
+    Raises SubmissionPending while it may still confirm.
+    """
+    from algosdk.error import AlgodHTTPError, IndexerHTTPError
+
+    running = _running_job.get()
+    if running is None or not running.previous_txid:
+        return None
+    txid = running.previous_txid
+    try:
+        info = algod_client.pending_transaction_info(txid)
+    except AlgodHTTPError as e:
+        if e.code != 404:
+            raise
+        info = None
+
+    if info is not None:
+        if info.get("confirmed-round"):
+            return info
+        if info.get("pool-error"):
+            return None
+        raise SubmissionPending(f"Transaction {txid} from an earlier attempt is still pending")
+
+    # algod only remembers recent transactions; the indexer keeps confirmed ones
+    if indexer_client is not None:
+        try:
+            txn = indexer_client.transaction(txid)["transaction"]
+            return {"confirmed-round": txn["confirmed-round"],
+                    "application-index": txn.get("created-application-index")}
+        except IndexerHTTPError as e:
+            if e.code != 404:
+                raise
+    if running.previous_last_valid and algod_client.status()["last-round"] <= running.previous_last_valid:
+        raise SubmissionPending(f"Transaction {txid} from an earlier attempt is not found but still valid")
+    return None
+
+
+class _RunningJob:
+    def __init__(self, queue, job):
+        self.queue = queue
+        self.job_id = job["id"]
+        self.previous_txid = job["txid"]
+        self.previous_last_valid = job["last_valid"]
+        self.sent = False
+
+    def record(self, txid, last_valid):
+        self.queue._connection().execute(
+            "UPDATE jobs SET txid = ?, last_valid = ?, updated_at = ? WHERE id = ?",
+            (txid, last_valid, time.time(), self.job_id))
+        self.sent = True
+
+
+def retry_delay(attempts, backoff=DEFAULT_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF):
+    """Seconds to wait before running a job again after `attempts` tries"""
+    return min(max_backoff, backoff * (2 ** (attempts - 1)))
+
+
+class JobQueue:
+    """
+    SQLite-backed job queue with a pool of worker threads.
+
+    Handlers are registered per job kind and called with the job's payload
+    dict; whatever they return (JSON-serializable) is stored as the job's
+    result. Jobs are claimed with a single UPDATE inside an immediate
+    transaction, so several processes can share one database.
+
+    A job may run more than once: after a transient error, or when a worker
+    dies after submitting a transaction but before recording the outcome.
+    Handlers that write on-chain send through an algod client wrapped with
+    record_submissions() and call previous_submission() first, so a replay
+    picks up the transaction already sent instead of sending a second one.
+    Once a job has sent a transaction, any failure short of algod rejecting
+    it queues the job again, so that the next attempt can look it up.
+    """
+
+    def __init__(self, path, workers=DEFAULT_WORKERS, max_attempts=DEFAULT_MAX_ATTEMPTS,
+                 backoff=DEFAULT_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF, lease=DEFAULT_LEASE,
+                 poll_interval=POLL_INTERVAL):
+        self.path = path
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.handlers = {}
+        self._local = threading.local()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+        self._connection().executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """Add the submission columns to databases created before them"""
+        conn = self._connection()
+        columns = [row["name"] for row in conn.execute("PRAGMA table_info(jobs)")]
+        if "txid" not in columns:
+            conn.execute("ALTER TABLE jobs ADD COLUMN txid TEXT")
+            conn.execute("ALTER TABLE jobs ADD COLUMN last_valid INTEGER")
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def register(self, kind, handler):
+        self.handlers[kind] = handler
+
+    # Producers
+
+    def enqueue(self, kind, payload=None, app_id=None):
+        """Queue a job and return it; workers pick it up right away"""
+        if kind not in self.handlers:
+            raise UnknownJobKind(f"No handler for job kind: {kind}")
+        now = time.time()
+        cursor = self._connection().execute(
+            "INSERT INTO jobs (kind, app_id, payload, run_after, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (kind, app_id, json.dumps(payload or {}), now, now, now))
+        self._wake.set()
+        return self.get(cursor.lastrowid)
+
+    def get(self, job_id):
+        row = self._connection().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _job_dict(row) if row else None
+
+    def list_jobs(self, app_id=None, status=None, limit=20):
+        """Most recent jobs first, optionally of one app and/or status"""
+        conditions, params = [], []
+        if app_id is not None:
+            conditions.append("app_id = ?")
+            params.append(app_id)
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(status)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._connection().execute(
+            f"SELECT * FROM jobs {where} ORDER BY id DESC LIMIT ?", params + [limit])
+        return [_job_dict(row) for row in rows]
+
+    def counts(self):
+        rows = self._connection().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")
+        counts = dict.fromkeys(JOB_STATUSES, 0)
+        counts.update({row["status"]: row["n"] for row in rows})
+        return counts
+
+    # Workers
+
+    def claim(self, now=None):
+        """Mark the next due job running and return it, or None if nothing is due"""
+        now = time.time() if now is None else now
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE (status = 'queued' AND run_after <= ?) "
+                "OR (status = 'running' AND lease_until < ?) ORDER BY run_after, id LIMIT 1",
+                (now, now)).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_until = ?, "
+                    "updated_at = ? WHERE id = ?", (now + self.lease, now, row["id"]))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get(row["id"]) if row is not None else None
+
+    def run(self, job):
+        """Run a claimed job and record its outcome"""
+        running = _RunningJob(self, job)
+        token = _running_job.set(running)
+        try:
+            result = self.handlers[job["kind"]](job["payload"])
+        except Exception as e:
+            # After a send, only a rejection settles it; anything else is
+            # looked up again rather than sent again (previous_submission)
+            submitted = running.sent or job["txid"]
+            retry = is_transient(e) or (submitted and not is_rejection(e))
+            if retry and job["attempts"] < self.max_attempts:
+                delay = retry_delay(job["attempts"], self.backoff, self.max_backoff)
+                self._finish(job["id"], "queued", error=str(e), run_after=time.time() + delay)
+            else:
+                self._finish(job["id"], "failed", error=str(e))
+            return
+        finally:
+            _running_job.reset(token)
+        self._finish(job["id"], "succeeded", result=result)
+
+    def _finish(self, job_id, status, result=None, error=None, run_after=None):
+        now = time.time()
+        self._connection().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, lease_until = NULL, "
+            "run_after = COALESCE(?, run_after), updated_at = ? WHERE id = ?",
+            (status, None if result is None else json.dumps(result), error, run_after, now, job_id))
+
+    def run_pending(self):
+        """Run every due job in the calling thread; returns how many ran"""
+        ran = 0
+        while True:
+            job = self.claim()
+            if job is None:
+                return ran
+            self.run(job)
+            ran += 1
+
+    def start(self):
+        """Start the worker threads"""
+        self._stopping.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout=None):
+        """Stop the workers after the jobs they are running"""
+        self._stopping.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _work(self):
+        while not self._stopping.is_set():
+            job = self.claim()
+            if job is None:
+                # Woken early by enqueue; otherwise polls for retries that became due
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                continue
+            self.run(job)
+        self.close()
+
+
+def _job_dict(row):
+    job = dict(row)
+    job["payload"] = json.loads(job["payload"])
+    job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+    job["done"] = job["status"] in ("succeeded", "failed")
+    del job["lease_until"]
+    return job
+
+
+def main():
+    if len(sys.argv) in (3, 5) and sys.argv[1] == "list":
+        status = sys.argv[4] if len(sys.argv) == 5 and sys.argv[3] == "--status" else None
+        queue = JobQueue(sys.argv[2])
+        for job in queue.list_jobs(status=status, limit=100):
+            print(f"{job['id']:>6}  {job['kind']:<20}{job['status']:<11}{job['attempts']:>3}  "
+                  f"{job['error'] or json.dumps(job['result'])}")
+        return 0
+
+    print("Usage: python job_queue.py list <jobs.db> [--status queued|running|succeeded|failed]")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
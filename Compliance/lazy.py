@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# lazy.py - Values built on first use, once, from any thread
+#
+#   algod_client = Lazy(lambda: algod.AlgodClient(token, address))
+#   algod_client.get()   # built here, on the first call only
+#
+# The apps build their algod / indexer clients this way so a worker imports
+# algosdk and connects only when a request (or the readiness probe) first
+# needs a node, instead of at import time.
+
+import threading
+
+
+class Lazy:
+    """Result of `factory()`, computed on the first get() and then reused"""
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._lock = threading.Lock()
+        self._built = False
+        self._value = None
+
+    @property
+    def built(self):
+        return self._built
+
+    def get(self):
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    # A factory that raises is retried on the next get()
+                    self._value = self.factory()
+                    self._built = True
+        return self._value
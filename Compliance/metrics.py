@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# metrics.py - Latency histograms in Prometheus text format
+#
+# Request latency per Flask route and status code, and call latency per
+# algod / indexer client method, served at /metrics:
+#
+#   metrics = MetricsRegistry()
+#   instrument_flask(app, metrics)
+#   instrument_client(algod_client, "algod", metrics)
+#
+# Recording a sample is a bisect and two increments under an uncontended
+# lock, so the per-request cost stays in the low microseconds (see
+# benchmarks/bench_metrics.py). Each process keeps its own counters; under
+# gunicorn, every worker serves its own /metrics.
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, request
+
+# Seconds; algod calls that wait on confirmations take whole rounds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Client methods the compliance, registry and voting clients call
+ALGOD_METHODS = ("suggested_params", "send_transaction", "send_transactions", "pending_transaction_info",
+                 "application_info", "account_info", "compile", "status", "status_after_block")
+INDEXER_METHODS = ("account_info", "search_transactions", "applications")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Cumulative histogram with one series per label-value tuple"""
+
+    def __init__(self, name, help_text, labelnames, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def snapshot(self):
+        """{labels: (cumulative bucket counts, sum, count)}"""
+        with self._lock:
+            series = {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+        result = {}
+        for labels, (counts, total) in series.items():
+            cumulative, running = [], 0
+            for count in counts:
+                running += count
+                cumulative.append(running)
+            result[labels] = (cumulative, total, running)
+        return result
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        bounds = [_format_float(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, (cumulative, total, count) in sorted(self.snapshot().items()):
+            pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels)]
+            for bound, value in zip(bounds, cumulative):
+                bucket_labels = ",".join(pairs + ['le="%s"' % bound])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {value}")
+            label_text = "{" + ",".join(pairs) + "}" if pairs else ""
+            lines.append(f"{self.name}_sum{label_text} {_format_float(total)}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return "\n".join(lines)
+
+
+class Counter:
+    """Monotonic counter with one series per label-value tuple"""
+
+    def __init__(self, name, help_text, labelnames):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._series[labels] = self._series.get(labels, 0) + amount
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._series)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, count in sorted(self.snapshot().items()):
+            pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, labels)]
+            label_text = "{" + ",".join(pairs) + "}" if pairs else ""
+            lines.append(f"{self.name}{label_text} {count}")
+        return "\n".join(lines)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.requests = Histogram("http_request_duration_seconds", "Latency of HTTP requests by route and status",
+                                  ("method", "route", "status"))
+        self.client_calls = Histogram("algod_request_duration_seconds",
+                                      "Latency of algod and indexer client calls by method",
+                                      ("client", "method", "outcome"))
+        self.coalesced_calls = Counter("algod_coalesced_calls_total",
+                                       "Client reads answered by an identical call in flight or just completed",
+                                       ("client", "method"))
+        self.shed_writes = Counter("write_requests_shed_total",
+                                   "Write requests turned away with 429 by admission control", ("reason",))
+        self.histograms = [self.requests, self.client_calls]
+        self.counters = [self.coalesced_calls, self.shed_writes]
+
+    def render(self):
+        return "\n".join(metric.render() for metric in self.histograms + self.counters) + "\n"
+
+
+def instrument_flask(app, registry, endpoint="/metrics"):
+    """Time every request of `app` and serve the registry at `endpoint`"""
+    observe = registry.requests.observe
+
+    @app.before_request
+    def _start_timer():
+        request.environ["metrics.start"] = time.perf_counter()
+
+    @app.after_request
+    def _record_latency(response):
+        start = request.environ.get("metrics.start")
+        if start is not None:
+            rule = request.url_rule
+            observe(time.perf_counter() - start,
+                    (request.method, rule.rule if rule is not None else "<unmatched>", str(response.status_code)))
+        return response
+
+    @app.route(endpoint, endpoint="metrics")
+    def _metrics():
+        return Response(registry.render(), content_type=CONTENT_TYPE)
+
+    return app
+
+
+def instrument_client(client, name, registry, methods=None):
+    """Wrap `methods` of one algod / indexer client instance with latency timers"""
+    if methods is None:
+        methods = INDEXER_METHODS if name == "indexer" else ALGOD_METHODS
+    observe = registry.client_calls.observe
+    for method_name in methods:
+        method = getattr(client, method_name, None)
+        if method is not None:
+            setattr(client, method_name, _timed(method, observe, name, method_name))
+    return client
+
+
+def _timed(method, observe, client_name, method_name):
+    ok_labels, error_labels = (client_name, method_name, "ok"), (client_name, method_name, "error")
+
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            result = method(*args, **kwargs)
+        except Exception:
+            observe(time.perf_counter() - start, error_labels)
+            raise
+        observe(time.perf_counter() - start, ok_labels)
+        return result
+
+    return timed
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_float(value):
+    return repr(float(value))
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# migrate_hash_encoding.py - Move deployed compliance apps to the binary (v2) hash encoding
+#
+# Usage: python migrate_hash_encoding.py [--dry-run] [app_id ...]
+#
+# Without app IDs, every app recorded by the compliance dashboard is checked.
+# Apps that still store the 64-character hex hash are re-registered with the
+# raw 32-byte digest, keeping their document version and expiration date.
+# Readers handle both encodings, so apps can be migrated at any time.
+
+import json
+import os
+import sys
+
+from algosdk.v2client import algod
+from document_compliance_client import ComplianceClient
+from contract_store import open_contract_store
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_app_ids():
+    store = open_contract_store(os.path.join(current_dir, "flask_app", "contracts.db"),
+                                os.path.join(current_dir, "flask_app", "contracts.json"))
+    return store.app_ids()
+
+
+def main():
+    dry_run = "--dry-run" in sys.argv
+    app_ids = [int(arg) for arg in sys.argv[1:] if not arg.startswith("--")] or load_app_ids()
+
+    with open(os.path.join(current_dir, "compliance_test_accounts.json"), "r") as f:
+        accounts = json.load(f)
+
+    algod_client = algod.AlgodClient("", "https://testnet-api.algonode.cloud")
+    client = ComplianceClient(algod_client, accounts["admin"]["private_key"])
+
+    for app_id in app_ids:
+        try:
+            status = client.get_compliance_status(app_id)
+        except Exception as e:
+            print(f"App {app_id}: could not read state ({e})")
+            continue
+
+        if status.get("hash_encoding") != "hex":
+            print(f"App {app_id}: nothing to migrate (encoding: {status.get('hash_encoding')})")
+        elif status.get("status") != "compliant":
+            print(f"App {app_id}: skipped, status is {status.get('status')}")
+        elif dry_run:
+            print(f"App {app_id}: would migrate {status['document_hash']}")
+        else:
+            client.migrate_hash_encoding(app_id)
+            print(f"App {app_id}: migrated {status['document_hash']} to binary encoding")
+
+
+if __name__ == "__main__":
+    main()
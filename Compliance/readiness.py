@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# readiness.py - Background readiness probe for the algod / indexer nodes
+#
+#   probe = ReadinessProbe({"algod": lambda: algod_client.get().status()})
+#   probe.start()                      # checks every READINESS_INTERVAL seconds
+#   add_readiness_route(app, probe)    # GET /readyz -> 200 or 503
+#
+# Node health is checked off the request path, so a worker starts serving
+# whether or not the node answers, and a network blip turns /readyz to 503
+# instead of crashing the worker. While a check is failing it is retried
+# every `retry_interval` seconds. With an interval of 0 no thread is started
+# and each /readyz request runs the checks itself.
+
+import os
+import threading
+import time
+
+DEFAULT_INTERVAL = 15.0
+DEFAULT_RETRY_INTERVAL = 2.0
+
+
+class ReadinessProbe:
+    def __init__(self, checks, interval=DEFAULT_INTERVAL, retry_interval=DEFAULT_RETRY_INTERVAL):
+        # name -> function raising when the dependency is not usable
+        self.checks = dict(checks)
+        self.interval = interval
+        self.retry_interval = min(retry_interval, interval) if interval else retry_interval
+        self._lock = threading.Lock()
+        self._results = {}
+        self._checked_at = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def check(self):
+        """Run every check now and return the resulting status"""
+        results = {}
+        for name, check in self.checks.items():
+            start = time.perf_counter()
+            try:
+                check()
+                results[name] = {"ok": True}
+            except Exception as e:
+                results[name] = {"ok": False, "error": str(e) or type(e).__name__}
+            results[name]["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        with self._lock:
+            self._results = results
+            self._checked_at = time.time()
+        return self.status()
+
+    def status(self):
+        """{"ready", "checked_at", "checks"}; not ready until the first probe has passed"""
+        with self._lock:
+            results = dict(self._results)
+            checked_at = self._checked_at
+        return {"ready": bool(results) and all(result["ok"] for result in results.values()),
+                "checked_at": checked_at, "checks": results}
+
+    def start(self):
+        if self.interval and not self.running:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="readiness-probe", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _loop(self):
+        while not self._stop.is_set():
+            ready = self.check()["ready"]
+            self._stop.wait(self.interval if ready else self.retry_interval)
+
+
+def probe_from_env(checks):
+    """ReadinessProbe checking every READINESS_INTERVAL seconds (0: on each /readyz request)"""
+    return ReadinessProbe(checks, interval=float(os.environ.get("READINESS_INTERVAL", DEFAULT_INTERVAL)))
+
+
+def add_readiness_route(app, probe, path="/readyz"):
+    """Serve the probe's status at `path`: 200 when ready, 503 otherwise"""
+    from flask import jsonify
+
+    def readyz():
+        status = probe.status() if probe.running else probe.check()
+        return jsonify(status), 200 if status["ready"] else 503
+
+    app.add_url_rule(path, "readyz", readyz)
+    return app
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# registry_box.py - Layout of the per-document boxes of the v2 document registry
+#
+# Each registered document is a box named by its raw 32-byte SHA-256 digest:
+#
+#   offset  size  field
+#   0       8     expiration_date   (uint64, big-endian)
+#   8       8     attestation_date  (uint64, 0 until a verifier attests it)
+#   16      1     status            (see STATUS_CODES)
+#   17      0-64  version           (utf-8)
+
+import base64
+
+try:
+    from .hash_encoding import digest_bytes
+except ImportError:
+    from hash_encoding import digest_bytes
+
+EXPIRY_OFFSET = 0
+ATTESTATION_OFFSET = 8
+STATUS_OFFSET = 16
+VERSION_OFFSET = 17
+MAX_VERSION_LENGTH = 64
+
+STATUS_PENDING = 0
+STATUS_COMPLIANT = 1
+STATUS_EXPIRED = 2
+STATUS_CODES = {STATUS_PENDING: "pending", STATUS_COMPLIANT: "compliant", STATUS_EXPIRED: "expired"}
+
+# Minimum balance the app account must hold per box (microAlgos)
+BOX_FLAT_MIN_BALANCE = 2500
+BOX_BYTE_MIN_BALANCE = 400
+
+
+def box_name(doc_hash):
+    """Box name of a document: its raw digest"""
+    return digest_bytes(doc_hash)
+
+
+def box_min_balance(version):
+    """Minimum balance a document box adds to the app account"""
+    size = 32 + VERSION_OFFSET + len(version.encode())
+    return BOX_FLAT_MIN_BALANCE + BOX_BYTE_MIN_BALANCE * size
+
+
+def encode_box(version, expiration_date, attestation_date=0, status="pending"):
+    """Box contents as the contract writes them"""
+    version = version.encode() if isinstance(version, str) else bytes(version)
+    if len(version) > MAX_VERSION_LENGTH:
+        raise ValueError(f"Version must be at most {MAX_VERSION_LENGTH} bytes")
+    code = next(code for code, name in STATUS_CODES.items() if name == status)
+    return (int(expiration_date).to_bytes(8, "big") + int(attestation_date).to_bytes(8, "big")
+            + bytes([code]) + version)
+
+
+def decode_box(value):
+    """Decode box contents (raw bytes or the base64 string algod returns)"""
+    if isinstance(value, str):
+        value = base64.b64decode(value)
+    if len(value) < VERSION_OFFSET:
+        raise ValueError(f"Registry box is {len(value)} bytes, expected at least {VERSION_OFFSET}")
+    return {
+        "expiration_date": int.from_bytes(value[EXPIRY_OFFSET:EXPIRY_OFFSET + 8], "big"),
+        "attestation_date": int.from_bytes(value[ATTESTATION_OFFSET:ATTESTATION_OFFSET + 8], "big") or None,
+        "status": STATUS_CODES.get(value[STATUS_OFFSET], "unknown"),
+        "version": value[VERSION_OFFSET:].decode("utf-8", errors="replace"),
+    }
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# single_flight.py - Identical concurrent reads share one upstream call
+#
+#   flights = SingleFlight(hold=1.0)
+#   coalesce_client(algod_client, "algod", flights, metrics)
+#
+# When many requests read the same app or account at once, the first call
+# of a method with given arguments goes to the node and every identical
+# call made while it is in flight waits for it and gets the same result (or
+# exception). With `hold`, a result is also handed to identical calls made
+# up to `hold` seconds after it arrived; keep it under the block time so a
+# read is at most one round old. Results are shared, not copied: callers
+# must treat them as read-only. Writes should forget() held results.
+
+import functools
+import threading
+import time
+
+# Client reads worth coalescing; never writes, and not the confirmation-wait
+# calls (status, pending_transaction_info), which must see every new round
+READ_METHODS = {
+    "algod": ("application_info", "account_info", "account_application_info"),
+    "indexer": ("account_info", "applications"),
+}
+
+MAX_HELD = 4096
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self, hold=0.0):
+        self.hold = hold
+        self._lock = threading.Lock()
+        self._flights = {}
+        # key -> (expires at, result) of recently completed calls
+        self._held = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """(result of fn(), shared): fn runs once for concurrent callers with equal `key`"""
+        with self._lock:
+            held = self._held.get(key)
+            if held is not None and held[0] > time.monotonic():
+                self.coalesced += 1
+                return held[1], True
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = fn()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if self.hold and flight.error is None:
+                    self._hold(key, flight.result)
+            flight.done.set()
+        return flight.result, False
+
+    def _hold(self, key, result):
+        now = time.monotonic()
+        if len(self._held) >= MAX_HELD:
+            self._held = {k: v for k, v in self._held.items() if v[0] > now}
+        if len(self._held) < MAX_HELD:
+            self._held[key] = (now + self.hold, result)
+
+    def forget(self):
+        """Drop held results, e.g. after a write changed on-chain state"""
+        with self._lock:
+            self._held.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._flights)}
+
+
+def coalesce_client(client, name, flights, registry=None, methods=None):
+    """Route `methods` of one algod / indexer client instance through `flights`"""
+    if methods is None:
+        methods = READ_METHODS.get(name, ())
+    counter = registry.coalesced_calls if registry is not None else None
+    for method_name in methods:
+        method = getattr(client, method_name, None)
+        if method is not None:
+            setattr(client, method_name, _coalesced(method, flights, name, method_name, counter))
+    return client
+
+
+def _coalesced(method, flights, client_name, method_name, counter):
+    labels = (client_name, method_name)
+
+    @functools.wraps(method)
+    def call(*args, **kwargs):
+        key = (labels, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return method(*args, **kwargs)
+        result, shared = flights.do(key, lambda: method(*args, **kwargs))
+        if shared and counter is not None:
+            counter.inc(labels)
+        return result
+
+    return call
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# test_admission.py - Test write admission: in-flight limits, overload cooldowns and AIMD
+
+import pytest
+
+from admission import AdmissionController, Overloaded, is_overload
+
+
+class AlgodHTTPError(Exception):
+    def __init__(self, msg, code=None):
+        super().__init__(msg)
+        self.code = code
+
+
+def test_limits_per_signer_and_overall():
+    admission = AdmissionController(max_in_flight=3, per_signer=2)
+    with admission.admit("ADMIN"), admission.admit("ADMIN"):
+        with pytest.raises(Overloaded) as shed:
+            with admission.admit("ADMIN"):
+                pass
+        assert shed.value.reason == "signer" and shed.value.retry_after >= 1
+
+        with admission.admit("VERIFIER"):
+            with pytest.raises(Overloaded) as shed:
+                with admission.admit("OTHER"):
+                    pass
+            assert shed.value.reason == "in_flight"
+        assert admission.stats()["in_flight"] == 2
+
+    assert admission.stats()["in_flight"] == 0
+    assert admission.stats()["shed"] == {"signer": 1, "in_flight": 1}
+
+
+def test_overload_errors_halve_the_limit_and_cool_down():
+    admission = AdmissionController(max_in_flight=16, per_signer=16, cooldown=30)
+    with pytest.raises(AlgodHTTPError):
+        with admission.admit("ADMIN"):
+            raise AlgodHTTPError("rate limit exceeded", 429)
+    stats = admission.stats()
+    assert stats["limit"] == 8 and stats["cooling_down"]
+
+    with pytest.raises(Overloaded) as shed:
+        with admission.admit("ADMIN"):
+            pass
+    assert shed.value.reason == "cooldown" and 29 <= shed.value.retry_after <= 30
+    assert 29 <= admission.retry_after() <= 30
+
+    # Other errors do not count against the node
+    admission = AdmissionController(max_in_flight=4, per_signer=4)
+    with pytest.raises(ValueError):
+        with admission.admit("ADMIN"):
+            raise ValueError("Document content is required")
+    assert admission.stats()["limit"] == 4 and not admission.stats()["cooling_down"]
+
+
+def test_limit_recovers_with_fast_writes():
+    admission = AdmissionController(max_in_flight=8, per_signer=8, cooldown=0)
+    for _ in range(3):
+        with pytest.raises(Exception):
+            with admission.admit("ADMIN"):
+                raise Exception("Pool error: transaction pool is full")
+    assert admission.stats()["limit"] == 1
+    for _ in range(20):
+        with admission.admit("ADMIN"):
+            pass
+    assert admission.stats()["limit"] >= 5
+
+
+def test_is_overload():
+    assert is_overload(AlgodHTTPError("Service Unavailable", 503))
+    assert is_overload(AlgodHTTPError("Too Many Requests", 429))
+    assert is_overload(AlgodHTTPError(
+        "TransactionPool.checkPendingQueueSize: transaction pool have reached capacity", 400))
+    assert not is_overload(AlgodHTTPError("logic eval error: assert failed", 400))
+    assert not is_overload(AlgodHTTPError("Bad Gateway", 502))
+    assert not is_overload(ConnectionRefusedError())
+    assert not is_overload(Exception("Transaction TX not confirmed after 5 rounds"))
+    assert not is_overload(ValueError("capacity must be positive"))
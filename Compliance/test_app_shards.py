@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# test_app_shards.py - Test the per-app state cache and write distribution over shards
+
+import threading
+
+import pytest
+
+from app_shards import AppStateCache, ShardSet, parse_app_ids
+
+
+def test_state_is_cached_per_app_until_invalidated():
+    reads = []
+
+    def fetch(app_id):
+        reads.append(app_id)
+        return {"status": "compliant", "app": app_id}
+
+    states = AppStateCache(fetch, ttl=60)
+    first = states.get(1)
+    first["status"] = "changed by the caller"
+    assert states.get(1) == {"status": "compliant", "app": 1}
+    states.get(2)
+    assert reads == [1, 2]
+
+    states.invalidate(1)
+    states.get(1)
+    states.get(2)
+    assert reads == [1, 2, 1]
+
+    assert states.get_many([1, 2, 3]) == {1: {"status": "compliant", "app": 1},
+                                          2: {"status": "compliant", "app": 2},
+                                          3: {"status": "compliant", "app": 3}}
+    states.invalidate()
+    assert states.cached_app_ids() == []
+
+
+def test_concurrent_writes_spread_over_shards():
+    shards = ShardSet([11, 12, 13])
+    entered, release = threading.Barrier(4), threading.Event()
+    chosen = []
+
+    def write():
+        with shards.acquire() as app_id:
+            chosen.append(app_id)
+            entered.wait()
+            release.wait()
+
+    threads = [threading.Thread(target=write) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    entered.wait()
+    assert sorted(chosen) == [11, 12, 13]
+    assert shards.in_flight() == {11: 1, 12: 1, 13: 1}
+
+    # A write aimed at one shard counts against it; an unknown app is not tracked
+    with shards.acquire(12), shards.acquire(99) as app_id:
+        assert app_id == 99
+        assert shards.in_flight()[12] == 2
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert shards.in_flight() == {11: 0, 12: 0, 13: 0}
+
+    # Sequential writes take turns
+    picks = []
+    for _ in range(6):
+        with shards.acquire() as app_id:
+            picks.append(app_id)
+    assert sorted(picks) == [11, 11, 12, 12, 13, 13]
+
+
+def test_parse_app_ids():
+    assert parse_app_ids(" 744059516, 744053057,,744059516 ") == [744059516, 744053057]
+    assert parse_app_ids("") == []
+    with pytest.raises(ValueError):
+        parse_app_ids("744059516,abc")
+    with pytest.raises(LookupError):
+        with ShardSet([]).acquire():
+            pass
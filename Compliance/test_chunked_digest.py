@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# test_chunked_digest.py - Test chunk-level Merkle digests for document versions
+
+import io
+import os
+import random
+import tempfile
+
+import pytest
+
+import chunked_digest
+from chunked_digest import (ChunkHashCache, compute_manifest, iter_cdc_chunks, update_manifest,
+                            digest_document_version, leaf_hash, merkle_root)
+
+
+def random_bytes(size, seed=1):
+    rng = random.Random(seed)
+    return bytes(rng.getrandbits(8) for _ in range(size))
+
+
+def test_merkle_root_is_order_sensitive():
+    a, b, c = leaf_hash(b"a"), leaf_hash(b"b"), leaf_hash(b"c")
+    assert merkle_root([a]) == a
+    assert merkle_root([a, b, c]) != merkle_root([b, a, c])
+
+
+def test_fixed_update_reuses_unchanged_chunks():
+    data = bytearray(random_bytes(10 * 1024))
+    old = compute_manifest(io.BytesIO(bytes(data)), "fixed", chunk_size=1024, version="1.0.0")
+
+    data[5000:5010] = b"x" * 10
+    hinted = update_manifest(old, io.BytesIO(bytes(data)), changed_ranges=[(5000, 5010)], version="1.1.0")
+    full = compute_manifest(io.BytesIO(bytes(data)), "fixed", chunk_size=1024)
+
+    assert hinted["root"] == full["root"]
+    assert hinted["rehashed_bytes"] == 1024
+    assert hinted["changed_ranges"] == [[4096, 5120]]
+    assert hinted["previous_version"] == "1.0.0"
+
+
+def test_cdc_insertion_only_reports_nearby_chunks():
+    data = random_bytes(3 * 1024 * 1024)
+    old = compute_manifest(io.BytesIO(data), "cdc")
+    edited = data[:2_300_000] + b"inserted clause" + data[2_300_000:]
+    new = update_manifest(old, io.BytesIO(edited))
+
+    # Chunks after the insertion are matched by content, not position
+    assert new["root"] != old["root"]
+    assert new["changed_ranges"]
+    assert new["changed_ranges"][0][0] > 0
+    assert new["changed_ranges"][-1][1] < len(edited)
+
+
+@pytest.mark.skipif(chunked_digest.numpy is None, reason="numpy is not installed")
+def test_vectorized_boundaries_match_the_byte_loop(monkeypatch):
+    # Random data, then a run of zeros that only the maximum chunk size cuts
+    data = os.urandom(5 * 1024 * 1024) + bytes(5 * 1024 * 1024)
+    vectorized = [len(chunk) for chunk in iter_cdc_chunks(io.BytesIO(data))]
+    monkeypatch.setattr(chunked_digest, "numpy", None)
+    assert [len(chunk) for chunk in iter_cdc_chunks(io.BytesIO(data))] == vectorized
+
+
+def test_cache_round_trip():
+    with tempfile.TemporaryDirectory() as root:
+        cache = ChunkHashCache(os.path.join(root, "cache"))
+        path = os.path.join(root, "policy.pdf")
+        with open(path, "wb") as f:
+            f.write(random_bytes(4096))
+
+        first = digest_document_version(path, cache, "1:policy.pdf", version="1")
+        second = digest_document_version(path, cache, "1:policy.pdf", version="2")
+
+        assert first["root"] == second["root"]
+        assert second["changed_ranges"] == []
+        assert cache.load("1:policy.pdf")["version"] == "2"
+
+        # A staged version only replaces the cached one once promoted
+        third = digest_document_version(path, cache, "1:policy.pdf", version="3", save=False)
+        token = cache.stage("1:policy.pdf", third)
+        assert cache.load("1:policy.pdf")["version"] == "2"
+        cache.promote("1:policy.pdf", token)
+        cache.promote("1:policy.pdf", token)
+        assert cache.load("1:policy.pdf")["version"] == "3"
+
+
+def test_new_versions_hash_every_chunk_of_the_file():
+    with tempfile.TemporaryDirectory() as root:
+        cache = ChunkHashCache(os.path.join(root, "cache"))
+        path = os.path.join(root, "policy.pdf")
+        data = bytearray(random_bytes(3 * 1024 * 1024))
+        with open(path, "wb") as f:
+            f.write(data)
+        digest_document_version(path, cache, "1:policy.pdf", version="1")
+
+        data[2 * 1024 * 1024 + 7] ^= 0xFF
+        with open(path, "wb") as f:
+            f.write(data)
+        second = digest_document_version(path, cache, "1:policy.pdf", version="2")
+
+        assert second["root"] == compute_manifest(io.BytesIO(bytes(data)), "fixed")["root"]
+        assert second["rehashed_bytes"] == len(data)
+        assert second["changed_ranges"] == [[2 * 1024 * 1024, 3 * 1024 * 1024]]
@@ -24,7 +24,9 @@ def main():
         
     # Connect to Algorand testnet
     print("Connecting to Algorand TestNet...")
-    algod_client = algod.AlgodClient("", "https://testnet-api.algonode.cloud")
+    # ALGOD_ADDRESS points at another node, e.g. the local stand-in (run_offline.py)
+    algod_client = algod.AlgodClient(os.environ.get("ALGOD_TOKEN", ""),
+                                     os.environ.get("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud"))
     
     try:
         algod_client.status()
@@ -190,12 +192,12 @@ def main():
     print("\n=== STEP 6: Checking Compliance Status ===")
     status = admin_client.get_compliance_status(app_id)
     print("\n=== COMPLIANCE RECORD ===")
-    print(f"Status: {status['status']}")
-    print(f"Document Hash: {status['document_hash']}")
-    print(f"Version: {status['version']}")
-    if status['attestation_date']:
+    print(f"Status: {status.get('status')}")
+    print(f"Document Hash: {status.get('document_hash')}")
+    print(f"Version: {status.get('document_version')}")
+    if status.get('attestation_date'):
         print(f"Attestation Date: {time.ctime(status['attestation_date'])}")
-    if status['expiration_date']:
+    if status.get('expiration_date'):
         print(f"Expiration Date: {time.ctime(status['expiration_date'])}")
     print("========================")
     
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# test_compliance_abi.py - Test ABI call encoding and legacy app detection offline
+
+import base64
+import hashlib
+
+import pytest
+from algosdk import account, encoding, transaction
+
+from compliance_abi import CALL_ENCODING_ABI, CALL_ENCODING_LEGACY, encode_call, load_contract
+from document_compliance_client import ComplianceClient
+from document_compliance_client_updated import ComplianceClient as UpdatedComplianceClient
+
+DOC_HASH = hashlib.sha256(b"policy v1").hexdigest()
+
+
+class StubAlgod:
+    """Records the transactions it is sent and confirms them immediately"""
+
+    def __init__(self, approval_program):
+        self.approval_program = approval_program
+        self.sent = []
+
+    def application_info(self, app_id):
+        return {"params": {"approval-program": base64.b64encode(self.approval_program).decode()}}
+
+    def suggested_params(self):
+        return transaction.SuggestedParams(1000, 1, 1001, "SGO1GKSzyE7IEPItTxCByw9x8FmnrCDexi9/cOUJOiI=",
+                                           flat_fee=True)
+
+    def send_transaction(self, signed_txn):
+        self.sent.append(signed_txn)
+        return signed_txn.transaction.get_txid()
+
+    def status(self):
+        return {"last-round": 1}
+
+    def pending_transaction_info(self, txid):
+        return {"confirmed-round": 2, "application-index": 1}
+
+
+def send_all(approval_program):
+    private_key, _ = account.generate_account()
+    _, verifier = account.generate_account()
+    algod_client = StubAlgod(approval_program)
+    client = ComplianceClient(algod_client, private_key)
+
+    client.register_document_hash(1, DOC_HASH, "1.0", 1900000000)
+    client.assign_verifier(1, verifier)
+    client.verify_compliance(1)
+    return client, algod_client.sent
+
+
+def test_updated_client_only_adds_the_creation_txid_to_deploy():
+    private_key, _ = account.generate_account()
+    legacy_program = b"\x06 ... register assign_verifier verify ..."
+    algod_client = StubAlgod(b"")
+
+    client = ComplianceClient(algod_client, private_key)
+    assert client.deploy_contract(legacy_program, b"\x06\x81\x01") == 1
+    updated = UpdatedComplianceClient(algod_client, private_key)
+    app_id, tx_id = updated.deploy_contract(legacy_program, b"\x06\x81\x01")
+
+    assert (app_id, tx_id) == (1, algod_client.sent[-1].transaction.get_txid())
+    # Both learn the call encoding from the program they deployed
+    assert client.call_encoding_for(1) == updated.call_encoding_for(1) == CALL_ENCODING_LEGACY
+
+
+def test_encode_call_uses_selectors_and_typed_arguments():
+    contract = load_contract()
+    assert [m.name for m in contract.methods] == ["register", "assign_verifier", "verify"]
+
+    args = encode_call("register", bytes.fromhex(DOC_HASH), "1.0", 1900000000)
+
+    assert args[0] == contract.get_method_by_name("register").get_selector()
+    assert args[1:] == [bytes.fromhex(DOC_HASH), b"\x00\x031.0", (1900000000).to_bytes(8, "big")]
+    assert encode_call("assign_verifier", 1)[1] == b"\x01"
+    with pytest.raises(ValueError):
+        encode_call("verify", 1)
+
+
+def test_client_detects_legacy_apps_and_keeps_their_arguments():
+    client, sent = send_all(b"\x06 ... register assign_verifier verify ...")
+
+    assert client.call_encoding_for(1) == CALL_ENCODING_LEGACY
+    assert [stxn.transaction.app_args[0] for stxn in sent] == [b"register", b"assign_verifier", b"verify"]
+
+
+def test_abi_calls_are_smaller_than_legacy_calls():
+    _, legacy = send_all(b"\x06 ... register assign_verifier verify ...")
+    client, abi_calls = send_all(b"\x06 ... compiled method router ...")
+
+    assert client.call_encoding_for(1) == CALL_ENCODING_ABI
+    assert [len(stxn.transaction.app_args[0]) for stxn in abi_calls] == [4, 4, 4]
+    for legacy_txn, abi_txn in zip(legacy, abi_calls):
+        legacy_size = len(base64.b64decode(encoding.msgpack_encode(legacy_txn)))
+        abi_size = len(base64.b64decode(encoding.msgpack_encode(abi_txn)))
+        assert abi_size < legacy_size
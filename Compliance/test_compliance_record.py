@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# test_compliance_record.py - Test the packed global-state layout and its decoding
+
+import base64
+import hashlib
+
+import pytest
+from algosdk import account
+
+from compliance_record import (EMPTY_RECORD, LAYOUT_KEYS, LAYOUT_PACKED, MAX_RECORD_VERSION_LENGTH, RECORD_KEY,
+                               app_min_balance, decode_record, encode_record)
+from document_compliance_client import ComplianceClient
+
+DOC_HASH = hashlib.sha256(b"policy v1").hexdigest()
+
+
+def global_state(items):
+    def value(v):
+        if isinstance(v, int):
+            return {"type": 2, "uint": v, "bytes": ""}
+        return {"type": 1, "uint": 0, "bytes": base64.b64encode(v).decode()}
+
+    return [{"key": base64.b64encode(key).decode(), "value": value(v)} for key, v in items.items()]
+
+
+class StubAlgod:
+    def __init__(self, items):
+        self.state = global_state(items)
+
+    def application_info(self, app_id):
+        return {"params": {"global-state": self.state}}
+
+
+KEYS_STATE = {b"document_hash": bytes.fromhex(DOC_HASH), b"document_version": b"1.2.0",
+              b"attestation_date": 1800000000, b"expiration_date": 1900000000,
+              b"status": b"compliant", b"admin": bytes(32)}
+PACKED_STATE = {RECORD_KEY: encode_record(DOC_HASH, "1.2.0", 1900000000, 1800000000)}
+
+
+def test_record_round_trip_and_limits():
+    value = encode_record(DOC_HASH, "1.2.0", 1900000000, 1800000000, "expired")
+
+    assert len(value) == 49 + 5 and value[48] == 2
+    assert decode_record(base64.b64encode(value).decode()) == {
+        "document_hash": DOC_HASH, "version": "1.2.0", "attestation_date": 1800000000,
+        "expiration_date": 1900000000, "status": "expired"}
+    assert decode_record(EMPTY_RECORD) == {"document_hash": None, "version": None, "attestation_date": None,
+                                           "expiration_date": None, "status": "pending"}
+    assert len(RECORD_KEY) + len(encode_record(DOC_HASH, "v" * MAX_RECORD_VERSION_LENGTH, 1)) == 128
+    with pytest.raises(ValueError):
+        encode_record(DOC_HASH, "v" * (MAX_RECORD_VERSION_LENGTH + 1), 1)
+
+
+def test_packed_layout_is_cheaper_to_hold():
+    assert app_min_balance(LAYOUT_KEYS) == 407000
+    assert app_min_balance(LAYOUT_PACKED) == 150000
+
+
+def test_client_reports_both_layouts_alike():
+    private_key, _ = account.generate_account()
+
+    keys = ComplianceClient(StubAlgod(KEYS_STATE), private_key).get_compliance_status(1)
+    packed = ComplianceClient(StubAlgod(PACKED_STATE), private_key).get_compliance_status(1)
+
+    keys.pop("admin", None)
+    assert packed == keys
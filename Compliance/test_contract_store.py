@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# test_contract_store.py - Test the SQLite contract store and the contracts.json importer
+
+import json
+import os
+import tempfile
+
+from contract_store import ContractStore, open_contract_store
+
+HASH_A = "a" * 64
+HASH_B = "b" * 64
+
+
+def test_contracts_and_documents():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ContractStore(os.path.join(tmp, "contracts.db"))
+        store.add_contract(1, created_at=100.0)
+        store.add_contract(2, created_at=200.0)
+        store.add_document(1, {"hash": HASH_A, "filename": "a.pdf", "version": "1.0.0",
+                               "registered_at": 150.0, "expiry_timestamp": 999,
+                               "digest_mode": "fixed", "changed_ranges": [[0, 10]]})
+        store.add_document(2, {"hash": HASH_A.upper(), "filename": "a.pdf", "version": "1.0.0",
+                               "registered_at": 250.0})
+
+        assert store.count_contracts() == 2
+        assert store.count_documents() == 2
+        assert store.count_documents(1) == 1
+        assert [c["document_count"] for c in store.list_contracts()] == [1, 1]
+        assert store.get_documents(1)[0]["changed_ranges"] == [[0, 10]]
+        assert [d["app_id"] for d in store.find_documents_by_hash(HASH_A)] == [2, 1]
+        assert store.get_contract(3) is None
+
+        store.add_document(2, {"hash": HASH_B, "file_hash": "C" * 64, "digest_mode": "cdc",
+                               "registered_at": 300.0})
+        assert store.find_documents_by_hash("c" * 64)[0]["hash"] == HASH_B
+        assert "file_hash" not in store.get_documents(1)[0]
+
+
+def test_json_import_runs_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "contracts.json")
+        with open(json_path, "w") as f:
+            json.dump([{"app_id": 7, "created_at": 1.0, "documents": [
+                {"hash": HASH_B, "filename": "b.txt", "version": "2", "registered_at": 2.0}]}], f)
+
+        db_path = os.path.join(tmp, "contracts.db")
+        store = open_contract_store(db_path, json_path)
+        assert store.import_json(json_path) == (0, 0)
+        store.close()
+
+        store = open_contract_store(db_path, json_path)
+        assert store.app_ids() == [7]
+        assert store.get_contract(7)["documents"][0]["filename"] == "b.txt"
+
+
+def test_counters_match_full_recount():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ContractStore(os.path.join(tmp, "contracts.db"))
+        store.add_contract(1)
+        store.add_contract(1)
+        store.add_document(1, {"hash": HASH_A, "registered_at": 1.0, "expiry_timestamp": 10})
+        assert store.get_documents(1)[0]["status"] == "compliant"
+        assert store.mark_verified(1, now=5) == "compliant"
+        store.add_document(1, {"hash": HASH_B, "registered_at": 2.0, "expiry_timestamp": 10})
+        store.add_document(2, {"hash": HASH_A, "registered_at": 3.0, "expiry_timestamp": 10})
+        store.add_document(2, {"hash": HASH_A, "registered_at": 3.0, "expiry_timestamp": 10})
+        assert store.mark_verified(2, now=50) == "expired"
+        assert store.mark_verified(3) is None
+
+        stats = store.get_stats()
+        assert stats["total_contracts"] == 2
+        assert stats["total_documents"] == 3
+        assert (stats["pending_documents"], stats["compliant_documents"],
+                stats["expired_documents"], stats["superseded_documents"]) == (0, 1, 1, 1)
+        # Only app 1's second document was never attested by a verifier
+        assert stats["unverified_documents"] == 1
+
+        consistent, stored, recounted = store.check_consistency()
+        assert consistent and stored == recounted
+
+
+def test_keyset_pages_cover_every_row_once():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = ContractStore(os.path.join(tmp, "contracts.db"))
+        for app_id in range(1, 8):
+            store.add_contract(app_id, created_at=float(app_id % 3))
+            store.add_document(app_id, {"hash": f"{app_id:064x}", "registered_at": float(app_id),
+                                        "expiry_timestamp": 100 - app_id % 2})
+        store.mark_verified(3, now=1000)
+
+        for sort in ("created_at", "expiry", "status"):
+            for order in ("asc", "desc"):
+                seen, cursor = [], None
+                while True:
+                    page = store.page_contracts(sort, order, cursor, limit=2)
+                    seen.extend(c["app_id"] for c in page["items"])
+                    cursor = page["next_cursor"]
+                    if cursor is None:
+                        break
+                assert sorted(seen) == list(range(1, 8))
+                full = store.page_contracts(sort, order, limit=100)["items"]
+                assert [c["app_id"] for c in full] == seen
+
+        assert store.get_contract(3)["documents"][0]["status"] == "expired"
+        assert store.page_contracts("status", "desc", limit=1)["items"][0]["app_id"] == 3
+        page = store.page_documents(app_id=5, sort="expiry")
+        assert [d["app_id"] for d in page["items"]] == [5] and page["next_cursor"] is None
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# test_document_index.py - Test batch resolution of document digests
+
+import hashlib
+import threading
+
+from document_index import DocumentIndex
+
+CURRENT = hashlib.sha256(b"current").hexdigest()
+OLD = hashlib.sha256(b"old").hexdigest()
+EXPIRED = hashlib.sha256(b"expired").hexdigest()
+
+
+def fetch_status(app_id):
+    if app_id == 1:
+        return {"document_hash": CURRENT, "document_version": "2.0", "status": "compliant",
+                "expiration_date": 4102444800, "attestation_date": 1700000000}
+    if app_id == 2:
+        return {"document_hash": EXPIRED, "version": "1.0", "status": "compliant",
+                "expiration_date": 1000, "attestation_date": 900}
+    raise Exception("app not found")
+
+
+def test_lookup_many_resolves_each_digest():
+    calls = []
+    index = DocumentIndex(lambda app_id: calls.append(app_id) or fetch_status(app_id))
+    index.ensure_fresh([1, 2, 3], history=[(1, {"hash": OLD, "version": "1.0"})])
+    index.ensure_fresh([1, 2, 3])
+
+    results = list(index.lookup_many([CURRENT.upper(), OLD, EXPIRED, "0" * 64, "nope"]))
+
+    assert sorted(calls) == [1, 2, 3]
+    assert [r["status"] for r in results] == ["compliant", "superseded", "expired", "unregistered", "invalid"]
+    assert results[0]["app_id"] == 1 and results[0]["version"] == "2.0" and results[0]["compliant"]
+    assert results[1]["registered"] and not results[1]["compliant"]
+    assert results[2]["version"] == "1.0"
+    assert results[3]["app_id"] is None
+
+
+def test_chunked_documents_resolve_by_root_and_file_hash():
+    root = hashlib.sha256(b"merkle root").hexdigest()
+    file_hash = hashlib.sha256(b"file").hexdigest()
+    index = DocumentIndex(lambda app_id: {"document_hash": root, "version": "3", "status": "pending"})
+    index.ensure_fresh([1], history=[(1, {"hash": root, "file_hash": file_hash, "version": "3"})])
+
+    by_root, by_file = index.lookup_many([root, file_hash])
+
+    assert by_root["current"] and by_file["current"]
+    assert by_file["document_hash"] == file_hash and by_file["onchain_hash"] == root
+
+
+def test_invalidate_rebuilds_once_for_concurrent_callers():
+    calls = []
+    release = threading.Event()
+
+    def slow_fetch(app_id):
+        calls.append(app_id)
+        release.wait(5)
+        return fetch_status(app_id)
+
+    index = DocumentIndex(slow_fetch)
+    release.set()
+    index.ensure_fresh([1])
+    release.clear()
+    index.invalidate()
+    threads = [threading.Thread(target=index.ensure_fresh, args=([1],)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1, 1]
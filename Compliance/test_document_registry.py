@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# test_document_registry.py - Test the v2 box registry contract, box layout and client
+
+import base64
+import hashlib
+
+import pytest
+
+from algosdk import account, transaction
+from algosdk.error import AlgodHTTPError
+from algosdk.logic import get_application_address
+from pyteal import compileTeal, Mode
+
+import document_registry
+from document_registry_client import ComplianceRegistryClient, plan_verify_batches
+from registry_box import box_min_balance, decode_box, encode_box
+
+DOC_HASH = hashlib.sha256(b"policy v1").hexdigest()
+APP_ID = 1234
+
+
+class StubAlgod:
+    """Records submitted transactions and serves boxes from a dict"""
+
+    def __init__(self):
+        self.boxes = {}
+        self.sent = []
+
+    def suggested_params(self):
+        return transaction.SuggestedParams(1000, 1, 1000, base64.b64encode(b"\x00" * 32).decode(),
+                                           flat_fee=True)
+
+    def status(self):
+        return {"last-round": 1}
+
+    def pending_transaction_info(self, txid):
+        return {"confirmed-round": 2}
+
+    def send_transaction(self, txn):
+        self.sent.append([txn])
+
+    def send_transactions(self, txns):
+        self.sent.append(txns)
+
+    def application_box_by_name(self, app_id, name):
+        if name not in self.boxes:
+            raise AlgodHTTPError("box not found", 404)
+        return {"name": base64.b64encode(name).decode(), "value": base64.b64encode(self.boxes[name]).decode()}
+
+
+def test_box_layout_round_trip():
+    value = encode_box("1.2.0", 1900000000, 1800000000, "compliant")
+
+    assert len(value) == 17 + len("1.2.0")
+    assert decode_box(value) == {"expiration_date": 1900000000, "attestation_date": 1800000000,
+                                 "status": "compliant", "version": "1.2.0"}
+    assert decode_box(base64.b64encode(encode_box("", 5)).decode())["attestation_date"] is None
+
+
+def test_program_dispatches_document_calls_on_boxes():
+    teal = compileTeal(document_registry.approval_program(), Mode.Application,
+                       version=document_registry.TEAL_VERSION)
+
+    assert teal.startswith("#pragma version 8")
+    for call in ("register", "assign_verifier", "verify", "expire", "verify_batch"):
+        assert f'"{call}"' in teal
+    assert "box_put" in teal and "box_replace" in teal
+
+
+def test_client_adds_box_references_and_pays_min_balance_once():
+    algod = StubAlgod()
+    private_key, _ = account.generate_account()
+    client = ComplianceRegistryClient(algod, private_key)
+    name = bytes.fromhex(DOC_HASH)
+
+    client.register_document_hash(APP_ID, DOC_HASH, "1.0", expiry=1900000000)
+    payment, call = (signed.transaction for signed in algod.sent[-1])
+    assert payment.receiver == get_application_address(APP_ID)
+    assert payment.amt == box_min_balance("1.0")
+    assert call.app_args == [b"register", name, b"1.0", (1900000000).to_bytes(8, "big")]
+    assert [(box.app_index, box.name) for box in call.boxes] == [(0, name)]
+
+    # Re-registering with a version of the same length needs no top-up
+    algod.boxes[name] = encode_box("1.0", 1900000000)
+    client.register_document_hash(APP_ID, DOC_HASH, "1.1", expiry=1900000000)
+    assert len(algod.sent[-1]) == 1
+
+    client.verify_document(APP_ID, DOC_HASH)
+    assert algod.sent[-1][0].transaction.app_args == [b"verify", name]
+    assert client.get_document(APP_ID, DOC_HASH)["status"] == "pending"
+    assert client.get_document(APP_ID, "00" * 32) is None
+
+
+def test_batches_need_an_eighth_of_the_transactions():
+    hashes = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(5000)]
+
+    groups = plan_verify_batches(hashes + hashes[:10])
+
+    calls = [call for group in groups for call in group]
+    assert len(calls) == 625 and len(groups) == 40
+    assert max(len(group) for group in groups) == 16
+    assert max(len(call) for call in calls) == document_registry.MAX_BATCH
+    assert [name.hex() for call in calls for name in call] == hashes
+
+
+def test_verify_documents_pools_the_group_fee_into_the_first_call():
+    algod = StubAlgod()
+    private_key, _ = account.generate_account()
+    client = ComplianceRegistryClient(algod, private_key)
+    hashes = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(20)]
+
+    results = client.verify_documents(APP_ID, hashes)
+
+    calls = [signed.transaction for signed in algod.sent[-1]]
+    assert len(results) == 1 and results[0]["transactions"] == 3 and "txn_id" in results[0]
+    assert [call.fee for call in calls] == [3000, 0, 0]
+    assert len({call.group for call in calls}) == 1
+    for call in calls:
+        assert call.app_args[0] == b"verify_batch"
+        assert [box.name for box in call.boxes] == call.app_args[1:]
+        assert len(call.boxes) <= 8
+
+
+def test_verify_documents_raises_node_failures_but_reports_rejected_groups():
+    algod = StubAlgod()
+    client = ComplianceRegistryClient(algod, account.generate_account()[0])
+    hashes = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(200)]
+
+    def reject(txns):
+        raise AlgodHTTPError("logic eval error: assert failed", 400)
+    algod.send_transactions = reject
+    results = client.verify_documents(APP_ID, hashes)
+    assert len(results) == 2 and all("logic eval error" in result["error"] for result in results)
+
+    def overloaded(txns):
+        raise AlgodHTTPError("service unavailable", 503)
+    algod.send_transactions = overloaded
+    with pytest.raises(AlgodHTTPError):
+        client.verify_documents(APP_ID, hashes)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# test_fast_json.py - Test the pluggable JSON encoders and streamed list responses
+
+import datetime
+import json
+
+import pytest
+from flask import Flask, jsonify
+
+from fast_json import ENCODERS, encoder_for, install_json_provider, list_response, stream_json, stream_ndjson
+
+PAYLOAD = {
+    "success": True,
+    "address": "ADMIN",
+    "round": 2 ** 63,
+    "balance": 10.5,
+    "note": "Prüfbericht ✓",
+    "tallies": {1: 4, 2: 7},
+    "issued": datetime.datetime(2025, 8, 10, 12, 0, tzinfo=datetime.timezone.utc),
+    "apps-local-state": [{"id": 744059516, "key-value": []}],
+}
+
+
+@pytest.mark.parametrize("name", sorted(ENCODERS))
+def test_encoders_match_flask_default(name):
+    default_app = Flask(__name__)
+    with default_app.app_context():
+        expected = json.loads(jsonify(PAYLOAD).get_data())
+
+    app = Flask(__name__)
+    install_json_provider(app, name)
+    with app.app_context():
+        response = jsonify(PAYLOAD)
+    assert json.loads(response.get_data()) == expected
+    assert expected["issued"] == "Sun, 10 Aug 2025 12:00:00 GMT"
+    # Integers past 64 bits fall back to the standard library
+    assert json.loads(encoder_for(name)({"big": 2 ** 70})) == {"big": 2 ** 70}
+
+
+def test_streams_parse_to_the_same_documents():
+    items = [{"txid": f"TX{i}", "round": 1000 + i} for i in range(250)]
+    dumps = encoder_for()
+
+    assert json.loads(b"".join(stream_json(items, dumps=dumps))) == items
+    assert json.loads(b"".join(stream_json([], dumps=dumps))) == []
+    body = b"".join(stream_json(iter(items), "transactions", {"count": 250}, dumps, batch_size=7))
+    assert json.loads(body) == {"count": 250, "transactions": items}
+    assert json.loads(b"".join(stream_json(items[:1], "jobs", dumps=dumps))) == {"jobs": items[:1]}
+    lines = b"".join(stream_ndjson(items, dumps)).splitlines()
+    assert [json.loads(line) for line in lines] == items
+
+
+def test_list_response_negotiates_ndjson():
+    app = Flask(__name__)
+    install_json_provider(app)
+
+    @app.route("/transactions")
+    def transactions():
+        return list_response(({"n": n} for n in range(3)), key="transactions", fields={"app_id": 7})
+
+    client = app.test_client()
+    response = client.get("/transactions")
+    assert response.mimetype == "application/json"
+    assert response.get_json() == {"app_id": 7, "transactions": [{"n": 0}, {"n": 1}, {"n": 2}]}
+
+    response = client.get("/transactions", headers={"Accept": "application/x-ndjson"})
+    assert response.mimetype == "application/x-ndjson"
+    assert response.get_data() == b'{"n":0}\n{"n":1}\n{"n":2}\n'
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# test_hash_encoding.py - Test the v1 (hex) and v2 (binary) document hash encodings
+
+import base64
+import hashlib
+
+import pytest
+from algosdk import account
+
+from hash_encoding import encode_document_hash, decode_document_hash
+from document_compliance_client import ComplianceClient
+
+DOC_HASH = hashlib.sha256(b"policy v1").hexdigest()
+
+
+class StubAlgod:
+    def __init__(self, stored_hash):
+        self.stored_hash = stored_hash
+
+    def application_info(self, app_id):
+        def item(key, value):
+            return {"key": base64.b64encode(key.encode()).decode(), "value": value}
+
+        return {"params": {"global-state": [
+            item("document_hash", {"type": 1, "bytes": base64.b64encode(self.stored_hash).decode()}),
+            item("status", {"type": 1, "bytes": base64.b64encode(b"compliant").decode()}),
+            item("expiration_date", {"type": 2, "uint": 1900000000}),
+        ]}}
+
+
+def test_encodings_round_trip():
+    binary = encode_document_hash(DOC_HASH)
+    hex_encoded = encode_document_hash(DOC_HASH, "hex")
+
+    assert len(binary) == 32
+    assert hex_encoded == DOC_HASH.encode()
+    assert decode_document_hash(binary) == (DOC_HASH, "binary")
+    assert decode_document_hash(hex_encoded) == (DOC_HASH, "hex")
+    assert decode_document_hash(base64.b64encode(binary).decode()) == (DOC_HASH, "binary")
+
+
+def test_rejects_malformed_hashes():
+    with pytest.raises(ValueError):
+        encode_document_hash("not-a-hash")
+    with pytest.raises(ValueError):
+        encode_document_hash(b"\x00" * 31)
+
+
+@pytest.mark.parametrize("stored", [DOC_HASH.encode(), bytes.fromhex(DOC_HASH)])
+def test_client_status_renders_hex_for_both_formats(stored):
+    private_key, _ = account.generate_account()
+    client = ComplianceClient(StubAlgod(stored), private_key)
+
+    status = client.get_compliance_status(1)
+
+    assert status["document_hash"] == DOC_HASH
+    assert status["hash_encoding"] == ("hex" if len(stored) == 64 else "binary")
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# test_job_queue.py - Test the durable job queue behind the dashboard's on-chain writes
+
+import os
+import tempfile
+import time
+import urllib.error
+
+from algosdk import account, transaction
+from algosdk.error import AlgodHTTPError
+
+from job_queue import JobQueue, is_transient, previous_submission, record_submissions, retry_delay
+
+
+def test_outcomes_are_recorded_and_transient_errors_retried():
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(os.path.join(tmp, "jobs.db"), backoff=0)
+        calls = []
+
+        def flaky(payload):
+            calls.append(payload)
+            if len(calls) < 3:
+                raise AlgodHTTPError("node is busy", 503)
+            return {"app_id": payload["n"]}
+
+        def rejected(payload):
+            raise AlgodHTTPError("logic eval error: assert failed", 400)
+
+        queue.register("flaky", flaky)
+        queue.register("rejected", rejected)
+        ok = queue.enqueue("flaky", {"n": 7}, app_id=7)
+        bad = queue.enqueue("rejected")
+
+        # Each pass runs whatever is due; retries with no backoff are due at once
+        while queue.run_pending():
+            pass
+
+        ok, bad = queue.get(ok["id"]), queue.get(bad["id"])
+        assert (ok["status"], ok["attempts"], ok["result"]) == ("succeeded", 3, {"app_id": 7})
+        assert (bad["status"], bad["attempts"]) == ("failed", 1)
+        assert "assert failed" in bad["error"]
+        assert [job["id"] for job in queue.list_jobs(app_id=7)] == [ok["id"]]
+        assert queue.counts() == {"queued": 0, "running": 0, "succeeded": 1, "failed": 1}
+
+
+def test_backoff_and_expired_leases():
+    assert is_transient(AlgodHTTPError("rate limited", 429))
+    assert is_transient(urllib.error.URLError("connection refused"))
+    assert not is_transient(AlgodHTTPError("overspend", 400))
+    assert not is_transient(ValueError("Admin account not found"))
+    assert [retry_delay(n, 2, 10) for n in (1, 2, 3, 4)] == [2, 4, 8, 10]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs.db")
+        queue = JobQueue(path, backoff=60, lease=30)
+
+        def deploy(payload):
+            raise ConnectionResetError("connection reset by peer")
+
+        queue.register("deploy", deploy)
+        job = queue.enqueue("deploy")
+
+        # A transient failure is queued again, not before its backoff
+        queue.run(queue.claim())
+        assert queue.get(job["id"])["status"] == "queued"
+        assert queue.claim() is None
+        assert queue.claim(now=time.time() + 61)["attempts"] == 2
+
+        # The worker holding it "died": another process takes it once the lease expires
+        other = JobQueue(path, lease=30)
+        assert other.claim(now=time.time() + 62) is None
+        assert other.claim(now=time.time() + 61 + 31)["id"] == job["id"]
+
+
+def test_workers_run_jobs_in_the_background():
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(os.path.join(tmp, "jobs.db"), workers=3, poll_interval=0.05)
+        queue.register("square", lambda payload: payload["n"] ** 2)
+        queue.start()
+        try:
+            jobs = [queue.enqueue("square", {"n": n}) for n in range(20)]
+            deadline = time.time() + 10
+            while time.time() < deadline and not all(queue.get(job["id"])["done"] for job in jobs):
+                time.sleep(0.02)
+        finally:
+            queue.stop()
+
+        assert [queue.get(job["id"])["result"] for job in jobs] == [n ** 2 for n in range(20)]
+        assert all(queue.get(job["id"])["attempts"] == 1 for job in jobs)
+
+
+class StubAlgod:
+    """Accepts transactions; `outcome` decides what pending_transaction_info reports"""
+
+    def __init__(self):
+        self.sent = []
+        self.outcome = {"confirmed-round": 5}
+        self.last_round = 10
+
+    def send_transaction(self, signed):
+        self.sent.append(signed.transaction.get_txid())
+
+    def pending_transaction_info(self, txid):
+        if self.outcome is None:
+            raise AlgodHTTPError("txn not found", 404)
+        return self.outcome
+
+    def status(self):
+        return {"last-round": self.last_round}
+
+
+def test_retries_look_up_what_was_sent_instead_of_sending_again():
+    private_key, sender = account.generate_account()
+    sp = transaction.SuggestedParams(1000, 1, 20, "A" * 43 + "=", flat_fee=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(os.path.join(tmp, "jobs.db"), backoff=0)
+        algod = record_submissions(StubAlgod())
+        failures = []
+
+        def register(payload):
+            if previous_submission(algod) is None:
+                algod.send_transaction(transaction.PaymentTxn(sender, sp, sender, payload["n"]).sign(private_key))
+                if failures:
+                    raise failures.pop()
+            return len(algod.sent)
+
+        queue.register("register", register)
+
+        # Sent, then the confirmation wait failed: the retry finds it confirmed
+        failures.append(Exception("Transaction not confirmed after 5 rounds"))
+        job = queue.enqueue("register", {"n": 1})
+        queue.run(queue.claim())
+        assert queue.get(job["id"])["status"] == "queued" and queue.get(job["id"])["txid"] == algod.sent[0]
+        queue.run(queue.claim())
+        assert (queue.get(job["id"])["status"], queue.get(job["id"])["result"]) == ("succeeded", 1)
+
+        # Dropped from the pool: sent again
+        failures.append(ConnectionResetError("connection reset by peer"))
+        job = queue.enqueue("register", {"n": 2})
+        queue.run(queue.claim())
+        algod.outcome = {"pool-error": "transaction dropped"}
+        queue.run(queue.claim())
+        assert queue.get(job["id"])["result"] == 3
+
+        # Unknown to the node but still valid: looked up again, not sent
+        failures.append(ConnectionResetError("connection reset by peer"))
+        job = queue.enqueue("register", {"n": 3})
+        queue.run(queue.claim())
+        algod.outcome = None
+        queue.run(queue.claim())
+        assert queue.get(job["id"])["status"] == "queued" and len(algod.sent) == 4
+        algod.last_round = 21
+        queue.run(queue.claim())
+        assert queue.get(job["id"])["result"] == 5
+
+        # Rejected by the node: never retried
+        failures.append(AlgodHTTPError("logic eval error: assert failed", 400))
+        job = queue.enqueue("register", {"n": 4})
+        queue.run(queue.claim())
+        assert (queue.get(job["id"])["status"], queue.get(job["id"])["attempts"]) == ("failed", 1)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# test_metrics.py - Test the latency histograms and their Prometheus exposition
+
+import pytest
+from algosdk.error import AlgodHTTPError
+from flask import Flask
+
+from metrics import Histogram, MetricsRegistry, instrument_client, instrument_flask
+
+
+class StubAlgod:
+    def suggested_params(self):
+        return "params"
+
+    def application_info(self, app_id):
+        raise AlgodHTTPError("application does not exist", 404)
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value, ("/a",))
+
+    assert histogram.snapshot() == {("/a",): ([2, 3, 4], 2.65, 4)}
+    assert histogram.render().splitlines() == [
+        "# HELP latency_seconds Latency",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a",le="0.1"} 2',
+        'latency_seconds_bucket{route="/a",le="1.0"} 3',
+        'latency_seconds_bucket{route="/a",le="+Inf"} 4',
+        'latency_seconds_sum{route="/a"} 2.65',
+        'latency_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_requests_and_client_calls_are_recorded():
+    registry = MetricsRegistry()
+    app = Flask(__name__)
+    algod_client = instrument_client(StubAlgod(), "algod", registry)
+
+    @app.route("/contracts/<int:app_id>")
+    def contract(app_id):
+        algod_client.suggested_params()
+        algod_client.application_info(app_id)
+
+    instrument_flask(app, registry)
+    client = app.test_client()
+    client.get("/contracts/7")
+    client.get("/nowhere")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    requests = registry.requests.snapshot()
+    assert requests[("GET", "/contracts/<int:app_id>", "500")][2] == 1
+    assert requests[("GET", "<unmatched>", "404")][2] == 1
+    calls = registry.client_calls.snapshot()
+    assert calls[("algod", "suggested_params", "ok")][2] == 1
+    assert calls[("algod", "application_info", "error")][2] == 1
+    text = response.get_data(as_text=True)
+    assert 'algod_request_duration_seconds_count{client="algod",method="application_info",outcome="error"} 1' in text
+
+
+def test_wrapped_methods_keep_their_behavior():
+    algod_client = instrument_client(StubAlgod(), "algod", MetricsRegistry(), methods=("application_info",))
+    with pytest.raises(AlgodHTTPError):
+        algod_client.application_info(1)
+    assert algod_client.application_info.__name__ == "application_info"
+    assert algod_client.suggested_params() == "params"
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# test_readiness.py - Test lazy clients, the /readyz probe and a node-free app import
+
+import os
+import subprocess
+import sys
+import threading
+
+from flask import Flask
+
+from lazy import Lazy
+from readiness import ReadinessProbe, add_readiness_route
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_lazy_builds_once_across_threads():
+    calls = []
+    value = Lazy(lambda: calls.append(1) or object())
+    assert not value.built
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(value.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1 and value.built
+    assert all(result is results[0] for result in results)
+
+    failing = Lazy(lambda: 1 / 0)
+    for _ in range(2):
+        try:
+            failing.get()
+        except ZeroDivisionError:
+            pass
+    assert not failing.built
+
+
+def test_readyz_follows_the_checks():
+    node = {"up": False}
+
+    def algod_status():
+        if not node["up"]:
+            raise ConnectionError("connection refused")
+
+    probe = ReadinessProbe({"algod": algod_status}, interval=0)
+    app = Flask(__name__)
+    add_readiness_route(app, probe)
+    client = app.test_client()
+
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.get_json()["checks"]["algod"]["error"] == "connection refused"
+
+    node["up"] = True
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    assert response.get_json()["ready"] and response.get_json()["checks"]["algod"]["ok"]
+
+    # Not ready before a background probe has run
+    assert ReadinessProbe({"algod": algod_status}).status() == {"ready": False, "checked_at": None, "checks": {}}
+
+
+def test_app_imports_without_algosdk_or_a_node():
+    env = dict(os.environ, READINESS_INTERVAL="0",
+               ALGOD_ADDRESS="http://127.0.0.1:9", INDEXER_ADDRESS="http://127.0.0.1:9")
+    code = ("import sys, app\n"
+            "print('algosdk' in sys.modules, 'pyteal' in sys.modules)\n"
+            "print(app.app.test_client().get('/readyz').status_code)\n")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["False", "False", "503"]
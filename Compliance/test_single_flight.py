@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# test_single_flight.py - Test coalescing of identical concurrent client reads
+
+import threading
+import time
+
+import pytest
+
+from metrics import MetricsRegistry
+from single_flight import SingleFlight, coalesce_client
+
+
+class SlowAlgod:
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def application_info(self, app_id):
+        self.calls.append(app_id)
+        self.release.wait(5)
+        if app_id == 0:
+            raise ConnectionError("node unreachable")
+        return {"id": app_id}
+
+    def send_transaction(self, signed_txn):
+        self.calls.append("send")
+        return "TXID"
+
+
+def run_together(count, target):
+    results = [None] * count
+
+    def run(i):
+        try:
+            results[i] = target(i)
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def test_identical_reads_share_one_call():
+    algod = SlowAlgod()
+    registry = MetricsRegistry()
+    flights = SingleFlight()
+    coalesce_client(algod, "algod", flights, registry)
+
+    threads, results = run_together(50, lambda i: algod.application_info(7 if i % 2 else 8))
+    while flights.stats()["calls"] + flights.stats()["coalesced"] < 50:
+        time.sleep(0.01)
+    algod.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(algod.calls) == [7, 8]
+    assert results == [{"id": 8}, {"id": 7}] * 25
+    assert flights.stats() == {"calls": 2, "coalesced": 48, "in_flight": 0}
+    assert registry.coalesced_calls.snapshot() == {("algod", "application_info"): 48}
+    assert 'algod_coalesced_calls_total{client="algod",method="application_info"} 48' in registry.render()
+
+    # Calls after the flight landed go upstream again; writes are never coalesced
+    algod.application_info(7)
+    algod.send_transaction(b"signed")
+    algod.send_transaction(b"signed")
+    assert algod.calls[2:] == [7, "send", "send"]
+
+
+def test_followers_get_the_leaders_error():
+    algod = SlowAlgod()
+    coalesce_client(algod, "algod", SingleFlight())
+    threads, results = run_together(10, lambda i: algod.application_info(0))
+    time.sleep(0.1)
+    algod.release.set()
+    for thread in threads:
+        thread.join()
+    assert algod.calls == [0]
+    assert all(isinstance(result, ConnectionError) for result in results)
+
+
+def test_held_results_until_forgotten():
+    flights = SingleFlight(hold=60)
+    calls = []
+    fetch = lambda: calls.append(1) or len(calls)
+    assert flights.do("app", fetch) == (1, False)
+    assert flights.do("app", fetch) == (1, True)
+    flights.forget()
+    assert flights.do("app", fetch) == (2, False)
+
+    with pytest.raises(ValueError):
+        flights.do("bad", lambda: int("x"))
+    # Errors are not held
+    assert flights.do("bad", lambda: 3) == (3, False)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# test_tracing.py - Test span nesting, sampling and the JSON-lines and OTLP exporters
+
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from flask import Flask
+
+import tracing
+from tracing import JsonLinesExporter, OtlpHttpExporter, Tracer, configure, trace_client, trace_flask, traced
+
+TXID = "Q" * 52
+
+
+class StubAlgod:
+    def status(self):
+        return {"last-round": 1200}
+
+    def send_transaction(self, signed_txn):
+        return TXID
+
+    def pending_transaction_info(self, txid):
+        return {"confirmed-round": 1201, "pool-error": ""}
+
+
+class StubClient:
+    def __init__(self, algod_client):
+        self.algod_client = algod_client
+
+    @traced
+    def verify_compliance(self, app_id):
+        txid = self.algod_client.send_transaction(b"signed")
+        self.algod_client.status()
+        return self.algod_client.pending_transaction_info(txid) and txid
+
+
+def read_spans(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_request_client_and_algod_spans_nest():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "spans.jsonl")
+        previous = tracing.get_tracer()
+        configure(Tracer([JsonLinesExporter(path)]))
+        try:
+            app = Flask(__name__)
+            client = StubClient(trace_client(StubAlgod(), "algod"))
+
+            @app.route("/contracts/<int:app_id>/verify", methods=["POST"])
+            def verify(app_id):
+                return {"txn_id": client.verify_compliance(app_id)}
+
+            trace_flask(app)
+            assert app.test_client().post("/contracts/7/verify").status_code == 200
+        finally:
+            tracing.get_tracer().shutdown()
+            configure(previous)
+
+        spans = {span["name"]: span for span in read_spans(path)}
+        root = spans["POST /contracts/<int:app_id>/verify"]
+        method = spans["StubClient.verify_compliance"]
+        assert root["parent_id"] is None and root["attributes"]["http.status_code"] == 200
+        assert method["parent_id"] == root["span_id"]
+        assert method["attributes"] == {"algorand.app_id": 7, "algorand.txid": TXID}
+        for name in ("algod.send_transaction", "algod.status", "algod.pending_transaction_info"):
+            assert spans[name]["parent_id"] == method["span_id"]
+            assert spans[name]["trace_id"] == root["trace_id"]
+        assert spans["algod.status"]["attributes"] == {"algorand.round": 1200}
+        assert spans["algod.pending_transaction_info"]["attributes"] == {
+            "algorand.txid": TXID, "algorand.confirmed_round": 1201}
+
+
+def test_sampling_is_decided_per_trace():
+    exported = []
+
+    class Collect:
+        def export(self, span, tracer):
+            exported.append(span)
+
+    tracer = Tracer([Collect()], sample_rate=0.0)
+    with tracer.span("root"):
+        with tracer.span("child"):
+            pass
+    assert exported == []
+
+    tracer.sample_rate = 1.0
+    with tracer.span("root"):
+        try:
+            with tracer.span("child"):
+                raise ValueError("pool error")
+        except ValueError:
+            pass
+    assert [span.name for span in exported] == ["child", "root"]
+    assert exported[0].to_dict()["error"] == "ValueError: pool error"
+    assert tracing.current_span() is None
+
+
+def test_otlp_exporter_posts_json_batches():
+    received = []
+
+    class Collector(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append((self.path, json.loads(self.rfile.read(int(self.headers["Content-Length"])))))
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Collector)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        exporter = OtlpHttpExporter(f"http://127.0.0.1:{server.server_address[1]}", flush_interval=60)
+        tracer = Tracer([exporter], service_name="test-service")
+        with tracer.span("root", **{"algorand.round": 1000}):
+            pass
+        tracer.shutdown()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    path, payload = received[0]
+    assert path == "/v1/traces"
+    resource_spans = payload["resourceSpans"][0]
+    assert resource_spans["resource"]["attributes"] == [
+        {"key": "service.name", "value": {"stringValue": "test-service"}}]
+    span = resource_spans["scopeSpans"][0]["spans"][0]
+    assert span["name"] == "root" and len(span["traceId"]) == 32 and len(span["spanId"]) == 16
+    assert span["attributes"] == [{"key": "algorand.round", "value": {"intValue": "1000"}}]
+
+
+def test_otlp_export_failures_are_logged(caplog):
+    server = HTTPServer(("127.0.0.1", 0), BaseHTTPRequestHandler)
+    port = server.server_address[1]
+    server.server_close()
+
+    exporter = OtlpHttpExporter(f"http://127.0.0.1:{port}", flush_interval=60, timeout=1)
+    tracer = Tracer([exporter])
+    with tracer.span("root"):
+        pass
+    tracer.shutdown()
+
+    assert "Dropped 1 spans" in caplog.text and caplog.records[-1].levelname == "WARNING"
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# test_upload_sessions.py - Test resumable chunked uploads (no network required)
+
+import hashlib
+import io
+import os
+import tempfile
+
+import pytest
+
+from upload_sessions import UploadSessionStore, UploadSessionError, UploadSessionNotFound
+
+
+def make_payload(size):
+    return bytes((i * 7) % 251 for i in range(size))
+
+
+def test_out_of_order_upload_and_commit():
+    payload = make_payload(10_000)
+    with tempfile.TemporaryDirectory() as root:
+        store = UploadSessionStore(os.path.join(root, "sessions"), chunk_size=4096)
+        session = store.create("evidence.bin", len(payload),
+                               sha256=hashlib.sha256(payload).hexdigest())
+        assert session["total_chunks"] == 3
+
+        for index in (2, 0, 1):
+            chunk = payload[index * 4096:(index + 1) * 4096]
+            store.write_chunk(session["session_id"], index, io.BytesIO(chunk))
+
+        destination = os.path.join(root, "evidence.bin")
+        result = store.commit(session["session_id"], destination)
+
+        assert result["sha256"] == hashlib.sha256(payload).hexdigest()
+        with open(destination, "rb") as f:
+            assert f.read() == payload
+        with pytest.raises(UploadSessionNotFound):
+            store.status(session["session_id"])
+
+
+def test_resume_after_restart():
+    payload = make_payload(9_000)
+    with tempfile.TemporaryDirectory() as root:
+        sessions = os.path.join(root, "sessions")
+        store = UploadSessionStore(sessions, chunk_size=4096)
+        session = store.create("policy.pdf", len(payload))
+        store.write_chunk(session["session_id"], 0, io.BytesIO(payload[:4096]))
+
+        # A new store instance stands in for a restarted server
+        store = UploadSessionStore(sessions, chunk_size=4096)
+        status = store.status(session["session_id"])
+        assert status["received_chunks"] == [0]
+        assert status["missing_chunks"] == [1, 2]
+
+        store.write_chunk(session["session_id"], 1, io.BytesIO(payload[4096:8192]))
+        store.write_chunk(session["session_id"], 2, io.BytesIO(payload[8192:]))
+        result = store.commit(session["session_id"], os.path.join(root, "policy.pdf"))
+        assert result["sha256"] == hashlib.sha256(payload).hexdigest()
+
+
+def test_rejects_bad_chunks_and_digests():
+    payload = make_payload(5_000)
+    with tempfile.TemporaryDirectory() as root:
+        store = UploadSessionStore(os.path.join(root, "sessions"), chunk_size=4096)
+        with pytest.raises(UploadSessionError):
+            store.create("sbom.json", "5000 bytes")
+        session = store.create("sbom.json", len(payload), sha256="0" * 64)
+        session_id = session["session_id"]
+
+        with pytest.raises(UploadSessionError):
+            store.write_chunk(session_id, 0, io.BytesIO(payload[:100]))
+        with pytest.raises(UploadSessionError):
+            store.write_chunk(session_id, 5, io.BytesIO(b""))
+        with pytest.raises(UploadSessionError):
+            store.write_chunk(session_id, 0, io.BytesIO(payload[:4096]), expected_sha256="f" * 64)
+
+        store.write_chunk(session_id, 0, io.BytesIO(payload[:4096]))
+        with pytest.raises(UploadSessionError):
+            store.commit(session_id, os.path.join(root, "sbom.json"))
+
+        store.write_chunk(session_id, 1, io.BytesIO(payload[4096:]))
+        with pytest.raises(UploadSessionError):
+            store.commit(session_id, os.path.join(root, "sbom.json"))
+        assert not os.path.exists(os.path.join(root, "sbom.json"))
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+# tracing.py - Lightweight span tracing for the compliance servers and clients
+#
+# Nested spans for each Flask handler, each client method (ComplianceClient,
+# ComplianceRegistryClient, VotingDAppClient) and each algod / indexer call,
+# with app ids, round numbers and txids as attributes:
+#
+#   tracer = configure_from_env()       # TRACE_FILE, TRACE_OTLP_ENDPOINT, TRACE_SAMPLE_RATE
+#   trace_flask(app)
+#   trace_client(algod_client, "algod")
+#
+# Finished spans go to a JSON-lines file and/or an OTLP/HTTP collector
+# (JSON encoding, POST <endpoint>/v1/traces). Sampling is decided once per
+# trace at its root span; with no exporter configured, or for a trace that
+# was not sampled, spans are no-op objects.
+
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import random
+import threading
+import time
+import urllib.request
+
+DEFAULT_SERVICE_NAME = "compliance-api"
+OTLP_BATCH_SIZE = 256
+OTLP_FLUSH_INTERVAL = 5.0
+
+# OTLP span kinds and status codes
+KIND_INTERNAL, KIND_SERVER, KIND_CLIENT = 1, 2, 3
+STATUS_OK, STATUS_ERROR = 1, 2
+
+logger = logging.getLogger(__name__)
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    def __init__(self, tracer, name, trace_id, parent_id, kind, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = random.getrandbits(64).to_bytes(8, "big").hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = dict(attributes)
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = STATUS_OK
+        self.error = None
+        self._token = None
+
+    def set_attribute(self, key, value):
+        if value is not None:
+            self.attributes[key] = value
+
+    def record_error(self, error):
+        self.status = STATUS_ERROR
+        self.error = f"{type(error).__name__}: {error}"
+
+    def end(self):
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+        self.end_ns = time.time_ns()
+        self.tracer.export(self)
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": "error" if self.status == STATUS_ERROR else "ok",
+            "error": self.error,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None:
+            self.record_error(exc)
+        self.end()
+        return False
+
+
+class _NoopSpan:
+    """Stands in for spans of unsampled traces; children of it are no-ops too"""
+    trace_id = span_id = parent_id = None
+    _token = None
+
+    def set_attribute(self, key, value):
+        pass
+
+    def record_error(self, error):
+        pass
+
+    def end(self):
+        if self._token is not None:
+            _current_span.reset(self._token)
+            self._token = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end()
+        return False
+
+
+class Tracer:
+    def __init__(self, exporters=(), sample_rate=1.0, service_name=DEFAULT_SERVICE_NAME):
+        self.exporters = list(exporters)
+        self.sample_rate = sample_rate
+        self.service_name = service_name
+
+    @property
+    def enabled(self):
+        return bool(self.exporters)
+
+    def start_span(self, name, kind=KIND_INTERNAL, **attributes):
+        """Start a span as a child of the current one and make it current until end()"""
+        parent = _current_span.get()
+        if isinstance(parent, _NoopSpan) or (parent is None and not self._sample()):
+            span = _NoopSpan()
+        elif parent is None:
+            span = Span(self, name, random.getrandbits(128).to_bytes(16, "big").hex(), None, kind, attributes)
+        else:
+            span = Span(self, name, parent.trace_id, parent.span_id, kind, attributes)
+        span._token = _current_span.set(span)
+        return span
+
+    def span(self, name, kind=KIND_INTERNAL, **attributes):
+        """Context manager form of start_span"""
+        return self.start_span(name, kind, **attributes)
+
+    def _sample(self):
+        return self.enabled and (self.sample_rate >= 1.0 or random.random() < self.sample_rate)
+
+    def export(self, span):
+        for exporter in self.exporters:
+            exporter.export(span, self)
+
+    def shutdown(self):
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+class JsonLinesExporter:
+    """Appends one JSON object per finished span to `path`"""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a", buffering=1)
+
+    def export(self, span, tracer):
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+class OtlpHttpExporter:
+    """Batches spans and POSTs them to an OTLP/HTTP collector in the JSON encoding"""
+
+    def __init__(self, endpoint, batch_size=OTLP_BATCH_SIZE, flush_interval=OTLP_FLUSH_INTERVAL,
+                 headers=None, timeout=10):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.headers = dict(headers or {})
+        self.timeout = timeout
+        self.service_name = DEFAULT_SERVICE_NAME
+        self._pending = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span, tracer):
+        self.service_name = tracer.service_name
+        with self._lock:
+            self._pending.append(span)
+            if len(self._pending) >= self.batch_size:
+                self._wake.set()
+
+    def flush(self):
+        with self._lock:
+            spans, self._pending = self._pending, []
+        if not spans:
+            return
+        body = json.dumps(otlp_payload(spans, self.service_name)).encode()
+        req = urllib.request.Request(self.url, data=body, method="POST",
+                                     headers={"Content-Type": "application/json", **self.headers})
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                response.read()
+        except OSError as e:
+            # Tracing must never take the server down with the collector
+            logger.warning("Dropped %d spans: OTLP export to %s failed: %s", len(spans), self.url, e)
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def shutdown(self):
+        self._stopping = True
+        self._wake.set()
+        self._thread.join(self.timeout)
+        self.flush()
+
+
+def otlp_payload(spans, service_name=DEFAULT_SERVICE_NAME):
+    """ExportTraceServiceRequest (OTLP/JSON) holding `spans`"""
+    return {"resourceSpans": [{
+        "resource": {"attributes": _otlp_attributes({"service.name": service_name})},
+        "scopeSpans": [{
+            "scope": {"name": "compliance.tracing"},
+            "spans": [{
+                "traceId": span.trace_id,
+                "spanId": span.span_id,
+                "parentSpanId": span.parent_id or "",
+                "name": span.name,
+                "kind": span.kind,
+                "startTimeUnixNano": str(span.start_ns),
+                "endTimeUnixNano": str(span.end_ns),
+                "attributes": _otlp_attributes(span.attributes),
+                "status": {"code": span.status, "message": span.error or ""},
+            } for span in spans],
+        }],
+    }]}
+
+
+def _otlp_attributes(attributes):
+    result = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            encoded = {"boolValue": value}
+        elif isinstance(value, int):
+            encoded = {"intValue": str(value)}
+        elif isinstance(value, float):
+            encoded = {"doubleValue": value}
+        else:
+            encoded = {"stringValue": str(value)}
+        result.append({"key": key, "value": encoded})
+    return result
+
+
+# Process-wide tracer used by trace_flask, trace_client and @traced; a no-op
+# until configure() or configure_from_env() installs one with exporters
+_tracer = Tracer()
+
+
+def get_tracer():
+    return _tracer
+
+
+def configure(tracer):
+    global _tracer
+    _tracer = tracer
+    return tracer
+
+
+def configure_from_env(environ=os.environ):
+    """Install a tracer from TRACE_FILE, TRACE_OTLP_ENDPOINT, TRACE_SAMPLE_RATE and TRACE_SERVICE_NAME"""
+    exporters = []
+    if environ.get("TRACE_FILE"):
+        exporters.append(JsonLinesExporter(environ["TRACE_FILE"]))
+    if environ.get("TRACE_OTLP_ENDPOINT"):
+        exporters.append(OtlpHttpExporter(environ["TRACE_OTLP_ENDPOINT"]))
+    return configure(Tracer(exporters, float(environ.get("TRACE_SAMPLE_RATE", "1.0")),
+                            environ.get("TRACE_SERVICE_NAME", DEFAULT_SERVICE_NAME)))
+
+
+def current_span():
+    return _current_span.get()
+
+
+# Instrumentation
+
+def trace_flask(app):
+    """One server span per request, named after the method and route pattern"""
+    from flask import request
+
+    @app.before_request
+    def _start_request_span():
+        rule = request.url_rule
+        route = rule.rule if rule is not None else "<unmatched>"
+        request.environ["tracing.span"] = _tracer.start_span(
+            f"{request.method} {route}", KIND_SERVER, **{"http.method": request.method, "http.route": route})
+
+    @app.after_request
+    def _record_status(response):
+        span = request.environ.get("tracing.span")
+        if span is not None:
+            span.set_attribute("http.status_code", response.status_code)
+        return response
+
+    @app.teardown_request
+    def _end_request_span(error):
+        span = request.environ.pop("tracing.span", None)
+        if span is not None:
+            if error is not None:
+                span.record_error(error)
+            span.end()
+
+    return app
+
+
+def traced(function):
+    """
+    Span per call of a client method (or helper such as wait_for_confirmation),
+    with the app id and txid it was given or returned and the confirmed round
+    """
+    name = function.__qualname__
+    parameters = list(inspect.signature(function).parameters)
+    app_id_param = _find_param(parameters, ("app_id",))
+    txid_param = _find_param(parameters, ("txid", "tx_id", "transaction_id"))
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not _tracer.enabled:
+            return function(*args, **kwargs)
+        with _tracer.start_span(name) as span:
+            if app_id_param is not None:
+                span.set_attribute("algorand.app_id", _argument(args, kwargs, *app_id_param))
+            elif args:
+                # VotingDAppClient keeps its app id on the instance
+                span.set_attribute("algorand.app_id", getattr(args[0], "app_id", None))
+            if txid_param is not None:
+                span.set_attribute("algorand.txid", _argument(args, kwargs, *txid_param))
+            result = function(*args, **kwargs)
+            span.set_attribute("algorand.txid", _txid_in(result))
+            if isinstance(result, dict):
+                span.set_attribute("algorand.confirmed_round", result.get("confirmed-round"))
+            return result
+
+    return wrapper
+
+
+def _find_param(parameters, names):
+    """(index, name) of the first parameter called one of `names`"""
+    return next(((index, name) for index, name in enumerate(parameters) if name in names), None)
+
+
+def _argument(args, kwargs, index, name):
+    return args[index] if len(args) > index else kwargs.get(name)
+
+
+def trace_client(client, name):
+    """Wrap the algod / indexer calls of one client instance with client spans"""
+    for method_name, annotate in _CALL_ATTRIBUTES.items():
+        method = getattr(client, method_name, None)
+        if method is not None:
+            setattr(client, method_name, _traced_call(method, f"{name}.{method_name}", annotate))
+    return client
+
+
+def _traced_call(method, span_name, annotate):
+    @functools.wraps(method)
+    def call(*args, **kwargs):
+        if not _tracer.enabled:
+            return method(*args, **kwargs)
+        with _tracer.start_span(span_name, KIND_CLIENT) as span:
+            result = method(*args, **kwargs)
+            for key, value in annotate(args, result).items():
+                span.set_attribute(key, value)
+            return result
+
+    return call
+
+
+def _first(args):
+    return args[0] if args else None
+
+
+def _txid_in(result):
+    if isinstance(result, str) and len(result) == 52:
+        return result
+    if isinstance(result, tuple):
+        return next((item for item in result if isinstance(item, str) and len(item) == 52), None)
+    return None
+
+
+# algod / indexer method -> (call args, result) -> span attributes
+_CALL_ATTRIBUTES = {
+    "suggested_params": lambda args, result: {"algorand.round": getattr(result, "first", None)},
+    "send_transaction": lambda args, result: {"algorand.txid": result},
+    "send_transactions": lambda args, result: {"algorand.txid": result, "algorand.group_size": len(_first(args) or ())},
+    "pending_transaction_info": lambda args, result: {
+        "algorand.txid": _first(args), "algorand.confirmed_round": result.get("confirmed-round") or None,
+        "algorand.pool_error": result.get("pool-error") or None},
+    "status": lambda args, result: {"algorand.round": result.get("last-round")},
+    "status_after_block": lambda args, result: {"algorand.wait_after_round": _first(args),
+                                                "algorand.round": result.get("last-round")},
+    "application_info": lambda args, result: {"algorand.app_id": _first(args)},
+    "account_info": lambda args, result: {"algorand.address": _first(args),
+                                          "algorand.round": result.get("current-round") or result.get("round")},
+    "compile": lambda args, result: {"teal.hash": result.get("hash")},
+    "search_transactions": lambda args, result: {"algorand.round": result.get("current-round")},
+}
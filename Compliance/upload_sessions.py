@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# upload_sessions.py - Resumable chunked uploads for large compliance documents
+
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024   # 8 MiB per chunk
+MAX_CHUNK_SIZE = 64 * 1024 * 1024      # Hard limit on a single PUT
+SESSION_TTL = 7 * 24 * 60 * 60         # Abandoned sessions are purged after a week
+_READ_BLOCK = 64 * 1024
+
+
+class UploadSessionError(Exception):
+    """Raised when an upload session request is invalid"""
+
+
+class UploadSessionNotFound(UploadSessionError):
+    """Raised when an upload session does not exist (or was already committed)"""
+
+
+class UploadSessionStore:
+    """
+    Disk-backed store for resumable uploads.
+
+    Each session lives in its own directory:
+
+        <root>/<session_id>/session.json     manifest written once at creation
+        <root>/<session_id>/<index>.chunk    chunk payloads, written atomically
+        <root>/<session_id>/<index>.sha256   per-chunk digests
+
+    Chunks may arrive in any order. The SHA-256 of the whole file is fed
+    incrementally over the contiguous prefix of received chunks, so committing
+    only has to hash whatever had not been hashed yet. Everything needed to
+    resume lives on disk, so a restarted server picks up where it left off.
+    """
+
+    def __init__(self, root, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.root = root
+        self.chunk_size = chunk_size
+        # Guards the per-session locks; each session hashes under its own lock
+        self._lock = threading.Lock()
+        self._session_locks = {}
+        # session_id -> (sha256 object, number of chunks already fed)
+        self._hashers = {}
+        os.makedirs(self.root, exist_ok=True)
+
+    # Paths
+
+    def _session_dir(self, session_id):
+        # Session IDs are generated by us; refuse anything that could escape the root
+        if not session_id or not all(c in "0123456789abcdef" for c in session_id):
+            raise UploadSessionNotFound(f"Unknown upload session: {session_id}")
+        return os.path.join(self.root, session_id)
+
+    def _manifest_path(self, session_id):
+        return os.path.join(self._session_dir(session_id), "session.json")
+
+    def _chunk_path(self, session_id, index):
+        return os.path.join(self._session_dir(session_id), f"{index:06d}.chunk")
+
+    def _digest_path(self, session_id, index):
+        return os.path.join(self._session_dir(session_id), f"{index:06d}.sha256")
+
+    def _session_lock(self, session_id):
+        with self._lock:
+            return self._session_locks.setdefault(session_id, threading.Lock())
+
+    # Session lifecycle
+
+    def create(self, filename, total_size, sha256=None, chunk_size=None, metadata=None):
+        """Start a new upload session and return its manifest"""
+        try:
+            chunk_size = int(chunk_size or self.chunk_size)
+            total_size = int(total_size)
+        except (TypeError, ValueError):
+            raise UploadSessionError("total_size and chunk_size must be integers")
+        if chunk_size <= 0 or chunk_size > MAX_CHUNK_SIZE:
+            raise UploadSessionError(f"chunk_size must be between 1 and {MAX_CHUNK_SIZE} bytes")
+        if total_size < 0:
+            raise UploadSessionError("total_size must not be negative")
+        if sha256 is not None:
+            sha256 = sha256.lower()
+            if len(sha256) != 64 or any(c not in "0123456789abcdef" for c in sha256):
+                raise UploadSessionError("sha256 must be a 64-character hex digest")
+
+        session_id = uuid.uuid4().hex
+        manifest = {
+            "session_id": session_id,
+            "filename": filename,
+            "total_size": total_size,
+            "chunk_size": chunk_size,
+            "total_chunks": max(1, -(-total_size // chunk_size)),
+            "sha256": sha256,
+            "metadata": metadata or {},
+            "created_at": time.time(),
+        }
+
+        os.makedirs(self._session_dir(session_id))
+        _write_atomic(self._manifest_path(session_id), json.dumps(manifest).encode())
+        return manifest
+
+    def load(self, session_id):
+        """Return the manifest of an existing session"""
+        try:
+            with open(self._manifest_path(session_id), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise UploadSessionNotFound(f"Unknown upload session: {session_id}")
+
+    def received_chunks(self, session_id):
+        """Indexes of the chunks that have been fully written"""
+        received = []
+        for name in os.listdir(self._session_dir(session_id)):
+            if name.endswith(".sha256"):
+                received.append(int(name.split(".")[0]))
+        return sorted(received)
+
+    def status(self, session_id):
+        """Manifest plus upload progress, used by clients to resume"""
+        manifest = self.load(session_id)
+        received = self.received_chunks(session_id)
+        missing = sorted(set(range(manifest["total_chunks"])) - set(received))
+        return dict(manifest, received_chunks=received, missing_chunks=missing,
+                    complete=not missing)
+
+    def write_chunk(self, session_id, index, stream, expected_sha256=None):
+        """
+        Store chunk `index` read from a file-like `stream`.
+
+        Re-sending a chunk overwrites the previous copy, which is what a client
+        does after a dropped connection. Returns the chunk's SHA-256 hex digest.
+        """
+        manifest = self.load(session_id)
+        index = int(index)
+        if index < 0 or index >= manifest["total_chunks"]:
+            raise UploadSessionError(
+                f"Chunk index {index} out of range (0..{manifest['total_chunks'] - 1})")
+
+        expected_size = _chunk_length(manifest, index)
+        chunk_path = self._chunk_path(session_id, index)
+        tmp_path = f"{chunk_path}.{uuid.uuid4().hex}.tmp"
+        digest = hashlib.sha256()
+        written = 0
+
+        try:
+            with open(tmp_path, "wb") as f:
+                while True:
+                    block = stream.read(_READ_BLOCK)
+                    if not block:
+                        break
+                    written += len(block)
+                    if written > expected_size:
+                        raise UploadSessionError(
+                            f"Chunk {index} is larger than the expected {expected_size} bytes")
+                    digest.update(block)
+                    f.write(block)
+
+            if written != expected_size:
+                raise UploadSessionError(
+                    f"Chunk {index} has {written} bytes, expected {expected_size}")
+
+            chunk_hash = digest.hexdigest()
+            if expected_sha256 and expected_sha256.lower() != chunk_hash:
+                raise UploadSessionError(f"Chunk {index} failed its integrity check")
+
+            with self._session_lock(session_id):
+                # A chunk that was already fed into the running hash must not change
+                fed = self._hashers.get(session_id, (None, 0))[1]
+                if index < fed and self._stored_digest(session_id, index) != chunk_hash:
+                    self._hashers.pop(session_id, None)
+                os.replace(tmp_path, chunk_path)
+                _write_atomic(self._digest_path(session_id, index), chunk_hash.encode())
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        self._advance_hash(session_id, manifest)
+        return chunk_hash
+
+    def commit(self, session_id, destination, sha256=None):
+        """
+        Assemble the uploaded chunks into `destination` and close the session.
+
+        The final digest is checked against the one given at creation (or
+        here). Returns a dict with the hex digest, size and destination path.
+        """
+        manifest = self.load(session_id)
+        expected = (sha256 or manifest.get("sha256") or "").lower() or None
+
+        status = self.status(session_id)
+        if status["missing_chunks"]:
+            raise UploadSessionError(
+                f"Upload incomplete, missing chunks: {status['missing_chunks'][:20]}")
+
+        file_hash = self._advance_hash(session_id, manifest, final=True)
+        if expected and expected != file_hash:
+            with self._session_lock(session_id):
+                self._hashers.pop(session_id, None)
+            raise UploadSessionError(
+                f"Digest mismatch: expected {expected}, received {file_hash}")
+
+        tmp_destination = f"{destination}.{session_id}.tmp"
+        with open(tmp_destination, "wb") as out:
+            for index in range(manifest["total_chunks"]):
+                with open(self._chunk_path(session_id, index), "rb") as f:
+                    while True:
+                        block = f.read(_READ_BLOCK)
+                        if not block:
+                            break
+                        out.write(block)
+        os.replace(tmp_destination, destination)
+
+        self.discard(session_id)
+        return {
+            "sha256": file_hash,
+            "size": manifest["total_size"],
+            "filename": manifest["filename"],
+            "path": destination,
+            "metadata": manifest.get("metadata", {}),
+        }
+
+    def discard(self, session_id):
+        """Delete a session and all of its chunks"""
+        session_dir = self._session_dir(session_id)
+        with self._session_lock(session_id):
+            self._hashers.pop(session_id, None)
+        with self._lock:
+            self._session_locks.pop(session_id, None)
+        if not os.path.isdir(session_dir):
+            raise UploadSessionNotFound(f"Unknown upload session: {session_id}")
+        for name in os.listdir(session_dir):
+            os.remove(os.path.join(session_dir, name))
+        os.rmdir(session_dir)
+
+    def purge_expired(self, max_age=SESSION_TTL):
+        """Remove sessions older than `max_age` seconds. Returns the number removed."""
+        removed = 0
+        cutoff = time.time() - max_age
+        for session_id in os.listdir(self.root):
+            try:
+                if self.load(session_id)["created_at"] < cutoff:
+                    self.discard(session_id)
+                    removed += 1
+            except (UploadSessionError, ValueError, OSError):
+                continue
+        return removed
+
+    # Incremental hashing
+
+    def _stored_digest(self, session_id, index):
+        try:
+            with open(self._digest_path(session_id, index), "r") as f:
+                return f.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def _advance_hash(self, session_id, manifest, final=False):
+        """
+        Feed every newly contiguous chunk into the running file hash.
+
+        After a restart the running hash is rebuilt from the chunks on disk.
+        When `final` is set, return the hex digest of the whole file.
+        """
+        with self._session_lock(session_id):
+            hasher, fed = self._hashers.get(session_id, (None, 0))
+            if hasher is None:
+                hasher, fed = hashlib.sha256(), 0
+
+            while fed < manifest["total_chunks"] and self._stored_digest(session_id, fed):
+                with open(self._chunk_path(session_id, fed), "rb") as f:
+                    while True:
+                        block = f.read(_READ_BLOCK)
+                        if not block:
+                            break
+                        hasher.update(block)
+                fed += 1
+
+            self._hashers[session_id] = (hasher, fed)
+            if final:
+                return hasher.copy().hexdigest()
+            return None
+
+
+def _chunk_length(manifest, index):
+    """Number of bytes chunk `index` must contain"""
+    if manifest["total_size"] == 0:
+        return 0
+    start = index * manifest["chunk_size"]
+    return min(manifest["chunk_size"], manifest["total_size"] - start)
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
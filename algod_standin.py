@@ -0,0 +1,670 @@
+#!/usr/bin/env python3
+# algod_standin.py - Local algod / indexer stand-in for offline testing and benchmarking
+#
+# Usage: python algod_standin.py [--port 4001] [--indexer-port 8980] [--latency 0.1]
+#                                [--round-time 0] [--max-concurrent 16] [--fail-rate 0]
+#                                [--pool-error-rate 0] [--pool-size N] [--seed N]
+#
+# Answers the REST calls the compliance and voting clients make (status,
+# params, TEAL compilation, transaction submission and pending info,
+# application and account info) after sleeping `latency` seconds, so the
+# scenario scripts and servers run without TestNet, funded accounts or keys.
+#
+# Submitted transactions are decoded and applied to a simulated ledger
+# (StandInLedger): payments move funds, and app calls run a Python model of
+# the program they were compiled from, keeping global and local state:
+#
+# - the compliance contract (ABI router with the "keys" or "packed" layout,
+#   and the legacy method-name program), see Compliance/document_compliance.py
+# - the voting contract, see voting_contract.py
+# - any other program approves every call and keeps no state
+#
+# /v2/teal/compile recognises these programs from their TEAL and returns a
+# short marker program instead of real bytecode. Signatures are not checked.
+# Apps the ledger did not create read as a compliance app holding one
+# document (`apps` overrides their global state) and accept every call.
+#
+# Rounds advance every `round_time` seconds, and transactions are confirmed
+# in the round after they were submitted. With round_time 0 (the default)
+# rounds only advance when a client waits for the next block and
+# transactions are confirmed at once.
+#
+# Failure injection: with `max_concurrent`, requests beyond that many at
+# once are answered 429 right away, like a rate-limited public node;
+# `fail_rate` answers that fraction of requests 503; `pool_error_rate`
+# accepts that fraction of transactions but drops them from the pool (the
+# pending info reports a pool error); `pool_size` rejects submissions while
+# that many transactions wait for a round.
+
+import argparse
+import base64
+import collections
+import copy
+import hashlib
+import io
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+GENESIS_ID = "standin-v1"
+GENESIS_HASH = base64.b64encode(hashlib.sha256(b"algod-standin").digest()).decode()
+DEFAULT_BALANCE = 100000000        # microAlgos of every account the ledger has not seen yet
+FIRST_APP_ID = 1000001
+MIN_FEE = 1000
+WAIT_FOR_BLOCK_TIMEOUT = 60        # Seconds wait-for-block-after blocks at most, as algod does
+VOTING_PERIOD = 86400              # voting_contract.py: voting ends 24 hours after creation
+VOTING_MAX_CANDIDATES = 60         # voting_contract.MAX_CANDIDATES
+
+# Marker "bytecode" of each program model /v2/teal/compile recognises. The
+# legacy compliance program keeps its method names, as the real one does,
+# so clients detect the call encoding from the approval program.
+PROGRAMS = {
+    "compliance": b"\x06standin compliance",
+    "compliance-packed": b"\x06standin compliance packed",
+    "compliance-legacy": b"\x06standin compliance legacy register assign_verifier verify",
+    "voting": b"\x08standin voting",
+    "approve": b"\x06standin approve",
+}
+PROGRAM_KINDS = {program: kind for kind, program in PROGRAMS.items()}
+
+# OnCompletion values
+NO_OP, OPT_IN, CLOSE_OUT, CLEAR_STATE, UPDATE, DELETE = range(6)
+
+
+def uint_item(key, value):
+    return {"key": base64.b64encode(key.encode()).decode(), "value": {"type": 2, "uint": value, "bytes": ""}}
+
+
+def bytes_item(key, value):
+    return {"key": base64.b64encode(key.encode()).decode(),
+            "value": {"type": 1, "uint": 0, "bytes": base64.b64encode(value).decode()}}
+
+
+def compliance_state(document_hash=bytes(32), version=b"1.0", expiration_date=1900000000):
+    """Global state of a compliance app (keys layout) holding one compliant document"""
+    return [bytes_item("document_hash", document_hash), bytes_item("document_version", version),
+            uint_item("attestation_date", 1700000000), uint_item("expiration_date", expiration_date),
+            bytes_item("status", b"compliant")]
+
+
+def program_kind(source):
+    """Program model for a TEAL source: a key of PROGRAMS"""
+    if 'byte "num_candidates"' in source:
+        return "voting"
+    if 'byte "assign_verifier"' in source:
+        return "compliance-legacy"
+    if 'method "register(byte[32],string,uint64)void"' in source:
+        from Compliance.compliance_record import RECORD_KEY
+        return "compliance-packed" if f"byte 0x{RECORD_KEY.hex()}" in source else "compliance"
+    return "approve"
+
+
+def state_items(state):
+    """A {key bytes: int or bytes} state as the key-value list algod returns"""
+    items = []
+    for key, value in state.items():
+        if isinstance(value, int):
+            items.append({"key": base64.b64encode(key).decode(), "value": {"type": 2, "uint": value, "bytes": ""}})
+        else:
+            items.append({"key": base64.b64encode(key).decode(),
+                          "value": {"type": 1, "uint": 0, "bytes": base64.b64encode(value).decode()}})
+    return items
+
+
+class Rejected(Exception):
+    """A transaction the ledger refuses, with the reason algod would give"""
+
+
+class StandInLedger:
+    """Accounts, apps, rounds and the transaction pool of the stand-in"""
+
+    def __init__(self, first_round=1000, round_time=0.0, pool_error_rate=0.0, pool_size=None,
+                 balance=DEFAULT_BALANCE, seed=None):
+        self.first_round = first_round
+        self.round_time = round_time
+        self.pool_error_rate = pool_error_rate
+        self.pool_size = pool_size
+        self.balance = balance
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._started = time.monotonic()
+        self._round = first_round
+        # app_id -> global-state list of apps the ledger did not create
+        self.apps = {}
+        # app_id -> {"creator", "kind", "approval", "clear", "global_schema", "local_schema", "global"}
+        self.created = {}
+        # (address, app_id) -> local state {key bytes: value}
+        self.local = {}
+        self.balances = {}
+        # txid -> {"txn": signed txn dict, "round": submitted in, "pool-error": "", "application-index"}
+        self.pending = {}
+        self.next_app_id = FIRST_APP_ID
+
+    @property
+    def round(self):
+        with self._lock:
+            if self.round_time:
+                elapsed = int((time.monotonic() - self._started) / self.round_time)
+                self._round = max(self._round, self.first_round + elapsed)
+            return self._round
+
+    def wait_for_round_after(self, round_number, timeout=WAIT_FOR_BLOCK_TIMEOUT):
+        """Block until the round after `round_number` (at once without round_time)"""
+        if not self.round_time:
+            with self._lock:
+                self._round = max(self._round, round_number + 1)
+            return self._round
+        deadline = time.monotonic() + timeout
+        while self.round <= round_number and time.monotonic() < deadline:
+            time.sleep(min(self.round_time / 4, 0.05))
+        return self.round
+
+    def compile(self, source):
+        program = PROGRAMS[program_kind(source)]
+        from algosdk import logic
+        return {"hash": logic.address(program), "result": base64.b64encode(program).decode()}
+
+    # Transactions
+
+    def submit(self, body):
+        """Decode and apply a signed transaction (group); returns the first txid or raises Rejected"""
+        from algosdk import transaction
+        import msgpack
+
+        try:
+            unpacker = msgpack.Unpacker(io.BytesIO(body), raw=False, strict_map_key=False)
+            group = [(transaction.SignedTransaction.undictify(stxn), stxn) for stxn in unpacker]
+        except Exception as e:
+            raise Rejected(f"msgpack decode error: {e}")
+        if not group:
+            raise Rejected("empty transaction group")
+        # Each transaction pays its own fee, but a group only needs the
+        # minimum per transaction in total (fee pooling)
+        fees = sum(signed.transaction.fee for signed, _ in group)
+        if len(group) == 1 and fees < MIN_FEE:
+            raise Rejected(f"transaction had fee {fees}, which is less than the minimum {MIN_FEE}")
+        if fees < MIN_FEE * len(group):
+            raise Rejected(f"txgroup had {fees} in fees, which is less than the minimum {len(group)} * {MIN_FEE}")
+
+        with self._lock:
+            if self.pool_size is not None and self._waiting() + len(group) > self.pool_size:
+                raise Rejected("TransactionPool.checkPendingQueueSize: transaction pool have reached capacity")
+            # The group applies as a whole or not at all
+            saved = copy.deepcopy((self.created, self.local, self.balances, self.next_app_id))
+            submitted, results = self.round, []
+            try:
+                for signed, stxn in group:
+                    txid = signed.transaction.get_txid()
+                    try:
+                        results.append((txid, stxn, self._apply(signed.transaction)))
+                    except Rejected as e:
+                        raise Rejected(f"TransactionPool.Remember: transaction {txid}: {e}")
+            except Rejected:
+                self.created, self.local, self.balances, self.next_app_id = saved
+                raise
+
+            dropped = self.pool_error_rate and self._random.random() < self.pool_error_rate
+            if dropped:
+                self.created, self.local, self.balances, self.next_app_id = saved
+            for txid, stxn, app_index in results:
+                self.pending[txid] = {"txn": stxn, "round": submitted, "app_index": app_index,
+                                      "pool-error": "transaction dropped from the pool" if dropped else ""}
+            return results[0][0]
+
+    def _waiting(self):
+        current = self.round
+        return sum(1 for txn in self.pending.values()
+                   if not txn["pool-error"] and txn["round"] >= current and self.round_time)
+
+    def pending_info(self, txid):
+        with self._lock:
+            txn = self.pending.get(txid)
+            if txn is None:
+                return None
+            info = {"txn": json_safe(txn["txn"]), "pool-error": txn["pool-error"]}
+            if not txn["pool-error"]:
+                confirmed = txn["round"] + 1 if self.round_time else txn["round"]
+                if self.round >= confirmed:
+                    info["confirmed-round"] = confirmed
+                    if txn["app_index"]:
+                        info["application-index"] = txn["app_index"]
+            return info
+
+    def _apply(self, txn):
+        current = self.round
+        if not txn.first_valid_round <= current + 1 <= txn.last_valid_round:
+            raise Rejected(f"txn dead: round {current + 1} outside of {txn.first_valid_round}--{txn.last_valid_round}")
+        fee = txn.fee
+        amount = getattr(txn, "amt", 0) or 0
+        if self.balance_of(txn.sender) < fee + amount:
+            raise Rejected(f"overspend (account {txn.sender}, data {{_struct:{{}} MicroAlgos:{{Raw:{self.balance_of(txn.sender)}}}}})")
+        self.balances[txn.sender] = self.balance_of(txn.sender) - fee - amount
+        receiver = getattr(txn, "receiver", None)
+        if receiver and amount:
+            self.balances[receiver] = self.balance_of(receiver) + amount
+        if txn.type == "appl":
+            return self._call(txn)
+        return None
+
+    def balance_of(self, address):
+        return self.balances.get(address, self.balance)
+
+    # Application calls
+
+    def _call(self, txn):
+        args = [bytes(arg) for arg in (txn.app_args or [])]
+        accounts = [txn.sender] + list(txn.accounts or [])
+        on_complete = int(txn.on_complete)
+        now = int(time.time())
+
+        if not txn.index:
+            kind = PROGRAM_KINDS.get(bytes(txn.approval_program or b""), "approve")
+            app_id, self.next_app_id = self.next_app_id, self.next_app_id + 1
+            schema = txn.global_schema
+            app = self.created[app_id] = {
+                "creator": txn.sender, "kind": kind, "approval": bytes(txn.approval_program or b""),
+                "clear": bytes(txn.clear_program or b""),
+                "global_schema": (schema.num_uints or 0, schema.num_byte_slices or 0) if schema else (0, 0),
+                "local_schema": ((txn.local_schema.num_uints or 0, txn.local_schema.num_byte_slices or 0)
+                                 if txn.local_schema else (0, 0)),
+                "global": {},
+            }
+            self._create(app, txn.sender, args, now)
+            self._check_schema(app["global"], app["global_schema"], "global")
+            if on_complete == OPT_IN:
+                self.local[txn.sender, app_id] = {}
+            return app_id
+
+        app_id = txn.index
+        app = self.created.get(app_id)
+        if on_complete == CLEAR_STATE:
+            self.local.pop((txn.sender, app_id), None)
+            return None
+        if on_complete == OPT_IN:
+            if (txn.sender, app_id) in self.local:
+                raise Rejected(f"account {txn.sender} has already opted in to app {app_id}")
+            self.local[txn.sender, app_id] = {}
+        if app is None or app["kind"] == "approve":
+            # Accept every call; untracked apps keep their configured state
+            if on_complete == CLOSE_OUT:
+                if self.local.pop((txn.sender, app_id), None) is None:
+                    raise Rejected(f"account {txn.sender} is not opted in to app {app_id}")
+            elif on_complete == DELETE and app is not None:
+                del self.created[app_id]
+            return None
+
+        if app["kind"] == "voting":
+            self._voting_call(app, app_id, txn.sender, on_complete, args, now)
+        else:
+            self._compliance_call(app, app_id, txn.sender, accounts, on_complete, args, now)
+        self._check_schema(app["global"], app["global_schema"], "global")
+        for (address, local_app_id), state in self.local.items():
+            if local_app_id == app_id:
+                self._check_schema(state, app["local_schema"], "local")
+        return None
+
+    def _create(self, app, sender, args, now):
+        from algosdk import encoding
+
+        kind, state = app["kind"], app["global"]
+        if kind == "voting":
+            require(len(args) == 1 and len(args[0]) <= 8, "assert failed")
+            num_candidates = int.from_bytes(args[0], "big")
+            require(1 <= num_candidates <= VOTING_MAX_CANDIDATES, "assert failed")
+            state.update({b"num_candidates": num_candidates, b"total_votes": 0,
+                          b"creator": encoding.decode_address(sender), b"voting_end": now + VOTING_PERIOD})
+        elif kind == "compliance-packed":
+            from Compliance.compliance_record import EMPTY_RECORD, RECORD_KEY
+            state[RECORD_KEY] = EMPTY_RECORD
+        elif kind in ("compliance", "compliance-legacy"):
+            state.update({b"admin": encoding.decode_address(sender), b"status": b"pending"})
+
+    def _compliance_call(self, app, app_id, sender, accounts, on_complete, args, now):
+        from algosdk import encoding
+        from Compliance.compliance_record import (RECORD_KEY, RECORD_EXPIRY_OFFSET, RECORD_STATUS_OFFSET,
+                                                  MAX_RECORD_VERSION_LENGTH)
+        from Compliance.registry_box import STATUS_COMPLIANT, STATUS_EXPIRED
+
+        if on_complete == OPT_IN:
+            return
+        require(on_complete == NO_OP, "transaction rejected by ApprovalProgram")
+        require(args, "invalid ApplicationArgs index 0")
+        state, packed, legacy = app["global"], app["kind"] == "compliance-packed", app["kind"] == "compliance-legacy"
+        method = method_name(args[0], legacy)
+
+        if method == "register":
+            if legacy:
+                require(encoding.decode_address(sender) == state.get(b"admin"), "assert failed")
+                require(len(args) == 4 and len(args[1]) in (32, 64), "assert failed")
+                version = args[2]
+            else:
+                require(sender == app["creator"], "assert failed")
+                require(len(args) >= 4, "invalid ApplicationArgs index")
+                require(len(args[1]) == 32, "assert failed")
+                require(len(args[2]) >= 2 and int.from_bytes(args[2][:2], "big") == len(args[2]) - 2,
+                        "assert failed")
+                require(len(args[3]) == 8, "assert failed")
+                version = args[2][2:]
+            expiry = int.from_bytes(args[3], "big")
+            if packed:
+                require(len(version) <= MAX_RECORD_VERSION_LENGTH, "key and value too long")
+                state[RECORD_KEY] = (args[1] + args[3] + now.to_bytes(8, "big") + bytes([STATUS_COMPLIANT])
+                                     + version)
+            else:
+                state.update({b"document_hash": args[1], b"document_version": version, b"attestation_date": now,
+                              b"expiration_date": expiry, b"status": b"compliant"})
+        elif method == "assign_verifier":
+            if legacy:
+                require(encoding.decode_address(sender) == state.get(b"admin"), "assert failed")
+                require(len(args) == 2, "assert failed")
+                index = 1
+            else:
+                require(sender == app["creator"], "assert failed")
+                require(len(args) >= 2 and len(args[1]) == 1, "assert failed")
+                index = args[1][0]
+            require(index < len(accounts), f"invalid Accounts index {index}")
+            local = self.local.get((accounts[index], app_id))
+            require(local is not None, f"account {accounts[index]} is not opted in to app {app_id}")
+            local[b"verifier_role"] = 1
+        elif method == "verify":
+            require((self.local.get((sender, app_id)) or {}).get(b"verifier_role") == 1, "assert failed")
+            if packed:
+                record = state[RECORD_KEY]
+                if now > int.from_bytes(record[RECORD_EXPIRY_OFFSET:RECORD_EXPIRY_OFFSET + 8], "big"):
+                    state[RECORD_KEY] = (record[:RECORD_STATUS_OFFSET] + bytes([STATUS_EXPIRED])
+                                         + record[RECORD_STATUS_OFFSET + 1:])
+            elif now > state.get(b"expiration_date", 0):
+                state[b"status"] = b"expired"
+        else:
+            raise Rejected("err opcode executed")
+
+    def _voting_call(self, app, app_id, sender, on_complete, args, now):
+        if on_complete == OPT_IN:
+            return
+        require(on_complete == NO_OP, "transaction rejected by ApprovalProgram")
+        require(args, "invalid ApplicationArgs index 0")
+        state = app["global"]
+        if args[0] == b"results":
+            return
+        require(args[0] == b"vote", "err opcode executed")
+        require(now < state[b"voting_end"], "assert failed")
+        local = self.local.get((sender, app_id))
+        require(local is not None, f"account {sender} is not opted in to app {app_id}")
+        require(not local.get(b"voted"), "assert failed")
+        require(len(args) >= 2 and len(args[1]) == 8, "assert failed")
+        candidate = int.from_bytes(args[1], "big")
+        require(1 <= candidate <= state[b"num_candidates"], "assert failed")
+        tally = b"v" + args[1]
+        state[tally] = state.get(tally, 0) + 1
+        local[b"voted"] = 1
+        state[b"total_votes"] += 1
+
+    @staticmethod
+    def _check_schema(state, schema, name):
+        uints = sum(1 for value in state.values() if isinstance(value, int))
+        for key, value in state.items():
+            size = len(key) + (8 if isinstance(value, int) else len(value))
+            require(size <= 128, f"key too long: length was {size}, maximum is 128")
+        require(uints <= schema[0], f"store integer count {uints} exceeds schema integer count {schema[0]}")
+        require(len(state) - uints <= schema[1],
+                f"store bytes count {len(state) - uints} exceeds schema bytes count {schema[1]}")
+
+    # Reads
+
+    def application(self, app_id):
+        with self._lock:
+            app = self.created.get(app_id)
+            if app is None:
+                return {"id": app_id, "params": {
+                    "approval-program": base64.b64encode(b"\x06 method router").decode(),
+                    "global-state": self.apps.get(app_id) or compliance_state()}}
+            return {"id": app_id, "params": {
+                "creator": app["creator"],
+                "approval-program": base64.b64encode(app["approval"]).decode(),
+                "clear-state-program": base64.b64encode(app["clear"]).decode(),
+                "global-state-schema": {"num-uint": app["global_schema"][0], "num-byte-slice": app["global_schema"][1]},
+                "local-state-schema": {"num-uint": app["local_schema"][0], "num-byte-slice": app["local_schema"][1]},
+                "global-state": state_items(app["global"])}}
+
+    def local_state(self, address, app_id):
+        state = self.local[address, app_id]
+        schema = self.created[app_id]["local_schema"] if app_id in self.created else (0, 0)
+        return {"id": app_id, "schema": {"num-uint": schema[0], "num-byte-slice": schema[1]},
+                "key-value": state_items(state)}
+
+    def account(self, address):
+        with self._lock:
+            local = [self.local_state(addr, app_id) for addr, app_id in sorted(self.local) if addr == address]
+            created = [self.application(app_id) for app_id, app in sorted(self.created.items())
+                       if app["creator"] == address]
+            amount = self.balance_of(address)
+            return {"address": address, "amount": amount, "amount-without-pending-rewards": amount,
+                    "min-balance": 100000 * (1 + len(local) + len(created)), "round": self.round,
+                    "status": "Offline", "apps-local-state": local, "created-apps": created,
+                    "total-apps-opted-in": len(local), "total-created-apps": len(created)}
+
+    def account_application(self, address, app_id):
+        with self._lock:
+            info = {"round": self.round}
+            if (address, app_id) in self.local:
+                info["app-local-state"] = self.local_state(address, app_id)
+            if app_id in self.created and self.created[app_id]["creator"] == address:
+                info["created-app"] = self.application(app_id)["params"]
+            return info if len(info) > 1 else None
+
+
+def require(condition, reason):
+    if not condition:
+        raise Rejected(f"logic eval error: {reason}")
+
+
+def method_name(arg, legacy):
+    """Method of a compliance call: args[0] is the name (legacy) or the ABI selector"""
+    if legacy:
+        return arg.decode(errors="replace")
+    from Compliance.compliance_abi import load_contract
+    for method in load_contract().methods:
+        if method.get_selector() == arg:
+            return method.name
+    return None
+
+
+def json_safe(value):
+    """A decoded msgpack value with bytes as base64, as algod renders transactions"""
+    if isinstance(value, dict):
+        return {key: json_safe(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [json_safe(item) for item in value]
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode()
+    return value
+
+
+class AlgodStandIn:
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, indexer=False, first_round=1000,
+                 max_concurrent=None, ledger=None, fail_rate=0.0, seed=None):
+        self.latency = latency
+        # Requests beyond this many at once are answered 429, like a rate-limited public node
+        self.max_concurrent = max_concurrent
+        # Fraction of requests answered 503
+        self.fail_rate = fail_rate
+        self._random = random.Random(seed)
+        self.active = 0
+        self.rejected = 0
+        self.failed = 0
+        self.indexer = indexer
+        # An indexer stand-in given the algod stand-in's ledger serves the same accounts and apps
+        self.ledger = ledger or StandInLedger(first_round, seed=seed)
+        self.requests = 0
+        # (method, path) -> number of requests
+        self.calls = collections.Counter()
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def apps(self):
+        """app_id -> global-state list of apps the ledger did not create"""
+        return self.ledger.apps
+
+    @property
+    def round(self):
+        return self.ledger.round
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def route(self, method, path, body):
+        """(status, JSON body) of one request"""
+        ledger = self.ledger
+        if self.indexer:
+            if method == "GET" and path == "/health":
+                return 200, {"round": ledger.round, "db-available": True, "is-migrating": False, "message": ""}
+            match = re.fullmatch(r"/v2/accounts/([A-Z2-7]+)", path)
+            if method == "GET" and match:
+                return 200, {"current-round": ledger.round, "account": ledger.account(match.group(1))}
+            match = re.fullmatch(r"/v2/applications/(\d+)", path)
+            if method == "GET" and match:
+                return 200, {"current-round": ledger.round, "application": ledger.application(int(match.group(1)))}
+            return 404, {"message": "not found"}
+
+        if method == "POST" and path == "/v2/transactions":
+            try:
+                return 200, {"txId": ledger.submit(body)}
+            except Rejected as e:
+                status = 503 if "capacity" in str(e) else 400
+                return status, {"message": str(e)}
+        if method == "POST" and path == "/v2/teal/compile":
+            return 200, ledger.compile(body.decode())
+        if method != "GET":
+            return 405, {"message": "method not allowed"}
+        if path == "/v2/status":
+            return 200, {"last-round": ledger.round, "time-since-last-round": 0}
+        match = re.fullmatch(r"/v2/status/wait-for-block-after/(\d+)", path)
+        if match:
+            return 200, {"last-round": ledger.wait_for_round_after(int(match.group(1)))}
+        if path == "/v2/transactions/params":
+            return 200, {"fee": 0, "min-fee": MIN_FEE, "last-round": ledger.round, "genesis-hash": GENESIS_HASH,
+                         "genesis-id": GENESIS_ID, "consensus-version": "standin"}
+        match = re.fullmatch(r"/v2/transactions/pending/([A-Z2-7]+)", path)
+        if match:
+            info = ledger.pending_info(match.group(1))
+            if info is None:
+                return 404, {"message": "txn does not exist"}
+            return 200, info
+        match = re.fullmatch(r"/v2/applications/(\d+)", path)
+        if match:
+            return 200, ledger.application(int(match.group(1)))
+        match = re.fullmatch(r"/v2/accounts/([A-Z2-7]+)/applications/(\d+)", path)
+        if match:
+            info = ledger.account_application(match.group(1), int(match.group(2)))
+            if info is None:
+                return 404, {"message": "account application info not found"}
+            return 200, info
+        match = re.fullmatch(r"/v2/accounts/([A-Z2-7]+)", path)
+        if match:
+            return 200, ledger.account(match.group(1))
+        return 404, {"message": "not found"}
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                with standin._lock:
+                    standin.requests += 1
+                    standin.calls[method, self.path.split("?")[0]] += 1
+                    limited = standin.max_concurrent is not None and standin.active >= standin.max_concurrent
+                    failed = not limited and standin.fail_rate and standin._random.random() < standin.fail_rate
+                    if limited:
+                        standin.rejected += 1
+                    elif failed:
+                        standin.failed += 1
+                    else:
+                        standin.active += 1
+                if limited:
+                    status, payload = 429, {"message": "rate limit exceeded"}
+                elif failed:
+                    status, payload = 503, {"message": "service unavailable (injected failure)"}
+                else:
+                    try:
+                        if standin.latency:
+                            time.sleep(standin.latency)
+                        status, payload = standin.route(method, self.path.split("?")[0], body)
+                    finally:
+                        with standin._lock:
+                            standin.active -= 1
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._respond("GET")
+
+            def do_POST(self):
+                self._respond("POST")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local algod/indexer stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=4001)
+    parser.add_argument("--indexer", action="store_true", help="serve indexer lookups only, from an empty ledger")
+    parser.add_argument("--indexer-port", type=int, default=None, help="also serve an indexer over the same ledger")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--round-time", type=float, default=0.0, help="seconds per round (0: advance on demand)")
+    parser.add_argument("--max-concurrent", type=int, default=None, help="answer 429 beyond this many requests at once")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered 503")
+    parser.add_argument("--pool-error-rate", type=float, default=0.0, help="fraction of transactions dropped from the pool")
+    parser.add_argument("--pool-size", type=int, default=None, help="transactions waiting for a round at most")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    ledger = StandInLedger(round_time=args.round_time, pool_error_rate=args.pool_error_rate,
+                           pool_size=args.pool_size, seed=args.seed)
+    standins = [AlgodStandIn(args.host, args.port, args.latency, args.indexer, max_concurrent=args.max_concurrent,
+                             ledger=ledger, fail_rate=args.fail_rate, seed=args.seed)]
+    if args.indexer_port is not None and not args.indexer:
+        standins.append(AlgodStandIn(args.host, args.indexer_port, args.latency, indexer=True, ledger=ledger,
+                                     fail_rate=args.fail_rate, seed=args.seed))
+    for standin in standins:
+        print(f"{'Indexer' if standin.indexer else 'Algod'} stand-in on {standin.address} "
+              f"({args.latency * 1000:.0f} ms latency)")
+        standin.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        for standin in standins:
+            standin.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,31 +2,85 @@
 # app.py - Flask API for the compliance document system
 
 from flask import Flask, request, jsonify, render_template
-from Compliance.document_compliance_client_updated import ComplianceClient
-from algosdk.v2client import algod
-from algosdk import account, mnemonic
-from algosdk.v2client import indexer
+from Compliance.upload_sessions import UploadSessionStore, UploadSessionError, UploadSessionNotFound
+from Compliance.document_index import DocumentIndex, normalize_digest
+from Compliance.app_shards import APP_STATE_TTL, AppStateCache, ShardSet, parse_app_ids
+from Compliance.contract_store import open_contract_store
+from Compliance.metrics import MetricsRegistry, instrument_client, instrument_flask
+from Compliance.tracing import configure_from_env, trace_client, trace_flask
+from Compliance.fast_json import install_json_provider, list_response, wants_ndjson
+from Compliance.single_flight import SingleFlight, coalesce_client
+from Compliance.admission import AdmissionController, Overloaded, is_overload, DEFAULT_MAX_IN_FLIGHT, DEFAULT_PER_SIGNER
+from Compliance.lazy import Lazy
+from Compliance.readiness import add_readiness_route, probe_from_env
+from werkzeug.utils import secure_filename
 import os
 import hashlib
 import datetime
 import json
+import time
 
 app = Flask(__name__, 
     static_folder='frontend/build/static',
     template_folder='frontend/build')
 
+# jsonify() through the fast encoder (JSON_ENCODER=orjson|json|auto)
+install_json_provider(app)
+
 # Configuration
 # Public TestNet node details
-algod_address = "https://testnet-api.algonode.cloud"
-algod_token = ""
+algod_address = os.environ.get("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+algod_token = os.environ.get("ALGOD_TOKEN", "")
+
+# Indexer for TestNet - we'll use this for account info
+indexer_address = os.environ.get("INDEXER_ADDRESS", "https://testnet-idx.algonode.cloud")
+indexer_token = os.environ.get("INDEXER_TOKEN", "")
+
+# Request and algod/indexer call latency histograms, served at /metrics
+metrics = MetricsRegistry()
+instrument_flask(app, metrics)
+
+# Spans per request, client method and algod/indexer call (TRACE_FILE, TRACE_OTLP_ENDPOINT, TRACE_SAMPLE_RATE)
+tracer = configure_from_env()
+trace_flask(app)
+
+# Identical concurrent app/account reads share one node call; results are
+# reused for COALESCE_HOLD seconds (below the ~3 s block time)
+read_flights = SingleFlight(hold=float(os.environ.get('COALESCE_HOLD', '1.0')))
+
+# algosdk and the clients are loaded on first use, so workers boot without it
+def build_algod_client():
+    from algosdk.v2client import algod
+    client = algod.AlgodClient(algod_token, algod_address)
+    instrument_client(client, "algod", metrics)
+    trace_client(client, "algod")
+    return coalesce_client(client, "algod", read_flights, metrics)
+
+def build_indexer_client():
+    from algosdk.v2client import indexer
+    client = indexer.IndexerClient(indexer_token, indexer_address)
+    instrument_client(client, "indexer", metrics)
+    trace_client(client, "indexer")
+    return coalesce_client(client, "indexer", read_flights, metrics)
+
+algod_client = Lazy(build_algod_client)
+indexer_client = Lazy(build_indexer_client)
+
+def compliance_client(private_key):
+    from Compliance.document_compliance_client_updated import ComplianceClient
+    return ComplianceClient(algod_client.get(), private_key)
 
-# Initialize Algod client
-algod_client = algod.AlgodClient(algod_token, algod_address)
+def registry_client(private_key):
+    from Compliance.document_registry_client import ComplianceRegistryClient
+    return ComplianceRegistryClient(algod_client.get(), private_key)
 
-# Initialize Indexer client for TestNet - we'll use this for account info
-indexer_address = "https://testnet-idx.algonode.cloud"
-indexer_token = ""
-indexer_client = indexer.IndexerClient(indexer_token, indexer_address)
+# Node health is probed in the background and served at /readyz (READINESS_INTERVAL)
+readiness = probe_from_env({
+    "algod": lambda: algod_client.get().status(),
+    "indexer": lambda: indexer_client.get().health(),
+})
+add_readiness_route(app, readiness)
+readiness.start()
 
 # Load admin/verifier accounts from config
 try:
@@ -36,9 +90,8 @@ try:
     verifier_private_key = admin_verifier_accounts.get('verifier', {}).get('private_key', '')
     verifier_address = admin_verifier_accounts.get('verifier', {}).get('address', '')
     admin_address = admin_verifier_accounts.get('admin', {}).get('address', '')
-    # Get App ID - in a production environment you would store this in a config file
-    # For now we'll hardcode the App ID for the existing deployed contract
-    APP_ID = 744059516  # Replace with your actual deployed app ID
+    # Default app for the /api/document/* routes; /api/apps/<app_id>/... serve any app
+    APP_ID = int(os.environ.get('APP_ID', '744059516'))
 except Exception as e:
     print(f"Error loading accounts: {str(e)}")
     admin_private_key = ""
@@ -47,11 +100,272 @@ except Exception as e:
     admin_address = ""
     APP_ID = None
 
+# v2 box registry app used by batch verification (one app holds many documents)
+REGISTRY_APP_ID = int(os.environ.get('REGISTRY_APP_ID', '0')) or None
+
+# Resumable uploads: chunks are staged on disk so sessions survive a restart
+UPLOAD_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads')
+upload_sessions = UploadSessionStore(os.path.join(UPLOAD_FOLDER, '.sessions'))
+
+# Contracts deployed through the compliance dashboard, used to find every known app (CONTRACTS_DB moves it)
+CONTRACTS_DB = os.environ.get('CONTRACTS_DB') or os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Compliance/flask_app/contracts.db')
+CONTRACTS_JSON = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Compliance/flask_app/contracts.json')
+contract_store = open_contract_store(CONTRACTS_DB, CONTRACTS_JSON)
+
+# Batch verification responses switch to NDJSON streaming above this many digests
+VERIFY_MANY_STREAM_THRESHOLD = 500
+
+# Most documents one /api/document/verify/batch request may attest
+VERIFY_BATCH_MAX_DOCUMENTS = 5000
+
+def read_compliance_status(app_id):
+    return compliance_client(admin_private_key).get_compliance_status(app_id)
+
+# Per-app compliance state, re-read at most every APP_STATE_TTL seconds
+app_states = AppStateCache(read_compliance_status, float(os.environ.get('APP_STATE_TTL', APP_STATE_TTL)))
+
+# Apps new registrations are spread over (COMPLIANCE_SHARDS=id,id,...; default APP_ID alone)
+shards = ShardSet(parse_app_ids(os.environ.get('COMPLIANCE_SHARDS', '')) or [app_id for app_id in [APP_ID] if app_id])
+
+# Writes in flight are limited overall (WRITE_MAX_IN_FLIGHT, adapted to the
+# node's errors and latency) and per signing account (WRITE_MAX_PER_SIGNER);
+# writes beyond that are answered at once with 429 and Retry-After
+admission = AdmissionController(int(os.environ.get('WRITE_MAX_IN_FLIGHT', DEFAULT_MAX_IN_FLIGHT)),
+                                int(os.environ.get('WRITE_MAX_PER_SIGNER', DEFAULT_PER_SIGNER)))
+
+# Error responses are (body, status, headers) so Flask and Quart routes can both return them
+def overloaded_response(e):
+    metrics.shed_writes.inc((e.reason,))
+    return ({"success": False, "error": str(e), "retry_after": e.retry_after}, 429,
+            {"Retry-After": str(e.retry_after)})
+
+def node_unavailable_response(e):
+    """A write the node itself failed under load: 503, retry once the admission cooldown ends"""
+    retry_after = admission.retry_after()
+    return ({"success": False, "error": str(e), "retry_after": retry_after}, 503,
+            {"Retry-After": str(retry_after)})
+
+# Digest -> registration index across all known apps
+document_index = DocumentIndex(app_states.get)
+
+def known_app_ids():
+    """Apps reads aggregate over: the default app, the shards and dashboard deployments"""
+    return [app_id for app_id in dict.fromkeys([APP_ID] + shards.app_ids + contract_store.app_ids()) if app_id]
+
+def state_changed(app_id):
+    """Forget cached and held reads after a write to `app_id`"""
+    app_states.invalidate(app_id)
+    document_index.invalidate()
+    read_flights.forget()
+
+def app_for_document(document_hash):
+    """The shard currently holding `document_hash`, else the default app"""
+    if len(shards) > 1:
+        digest = normalize_digest(document_hash or '')
+        for app_id, state in app_states.get_many(shards.app_ids).items():
+            if digest and state and normalize_digest(state.get('document_hash') or '') == digest:
+                return app_id
+    return APP_ID or (shards.app_ids[0] if shards.app_ids else None)
+
 # Utility function to generate document hash
 def generate_document_hash(content):
     """Generate SHA-256 hash of document content"""
     return hashlib.sha256(content.encode()).hexdigest()
 
+# Response bodies shared with the ASGI server (asgi_app.py)
+def describe_status(status):
+    """Add human-readable dates and the days until expiration to a compliance status"""
+    # Convert timestamp to human-readable format if available
+    if status.get('attestation_date'):
+        status['attestation_date_readable'] = datetime.datetime.fromtimestamp(
+            status['attestation_date']).strftime('%Y-%m-%d %H:%M:%S')
+    
+    if status.get('expiration_date'):
+        status['expiration_date_readable'] = datetime.datetime.fromtimestamp(
+            status['expiration_date']).strftime('%Y-%m-%d %H:%M:%S')
+        
+        # Add days until expiration
+        now = datetime.datetime.now().timestamp()
+        if now < status['expiration_date']:
+            days_remaining = (status['expiration_date'] - now) / (60 * 60 * 24)
+            status['days_until_expiration'] = int(days_remaining)
+        else:
+            status['days_until_expiration'] = 0
+    return status
+
+def batch_verification_summary(app_id, groups):
+    """Response body of /api/document/verify/batch"""
+    failed = [group for group in groups if "error" in group]
+    return {
+        "success": not failed,
+        "app_id": int(app_id),
+        "verified": sum(len(group["document_hashes"]) for group in groups if "txn_id" in group),
+        "failed": sum(len(group["document_hashes"]) for group in failed),
+        "transactions": sum(group["transactions"] for group in groups),
+        "groups": groups,
+        "verification_date": datetime.datetime.now().isoformat()
+    }
+
+def account_status_summary(address, account_info):
+    """Response body of /api/account/status for an indexer account lookup"""
+    # Check if account is opted into the app
+    is_opted_in = False
+    local_state = None
+    
+    if 'account' in account_info and 'apps-local-state' in account_info['account']:
+        for app_state in account_info['account']['apps-local-state']:
+            if app_state['id'] == APP_ID:
+                is_opted_in = True
+                local_state = app_state.get('key-value', [])
+                break
+                
+    return {
+        "success": True, 
+        "address": address,
+        "is_verifier": address == verifier_address,
+        "is_admin": address == admin_address,
+        "is_opted_in": is_opted_in,
+        "account_info": account_info.get('account', {}),
+        "local_state": local_state
+    }
+
+# Request checks and bookkeeping of the write and lookup routes, shared with asgi_app.py;
+# only the node calls differ between the two servers
+class RequestRejected(Exception):
+    """A request answered with `status` before anything is sent to the node"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+def rejected_response(e):
+    return {"success": False, "error": str(e)}, e.status
+
+def require_role(data, role, action):
+    """Raise a 403 unless the request carries the key of the `role` account"""
+    private_key = admin_private_key if role == 'admin' else verifier_private_key
+    if data.get('role') != role or data.get('private_key') != private_key:
+        raise RequestRejected(f"Unauthorized: Only {action}", 403)
+
+def registration_request(data, app_id):
+    """(document hash, version, expiry) of a registration; the expiry is a year from now"""
+    require_role(data, 'admin', "admin can register documents")
+    if app_id is None and not shards.app_ids:
+        raise RequestRejected("No deployed app ID found")
+    # Check for both parameter names to support existing clients
+    document_content = data.get('document_content') or data.get('content')
+    return generate_document_hash(document_content), data.get('version'), int(time.time()) + 31536000
+
+def registration_recorded(app_id, doc_hash, version, expiry, txn_id):
+    """Record a sent registration and return the response body"""
+    state_changed(app_id)
+    # Keep the dashboard's document records and aggregates current
+    contract_store.add_document(app_id, {
+        "hash": doc_hash,
+        "version": version,
+        "registered_at": time.time(),
+        "expiry_timestamp": expiry
+    })
+    return {"success": True, "app_id": app_id, "document_hash": doc_hash, "txn_id": txn_id}
+
+def assignment_request(data, app_id):
+    """(verifier address, apps to assign it on); documents may land on any shard"""
+    require_role(data, 'admin', "admin can assign verifiers")
+    app_ids = [app_id] if app_id is not None else shards.app_ids
+    if not app_ids:
+        raise RequestRejected("No deployed app ID found")
+    return data.get('verifier_address'), app_ids
+
+def assignment_summary(address, app_ids, txn_ids):
+    return {
+        "success": True,
+        "message": f"Assigned {address} as verifier",
+        "txn_id": txn_ids[str(app_ids[0])],
+        "txn_ids": txn_ids
+    }
+
+def verification_request(data, app_id):
+    """(app, document hash, is_compliant) of a verification; may read app state to find the shard"""
+    require_role(data, 'verifier', "designated verifiers can verify compliance")
+    document_hash = data.get('document_hash')
+    if app_id is None:
+        app_id = app_for_document(document_hash)
+    if not app_id:
+        raise RequestRejected("No deployed app ID found")
+    return app_id, document_hash, data.get('is_compliant', True)
+
+def verification_recorded(app_id, is_compliant):
+    state_changed(app_id)
+    if is_compliant:
+        contract_store.mark_verified(app_id)
+
+def verification_summary(app_id, document_hash, status, txn_id):
+    return {
+        "success": True,
+        "app_id": app_id,
+        "verified_hash": document_hash,
+        "status": status.get('status', 'Unknown'),
+        "verification_date": datetime.datetime.now().isoformat(),
+        "txn_id": txn_id
+    }
+
+def batch_request(data):
+    """(registry app, document hashes) of a batch verification"""
+    require_role(data, 'verifier', "designated verifiers can verify compliance")
+    document_hashes = data.get('document_hashes')
+    app_id = data.get('app_id') or REGISTRY_APP_ID
+    if not app_id:
+        raise RequestRejected("No registry app ID configured (set REGISTRY_APP_ID)")
+    if not isinstance(document_hashes, list) or not document_hashes:
+        raise RequestRejected("Provide a non-empty 'document_hashes' list")
+    if len(document_hashes) > VERIFY_BATCH_MAX_DOCUMENTS:
+        raise RequestRejected(f"At most {VERIFY_BATCH_MAX_DOCUMENTS} documents per request")
+    return int(app_id), document_hashes
+
+def parse_digests(mimetype, body):
+    """Digests of a verify-many body: JSON, or one digest per line as text/plain"""
+    if mimetype == 'text/plain':
+        digests = [line.strip() for line in body.splitlines() if line.strip()]
+    else:
+        try:
+            data = json.loads(body) if body else {}
+        except ValueError:
+            data = {}
+        digests = data.get('digests') if isinstance(data, dict) else None
+    if not isinstance(digests, list) or not digests:
+        raise RequestRejected("A non-empty list of digests is required")
+    return digests
+
+def resolve_digests(digests):
+    """Look `digests` up across every known app; reads app state with the sync client"""
+    # Rebuilt after the TTL, when the app set changes or after a write (state_changed)
+    document_index.ensure_fresh(known_app_ids(), contract_store.iter_documents())
+    return document_index.lookup_many(digests)
+
+def verify_many_summary(results):
+    return {
+        "success": True,
+        "count": len(results),
+        "registered": sum(1 for result in results if result["registered"]),
+        "compliant": sum(1 for result in results if result.get("compliant")),
+        "results": results
+    }
+
+def apps_summary(states):
+    """Response body of /api/apps for {app_id: state or None}"""
+    in_flight = shards.in_flight()
+    apps = []
+    for app_id, state in states.items():
+        entry = {"app_id": app_id, "default": app_id == APP_ID, "shard": app_id in shards}
+        if app_id in in_flight:
+            entry["writes_in_flight"] = in_flight[app_id]
+        if state is None:
+            entry["error"] = "State could not be read"
+        else:
+            entry["status"] = describe_status(state)
+        apps.append(entry)
+    return {"success": True, "count": len(apps), "apps": apps}
+
 # Routes for the API - focus on document handling and verification
 @app.route('/api/document/hash', methods=['POST'])
 def get_document_hash():
@@ -86,11 +400,11 @@ def upload_document():
         if file.filename == '':
             return jsonify({"success": False, "error": "No file selected"}), 400
         
-        # Read file content
-        content = file.read().decode('utf-8', errors='ignore')
-        
-        # Generate hash
-        doc_hash = generate_document_hash(content)
+        # Hash the raw bytes, as resumable upload sessions do, so both give the same digest
+        hasher = hashlib.sha256()
+        for block in iter(lambda: file.stream.read(1024 * 1024), b''):
+            hasher.update(block)
+        doc_hash = hasher.hexdigest()
         
         return jsonify({
             "success": True,
@@ -102,143 +416,234 @@ def upload_document():
         print(f"Error uploading document: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
 
+def upload_error_response(e):
+    """Map upload session errors to JSON responses"""
+    if isinstance(e, UploadSessionNotFound):
+        return jsonify({"success": False, "error": str(e)}), 404
+    if isinstance(e, UploadSessionError):
+        return jsonify({"success": False, "error": str(e)}), 400
+    app.logger.exception("Error in upload session")
+    return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/upload/sessions', methods=['POST'])
+def create_upload_session():
+    """Start a resumable upload for a large document"""
+    try:
+        data = request.json or {}
+        filename = data.get('filename')
+        total_size = data.get('total_size')
+
+        if not filename or total_size is None:
+            return jsonify({"success": False, "error": "filename and total_size are required"}), 400
+
+        session = upload_sessions.create(
+            filename,
+            total_size,
+            sha256=data.get('sha256'),
+            chunk_size=data.get('chunk_size'))
+
+        return jsonify({"success": True, "session": session}), 201
+    except Exception as e:
+        return upload_error_response(e)
+
+@app.route('/api/upload/sessions/<session_id>', methods=['GET'])
+def get_upload_session(session_id):
+    """Report which chunks have been received so a client can resume"""
+    try:
+        return jsonify({"success": True, "session": upload_sessions.status(session_id)})
+    except Exception as e:
+        return upload_error_response(e)
+
+@app.route('/api/upload/sessions/<session_id>/chunks/<int:index>', methods=['PUT'])
+def put_upload_chunk(session_id, index):
+    """Store one numbered chunk; chunks may be sent in any order"""
+    try:
+        chunk_hash = upload_sessions.write_chunk(
+            session_id, index, request.stream,
+            expected_sha256=request.headers.get('X-Chunk-SHA256'))
+
+        return jsonify({"success": True, "index": index, "sha256": chunk_hash})
+    except Exception as e:
+        return upload_error_response(e)
+
+@app.route('/api/upload/sessions/<session_id>/commit', methods=['POST'])
+def commit_upload_session(session_id):
+    """Assemble the chunks, check the final digest and return the document hash"""
+    try:
+        data = request.get_json(silent=True) or {}
+        manifest = upload_sessions.load(session_id)
+        filename = secure_filename(manifest['filename']) or session_id
+        destination = os.path.join(UPLOAD_FOLDER, f"{session_id}_{filename}")
+
+        result = upload_sessions.commit(session_id, destination, sha256=data.get('sha256'))
+
+        return jsonify({
+            "success": True,
+            "hash": result['sha256'],
+            "filename": result['filename'],
+            "size": result['size'],
+            "timestamp": datetime.datetime.now().isoformat()
+        })
+    except Exception as e:
+        return upload_error_response(e)
+
+@app.route('/api/upload/sessions/<session_id>', methods=['DELETE'])
+def delete_upload_session(session_id):
+    """Abandon an upload and free its staged chunks"""
+    try:
+        upload_sessions.discard(session_id)
+        return jsonify({"success": True})
+    except Exception as e:
+        return upload_error_response(e)
+
 @app.route('/api/document/register', methods=['POST'])
-def register_document():
-    """Register a document with the compliance contract - ADMIN ONLY"""
+@app.route('/api/apps/<int:app_id>/documents', methods=['POST'])
+def register_document(app_id=None):
+    """Register a document with a compliance contract (the least busy shard by default) - ADMIN ONLY"""
     try:
-        data = request.json
-        verifier_role = data.get('role')
-        provided_key = data.get('private_key')
-        # Check for both parameter names to support existing clients
-        document_content = data.get('document_content') or data.get('content')
-        version = data.get('version')
-        
-        # Only allow admin to register documents
-        if verifier_role != 'admin' or provided_key != admin_private_key:
-            return jsonify({"success": False, "error": "Unauthorized: Only admin can register documents"}), 403
-            
-        if not APP_ID:
-            return jsonify({"success": False, "error": "No deployed app ID found"}), 400
+        doc_hash, version, expiry = registration_request(request.json, app_id)
         
         # Initialize client
-        client = ComplianceClient(algod_client, admin_private_key)
+        client = compliance_client(admin_private_key)
         
         # Register document and get transaction ID
-        txn_id = client.register_document(APP_ID, document_content, version)
+        with admission.admit(admin_address), shards.acquire(app_id) as app_id:
+            txn_id = client.register_document_hash(app_id, doc_hash, version, expiry)
         
-        # Generate hash for reference
-        doc_hash = generate_document_hash(document_content)
-        
-        return jsonify({
-            "success": True,
-            "document_hash": doc_hash,
-            "txn_id": txn_id
-        })
+        return jsonify(registration_recorded(app_id, doc_hash, version, expiry, txn_id))
+    except RequestRejected as e:
+        return rejected_response(e)
+    except Overloaded as e:
+        return overloaded_response(e)
     except Exception as e:
+        if is_overload(e):
+            return node_unavailable_response(e)
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/verifier/assign', methods=['POST'])
-def assign_verifier():
-    """Assign a verifier to the compliance contract - ADMIN ONLY"""
+@app.route('/api/apps/<int:app_id>/verifier', methods=['POST'])
+def assign_verifier(app_id=None):
+    """Assign a verifier to a compliance contract (every shard by default) - ADMIN ONLY"""
     try:
-        data = request.json
-        verifier_role = data.get('role')
-        provided_key = data.get('private_key')
-        new_verifier_address = data.get('verifier_address')
+        new_verifier_address, app_ids = assignment_request(request.json, app_id)
         
-        # Only allow admin to assign verifiers
-        if verifier_role != 'admin' or provided_key != admin_private_key:
-            return jsonify({"success": False, "error": "Unauthorized: Only admin can assign verifiers"}), 403
-            
-        if not APP_ID:
-            return jsonify({"success": False, "error": "No deployed app ID found"}), 400
+        # Initialize client and assign verifier on each app
+        client = compliance_client(admin_private_key)
+        txn_ids = {}
+        with admission.admit(admin_address):
+            for target in app_ids:
+                txn_ids[str(target)] = client.assign_verifier(target, new_verifier_address)
+                state_changed(target)
         
-        # Initialize client and assign verifier
-        client = ComplianceClient(algod_client, admin_private_key)
-        txn_id = client.assign_verifier(APP_ID, new_verifier_address)
-        
-        return jsonify({
-            "success": True,
-            "message": f"Assigned {new_verifier_address} as verifier",
-            "txn_id": txn_id
-        })
+        return jsonify(assignment_summary(new_verifier_address, app_ids, txn_ids))
+    except RequestRejected as e:
+        return rejected_response(e)
+    except Overloaded as e:
+        return overloaded_response(e)
     except Exception as e:
+        if is_overload(e):
+            return node_unavailable_response(e)
         return jsonify({"success": False, "error": str(e)}), 500
 
 @app.route('/api/document/verify', methods=['POST'])
-def verify_compliance():
-    """Verify compliance of a document - VERIFIER ONLY"""
+@app.route('/api/apps/<int:app_id>/verify', methods=['POST'])
+def verify_compliance(app_id=None):
+    """Verify compliance of a document (on the shard holding it by default) - VERIFIER ONLY"""
     try:
-        data = request.json
-        verifier_role = data.get('role')
-        provided_key = data.get('private_key')
-        document_hash = data.get('document_hash')
-        
-        # Only allow verifier to verify compliance
-        if verifier_role != 'verifier' or provided_key != verifier_private_key:
-            return jsonify({"success": False, "error": "Unauthorized: Only designated verifiers can verify compliance"}), 403
-            
-        if not APP_ID:
-            return jsonify({"success": False, "error": "No deployed app ID found"}), 400
+        app_id, document_hash, is_compliant = verification_request(request.json, app_id)
         
         # Initialize client
-        client = ComplianceClient(algod_client, verifier_private_key)
-        
-        # Check if document is compliant (from request data)
-        is_compliant = data.get('is_compliant', True)
-        attestation_date = int(time.time())
+        client = compliance_client(verifier_private_key)
         
         # Verify compliance
-        txn_id = client.verify_compliance(APP_ID, document_hash, is_compliant, attestation_date)
+        with admission.admit(verifier_address), shards.acquire(app_id):
+            txn_id = client.verify_compliance(app_id, document_hash, is_compliant, int(time.time()))
+        verification_recorded(app_id, is_compliant)
         
         # Get updated status
-        status = client.get_compliance_status(APP_ID)
+        status = app_states.get(app_id)
         
-        return jsonify({
-            "success": True,
-            "verified_hash": document_hash,
-            "status": status.get('status', 'Unknown'),
-            "verification_date": datetime.datetime.now().isoformat(),
-            "txn_id": txn_id
-        })
+        return jsonify(verification_summary(app_id, document_hash, status, txn_id))
+    except RequestRejected as e:
+        return rejected_response(e)
+    except Overloaded as e:
+        return overloaded_response(e)
     except Exception as e:
+        if is_overload(e):
+            return node_unavailable_response(e)
         return jsonify({"success": False, "error": str(e)}), 500
 
-@app.route('/api/document/status', methods=['GET'])
-def get_compliance_status():
-    """Get compliance status of the document - Public endpoint"""
+@app.route('/api/document/verify/batch', methods=['POST'])
+def verify_documents_batch():
+    """Verify many documents of the box registry in few transactions - VERIFIER ONLY"""
     try:
-        if not APP_ID:
-            return jsonify({"success": False, "error": "No deployed app ID found"}), 400
-            
-        # Use admin key for read-only operations
-        # In production, use a dedicated read-only account
-        client = ComplianceClient(algod_client, admin_private_key)
+        app_id, document_hashes = batch_request(request.json)
         
-        # Get compliance status
-        status = client.get_compliance_status(APP_ID)
+        client = registry_client(verifier_private_key)
+        try:
+            with admission.admit(verifier_address):
+                groups = client.verify_documents(app_id, document_hashes)
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        state_changed(app_id)
         
-        # Convert timestamp to human-readable format if available
-        if status.get('attestation_date'):
-            status['attestation_date_readable'] = datetime.datetime.fromtimestamp(
-                status['attestation_date']).strftime('%Y-%m-%d %H:%M:%S')
-        
-        if status.get('expiration_date'):
-            status['expiration_date_readable'] = datetime.datetime.fromtimestamp(
-                status['expiration_date']).strftime('%Y-%m-%d %H:%M:%S')
+        return jsonify(batch_verification_summary(app_id, groups))
+    except RequestRejected as e:
+        return rejected_response(e)
+    except Overloaded as e:
+        return overloaded_response(e)
+    except Exception as e:
+        if is_overload(e):
+            return node_unavailable_response(e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/document/status', methods=['GET'])
+@app.route('/api/apps/<int:app_id>/status', methods=['GET'])
+def get_compliance_status(app_id=None):
+    """Get compliance status of an app's document (?app_id=, default APP_ID) - Public endpoint"""
+    try:
+        app_id = app_id or request.args.get('app_id', type=int) or APP_ID
+        if not app_id:
+            return jsonify({"success": False, "error": "No deployed app ID found"}), 400
             
-            # Add days until expiration
-            now = datetime.datetime.now().timestamp()
-            if now < status['expiration_date']:
-                days_remaining = (status['expiration_date'] - now) / (60 * 60 * 24)
-                status['days_until_expiration'] = int(days_remaining)
-            else:
-                status['days_until_expiration'] = 0
+        # Cached per app; read with the admin key (in production, a dedicated read-only account)
+        status = describe_status(app_states.get(app_id))
         
         return jsonify({"success": True, "status": status})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
         
+@app.route('/api/apps', methods=['GET'])
+def list_apps():
+    """Every known compliance app with its (cached) current document - Public endpoint"""
+    try:
+        return jsonify(apps_summary(app_states.get_many(known_app_ids())))
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/api/admission', methods=['GET'])
+def admission_status():
+    """Writes in flight, the current write limit and shed counts - Public endpoint"""
+    return jsonify({"success": True, "admission": admission.stats()})
+
+@app.route('/api/document/verify-many', methods=['POST'])
+def verify_many_documents():
+    """Resolve a list of document digests against every known compliance app - Public endpoint"""
+    try:
+        digests = parse_digests(request.mimetype, request.get_data(as_text=True))
+        results = resolve_digests(digests)
+
+        # Large lists are streamed as one JSON object per line
+        if wants_ndjson() or len(digests) > VERIFY_MANY_STREAM_THRESHOLD:
+            return list_response(results, ndjson=True)
+
+        return jsonify(verify_many_summary(list(results)))
+    except RequestRejected as e:
+        return rejected_response(e)
+    except Exception as e:
+        print(f"Error verifying documents: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
 @app.route('/api/login/verifier', methods=['POST'])
 def verifier_login():
     """Login as a verifier"""
@@ -310,33 +715,10 @@ def account_status():
         if not address:
             return jsonify({"success": False, "error": "Address parameter is required"}), 400
             
-        # Check if this is a verifier or admin account
-        is_verifier = (address == verifier_address)
-        is_admin = (address == admin_address)
-        
         # Get account information from indexer
-        account_info = indexer_client.account_info(address)
-        
-        # Check if account is opted into the app
-        is_opted_in = False
-        local_state = None
+        account_info = indexer_client.get().account_info(address)
         
-        if 'account' in account_info and 'apps-local-state' in account_info['account']:
-            for app_state in account_info['account']['apps-local-state']:
-                if app_state['id'] == APP_ID:
-                    is_opted_in = True
-                    local_state = app_state.get('key-value', [])
-                    break
-                    
-        return jsonify({
-            "success": True, 
-            "address": address,
-            "is_verifier": is_verifier,
-            "is_admin": is_admin,
-            "is_opted_in": is_opted_in,
-            "account_info": account_info.get('account', {}),
-            "local_state": local_state
-        })
+        return jsonify(account_status_summary(address, account_info))
     except Exception as e:
         print(f"Error checking account status: {str(e)}")
         return jsonify({"success": False, "error": str(e)}), 500
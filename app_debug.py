@@ -2,16 +2,13 @@
 # app.py - Flask API for the compliance document system
 
 from flask import Flask, request, jsonify, render_template
-from Compliance.document_compliance_client import ComplianceClient
-from algosdk.v2client import algod
-from algosdk import account, mnemonic
-from algosdk.v2client import indexer
+from Compliance.lazy import Lazy
+from Compliance.readiness import add_readiness_route, probe_from_env
 import os
 import hashlib
 import datetime
 import json
 import traceback
-import sys
 
 app = Flask(__name__, 
     static_folder='frontend/build/static',
@@ -22,34 +19,38 @@ app.config['PROPAGATE_EXCEPTIONS'] = True
 
 # Configuration
 # Public TestNet node details
-algod_address = "https://testnet-api.algonode.cloud"
-algod_token = ""
+algod_address = os.environ.get("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+algod_token = os.environ.get("ALGOD_TOKEN", "")
 
-# Initialize Algod client
-print(f"Initializing Algod client with {algod_address}")
-try:
-    algod_client = algod.AlgodClient(algod_token, algod_address)
-    # Test algod connection
-    node_status = algod_client.status()
-    print(f"Successfully connected to Algod. Node status: {node_status}")
-except Exception as e:
-    print(f"ERROR initializing Algod client: {str(e)}")
-    print(traceback.format_exc())
-    sys.exit(1)
+# Indexer for TestNet - we'll use this for account info
+indexer_address = os.environ.get("INDEXER_ADDRESS", "https://testnet-idx.algonode.cloud")
+indexer_token = os.environ.get("INDEXER_TOKEN", "")
 
-# Initialize Indexer client for TestNet - we'll use this for account info
-indexer_address = "https://testnet-idx.algonode.cloud"
-indexer_token = ""
-print(f"Initializing Indexer client with {indexer_address}")
-try:
-    indexer_client = indexer.IndexerClient(indexer_token, indexer_address)
-    # Test indexer connection
-    health = indexer_client.health()
-    print(f"Successfully connected to Indexer. Health: {health}")
-except Exception as e:
-    print(f"ERROR initializing Indexer client: {str(e)}")
-    print(traceback.format_exc())
-    sys.exit(1)
+# Clients are created on first use; an unreachable node shows up at /readyz
+# instead of stopping the server at startup
+def build_algod_client():
+    from algosdk.v2client import algod
+    print(f"Initializing Algod client with {algod_address}")
+    return algod.AlgodClient(algod_token, algod_address)
+
+def build_indexer_client():
+    from algosdk.v2client import indexer
+    print(f"Initializing Indexer client with {indexer_address}")
+    return indexer.IndexerClient(indexer_token, indexer_address)
+
+algod_client = Lazy(build_algod_client)
+indexer_client = Lazy(build_indexer_client)
+
+def compliance_client(private_key):
+    from Compliance.document_compliance_client import ComplianceClient
+    return ComplianceClient(algod_client.get(), private_key)
+
+readiness = probe_from_env({
+    "algod": lambda: algod_client.get().status(),
+    "indexer": lambda: indexer_client.get().health(),
+})
+add_readiness_route(app, readiness)
+readiness.start()
 
 # Load admin/verifier accounts from config
 try:
@@ -160,7 +161,7 @@ def register_document():
         
         # Initialize client
         print("Initializing ComplianceClient...")
-        client = ComplianceClient(algod_client, admin_private_key)
+        client = compliance_client(admin_private_key)
         
         # Register document
         print(f"Calling register_document with APP_ID: {APP_ID}")
@@ -206,7 +207,7 @@ def assign_verifier():
         
         # Initialize client
         print("Initializing ComplianceClient...")
-        client = ComplianceClient(algod_client, admin_private_key)
+        client = compliance_client(admin_private_key)
         
         # Assign verifier
         print(f"Calling assign_verifier with APP_ID: {APP_ID} and verifier: {new_verifier_address}")
@@ -250,7 +251,7 @@ def verify_compliance():
             
         # Initialize client
         print("Initializing ComplianceClient...")
-        client = ComplianceClient(algod_client, verifier_private_key)
+        client = compliance_client(verifier_private_key)
         
         # Verify compliance
         print(f"Calling verify_compliance with APP_ID: {APP_ID}, hash: {document_hash}, status: {compliance_status}")
@@ -280,7 +281,7 @@ def get_compliance_status():
         # Use admin key for read-only operations
         # In production, use a dedicated read-only account
         print("Initializing ComplianceClient...")
-        client = ComplianceClient(algod_client, admin_private_key)
+        client = compliance_client(admin_private_key)
         
         # Get compliance status
         print(f"Calling get_compliance_status with APP_ID: {APP_ID}")
@@ -351,7 +352,7 @@ def account_status():
         is_admin = (address == admin_address)
         
         # Get account information from indexer
-        account_info = indexer_client.account_info(address)
+        account_info = indexer_client.get().account_info(address)
         
         # Check if account is opted into the app
         is_opted_in = False
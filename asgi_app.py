@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# asgi_app.py - Async (ASGI) serving mode for the compliance API of app.py
+#
+#   hypercorn asgi_app:app --bind 0.0.0.0:5047
+#
+# Serves the same /api/document/*, /api/apps/*, /api/verifier/*,
+# /api/admission and /api/account/status routes as app.py, with the same
+# request and response bodies, on Quart. algod and indexer calls go through
+# async clients, so a request waiting on the network or on a confirmation
+# holds no worker while it waits. Request checks, shard selection, write
+# admission, cache invalidation and response bodies are app.py's (the
+# helpers after describe_status there); uploads and the React frontend are
+# still served by app.py.
+
+import asyncio
+import datetime
+import json
+import os
+import time
+
+from quart import Quart, Response, jsonify, request
+
+import app as wsgi
+from Compliance.admission import Overloaded, is_overload
+from Compliance.async_algod import AsyncAlgodClient, AsyncIndexerClient
+from Compliance.async_compliance_client import AsyncComplianceClient
+
+app = Quart(__name__)
+
+# Created per event loop when serving starts
+clients = {}
+
+
+@app.before_serving
+async def open_clients():
+    clients["algod"] = AsyncAlgodClient(wsgi.algod_token, wsgi.algod_address)
+    clients["indexer"] = AsyncIndexerClient(wsgi.indexer_token, wsgi.indexer_address)
+
+
+@app.after_serving
+async def close_clients():
+    for client in clients.values():
+        await client.aclose()
+    clients.clear()
+
+
+def compliance_client(private_key):
+    return AsyncComplianceClient(clients["algod"], private_key)
+
+
+@app.route('/api/document/hash', methods=['POST'])
+async def get_document_hash():
+    """Get hash for a document without uploading to blockchain"""
+    try:
+        data = await request.get_json()
+        document_content = data.get('document_content')
+
+        if not document_content:
+            return jsonify({"success": False, "error": "Document content is required"}), 400
+
+        return jsonify({
+            "success": True,
+            "document_hash": wsgi.generate_document_hash(document_content),
+            "timestamp": datetime.datetime.now().isoformat()
+        })
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/document/register', methods=['POST'])
+@app.route('/api/apps/<int:app_id>/documents', methods=['POST'])
+async def register_document(app_id=None):
+    """Register a document with a compliance contract (the least busy shard by default) - ADMIN ONLY"""
+    try:
+        doc_hash, version, expiry = wsgi.registration_request(await request.get_json(), app_id)
+
+        client = compliance_client(wsgi.admin_private_key)
+        with wsgi.admission.admit(wsgi.admin_address), wsgi.shards.acquire(app_id) as app_id:
+            txn_id = await client.register_document_hash(app_id, doc_hash, version, expiry)
+
+        return jsonify(wsgi.registration_recorded(app_id, doc_hash, version, expiry, txn_id))
+    except wsgi.RequestRejected as e:
+        return wsgi.rejected_response(e)
+    except Overloaded as e:
+        return wsgi.overloaded_response(e)
+    except Exception as e:
+        if is_overload(e):
+            return wsgi.node_unavailable_response(e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/verifier/assign', methods=['POST'])
+@app.route('/api/apps/<int:app_id>/verifier', methods=['POST'])
+async def assign_verifier(app_id=None):
+    """Assign a verifier to a compliance contract (every shard by default) - ADMIN ONLY"""
+    try:
+        new_verifier_address, app_ids = wsgi.assignment_request(await request.get_json(), app_id)
+
+        client = compliance_client(wsgi.admin_private_key)
+        txn_ids = {}
+        with wsgi.admission.admit(wsgi.admin_address):
+            for target in app_ids:
+                txn_ids[str(target)] = await client.assign_verifier(target, new_verifier_address)
+                wsgi.state_changed(target)
+
+        return jsonify(wsgi.assignment_summary(new_verifier_address, app_ids, txn_ids))
+    except wsgi.RequestRejected as e:
+        return wsgi.rejected_response(e)
+    except Overloaded as e:
+        return wsgi.overloaded_response(e)
+    except Exception as e:
+        if is_overload(e):
+            return wsgi.node_unavailable_response(e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/document/verify', methods=['POST'])
+@app.route('/api/apps/<int:app_id>/verify', methods=['POST'])
+async def verify_compliance(app_id=None):
+    """Verify compliance of a document (on the shard holding it by default) - VERIFIER ONLY"""
+    try:
+        # Finding the shard may read app state with the sync client; keep it off the event loop
+        app_id, document_hash, is_compliant = await asyncio.to_thread(
+            wsgi.verification_request, await request.get_json(), app_id)
+
+        client = compliance_client(wsgi.verifier_private_key)
+        with wsgi.admission.admit(wsgi.verifier_address), wsgi.shards.acquire(app_id):
+            txn_id = await client.verify_compliance(app_id, document_hash, is_compliant, int(time.time()))
+        wsgi.verification_recorded(app_id, is_compliant)
+
+        status = await client.get_compliance_status(app_id)
+        return jsonify(wsgi.verification_summary(app_id, document_hash, status, txn_id))
+    except wsgi.RequestRejected as e:
+        return wsgi.rejected_response(e)
+    except Overloaded as e:
+        return wsgi.overloaded_response(e)
+    except Exception as e:
+        if is_overload(e):
+            return wsgi.node_unavailable_response(e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/document/verify/batch', methods=['POST'])
+async def verify_documents_batch():
+    """Verify many documents of the box registry in few transactions - VERIFIER ONLY"""
+    try:
+        app_id, document_hashes = wsgi.batch_request(await request.get_json())
+
+        # Groups are sent one after another; run the sync registry client off the event loop
+        client = wsgi.registry_client(wsgi.verifier_private_key)
+        try:
+            with wsgi.admission.admit(wsgi.verifier_address):
+                groups = await asyncio.to_thread(client.verify_documents, app_id, document_hashes)
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        wsgi.state_changed(app_id)
+
+        return jsonify(wsgi.batch_verification_summary(app_id, groups))
+    except wsgi.RequestRejected as e:
+        return wsgi.rejected_response(e)
+    except Overloaded as e:
+        return wsgi.overloaded_response(e)
+    except Exception as e:
+        if is_overload(e):
+            return wsgi.node_unavailable_response(e)
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/document/status', methods=['GET'])
+@app.route('/api/apps/<int:app_id>/status', methods=['GET'])
+async def get_compliance_status(app_id=None):
+    """Get compliance status of an app's document (?app_id=, default APP_ID) - Public endpoint"""
+    try:
+        app_id = app_id or request.args.get('app_id', type=int) or wsgi.APP_ID
+        if not app_id:
+            return jsonify({"success": False, "error": "No deployed app ID found"}), 400
+
+        status = await compliance_client(wsgi.admin_private_key).get_compliance_status(app_id)
+        return jsonify({"success": True, "status": wsgi.describe_status(status)})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/apps', methods=['GET'])
+async def list_apps():
+    """Every known compliance app with its current document - Public endpoint"""
+    try:
+        app_ids = await asyncio.to_thread(wsgi.known_app_ids)
+        client = compliance_client(wsgi.admin_private_key)
+        results = await asyncio.gather(*[client.get_compliance_status(app_id) for app_id in app_ids],
+                                       return_exceptions=True)
+        states = {app_id: None if isinstance(result, Exception) else result
+                  for app_id, result in zip(app_ids, results)}
+        return jsonify(wsgi.apps_summary(states))
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/admission', methods=['GET'])
+async def admission_status():
+    """Writes in flight, the current write limit and shed counts - Public endpoint"""
+    return jsonify({"success": True, "admission": wsgi.admission.stats()})
+
+
+@app.route('/api/document/verify-many', methods=['POST'])
+async def verify_many_documents():
+    """Resolve a list of document digests against every known compliance app - Public endpoint"""
+    try:
+        digests = wsgi.parse_digests(request.mimetype, await request.get_data(as_text=True))
+
+        # The document index reads app state with the sync client; keep it off the event loop
+        results = await asyncio.to_thread(lambda: list(wsgi.resolve_digests(digests)))
+
+        wants_ndjson = 'application/x-ndjson' in request.headers.get('Accept', '')
+        if wants_ndjson or len(digests) > wsgi.VERIFY_MANY_STREAM_THRESHOLD:
+            async def generate():
+                for result in results:
+                    yield (json.dumps(result) + "\n").encode()
+            return Response(generate(), mimetype='application/x-ndjson')
+
+        return jsonify(wsgi.verify_many_summary(results))
+    except wsgi.RequestRejected as e:
+        return wsgi.rejected_response(e)
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@app.route('/api/verifier/status', methods=['GET'])
+async def verifier_status():
+    """Check if an account has verifier role"""
+    address = request.args.get('address')
+    if not address:
+        return jsonify({"success": False, "error": "Address parameter is required"}), 400
+    return jsonify({"success": True, "is_verifier": address == wsgi.verifier_address})
+
+
+@app.route('/api/account/status', methods=['GET'])
+async def account_status():
+    """Check if an account is a verifier and if it's opted in to the compliance contract"""
+    try:
+        address = request.args.get('address')
+        if not address:
+            return jsonify({"success": False, "error": "Address parameter is required"}), 400
+
+        account_info = await clients["indexer"].account_info(address)
+        return jsonify(wsgi.account_status_summary(address, account_info))
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5047)))
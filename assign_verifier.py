@@ -23,7 +23,7 @@ def wait_for_confirmation(client, txid):
 # -------- CONFIG --------
 ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"  # Free public endpoint
 ALGOD_TOKEN = ""  # No token needed for AlgoNode public API
-APP_ID = 744053057  # From app.py
+APP_ID = int(os.environ.get("APP_ID", "744053057"))  # Compliance app to assign the verifier on
 
 # Load accounts from the JSON file
 try:
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# bench_async_serving.py - Concurrent-request scaling of app.py (WSGI) vs asgi_app.py (ASGI)
+#
+# Usage: python benchmarks/bench_async_serving.py [--latency 0.1] [--concurrency 1,10,50,100]
+#                                                 [--workers 4] [--route status|register]
+#                                                 [--servers wsgi,asgi]
+#
+# Both servers are started against a local algod stand-in (algod_standin.py)
+# that adds `latency` to every call. app.py runs under gunicorn with
+# `workers` sync workers, asgi_app.py under hypercorn with a single worker.
+# For each concurrency level, `concurrency` clients send requests back to
+# back; throughput and latency percentiles are reported per server. A
+# blocking server tops out near workers / (calls per request * latency)
+# requests per second; the async one should keep scaling with concurrency.
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from algod_standin import AlgodStandIn
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, port, workers, env):
+    if kind == "wsgi":
+        command = ["gunicorn", "-w", str(workers), "-b", f"127.0.0.1:{port}", "app:app"]
+    else:
+        command = ["hypercorn", "asgi_app:app", "--bind", f"127.0.0.1:{port}"]
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f"{kind} server did not start (is {command[0]} installed?)")
+
+
+def request_for(route, base_url, admin_key):
+    if route == "register":
+        body = json.dumps({"role": "admin", "private_key": admin_key, "document_content": "benchmark",
+                           "version": "1.0"}).encode()
+        return lambda: urllib.request.Request(f"{base_url}/api/document/register", data=body,
+                                              headers={"Content-Type": "application/json"})
+    return lambda: urllib.request.Request(f"{base_url}/api/document/status")
+
+
+def run_level(make_request, concurrency, requests_per_client):
+    """(requests/s, p50 ms, p95 ms, errors) with `concurrency` clients sending back to back"""
+    def client(_):
+        latencies, errors = [], 0
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(make_request(), timeout=60) as response:
+                    response.read()
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+        return latencies, errors
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for client_latencies, _ in results for latency in client_latencies)
+    errors = sum(client_errors for _, client_errors in results)
+    return (len(latencies) / elapsed, latencies[len(latencies) // 2],
+            latencies[int(len(latencies) * 0.95)], errors)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds added to every algod call")
+    parser.add_argument("--concurrency", default="1,10,50,100")
+    parser.add_argument("--requests", type=int, default=5, help="requests per client per level")
+    parser.add_argument("--workers", type=int, default=4, help="gunicorn sync workers for app.py")
+    parser.add_argument("--route", choices=("status", "register"), default="status")
+    parser.add_argument("--servers", default="wsgi,asgi")
+    args = parser.parse_args()
+
+    standin = AlgodStandIn(latency=args.latency).start()
+    indexer = AlgodStandIn(latency=args.latency, indexer=True).start()
+    # Registrations go to a scratch contract store, and admission control is
+    # lifted so every level measures serving rather than write shedding
+    scratch = tempfile.TemporaryDirectory()
+    env = dict(os.environ, ALGOD_ADDRESS=standin.address, INDEXER_ADDRESS=indexer.address,
+               CONTRACTS_DB=os.path.join(scratch.name, "contracts.db"),
+               WRITE_MAX_IN_FLIGHT="10000", WRITE_MAX_PER_SIGNER="10000")
+    with open(os.path.join(ROOT, "Compliance", "compliance_test_accounts.json")) as f:
+        admin_key = json.load(f).get("admin", {}).get("private_key", "")
+
+    print(f"route={args.route} algod latency={args.latency * 1000:.0f} ms, "
+          f"wsgi: gunicorn {args.workers} sync workers, asgi: hypercorn 1 worker")
+    print(f"{'server':<6}{'clients':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+    try:
+        for kind in args.servers.split(","):
+            port = free_port()
+            process = start_server(kind, port, args.workers, env)
+            try:
+                make_request = request_for(args.route, f"http://127.0.0.1:{port}", admin_key)
+                for concurrency in [int(c) for c in args.concurrency.split(",")]:
+                    throughput, p50, p95, errors = run_level(make_request, concurrency, args.requests)
+                    print(f"{kind:<6}{concurrency:>8}{throughput:>10.1f}{p50:>10.1f}{p95:>10.1f}{errors:>8}")
+            finally:
+                process.terminate()
+                process.wait()
+    finally:
+        standin.stop()
+        indexer.stop()
+        scratch.cleanup()
+
+
+if __name__ == "__main__":
+    main()
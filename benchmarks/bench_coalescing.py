@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# bench_coalescing.py - Upstream algod / indexer calls under a burst of identical reads
+#
+# Usage: python benchmarks/bench_coalescing.py [--requests 500] [--apps 3] [--accounts 5]
+#                                              [--latency 0.05] [--budget 2]
+#
+# Serves app.py on a threaded local server against the algod / indexer
+# stand-in (algod_standin.py) and releases `requests` concurrent clients at
+# once, spread over `apps` /api/apps/<app_id>/status keys and `accounts`
+# /api/account/status keys, as when many dashboards load together. The
+# burst is run with read coalescing off and on; for each run the number of
+# application_info / account_info calls that reached the stand-in per key
+# is reported with request latency. Exits non-zero if, with coalescing on,
+# any key needed more than `budget` upstream calls.
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from algod_standin import AlgodStandIn
+
+
+def burst(base_url, paths):
+    """Latencies (s) of one request per path, all released together"""
+    start = threading.Barrier(len(paths))
+
+    def fetch(path):
+        start.wait()
+        began = time.perf_counter()
+        with urllib.request.urlopen(base_url + path, timeout=60) as response:
+            response.read()
+        return time.perf_counter() - began
+
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+        return list(pool.map(fetch, paths))
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--apps", type=int, default=3)
+    parser.add_argument("--accounts", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--budget", type=float, default=2)
+    args = parser.parse_args()
+
+    algod = AlgodStandIn(latency=args.latency).start()
+    indexer = AlgodStandIn(latency=args.latency, indexer=True).start()
+    os.environ.update(ALGOD_ADDRESS=algod.address, INDEXER_ADDRESS=indexer.address, READINESS_INTERVAL="0")
+    from werkzeug.serving import make_server
+    import app as wsgi
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    server = make_server("127.0.0.1", 0, wsgi.app, threaded=True)
+    server.socket.listen(args.requests)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    app_ids = [900100 + i for i in range(args.apps)]
+    addresses = [chr(ord("A") + i) * 58 for i in range(args.accounts)]
+    keys = [f"/api/apps/{app_id}/status" for app_id in app_ids] + \
+           [f"/api/account/status?address={address}" for address in addresses]
+    paths = [keys[i % len(keys)] for i in range(args.requests)]
+    upstream = {f"/api/apps/{app_id}/status": (algod, f"/v2/applications/{app_id}") for app_id in app_ids}
+    upstream.update({f"/api/account/status?address={address}": (indexer, f"/v2/accounts/{address}")
+                     for address in addresses})
+
+    coalesce = wsgi.read_flights.do
+    worst = 0
+    print(f"{'coalescing':<12}{'req/s':>8}{'p50 ms':>9}{'p95 ms':>9}{'upstream/key (max)':>22}")
+    try:
+        for mode in ("off", "on"):
+            wsgi.read_flights.do = coalesce if mode == "on" else (lambda key, fn: (fn(), False))
+            wsgi.read_flights.forget()
+            wsgi.app_states.invalidate()
+            for node in (algod, indexer):
+                node.calls.clear()
+            began = time.perf_counter()
+            latencies = burst(base_url, paths)
+            elapsed = time.perf_counter() - began
+            per_key = [node.calls["GET", path] for node, path in upstream.values()]
+            mean = sum(per_key) / len(per_key)
+            print(f"{mode:<12}{len(paths) / elapsed:>8.0f}{percentile(latencies, 0.5) * 1000:>9.0f}"
+                  f"{percentile(latencies, 0.95) * 1000:>9.0f}{f'{mean:.1f} ({max(per_key)})':>22}")
+            if mode == "on":
+                worst = max(per_key)
+        stats = wsgi.read_flights.stats()
+        print(f"coalesced calls (on): {stats['coalesced']} of {stats['calls'] + stats['coalesced']}")
+    finally:
+        server.shutdown()
+        algod.stop()
+        indexer.stop()
+    sys.exit(1 if worst > args.budget else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# bench_contract_store.py - Compare contracts.json with the SQLite contract store
+#
+# Usage: python benchmarks/bench_contract_store.py [--documents 100000] [--contracts 1000]
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Compliance"))
+
+from contract_store import ContractStore
+
+
+def make_contracts(num_contracts, num_documents):
+    contracts = [{"app_id": 1000 + i, "created_at": 1754851765.0 + i, "documents": []}
+                 for i in range(num_contracts)]
+    for i in range(num_documents):
+        contracts[i % num_contracts]["documents"].append({
+            "hash": hashlib.sha256(str(i).encode()).hexdigest(),
+            "filename": f"document_{i}.pdf",
+            "version": "1.0.0",
+            "registered_at": 1754851765.0 + i,
+            "expiry_timestamp": 1786387765 + i,
+        })
+    return contracts
+
+
+def timed(fn, repeat):
+    """Median wall time of `fn` in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", type=int, default=100000)
+    parser.add_argument("--contracts", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    contracts = make_contracts(args.contracts, args.documents)
+    app_id = contracts[args.contracts // 2]["app_id"]
+    lookup_hash = hashlib.sha256(str(args.documents // 2).encode()).hexdigest()
+    counter = iter(range(10 ** 9))
+
+    def new_document():
+        n = next(counter)
+        return {"hash": hashlib.sha256(f"new-{n}".encode()).hexdigest(), "filename": f"new_{n}.pdf",
+                "version": "2.0.0", "registered_at": time.time() + n, "expiry_timestamp": 1900000000}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "contracts.json")
+        with open(json_path, "w") as f:
+            json.dump(contracts, f)
+
+        start = time.perf_counter()
+        store = ContractStore(os.path.join(tmp, "contracts.db"))
+        store.import_json(json_path)
+        import_ms = (time.perf_counter() - start) * 1000
+
+        def json_load():
+            with open(json_path, "r") as f:
+                return json.load(f)
+
+        def json_register():
+            data = json_load()
+            next(c for c in data if c["app_id"] == app_id)["documents"].append(new_document())
+            with open(json_path, "w") as f:
+                json.dump(data, f)
+
+        def json_view():
+            return next(c for c in json_load() if c["app_id"] == app_id)["documents"]
+
+        def json_stats():
+            data = json_load()
+            return len(data), sum(len(c.get("documents", [])) for c in data)
+
+        def json_find():
+            return [d for c in json_load() for d in c["documents"] if d["hash"] == lookup_hash]
+
+        rows = [
+            ("register document", json_register, lambda: store.add_document(app_id, new_document())),
+            ("view contract documents", json_view, lambda: store.get_documents(app_id)),
+            ("dashboard stats", json_stats, lambda: (store.count_contracts(), store.count_documents())),
+            ("list contracts", json_load, store.list_contracts),
+            ("find by hash", json_find, lambda: store.find_documents_by_hash(lookup_hash)),
+        ]
+
+        print(f"{args.contracts} contracts, {args.documents} documents "
+              f"(SQLite import from JSON: {import_ms:.0f} ms)")
+        print(f"{'operation':<26}{'contracts.json (ms)':>22}{'SQLite (ms)':>14}{'speedup':>10}")
+        for name, json_fn, sqlite_fn in rows:
+            json_ms = timed(json_fn, args.repeat)
+            sqlite_ms = timed(sqlite_fn, args.repeat)
+            print(f"{name:<26}{json_ms:>22.3f}{sqlite_ms:>14.3f}{json_ms / max(sqlite_ms, 1e-6):>9.0f}x")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
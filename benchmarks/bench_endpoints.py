@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+# bench_endpoints.py - Throughput, latency percentiles and allocations of every app.py and dashboard endpoint
+#
+# Usage: python benchmarks/bench_endpoints.py [--apps app,dashboard] [--modes client,http]
+#                                             [--requests 100] [--repeat 3] [--concurrency 4] [--latency 0.0]
+#                                             [--routes TEXT] [--output bench_endpoints.json]
+#                                             [--baseline benchmarks/baseline_endpoints.json]
+#                                             [--threshold 0.5] [--update-baseline]
+#
+# Starts the algod / indexer stand-in (algod_standin.py) in its own process,
+# deploys a compliance app on it and imports app.py and the compliance
+# dashboard (Compliance/flask_app/api.py) with their databases and uploads
+# in a temporary directory. Every route of both apps is then driven
+# `requests` times, `repeat` times over, keeping each metric at its best
+# run so that interference from other processes does not count:
+#
+#   client  through the Flask test client, one request after another; a
+#           second, shorter pass records the peak memory traced while
+#           serving each request (tracemalloc), reported as KiB/request
+#   http    through a threaded werkzeug server on a local port, from
+#           `concurrency` keep-alive connections
+#
+# Writes are real stand-in transactions, and dashboard writes are only
+# queued (JOB_WORKERS=0), so the numbers are the servers' own cost. Results
+# (req/s, p50/p95/p99 ms, KiB/request, errors) go to `output` as JSON and
+# are compared with `baseline`: a case regresses when its p95 latency or
+# KiB/request grows, or its req/s drops, by more than `threshold`, or it
+# answers with an unexpected status more often. Differences within the
+# noise floors below are ignored. Exits 1 on any regression.
+#
+# The checked-in baseline was recorded on one development machine; after
+# moving the benchmark to other hardware, record a new one there with
+# --update-baseline before comparing.
+
+import argparse
+import datetime
+import hashlib
+import http.client
+import io
+import json
+import logging
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DASHBOARD_DIR = os.path.join(ROOT, "Compliance", "flask_app")
+sys.path.append(ROOT)
+
+from run_offline import deploy_compliance_app, free_port
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline_endpoints.json")
+ALLOC_SAMPLES = 50          # Requests per case in the allocation pass
+LATENCY_FLOOR_MS = 1.0      # Latency differences below this are noise
+ALLOC_FLOOR_KIB = 4.0       # So are allocation differences below this
+REGISTRY_APP_ID = 900500    # Unknown to the stand-in, which accepts any call to it
+JSON_ACCEPT = {"Accept": "application/json"}
+DOCUMENT = b"Benchmark compliance document\n" * 128
+DIGESTS = [hashlib.sha256(f"benchmark document {n}".encode()).hexdigest() for n in range(8)]
+
+
+def start_standin(latency):
+    """Algod and indexer stand-ins over one ledger, in a child process; returns (process, algod, indexer)"""
+    algod_port, indexer_port = free_port(), free_port()
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, "algod_standin.py"), "--port", str(algod_port),
+                                "--indexer-port", str(indexer_port), "--latency", str(latency)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for port in (algod_port, indexer_port):
+        deadline = time.time() + 30
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1).close()
+                break
+            except OSError:
+                if process.poll() is not None or time.time() > deadline:
+                    process.kill()
+                    raise RuntimeError("algod stand-in did not start")
+                time.sleep(0.1)
+    return process, f"http://127.0.0.1:{algod_port}", f"http://127.0.0.1:{indexer_port}"
+
+
+def load_servers(algod_address, indexer_address, tmp):
+    """Import app.py and the dashboard against the stand-in, keeping their files under `tmp`"""
+    app_id = deploy_compliance_app(algod_address)
+    os.environ.update(ALGOD_ADDRESS=algod_address, INDEXER_ADDRESS=indexer_address, APP_ID=str(app_id),
+                      REGISTRY_APP_ID=str(REGISTRY_APP_ID), READINESS_INTERVAL="0", JOB_WORKERS="0",
+                      CONTRACTS_DB=os.path.join(tmp, "contracts.db"), JOBS_DB=os.path.join(tmp, "jobs.db"))
+    import app as wsgi
+    sys.path.insert(0, DASHBOARD_DIR)
+    import api as dashboard
+
+    wsgi.UPLOAD_FOLDER = os.path.join(tmp, "uploads")
+    wsgi.upload_sessions = wsgi.UploadSessionStore(os.path.join(wsgi.UPLOAD_FOLDER, ".sessions"))
+    dashboard.app.config["UPLOAD_FOLDER"] = os.path.join(tmp, "documents")
+    os.makedirs(dashboard.app.config["UPLOAD_FOLDER"])
+    dashboard.upload_sessions = dashboard.UploadSessionStore(os.path.join(tmp, "upload_sessions"))
+    dashboard.chunk_cache = dashboard.ChunkHashCache(os.path.join(tmp, "chunk_cache"))
+    with open(os.path.join(dashboard.app.config["UPLOAD_FOLDER"], "benchmark.txt"), "wb") as f:
+        f.write(DOCUMENT)
+
+    # The verifier may verify, and the app holds a document, whichever cases run
+    admin = wsgi.compliance_client(wsgi.admin_private_key)
+    admin.assign_verifier(app_id, wsgi.verifier_address)
+    admin.register_document_hash(app_id, hashlib.sha256(DOCUMENT).hexdigest(), "1.0", int(time.time()) + 31536000)
+    dashboard.contract_store.add_contract(app_id)
+    return wsgi, dashboard
+
+
+def case(method, rule, path=None, expect=200, prepare=None, **kwargs):
+    """
+    One benchmarked route. `path` is the URL to request (default: `rule`),
+    or a function (i, prepared) -> (URL, test client arguments) for requests
+    that differ; `prepare(count)` sets up what `count` requests consume and
+    is passed to it as `prepared`.
+    """
+    if not callable(path):
+        url = path or rule
+        path = lambda i, prepared: (url, kwargs)
+    return {"name": f"{method} {rule}", "method": method, "build": path, "expect": expect, "prepare": prepare}
+
+
+def new_sessions(store, count, written=True, metadata=None):
+    """Ids of `count` upload sessions of DOCUMENT, with its single chunk stored if `written`"""
+    session_ids = []
+    for _ in range(count):
+        session = store.create("benchmark.txt", len(DOCUMENT), metadata=metadata)
+        if written:
+            store.write_chunk(session["session_id"], 0, io.BytesIO(DOCUMENT))
+        session_ids.append(session["session_id"])
+    return session_ids
+
+
+def file_form(field, **form):
+    """Multipart form data uploading DOCUMENT as `field` (a fresh stream per request)"""
+    return dict(form, **{field: (io.BytesIO(DOCUMENT), "benchmark.txt")})
+
+
+def app_cases(wsgi):
+    app_id = wsgi.APP_ID
+    admin = {"role": "admin", "private_key": wsgi.admin_private_key}
+    verifier = {"role": "verifier", "private_key": wsgi.verifier_private_key}
+    digest = hashlib.sha256(DOCUMENT).hexdigest()
+    sessions = lambda count: new_sessions(wsgi.upload_sessions, count)
+    one_session = lambda count: new_sessions(wsgi.upload_sessions, 1)
+
+    def register(url):
+        return lambda i, prepared: (url, {"json": dict(admin, document_content=f"benchmark document {i}",
+                                                       version="1.0")})
+
+    return [
+        case("POST", "/api/document/hash", json={"document_content": DOCUMENT.decode()}),
+        case("POST", "/api/upload", lambda i, prepared: ("/api/upload", {"data": file_form("file")})),
+        case("POST", "/api/upload/sessions", expect=201,
+             json={"filename": "benchmark.txt", "total_size": len(DOCUMENT)}),
+        case("GET", "/api/upload/sessions/<session_id>",
+             lambda i, ids: (f"/api/upload/sessions/{ids[0]}", {}), prepare=one_session),
+        case("PUT", "/api/upload/sessions/<session_id>/chunks/<int:index>",
+             lambda i, ids: (f"/api/upload/sessions/{ids[0]}/chunks/0", {"data": DOCUMENT}), prepare=one_session),
+        case("POST", "/api/upload/sessions/<session_id>/commit",
+             lambda i, ids: (f"/api/upload/sessions/{ids[i]}/commit", {"json": {}}), prepare=sessions),
+        case("DELETE", "/api/upload/sessions/<session_id>",
+             lambda i, ids: (f"/api/upload/sessions/{ids[i]}", {}), prepare=sessions),
+        case("POST", "/api/document/register", register("/api/document/register")),
+        case("POST", "/api/apps/<int:app_id>/documents", register(f"/api/apps/{app_id}/documents")),
+        case("POST", "/api/verifier/assign", json=dict(admin, verifier_address=wsgi.verifier_address)),
+        case("POST", "/api/apps/<int:app_id>/verifier", f"/api/apps/{app_id}/verifier",
+             json=dict(admin, verifier_address=wsgi.verifier_address)),
+        case("POST", "/api/document/verify", json=dict(verifier, document_hash=digest)),
+        case("POST", "/api/apps/<int:app_id>/verify", f"/api/apps/{app_id}/verify",
+             json=dict(verifier, document_hash=digest)),
+        case("POST", "/api/document/verify/batch", json=dict(verifier, document_hashes=DIGESTS)),
+        case("GET", "/api/document/status"),
+        case("GET", "/api/apps/<int:app_id>/status", f"/api/apps/{app_id}/status"),
+        case("GET", "/api/apps"),
+        case("GET", "/api/admission"),
+        case("POST", "/api/document/verify-many", json={"digests": [digest] + DIGESTS}),
+        case("POST", "/api/login/verifier", json={"private_key": wsgi.verifier_private_key}),
+        case("GET", "/api/admin/status", f"/api/admin/status?address={wsgi.admin_address}"),
+        case("GET", "/api/verifier/status", f"/api/verifier/status?address={wsgi.verifier_address}"),
+        case("GET", "/api/account/status", f"/api/account/status?address={wsgi.verifier_address}"),
+        case("GET", "/"),
+        case("GET", "/<path:path>", "/contracts"),
+        case("GET", "/metrics"),
+        case("GET", "/readyz"),
+    ]
+
+
+def dashboard_cases(dashboard, app_id):
+    store = lambda: dashboard.upload_sessions
+    sessions = lambda count: new_sessions(store(), count, metadata={"app_id": app_id})
+    one_session = lambda count: new_sessions(store(), 1, metadata={"app_id": app_id})
+    uploads = f"/api/contracts/{app_id}/uploads"
+
+    def queued_job(count):
+        return [dashboard.job_queue.enqueue("verify_compliance", {"app_id": app_id}, app_id=app_id)["id"]]
+
+    return [
+        case("GET", "/"),
+        case("POST", "/contracts", expect=202, headers=JSON_ACCEPT),
+        case("GET", "/contracts/<int:app_id>", f"/contracts/{app_id}"),
+        case("POST", "/contracts/<int:app_id>/opt-in", f"/contracts/{app_id}/opt-in", expect=302,
+             data={"role": "verifier"}),
+        case("POST", "/contracts/<int:app_id>/documents",
+             lambda i, prepared: (f"/contracts/{app_id}/documents",
+                                  {"data": file_form("document", version="1.0"), "headers": JSON_ACCEPT}), expect=202),
+        case("POST", "/api/contracts/<int:app_id>/uploads", uploads, expect=201,
+             json={"filename": "benchmark.txt", "total_size": len(DOCUMENT)}),
+        case("GET", "/api/contracts/<int:app_id>/uploads/<session_id>",
+             lambda i, ids: (f"{uploads}/{ids[0]}", {}), prepare=one_session),
+        case("PUT", "/api/contracts/<int:app_id>/uploads/<session_id>/chunks/<int:index>",
+             lambda i, ids: (f"{uploads}/{ids[0]}/chunks/0", {"data": DOCUMENT}), prepare=one_session),
+        case("POST", "/api/contracts/<int:app_id>/uploads/<session_id>/commit",
+             lambda i, ids: (f"{uploads}/{ids[i]}/commit", {"json": {"version": "1.0"}, "headers": JSON_ACCEPT}),
+             expect=202, prepare=sessions),
+        case("DELETE", "/api/contracts/<int:app_id>/uploads/<session_id>",
+             lambda i, ids: (f"{uploads}/{ids[i]}", {}), prepare=sessions),
+        case("POST", "/contracts/<int:app_id>/verifiers", f"/contracts/{app_id}/verifiers", expect=202,
+             data={"verifier_address": dashboard.load_accounts()["verifier"]["address"]}, headers=JSON_ACCEPT),
+        case("POST", "/contracts/<int:app_id>/verify", f"/contracts/{app_id}/verify", expect=202,
+             headers=JSON_ACCEPT),
+        case("GET", "/documents/<filename>", "/documents/benchmark.txt"),
+        case("GET", "/documents/<filename>/preview", "/documents/benchmark.txt/preview"),
+        case("GET", "/api/transactions/<int:app_id>", f"/api/transactions/{app_id}"),
+        case("GET", "/api/contracts"),
+        case("GET", "/api/documents", f"/api/documents?app_id={app_id}"),
+        case("GET", "/api/jobs"),
+        case("GET", "/api/jobs/<int:job_id>", lambda i, ids: (f"/api/jobs/{ids[0]}", {}), prepare=queued_job),
+        case("GET", "/api/contract-stats"),
+        case("GET", "/metrics"),
+        case("GET", "/readyz"),
+    ]
+
+
+def uncovered_routes(flask_app, cases):
+    """'METHOD rule' of every route no case drives"""
+    names = {benchmark["name"] for benchmark in cases}
+    routes = [f"{method} {rule.rule}" for rule in flask_app.url_map.iter_rules() if rule.endpoint != "static"
+              for method in sorted(rule.methods - {"HEAD", "OPTIONS"})]
+    return [route for route in routes if route not in names]
+
+
+def requests_for(benchmark, count):
+    prepared = benchmark["prepare"](count) if benchmark["prepare"] else None
+    return [benchmark["build"](i, prepared) for i in range(count)]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def summarize(latencies, errors, elapsed, alloc_kib=None):
+    return {"requests": len(latencies), "errors": errors, "rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 0.5) * 1000, 3),
+            "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            "alloc_kib": None if alloc_kib is None else round(alloc_kib, 1)}
+
+
+def run_client(flask_app, benchmark, count):
+    """Sequential timing pass, then a shorter pass measuring traced memory per request"""
+    client = flask_app.test_client()
+    method, expect = benchmark["method"], benchmark["expect"]
+    latencies, errors = [], 0
+    requests = requests_for(benchmark, count)
+    began = time.perf_counter()
+    for url, kwargs in requests:
+        start = time.perf_counter()
+        response = client.open(url, method=method, **kwargs)
+        response.get_data()
+        latencies.append(time.perf_counter() - start)
+        errors += response.status_code != expect
+        response.close()
+    elapsed = time.perf_counter() - began
+
+    peaks = []
+    requests = requests_for(benchmark, min(count, ALLOC_SAMPLES))
+    tracemalloc.start()
+    try:
+        for url, kwargs in requests:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            response = client.open(url, method=method, **kwargs)
+            response.get_data()
+            response.close()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return summarize(latencies, errors, elapsed, sum(peaks) / len(peaks) / 1024)
+
+
+def encode(method, url, kwargs):
+    """(method, URL, body, headers) of the request the test client would make, for http.client"""
+    from werkzeug.test import EnvironBuilder
+    builder = EnvironBuilder(path=url, method=method, **kwargs)
+    try:
+        environ = builder.get_environ()
+        body = environ["wsgi.input"].read()
+    finally:
+        builder.close()
+    headers = {key[5:].replace("_", "-").title(): value for key, value in environ.items()
+               if key.startswith("HTTP_") and key != "HTTP_HOST"}
+    if environ.get("CONTENT_TYPE"):
+        headers["Content-Type"] = environ["CONTENT_TYPE"]
+    headers["Content-Length"] = str(len(body))
+    return method, url, body, headers
+
+
+def send_all(port, requests, expect):
+    """Latencies (s) and unexpected statuses of `requests`, sent over one keep-alive connection"""
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    latencies, errors = [], 0
+    try:
+        for method, url, body, headers in requests:
+            start = time.perf_counter()
+            connection.request(method, url, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            latencies.append(time.perf_counter() - start)
+            errors += response.status != expect
+    finally:
+        connection.close()
+    return latencies, errors
+
+
+def run_http(port, benchmark, count, concurrency):
+    requests = [encode(benchmark["method"], url, kwargs) for url, kwargs in requests_for(benchmark, count)]
+    outcomes = [None] * concurrency
+
+    def worker(n):
+        outcomes[n] = send_all(port, requests[n::concurrency], benchmark["expect"])
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(concurrency)]
+    began = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - began
+    latencies = [latency for outcome in outcomes for latency in outcome[0]]
+    return summarize(latencies, sum(outcome[1] for outcome in outcomes), elapsed)
+
+
+def best_of(runs):
+    """Each metric of repeated runs at its best"""
+    best = dict(runs[0])
+    for run in runs[1:]:
+        best["rps"] = max(best["rps"], run["rps"])
+        best["errors"] = max(best["errors"], run["errors"])
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "alloc_kib"):
+            if run[metric] is not None:
+                best[metric] = min(best[metric], run[metric])
+    return best
+
+
+def compare(results, baseline, threshold):
+    """(key, metric, baseline value, current value) of every regression beyond `threshold`"""
+    regressions = []
+    for key, now in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        if now["errors"] > before["errors"]:
+            regressions.append((key, "errors", before["errors"], now["errors"]))
+        if (now["p95_ms"] > before["p95_ms"] * (1 + threshold)
+                and now["p95_ms"] - before["p95_ms"] > LATENCY_FLOOR_MS):
+            regressions.append((key, "p95_ms", before["p95_ms"], now["p95_ms"]))
+        # Compared as time per request, so fast routes get the same floor
+        if (now["rps"] < before["rps"] * (1 - threshold)
+                and 1000 / now["rps"] - 1000 / before["rps"] > LATENCY_FLOOR_MS):
+            regressions.append((key, "rps", before["rps"], now["rps"]))
+        if (now["alloc_kib"] is not None and before.get("alloc_kib") is not None
+                and now["alloc_kib"] > before["alloc_kib"] * (1 + threshold)
+                and now["alloc_kib"] - before["alloc_kib"] > ALLOC_FLOOR_KIB):
+            regressions.append((key, "alloc_kib", before["alloc_kib"], now["alloc_kib"]))
+    return regressions
+
+
+def print_row(name, result):
+    alloc = "-" if result["alloc_kib"] is None else f"{result['alloc_kib']:.1f}"
+    print(f"{name:<74}{result['rps']:>9.0f}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+          f"{result['p99_ms']:>9.2f}{alloc:>9}{result['errors']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--apps", default="app,dashboard")
+    parser.add_argument("--modes", default="client,http")
+    parser.add_argument("--requests", type=int, default=100, help="requests per route, mode and run")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per route and mode; the best counts")
+    parser.add_argument("--concurrency", type=int, default=4, help="connections in http mode")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every node response")
+    parser.add_argument("--routes", default=None, help="only routes whose 'METHOD rule' contains this text")
+    parser.add_argument("--output", default=os.path.join(ROOT, "bench_endpoints.json"))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.5, help="relative change counted as a regression")
+    parser.add_argument("--update-baseline", action="store_true", help="record these results as the baseline")
+    args = parser.parse_args()
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    from werkzeug.serving import make_server
+
+    standin, algod_address, indexer_address = start_standin(args.latency)
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            wsgi, dashboard = load_servers(algod_address, indexer_address, tmp)
+            apps = {"app": (wsgi.app, app_cases(wsgi)),
+                    "dashboard": (dashboard.app, dashboard_cases(dashboard, wsgi.APP_ID))}
+            print(f"{'route':<74}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'KiB/req':>9}{'errors':>7}")
+            for app_name in args.apps.split(","):
+                flask_app, cases = apps[app_name]
+                if args.routes is None:
+                    for route in uncovered_routes(flask_app, cases):
+                        print(f"{app_name}: not benchmarked: {route}")
+                cases = [benchmark for benchmark in cases if args.routes is None or args.routes in benchmark["name"]]
+                for mode in args.modes.split(","):
+                    print(f"-- {app_name} ({mode})")
+                    server = None
+                    if mode == "http":
+                        server = make_server("127.0.0.1", 0, flask_app, threaded=True)
+                        threading.Thread(target=server.serve_forever, daemon=True).start()
+                    try:
+                        for benchmark in cases:
+                            if mode == "http":
+                                runs = [run_http(server.server_port, benchmark, args.requests, args.concurrency)
+                                        for _ in range(args.repeat)]
+                            else:
+                                runs = [run_client(flask_app, benchmark, args.requests) for _ in range(args.repeat)]
+                            result = best_of(runs)
+                            results[f"{app_name}:{mode}:{benchmark['name']}"] = result
+                            print_row(benchmark["name"], result)
+                    finally:
+                        if server:
+                            server.shutdown()
+            dashboard.job_queue.close()
+            dashboard.contract_store.close()
+    finally:
+        standin.terminate()
+        standin.wait(timeout=10)
+
+    report = {"meta": {"recorded_at": datetime.datetime.now().isoformat(timespec="seconds"),
+                       "python": platform.python_version(), "platform": platform.platform(),
+                       "requests": args.requests, "repeat": args.repeat, "concurrency": args.concurrency, "latency": args.latency},
+              "results": results}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=1, sort_keys=True)
+    print(f"results written to {args.output}")
+
+    if args.update_baseline:
+        baseline = {"results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline["meta"] = report["meta"]
+        baseline["results"].update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+        print(f"baseline updated: {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; record one with --update-baseline")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)["results"]
+    regressions = compare(results, baseline, args.threshold)
+    compared = sum(1 for key in results if key in baseline)
+    print(f"{compared} of {len(results)} results compared with {args.baseline} (threshold {args.threshold:.0%})")
+    for key, metric, before, now in regressions:
+        print(f"REGRESSION {key} {metric}: {before} -> {now}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# bench_json.py - Serialization time and peak memory of large JSON responses
+#
+# Usage: python benchmarks/bench_json.py [--sizes 1000,10000,100000] [--repeat 5]
+#
+# For a transaction listing of each size, and for an indexer account object
+# with that many apps in its local state, times a full jsonify() through
+# Flask's default provider and through FastJSONProvider with each available
+# encoder, then a streamed JSON body and a streamed NDJSON body. Peak memory
+# is what tracemalloc sees while the body is produced; streamed bodies are
+# consumed chunk by chunk as a WSGI server would.
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Compliance"))
+
+from flask import Flask, jsonify
+
+from fast_json import ENCODERS, install_json_provider, list_response
+
+
+def transactions(count):
+    return [{"type": "Document Registration", "status": "confirmed", "timestamp": 1754851765 + i,
+             "txid": f"{i:052d}", "sender": "ADMIN" * 11 + "XYZ", "app_id": 744059516,
+             "confirmed-round": 52000000 + i, "note": "registered v1.0.0"} for i in range(count)]
+
+
+def account(apps):
+    return {"current-round": 52000000, "account": {
+        "address": "A" * 58, "amount": 10000000, "status": "Offline",
+        "apps-local-state": [{"id": 744059516 + i, "schema": {"num-uint": 1, "num-byte-slice": 0},
+                              "key-value": [{"key": "dmVyaWZpZXI=", "value": {"type": 2, "uint": i, "bytes": ""}}]}
+                             for i in range(apps)]}}
+
+
+def measure(produce, repeat):
+    """(median ms, peak MiB) to produce and consume a response body"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        produce()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+
+    tracemalloc.start()
+    produce()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return samples[len(samples) // 2], peak / (1024 * 1024)
+
+
+def full_body(app, payload):
+    def produce():
+        with app.app_context():
+            return jsonify(payload).get_data()
+    return produce
+
+
+def streamed_body(app, items, ndjson):
+    def produce():
+        with app.test_request_context():
+            response = list_response(items, key=None if ndjson else "transactions", ndjson=ndjson)
+            for _ in response.response:
+                pass
+    return produce
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    apps = {"flask default": Flask(__name__)}
+    for name in sorted(ENCODERS):
+        apps[name] = Flask(__name__)
+        install_json_provider(apps[name], name)
+
+    print(f"{'payload':<22}{'body':<24}{'ms':>10}{'peak MiB':>10}")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        rows = transactions(size)
+        for name, app in apps.items():
+            ms, peak = measure(full_body(app, {"transactions": rows}), args.repeat)
+            print(f"{f'{size} transactions':<22}{f'jsonify, {name}':<24}{ms:>10.1f}{peak:>10.2f}")
+        for name, app in apps.items():
+            if name == "flask default":
+                continue
+            for ndjson in (False, True):
+                ms, peak = measure(streamed_body(app, rows, ndjson), args.repeat)
+                body = f"{'NDJSON' if ndjson else 'stream'}, {name}"
+                print(f"{f'{size} transactions':<22}{body:<24}{ms:>10.1f}{peak:>10.2f}")
+
+        lookup = account(size)
+        for name, app in apps.items():
+            ms, peak = measure(full_body(app, {"success": True, "account": lookup}), args.repeat)
+            print(f"{f'account, {size} apps':<22}{f'jsonify, {name}':<24}{ms:>10.1f}{peak:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
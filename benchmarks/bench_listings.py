@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# bench_listings.py - Keyset vs OFFSET pagination of contract and document listings
+#
+# Usage: python benchmarks/bench_listings.py [--sizes 1000,10000,100000] [--page-size 50]
+#
+# For each table size, times the first page and a page near the end of every
+# sort order. Keyset pages should stay flat as the table grows; OFFSET pages
+# grow with the depth of the page.
+
+import argparse
+import hashlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Compliance"))
+
+from contract_store import ContractStore, CONTRACT_SORTS, DOCUMENT_SORTS, encode_cursor, _SELECT_COLUMNS
+
+STATUSES = ("pending", "compliant", "expired")
+
+
+def populate(store, num_documents):
+    """One contract per document, so both listings hold `num_documents` rows"""
+    conn = store._connection()
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO contracts (app_id, created_at, status, expiry_timestamp) VALUES (?, ?, ?, ?)",
+        [(1000 + i, 1754851765.0 + i, STATUSES[i % 3], 1786387765 + (i * 7919) % num_documents)
+         for i in range(num_documents)])
+    conn.executemany(
+        f"INSERT INTO documents (app_id, {_SELECT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [(1000 + i, hashlib.sha256(str(i).encode()).hexdigest(), f"document_{i}.pdf", "1.0.0",
+          1754851765.0 + i, 1786387765 + (i * 7919) % num_documents, None, None, STATUSES[i % 3])
+         for i in range(num_documents)])
+    conn.execute("COMMIT")
+    conn.execute("ANALYZE")
+
+
+def timed(fn, repeat):
+    """Median wall time of `fn` in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def deep_cursor(store, table, key, tiebreak, depth):
+    """Cursor of the row at `depth`, as a client paging that far would hold"""
+    row = store._connection().execute(
+        f"SELECT {key}, {tiebreak} FROM {table} ORDER BY {key}, {tiebreak} LIMIT 1 OFFSET ?", (depth,)).fetchone()
+    return encode_cursor(row[0], row[1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8}  {'sort':<11}{'first page':>12}{'keyset deep':>13}{'offset deep':>13}"
+          f"{'contracts deep':>16}   (ms, median of {args.repeat})")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = ContractStore(os.path.join(tmp, "contracts.db"))
+            populate(store, size)
+            depth = size - args.page_size - 1
+            conn = store._connection()
+
+            for sort, key in DOCUMENT_SORTS.items():
+                cursor = deep_cursor(store, "documents", key, "id", depth)
+                contract_cursor = deep_cursor(store, "contracts", CONTRACT_SORTS[sort], "app_id", depth)
+
+                first = timed(lambda: store.page_documents(sort=sort, limit=args.page_size), args.repeat)
+                keyset = timed(lambda: store.page_documents(sort=sort, cursor=cursor, limit=args.page_size),
+                               args.repeat)
+                offset = timed(lambda: conn.execute(
+                    f"SELECT id, app_id, {_SELECT_COLUMNS} FROM documents ORDER BY {key}, id LIMIT ? OFFSET ?",
+                    (args.page_size, depth)).fetchall(), args.repeat)
+                contracts = timed(lambda: store.page_contracts(sort=sort, cursor=contract_cursor,
+                                                               limit=args.page_size), args.repeat)
+                print(f"{size:>8}  {sort:<11}{first:>12.3f}{keyset:>13.3f}{offset:>13.3f}{contracts:>16.3f}")
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# bench_metrics.py - Per-request cost of the latency histograms behind /metrics
+#
+# Usage: python benchmarks/bench_metrics.py [--repeat 20] [--requests 2000] [--budget-us 50]
+#
+# Sends the same requests through a bare Flask app and through one set up
+# with instrument_flask, and calls a stub algod method bare and wrapped with
+# instrument_client. Prints the added time per request and per client call
+# (medians), plus the time to render /metrics, and exits non-zero if the
+# per-request overhead exceeds the budget.
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Compliance"))
+
+from flask import Flask, jsonify
+
+from metrics import MetricsRegistry, instrument_client, instrument_flask
+
+
+class StubAlgod:
+    def application_info(self, app_id):
+        return {"id": app_id}
+
+
+def make_app(registry=None):
+    app = Flask(__name__)
+
+    @app.route("/api/document/status")
+    def status():
+        return jsonify({"success": True})
+
+    @app.route("/api/contracts/<int:app_id>")
+    def contract(app_id):
+        return jsonify({"app_id": app_id})
+
+    if registry is not None:
+        instrument_flask(app, registry)
+    return app
+
+
+def timed(fn, repeat):
+    """Median wall time of `fn` in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def per_request_us(app, requests, repeat):
+    client = app.test_client()
+    paths = ["/api/document/status", "/api/contracts/7", "/missing"]
+
+    def run():
+        for i in range(requests):
+            client.get(paths[i % len(paths)])
+
+    run()  # warm up
+    return timed(run, repeat) * 1000 / requests
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--calls", type=int, default=100000)
+    parser.add_argument("--budget-us", type=float, default=50.0)
+    args = parser.parse_args()
+
+    registry = MetricsRegistry()
+    bare = per_request_us(make_app(), args.requests, args.repeat)
+    instrumented = per_request_us(make_app(registry), args.requests, args.repeat)
+
+    stub, wrapped = StubAlgod(), instrument_client(StubAlgod(), "algod", registry)
+
+    def calls(client):
+        return lambda: [client.application_info(1) for _ in range(args.calls)]
+
+    call_bare = timed(calls(stub), args.repeat) * 1000 / args.calls
+    call_wrapped = timed(calls(wrapped), args.repeat) * 1000 / args.calls
+    render_ms = timed(registry.render, args.repeat)
+
+    overhead = instrumented - bare
+    print(f"{'':<26}{'bare us':>10}{'timed us':>10}{'added us':>10}   (median of {args.repeat})")
+    print(f"{'request (test client)':<26}{bare:>10.2f}{instrumented:>10.2f}{overhead:>10.2f}")
+    print(f"{'algod method call':<26}{call_bare:>10.3f}{call_wrapped:>10.3f}{call_wrapped - call_bare:>10.3f}")
+    print(f"render /metrics: {render_ms:.3f} ms for {len(registry.render().splitlines())} lines")
+
+    if overhead > args.budget_us:
+        print(f"FAIL: request overhead {overhead:.2f} us exceeds the {args.budget_us:.0f} us budget")
+        return 1
+    print(f"OK: request overhead {overhead:.2f} us is within the {args.budget_us:.0f} us budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
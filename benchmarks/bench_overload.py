@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# bench_overload.py - Write goodput of app.py as offered load exceeds the node's capacity
+#
+# Usage: python benchmarks/bench_overload.py [--clients 4,16,64,200] [--duration 5]
+#                                            [--latency 0.05] [--node-capacity 16]
+#
+# Serves app.py on a threaded local server against an algod stand-in that
+# answers `latency` seconds late and returns 429 beyond `node-capacity`
+# concurrent requests. For each client count, that many clients register
+# documents back to back for `duration` seconds. A client turned away with
+# 429 waits for its Retry-After; one that gets an error retries at once.
+# Reported with admission control off and on: goodput (registrations that
+# succeeded per second), shed and failed requests, and p95 latency of the
+# successful ones. Goodput should level off as load grows, not collapse.
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from algod_standin import AlgodStandIn
+
+
+def register(base_url, body):
+    request = urllib.request.Request(base_url + "/api/document/register", data=json.dumps(body).encode(),
+                                     headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            return response.status, 0
+    except urllib.error.HTTPError as e:
+        return e.code, int(e.headers.get("Retry-After") or 0)
+
+
+def offer_load(base_url, body, clients, duration):
+    """(goodput per s, shed, failed, p95 s of successes)"""
+    deadline = time.monotonic() + duration
+    lock = threading.Lock()
+    outcome = {"ok": [], "shed": 0, "failed": 0}
+
+    def client(n):
+        count = 0
+        while time.monotonic() < deadline:
+            count += 1
+            began = time.monotonic()
+            status, retry_after = register(base_url, dict(body, document_content=f"client {n} document {count}"))
+            with lock:
+                if status == 200:
+                    outcome["ok"].append(time.monotonic() - began)
+                elif status == 429:
+                    outcome["shed"] += 1
+                else:
+                    outcome["failed"] += 1
+            if status == 429:
+                time.sleep(min(retry_after, max(0, deadline - time.monotonic())))
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    started = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+    ok = sorted(outcome["ok"])
+    p95 = ok[min(len(ok) - 1, int(len(ok) * 0.95))] if ok else 0
+    return len(ok) / elapsed, outcome["shed"], outcome["failed"], p95
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", default="4,16,64,200")
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--node-capacity", type=int, default=16)
+    args = parser.parse_args()
+
+    algod = AlgodStandIn(latency=args.latency, max_concurrent=args.node_capacity).start()
+    indexer = AlgodStandIn(indexer=True).start()
+    os.environ.update(ALGOD_ADDRESS=algod.address, INDEXER_ADDRESS=indexer.address, READINESS_INTERVAL="0")
+    from werkzeug.serving import make_server
+    import app as wsgi
+    from Compliance.admission import AdmissionController
+    from Compliance.contract_store import open_contract_store
+
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    wsgi.contract_store = open_contract_store(os.path.join(tempfile.mkdtemp(), "contracts.db"))
+    server = make_server("127.0.0.1", 0, wsgi.app, threaded=True)
+    server.socket.listen(1024)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    body = {"role": "admin", "private_key": wsgi.admin_private_key, "version": "1.0"}
+
+    controllers = {
+        "off": lambda: AdmissionController(max_in_flight=None, per_signer=None, cooldown=0),
+        "on": lambda: AdmissionController(),
+    }
+    print(f"{'admission':<11}{'clients':>8}{'goodput/s':>11}{'shed':>7}{'failed':>8}{'p95 ms':>9}{'node 429s':>11}")
+    try:
+        for mode, make_controller in controllers.items():
+            for clients in [int(c) for c in args.clients.split(",")]:
+                wsgi.admission = make_controller()
+                algod.rejected = 0
+                goodput, shed, failed, p95 = offer_load(base_url, body, clients, args.duration)
+                print(f"{mode:<11}{clients:>8}{goodput:>11.1f}{shed:>7}{failed:>8}{p95 * 1000:>9.0f}"
+                      f"{algod.rejected:>11}")
+    finally:
+        server.shutdown()
+        algod.stop()
+        indexer.stop()
+
+
+if __name__ == "__main__":
+    main()
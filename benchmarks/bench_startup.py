@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# bench_startup.py - Cold start of the Flask apps: process start to first response
+#
+# Usage: python benchmarks/bench_startup.py [--repeat 5] [--apps app,app_debug,flask_app]
+#                                           [--latency 0.0] [--node up|down]
+#
+# Each sample is a fresh interpreter that imports the app module and serves
+# one request through the Flask test client, so nothing is cached between
+# samples but the OS page cache. Reported per app (medians): time to import
+# the module, time from the end of the import to the first response, and
+# wall time of the whole process. The apps are pointed at a local algod /
+# indexer stand-in (algod_standin.py) answering after `latency` seconds;
+# with `--node down` they are pointed at a closed port instead, as during a
+# network blip, and a worker that exits at import is reported as failed.
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from algod_standin import AlgodStandIn
+
+# name -> (directory put on sys.path, module, method, path, JSON body)
+APPS = {
+    "app": (ROOT, "app", "POST", "/api/document/hash", {"document_content": "startup"}),
+    "app_debug": (ROOT, "app_debug", "POST", "/api/document/hash", {"document_content": "startup"}),
+    "flask_app": (os.path.join(ROOT, "Compliance", "flask_app"), "api", "GET", "/api/contracts", None),
+}
+
+SAMPLE = """
+import time
+start = time.perf_counter()
+import importlib, json, sys
+sys.path.insert(0, {path!r})
+module = importlib.import_module({module!r})
+imported = time.perf_counter()
+response = module.app.test_client().open({route!r}, method={method!r}, json={body!r})
+served = time.perf_counter()
+print(json.dumps({{"import_ms": (imported - start) * 1000, "first_response_ms": (served - imported) * 1000,
+                  "status": response.status_code}}))
+"""
+
+
+def closed_port_address():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+def sample(name, env):
+    path, module, method, route, body = APPS[name]
+    code = SAMPLE.format(path=path, module=module, method=method, route=route, body=body)
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    wall = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        return None
+    return dict(json.loads(result.stdout.strip().splitlines()[-1]), wall_ms=wall)
+
+
+def sample_interpreter(env):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], env=env, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--apps", default=",".join(APPS))
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--node", choices=["up", "down"], default="up")
+    args = parser.parse_args()
+
+    algod_node = AlgodStandIn(latency=args.latency).start()
+    indexer_node = AlgodStandIn(latency=args.latency, indexer=True).start()
+    env = dict(os.environ, JOB_WORKERS="0")
+    if args.node == "up":
+        env.update(ALGOD_ADDRESS=algod_node.address, INDEXER_ADDRESS=indexer_node.address)
+    else:
+        env.update(ALGOD_ADDRESS=closed_port_address(), INDEXER_ADDRESS=closed_port_address())
+
+    baseline = median([sample_interpreter(env) for _ in range(args.repeat)])
+    print(f"python -c pass: {baseline:.0f} ms")
+    print(f"{'app':<12}{'import ms':>12}{'first resp ms':>15}{'wall ms':>10}{'status':>8}")
+    try:
+        for name in args.apps.split(","):
+            samples = [sample(name, env) for _ in range(args.repeat)]
+            if None in samples:
+                print(f"{name:<12}{'failed (worker exited)':>45}")
+                continue
+            print(f"{name:<12}{median([s['import_ms'] for s in samples]):>12.0f}"
+                  f"{median([s['first_response_ms'] for s in samples]):>15.0f}"
+                  f"{median([s['wall_ms'] for s in samples]):>10.0f}{samples[0]['status']:>8}")
+    finally:
+        algod_node.stop()
+        indexer_node.stop()
+
+
+if __name__ == "__main__":
+    main()
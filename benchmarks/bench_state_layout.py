@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# bench_state_layout.py - Keys vs packed global-state layout of the compliance contract
+#
+# Usage: python benchmarks/bench_state_layout.py [--repeat 20] [--reads 10000]
+#
+# For each layout, prints the global schema, the creator's minimum balance per
+# app, the size of the global-state JSON algod returns, and the time for the
+# client's get_compliance_status to parse and decode it.
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Compliance"))
+
+from algosdk import account
+
+from compliance_record import GLOBAL_SCHEMAS, LAYOUT_KEYS, LAYOUT_PACKED, RECORD_KEY, app_min_balance, encode_record
+from document_compliance_client import ComplianceClient
+
+DOC_HASH = hashlib.sha256(b"policy v1").hexdigest()
+
+
+def global_state(layout):
+    """Global state as algod returns it for a registered, compliant document"""
+    if layout == LAYOUT_PACKED:
+        items = {RECORD_KEY: encode_record(DOC_HASH, "1.2.0", 1900000000, 1800000000)}
+    else:
+        items = {b"document_hash": bytes.fromhex(DOC_HASH), b"document_version": b"1.2.0",
+                 b"attestation_date": 1800000000, b"expiration_date": 1900000000,
+                 b"status": b"compliant", b"admin": bytes(32)}
+    state = []
+    for key, value in items.items():
+        if isinstance(value, int):
+            value = {"type": 2, "uint": value, "bytes": ""}
+        else:
+            value = {"type": 1, "uint": 0, "bytes": base64.b64encode(value).decode()}
+        state.append({"key": base64.b64encode(key).decode(), "value": value})
+    return state
+
+
+class JsonAlgod:
+    """Serves application_info from a JSON body, parsed on every call like the SDK does"""
+
+    def __init__(self, layout):
+        self.body = json.dumps({"id": 1, "params": {"global-state": global_state(layout)}})
+
+    def application_info(self, app_id):
+        return json.loads(self.body)
+
+
+def timed(fn, repeat):
+    """Median wall time of `fn` in milliseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--reads", type=int, default=10000)
+    args = parser.parse_args()
+
+    private_key, _ = account.generate_account()
+    print(f"{'layout':<8}{'schema':>8}{'min balance':>13}{'state JSON':>12}"
+          f"{'read':>10}   (us per read, median of {args.repeat} x {args.reads})")
+    for layout in (LAYOUT_KEYS, LAYOUT_PACKED):
+        algod_client = JsonAlgod(layout)
+        client = ComplianceClient(algod_client, private_key)
+
+        def reads():
+            for _ in range(args.reads):
+                client.get_compliance_status(1)
+
+        per_read = timed(reads, args.repeat) * 1000 / args.reads
+        schema = "{}/{}".format(*GLOBAL_SCHEMAS[layout])
+        print(f"{layout:<8}{schema:>8}{app_min_balance(layout):>13}{len(algod_client.body):>12}"
+              f"{per_read:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
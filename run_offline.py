@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# run_offline.py - Run the TestNet scenario scripts against the local algod / indexer stand-in
+#
+# Usage: python run_offline.py [--scenarios voting,compliance,api,api_txn,dashboard] [--verbose]
+#                              [--latency 0.0] [--round-time 0] [--fail-rate 0]
+#                              [--pool-error-rate 0] [--seed N]
+#
+# Starts an algod and an indexer stand-in over one simulated ledger
+# (algod_standin.py) and runs each scenario script against it as its own
+# process, so none of them needs TestNet, funded accounts or a server
+# started by hand:
+#
+#   voting      test_voting.py                 deploy, opt in and vote with the voting contract
+#   compliance  Compliance/test_compliance.py  deploy, register, assign and verify with ComplianceClient
+#   api         test_api.py                    app.py endpoints
+#   api_txn     test_api_with_txn.py           app.py per-app endpoints, with transaction IDs
+#   dashboard   Compliance/api_test.py         flask_app/api.py dashboard and background jobs
+#
+# For the app.py scenarios a compliance app is deployed first, with the
+# admin of Compliance/compliance_test_accounts.json as creator and the
+# verifier opted in, as the TestNet app is. The servers keep their
+# databases in a temporary directory. A scenario passes when its script
+# exits 0, prints no failure marker and, where it has one, prints its
+# completion message. Exits 1 if any scenario failed.
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+COMPLIANCE_DIR = os.path.join(ROOT, "Compliance")
+sys.path.append(ROOT)
+
+from algod_standin import AlgodStandIn, StandInLedger
+
+# name -> (script, working directory, server it needs or None, completion message or None)
+SCENARIOS = {
+    "voting": ("test_voting.py", ROOT, None, "TEST COMPLETED SUCCESSFULLY"),
+    "compliance": ("test_compliance.py", COMPLIANCE_DIR, None, "TEST COMPLETED SUCCESSFULLY"),
+    "api": ("test_api.py", ROOT, "app", None),
+    "api_txn": ("test_api_with_txn.py", ROOT, "app", None),
+    "dashboard": ("api_test.py", COMPLIANCE_DIR, "dashboard", "TEST COMPLETED SUCCESSFULLY"),
+}
+FAILURE_MARKERS = ("❌", "Traceback (most recent call last)")
+
+# server -> (directory put on sys.path, module, environment variable the scenario reads its URL from)
+SERVERS = {
+    "app": (ROOT, "app", "BASE_URL"),
+    "dashboard": (os.path.join(COMPLIANCE_DIR, "flask_app"), "api", "API_BASE_URL"),
+}
+SERVE = """
+import logging, sys
+sys.path.insert(0, {path!r})
+import {module} as served
+logging.getLogger("werkzeug").setLevel(logging.ERROR)
+served.app.run(host="127.0.0.1", port={port}, threaded=True)
+"""
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(name, env):
+    """Serve app.py or flask_app/api.py on a free port; returns (process, base URL)"""
+    path, module, _ = SERVERS[name]
+    port = free_port()
+    process = subprocess.Popen([sys.executable, "-c", SERVE.format(path=path, module=module, port=port)],
+                               cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return process, f"http://127.0.0.1:{port}"
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{name} server did not start")
+
+
+def deploy_compliance_app(algod_address):
+    """A compliance app created by the admin account, with the verifier opted in"""
+    from algosdk.v2client import algod
+    sys.path.append(COMPLIANCE_DIR)
+    from document_compliance_client import ComplianceClient
+
+    with open(os.path.join(COMPLIANCE_DIR, "compliance_test_accounts.json")) as f:
+        accounts = json.load(f)
+    client = algod.AlgodClient("", algod_address)
+    admin = ComplianceClient(client, accounts["admin"]["private_key"])
+    verifier = ComplianceClient(client, accounts["verifier"]["private_key"])
+
+    def program(name):
+        with open(os.path.join(COMPLIANCE_DIR, name)) as f:
+            return admin.compile_program(f.read())
+
+    app_id = admin.deploy_contract(program("compliance_approval.teal"), program("compliance_clear.teal"))
+    verifier.opt_in(app_id)
+    return app_id
+
+
+def run_scenario(name, env, servers, verbose=False):
+    """(passed, output) of one scenario script"""
+    script, cwd, server, done_message = SCENARIOS[name]
+    env = dict(env)
+    if server:
+        env[SERVERS[server][2]] = servers[server]
+    result = subprocess.run([sys.executable, script], cwd=cwd, env=env, capture_output=True, text=True,
+                            encoding="utf-8", timeout=600)
+    output = result.stdout + result.stderr
+    passed = (result.returncode == 0 and not any(marker in output for marker in FAILURE_MARKERS)
+              and (done_message is None or done_message in output))
+    if verbose or not passed:
+        print(output)
+    return passed, output
+
+
+def run_scenarios(names, latency=0.0, round_time=0.0, fail_rate=0.0, pool_error_rate=0.0, seed=None,
+                  verbose=False):
+    """{scenario: passed} of the named scenarios, run one after another against fresh stand-ins"""
+    ledger = StandInLedger(round_time=round_time, pool_error_rate=pool_error_rate, seed=seed)
+    algod_node = AlgodStandIn(latency=latency, ledger=ledger, fail_rate=fail_rate, seed=seed).start()
+    indexer_node = AlgodStandIn(latency=latency, indexer=True, ledger=ledger).start()
+    processes, results = [], {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, ALGOD_ADDRESS=algod_node.address, INDEXER_ADDRESS=indexer_node.address,
+                       READINESS_INTERVAL="0", CONTRACTS_DB=os.path.join(tmp, "contracts.db"),
+                       JOBS_DB=os.path.join(tmp, "jobs.db"), PYTHONIOENCODING="utf-8")
+            needed = {SCENARIOS[name][2] for name in names} - {None}
+            if "app" in needed:
+                env["APP_ID"] = str(deploy_compliance_app(algod_node.address))
+            servers = {}
+            for server in sorted(needed):
+                process, servers[server] = start_server(server, env)
+                processes.append(process)
+
+            for name in names:
+                start = time.perf_counter()
+                results[name], _ = run_scenario(name, env, servers, verbose)
+                print(f"{name:<12}{'passed' if results[name] else 'FAILED':<8}{time.perf_counter() - start:>8.1f} s")
+
+            for process in processes:
+                process.terminate()
+                process.wait(timeout=10)
+    finally:
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+        algod_node.stop()
+        indexer_node.stop()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the scenario scripts against the local stand-in")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every node response")
+    parser.add_argument("--round-time", type=float, default=0.0, help="seconds per round (0: advance on demand)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of algod requests answered 503")
+    parser.add_argument("--pool-error-rate", type=float, default=0.0,
+                        help="fraction of transactions dropped from the pool")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--verbose", action="store_true", help="print the output of passing scenarios too")
+    args = parser.parse_args()
+
+    names = args.scenarios.split(",")
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)} (available: {', '.join(SCENARIOS)})")
+    results = run_scenarios(names, args.latency, args.round_time, args.fail_rate, args.pool_error_rate,
+                            args.seed, args.verbose)
+    sys.exit(0 if all(results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()
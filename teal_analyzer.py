@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+# teal_analyzer.py - Offline opcode-cost and size analysis of generated TEAL
+#
+# Usage:
+#   python teal_analyzer.py Compliance/compliance_approval.teal
+#   python teal_analyzer.py voting                 # compiles voting_contract.py
+#   python teal_analyzer.py compliance registry    # compiles the Compliance contracts
+#   python teal_analyzer.py compliance-packed      # ... with the packed global-state layout
+#
+# For an approval program built from a PyTeal `Cond`, every dispatch branch
+# (create, optin, and one per application_args[0] value) is reported with its
+# worst-case opcode cost: the comparisons needed to reach it plus the most
+# expensive path through its body. The program size is estimated the way the
+# assembler lays it out (constant blocks for repeated constants, push ops for
+# the rest), so it usually matches `algod compile` to within a few bytes.
+
+import ast
+import base64
+import sys
+
+MAX_APP_PROGRAM_COST = 700      # Opcode budget of a single app call
+MAX_APP_PROGRAM_LEN = 2048      # Bytes per program page
+MAX_EXTRA_APP_PAGES = 3
+
+# Opcodes that cost more than 1 (AVM v6-v8)
+OPCODE_COSTS = {
+    "sha256": 35, "keccak256": 130, "sha512_256": 45, "sha3_256": 130,
+    "ed25519verify": 1900, "ed25519verify_bare": 1900,
+    "ecdsa_verify": 1700, "ecdsa_pk_decompress": 650, "ecdsa_pk_recover": 2000,
+    "vrf_verify": 5700, "bn256_add": 70, "bn256_scalar_mul": 970, "bn256_pairing": 8700,
+    "divmodw": 20, "sqrt": 4, "bsqrt": 40, "expw": 10,
+    "b+": 10, "b-": 10, "b*": 20, "b/": 20, "b%": 20,
+    "b|": 6, "b&": 6, "b^": 6, "b~": 4,
+    "json_ref": 25,
+}
+# Curve-dependent costs, keyed by (opcode, curve)
+CURVE_COSTS = {
+    ("ecdsa_verify", "Secp256r1"): 2500,
+    ("ecdsa_pk_decompress", "Secp256r1"): 2400,
+}
+
+# Number of one-byte immediates of each opcode (anything not listed has none)
+BYTE_IMMEDIATES = {
+    "txn": 1, "txna": 2, "gtxn": 2, "gtxna": 3, "txnas": 1, "gtxns": 1, "gtxnsa": 2, "gtxnas": 2,
+    "gtxnsas": 1, "global": 1, "arg": 1, "load": 1, "store": 1, "gload": 2, "gloads": 1, "gaid": 1,
+    "intc": 1, "bytec": 1, "substring": 2, "extract": 2, "replace2": 1, "dig": 1, "bury": 1,
+    "cover": 1, "uncover": 1, "popn": 1, "dupn": 1, "frame_dig": 1, "frame_bury": 1, "proto": 2,
+    "asset_holding_get": 1, "asset_params_get": 1, "app_params_get": 1, "acct_params_get": 1,
+    "ecdsa_verify": 1, "ecdsa_pk_decompress": 1, "ecdsa_pk_recover": 1, "base64_decode": 1,
+    "json_ref": 1, "vrf_verify": 1, "block": 1, "itxn_field": 1, "itxn": 1, "itxna": 2,
+    "gitxn": 2, "gitxna": 3, "gitxnas": 2, "itxnas": 1,
+}
+BRANCH_OPS = ("b", "bz", "bnz", "callsub")
+TERMINAL_OPS = ("return", "err", "retsub")
+
+# Named integer constants PyTeal emits for `int`
+NAMED_INTS = {
+    "NoOp": 0, "OptIn": 1, "CloseOut": 2, "ClearState": 3, "UpdateApplication": 4,
+    "DeleteApplication": 5, "unknown": 0, "pay": 1, "keyreg": 2, "acfg": 3, "axfer": 4,
+    "afrz": 5, "appl": 6,
+}
+
+
+class TealParseError(ValueError):
+    pass
+
+
+class UnboundedCostError(ValueError):
+    """The program loops, so it has no static worst-case cost"""
+
+
+class Instruction:
+    def __init__(self, op, args, line):
+        self.op = op
+        self.args = args
+        self.line = line
+
+    def __repr__(self):
+        return f"Instruction({self.op!r}, {self.args!r}, line={self.line})"
+
+
+class Program:
+    def __init__(self, version, instructions, labels):
+        self.version = version
+        self.instructions = instructions
+        self.labels = labels    # label -> index of the next instruction
+
+
+def parse_teal(source):
+    """Parse TEAL source into a Program"""
+    version = 1
+    instructions = []
+    labels = {}
+    for line_no, raw in enumerate(source.splitlines(), 1):
+        line = _strip_comment(raw).strip()
+        if not line:
+            continue
+        if line.startswith("#pragma"):
+            parts = line.split()
+            if len(parts) == 3 and parts[1] == "version":
+                version = int(parts[2])
+            continue
+        if line.endswith(":") and " " not in line:
+            labels[line[:-1]] = len(instructions)
+            continue
+        op, _, rest = line.partition(" ")
+        instructions.append(Instruction(op, _split_args(rest.strip(), line_no), line_no))
+
+    for instruction in instructions:
+        targets = _branch_targets(instruction)
+        for target in targets:
+            if target not in labels:
+                raise TealParseError(f"line {instruction.line}: unknown label {target!r}")
+    return Program(version, instructions, labels)
+
+
+def _strip_comment(line):
+    in_string = False
+    escaped = False
+    for i, char in enumerate(line):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif line.startswith("//", i):
+            return line[:i]
+    return line
+
+
+def _split_args(text, line_no):
+    args = []
+    while text:
+        if text.startswith('"'):
+            end = 1
+            while end < len(text) and (text[end] != '"' or text[end - 1] == "\\"):
+                end += 1
+            if end >= len(text):
+                raise TealParseError(f"line {line_no}: unterminated string")
+            args.append(text[:end + 1])
+            text = text[end + 1:].strip()
+        else:
+            arg, _, text = text.partition(" ")
+            args.append(arg)
+            text = text.strip()
+    return args
+
+
+def _branch_targets(instruction):
+    if instruction.op in BRANCH_OPS:
+        return instruction.args[:1]
+    if instruction.op in ("switch", "match"):
+        return instruction.args
+    return []
+
+
+def opcode_cost(instruction):
+    curve = instruction.args[0] if instruction.args else None
+    return CURVE_COSTS.get((instruction.op, curve), OPCODE_COSTS.get(instruction.op, 1))
+
+
+# Size
+
+def _varuint_size(value):
+    size = 1
+    while value >= 0x80:
+        value >>= 7
+        size += 1
+    return size
+
+
+def _int_value(arg):
+    if arg in NAMED_INTS:
+        return NAMED_INTS[arg]
+    return int(arg, 0)
+
+
+def _bytes_value(args):
+    """Decode the immediate of a byte/pushbytes/addr/method pseudo-op"""
+    if len(args) == 2 and args[0] in ("base64", "b64"):
+        return base64.b64decode(args[1])
+    if len(args) == 2 and args[0] in ("base32", "b32"):
+        return base64.b32decode(args[1] + "=" * (-len(args[1]) % 8))
+    if len(args) == 1:
+        arg = args[0]
+        if arg.startswith('"'):
+            return ast.literal_eval("b" + arg)
+        if arg.startswith("0x"):
+            return bytes.fromhex(arg[2:])
+        for prefix in ("base64(", "b64(", "base32(", "b32("):
+            if arg.startswith(prefix) and arg.endswith(")"):
+                return _bytes_value([prefix[:-1], arg[len(prefix):-1]])
+    raise TealParseError(f"cannot decode byte constant {' '.join(args)}")
+
+
+def _constant(instruction):
+    """('int', value) or ('byte', value) for constant pseudo-ops, else None"""
+    if instruction.op in ("int", "pushint"):
+        return "int", _int_value(instruction.args[0])
+    if instruction.op in ("byte", "pushbytes"):
+        return "byte", _bytes_value(instruction.args)
+    if instruction.op == "addr":
+        from algosdk.encoding import decode_address
+        return "byte", decode_address(instruction.args[0])
+    if instruction.op == "method":
+        from algosdk.abi import Method
+        return "byte", Method.from_signature(ast.literal_eval(instruction.args[0])).get_selector()
+    return None
+
+
+def _constant_size(kind, value):
+    if kind == "int":
+        return _varuint_size(value)
+    return _varuint_size(len(value)) + len(value)
+
+
+def program_size(program):
+    """Estimated assembled size in bytes"""
+    counts = {}
+    for instruction in program.instructions:
+        constant = _constant(instruction)
+        if constant and instruction.op in ("int", "byte", "addr", "method"):
+            counts[constant] = counts.get(constant, 0) + 1
+
+    # Repeated constants go into intcblock/bytecblock, most used first
+    blocks = {"int": [], "byte": []}
+    for constant, count in sorted(counts.items(), key=lambda item: -item[1]):
+        if count > 1:
+            blocks[constant[0]].append(constant)
+    index = {constant: i for kind in blocks for i, constant in enumerate(blocks[kind])}
+
+    size = _varuint_size(program.version)
+    for kind in ("int", "byte"):
+        if blocks[kind]:
+            size += 1 + _varuint_size(len(blocks[kind]))
+            size += sum(_constant_size(*constant) for constant in blocks[kind])
+
+    for instruction in program.instructions:
+        constant = _constant(instruction)
+        if constant and constant in index:
+            size += 1 if index[constant] < 4 else 2
+        elif constant:
+            size += 1 + _constant_size(*constant)
+        elif instruction.op in BRANCH_OPS:
+            size += 3
+        elif instruction.op in ("switch", "match"):
+            size += 2 + 2 * len(instruction.args)
+        elif instruction.op in ("intcblock", "pushints"):
+            size += 1 + _varuint_size(len(instruction.args))
+            size += sum(_varuint_size(_int_value(arg)) for arg in instruction.args)
+        elif instruction.op in ("bytecblock", "pushbytess"):
+            values = [_bytes_value([arg]) for arg in instruction.args]
+            size += 1 + _varuint_size(len(values)) + sum(_constant_size("byte", v) for v in values)
+        else:
+            size += 1 + BYTE_IMMEDIATES.get(instruction.op, 0)
+    return size
+
+
+# Cost
+
+def _successors(program, i):
+    instruction = program.instructions[i]
+    op = instruction.op
+    if op in TERMINAL_OPS:
+        return []
+    if op == "b":
+        return [program.labels[instruction.args[0]]]
+    following = [i + 1] if i + 1 < len(program.instructions) else []
+    if op in ("bz", "bnz"):
+        return following + [program.labels[instruction.args[0]]]
+    if op in ("switch", "match"):
+        return following + [program.labels[label] for label in instruction.args]
+    return following
+
+
+def worst_case_costs(program):
+    """
+    Worst-case cost from each instruction to the end of the program, as a
+    list indexed like `program.instructions`. A subroutine call costs its
+    most expensive path up to retsub. Raises UnboundedCostError on loops.
+    """
+    count = len(program.instructions)
+    cost = [None] * count
+    state = [0] * count     # 0 unvisited, 1 on stack, 2 done
+
+    def resolve(start):
+        stack = [start]
+        while stack:
+            i = stack[-1]
+            if state[i] == 2:
+                stack.pop()
+                continue
+            instruction = program.instructions[i]
+            pending = _successors(program, i)
+            if instruction.op == "callsub":
+                pending = pending + [program.labels[instruction.args[0]]]
+            pending = [j for j in pending if state[j] != 2]
+            if state[i] == 0:
+                state[i] = 1
+                for j in pending:
+                    if state[j] == 1:
+                        raise UnboundedCostError(
+                            f"line {program.instructions[j].line}: loop, cost has no static bound")
+                stack.extend(pending)
+                continue
+            if pending:
+                raise UnboundedCostError(f"line {instruction.line}: loop, cost has no static bound")
+            rest = max((cost[j] for j in _successors(program, i)), default=0)
+            if instruction.op == "callsub":
+                rest += cost[program.labels[instruction.args[0]]]
+            cost[i] = opcode_cost(instruction) + rest
+            state[i] = 2
+            stack.pop()
+
+    for i in range(count):
+        if state[i] == 0:
+            resolve(i)
+    return cost
+
+
+# Opcodes that may appear in a dispatch condition (they only read the transaction)
+CONDITION_OPS = {
+    "txn", "txna", "gtxn", "global", "int", "pushint", "byte", "pushbytes", "method", "addr",
+    "intc", "bytec", "intc_0", "intc_1", "intc_2", "intc_3", "bytec_0", "bytec_1", "bytec_2", "bytec_3",
+    "==", "!=", "<", ">", "<=", ">=", "!", "&&", "||", "len", "btoi",
+}
+
+
+def dispatch_branches(program):
+    """
+    Find the call dispatch at the start of the program: the tree of
+    `<condition>; bnz|bz <label>` blocks that only inspect the transaction,
+    as produced by PyTeal `Cond` chains and nested `If`s on ApplicationID,
+    OnCompletion and application_args[0]. Returns a list of
+    (name, index of the first instruction of the branch, cost of reaching it).
+    """
+    branches = []
+    visited = set()
+
+    def condition_end(start):
+        for j in range(start, len(program.instructions)):
+            op = program.instructions[j].op
+            if op in ("bnz", "bz"):
+                return j if j > start else None
+            if op not in CONDITION_OPS:
+                return None
+        return None
+
+    def visit(start, cost, name):
+        if start in visited or start >= len(program.instructions):
+            return
+        visited.add(start)
+        end = condition_end(start)
+        if end is None:
+            if program.instructions[start].op != "err":
+                label = next((l for l, i in program.labels.items() if i == start), f"@{start}")
+                branches.append((name or _leaf_name(program.instructions[start:start + 3]) or label,
+                                 start, cost))
+            return
+        branch = program.instructions[end]
+        cost += sum(opcode_cost(instruction) for instruction in program.instructions[start:end + 1])
+        target = program.labels[branch.args[0]]
+        true_side, false_side = (target, end + 1) if branch.op == "bnz" else (end + 1, target)
+        true_name, false_name = _side_names(program.instructions[start:end])
+        visit(true_side, cost, true_name)
+        visit(false_side, cost, false_name)
+
+    visit(0, 0, None)
+    return branches
+
+
+def _side_names(condition):
+    """Branch names for the true and false sides of a dispatch condition"""
+    ops = [(instruction.op, instruction.args) for instruction in condition]
+    if ops == [("txn", ["ApplicationID"])]:
+        return None, "create"
+    if ops == [("txn", ["ApplicationID"]), ("int", ["0"]), ("==", [])]:
+        return "create", None
+    if ops == [("txn", ["OnCompletion"])]:
+        return None, "noop"
+    if len(ops) == 3 and ops[0] == ("txn", ["OnCompletion"]) and ops[2] == ("==", []):
+        return ops[1][1][0].lower(), None
+    for op, args in ops:
+        if op == "method":
+            return ast.literal_eval(args[0]).split("(")[0], None
+        if op in ("byte", "pushbytes") and args and args[0].startswith('"') \
+                and ("txna", ["ApplicationArgs", "0"]) in ops:
+            return ast.literal_eval(args[0]), None
+    return None, None
+
+
+def _leaf_name(instructions):
+    """Name a branch whose body starts by testing OnCompletion (e.g. `return OnCompletion == OptIn`)"""
+    ops = [(instruction.op, instruction.args) for instruction in instructions]
+    if len(ops) == 3 and ops[0] == ("txn", ["OnCompletion"]) and ops[2] == ("==", []):
+        return ops[1][1][0].lower()
+    return None
+
+
+def analyze(source):
+    """
+    Analyze TEAL source. Returns a dict with the version, instruction count,
+    estimated size, the worst-case cost of the whole program and, for each
+    dispatch branch, the worst-case cost of a call taking it.
+    """
+    program = parse_teal(source)
+    costs = worst_case_costs(program)
+
+    branches = {}
+    for name, start, dispatch_cost in dispatch_branches(program):
+        # The conditions and branches taken to reach it, then the branch body
+        branches[name] = dispatch_cost + costs[start]
+
+    size = program_size(program)
+    return {
+        "version": program.version,
+        "instructions": len(program.instructions),
+        "size": size,
+        "pages": -(-size // MAX_APP_PROGRAM_LEN),
+        "max_cost": costs[0] if costs else 0,
+        "branches": branches,
+    }
+
+
+def check_budgets(analysis, budgets):
+    """
+    Compare an analysis with a budget dict: {"size": bytes, "max_cost": ops,
+    "<branch>": ops}. Returns a list of messages, empty when within budget.
+    """
+    problems = []
+    for key, limit in budgets.items():
+        if key in ("size", "max_cost", "instructions"):
+            actual = analysis[key]
+        elif key in analysis["branches"]:
+            actual = analysis["branches"][key]
+        else:
+            problems.append(f"{key}: no such dispatch branch")
+            continue
+        if actual > limit:
+            problems.append(f"{key}: {actual} exceeds budget of {limit}")
+    return problems
+
+
+def format_report(name, analysis):
+    lines = [
+        f"{name}: TEAL v{analysis['version']}, {analysis['instructions']} instructions, "
+        f"~{analysis['size']} bytes ({analysis['pages']} page(s) of {MAX_APP_PROGRAM_LEN})",
+        f"  worst-case cost: {analysis['max_cost']} / {MAX_APP_PROGRAM_COST}",
+    ]
+    for branch, cost in analysis["branches"].items():
+        lines.append(f"  {branch:<20}{cost:>6}  ({cost * 100 // MAX_APP_PROGRAM_COST}% of budget)")
+    return "\n".join(lines)
+
+
+def _builtin_programs(name):
+    """TEAL of the repo's contracts, compiled from their PyTeal source"""
+    import os
+    from pyteal import compileTeal, Mode
+
+    root = os.path.dirname(os.path.abspath(__file__))
+    sys.path.append(os.path.join(root, "Compliance"))
+    if name == "voting":
+        from voting_contract import get_approval_program
+        return get_approval_program()
+    if name in ("compliance", "compliance-packed"):
+        import document_compliance
+        layout = "packed" if name == "compliance-packed" else "keys"
+        return compileTeal(document_compliance.approval_program(layout), Mode.Application, version=6)
+    if name == "registry":
+        import document_registry
+        return compileTeal(document_registry.approval_program(), Mode.Application,
+                           version=document_registry.TEAL_VERSION)
+    return None
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python teal_analyzer.py <program.teal | voting | compliance | compliance-packed | registry> ...")
+        return 1
+
+    for target in sys.argv[1:]:
+        source = _builtin_programs(target)
+        if source is None:
+            with open(target, "r") as f:
+                source = f.read()
+        try:
+            print(format_report(target, analyze(source)))
+        except (TealParseError, UnboundedCostError) as e:
+            print(f"{target}: {e}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# test_algod_standin.py - The algod stand-in simulates app state, rounds and pool errors, and runs the scenarios offline
+
+import base64
+import time
+
+import pytest
+from algosdk import account, transaction
+from algosdk.error import AlgodHTTPError
+from algosdk.v2client import algod
+
+from algod_standin import AlgodStandIn, StandInLedger
+from run_offline import run_scenarios
+from voting_client import VotingDAppClient
+from voting_contract import get_approval_program, get_clear_program
+
+
+def pay(client, private_key, amount=1000):
+    sender = account.address_from_private_key(private_key)
+    txn = transaction.PaymentTxn(sender, client.suggested_params(), account.generate_account()[1], amount)
+    return client.send_transaction(txn.sign(private_key))
+
+
+def test_voting_contract_keeps_tallies_and_rejects_a_second_vote():
+    node = AlgodStandIn().start()
+    try:
+        client = algod.AlgodClient("", node.address)
+        creator, voter = account.generate_account()[0], account.generate_account()[0]
+        voting = VotingDAppClient(client, creator)
+        voting.deploy_contract(get_approval_program(), get_clear_program(), num_candidates=4)
+        for private_key in (creator, voter):
+            voting.opt_in(private_key)
+        voting.vote(3)
+        voting.vote(3, voter)
+
+        with pytest.raises(AlgodHTTPError, match="logic eval error"):
+            voting.vote(1, voter)
+        with pytest.raises(AlgodHTTPError, match="logic eval error"):
+            voting.vote(5)
+
+        assert voting.get_results()[0] == {"candidate": 3, "votes": 2}
+        assert voting.get_state()["total_votes"] == 2
+        local = client.account_info(account.address_from_private_key(voter))["apps-local-state"]
+        assert local[0]["id"] == voting.app_id
+        assert local[0]["key-value"][0]["key"] == base64.b64encode(b"voted").decode()
+    finally:
+        node.stop()
+
+
+def test_rounds_pool_errors_and_injected_failures():
+    private_key = account.generate_account()[0]
+
+    # Confirmed in the round after submission
+    node = AlgodStandIn(ledger=StandInLedger(round_time=0.5)).start()
+    client = algod.AlgodClient("", node.address)
+    before = client.status()["last-round"]
+    txid = pay(client, private_key)
+    assert "confirmed-round" not in client.pending_transaction_info(txid)
+    confirmed = transaction.wait_for_confirmation(client, txid, 4)
+    assert confirmed["confirmed-round"] in (before + 1, before + 2)
+    assert client.status()["last-round"] >= confirmed["confirmed-round"]
+    node.stop()
+
+    # Dropped transactions report a pool error and change nothing
+    node = AlgodStandIn(ledger=StandInLedger(pool_error_rate=1.0, balance=5000)).start()
+    client = algod.AlgodClient("", node.address)
+    txid = pay(client, private_key)
+    assert client.pending_transaction_info(txid)["pool-error"]
+    assert client.account_info(account.address_from_private_key(private_key))["amount"] == 5000
+    node.stop()
+
+    # A full pool and a failing node
+    node = AlgodStandIn(ledger=StandInLedger(round_time=60, pool_size=1), fail_rate=0.0).start()
+    client = algod.AlgodClient("", node.address)
+    pay(client, private_key)
+    with pytest.raises(AlgodHTTPError, match="capacity"):
+        pay(client, private_key)
+    node.fail_rate = 1.0
+    with pytest.raises(AlgodHTTPError) as error:
+        client.status()
+    assert error.value.code == 503 and node.failed == 1
+    node.stop()
+
+
+def test_group_fees_are_pooled_but_must_cover_every_transaction():
+    node = AlgodStandIn(ledger=StandInLedger(balance=100000)).start()
+    try:
+        client = algod.AlgodClient("", node.address)
+        private_key = account.generate_account()[0]
+        sender = account.address_from_private_key(private_key)
+
+        def group(*fees):
+            txns = []
+            for fee in fees:
+                sp = client.suggested_params()
+                sp.flat_fee, sp.fee = True, fee
+                txns.append(transaction.PaymentTxn(sender, sp, account.generate_account()[1], 0))
+            transaction.assign_group_id(txns)
+            return [txn.sign(private_key) for txn in txns]
+
+        client.send_transactions(group(3000, 0, 0))
+        assert client.account_info(sender)["amount"] == 97000
+        with pytest.raises(AlgodHTTPError, match="less than the minimum"):
+            client.send_transactions(group(2000, 0, 0))
+        with pytest.raises(AlgodHTTPError, match="less than the minimum"):
+            client.send_transactions(group(0))
+        assert client.account_info(sender)["amount"] == 97000
+    finally:
+        node.stop()
+
+
+def test_scenario_scripts_pass_offline():
+    start = time.monotonic()
+    results = run_scenarios(["voting", "compliance", "api", "dashboard"])
+    assert results == {"voting": True, "compliance": True, "api": True, "dashboard": True}
+    assert time.monotonic() - start < 120
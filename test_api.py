@@ -8,8 +8,8 @@ import time
 import hashlib
 import sys
 
-# Configuration
-BASE_URL = "http://localhost:5045"
+# Configuration (BASE_URL points the script at another server, e.g. one run by run_offline.py)
+BASE_URL = os.environ.get("BASE_URL", "http://localhost:5045")
 API_PREFIX = "/api"
 
 # Test document data
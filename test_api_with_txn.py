@@ -3,6 +3,7 @@
 
 import requests
 import json
+import os
 import sys
 import time
 import hashlib
@@ -11,7 +12,7 @@ from pprint import pprint
 # Server URL and port - change this as needed
 SERVER = "http://127.0.0.1"
 PORT = 5047  # Updated port to match Flask server
-BASE_URL = f"{SERVER}:{PORT}"
+BASE_URL = os.environ.get("BASE_URL", f"{SERVER}:{PORT}")
 
 # Accounts setup from the config file
 try:
@@ -26,8 +27,8 @@ try:
     VERIFIER_PRIVATE_KEY = accounts["verifier"]["private_key"]
     VERIFIER_ADDRESS = accounts["verifier"]["address"]
     
-    # App ID
-    APP_ID = 744059516  # This should match the value in app.py
+    # App ID - any compliance app the server can reach (the /api/apps/<app_id>/... routes)
+    APP_ID = int(os.environ.get("APP_ID", "744059516"))
     
     print("✓ Loaded account configurations")
 except Exception as e:
@@ -83,7 +84,7 @@ def check_verifier_status():
 def test_register_document():
     """Test the document registration endpoint with admin role"""
     print("\n=== Testing Document Registration ===")
-    endpoint = f"{BASE_URL}/api/document/register"
+    endpoint = f"{BASE_URL}/api/apps/{APP_ID}/documents"
     
     # Check admin status first
     admin_status = requests.get(f"{BASE_URL}/api/admin/status", params={"address": ADMIN_ADDRESS}).json()
@@ -123,7 +124,7 @@ def test_register_document():
 def test_assign_verifier():
     """Test the assign verifier endpoint with admin role"""
     print("\n=== Testing Assign Verifier ===")
-    endpoint = f"{BASE_URL}/api/verifier/assign"
+    endpoint = f"{BASE_URL}/api/apps/{APP_ID}/verifier"
     
     # Data for request
     data = {
@@ -157,7 +158,7 @@ def test_assign_verifier():
 def test_verify_compliance():
     """Test the verify compliance endpoint with verifier role"""
     print("\n=== Testing Document Verification ===")
-    endpoint = f"{BASE_URL}/api/document/verify"
+    endpoint = f"{BASE_URL}/api/apps/{APP_ID}/verify"
     
     # First register a document to get a hash
     register_result = test_register_document()
@@ -210,8 +211,8 @@ def test_get_compliance_status():
     verification_result = None
     try:
         # Try to get status first, if it fails, we'll do verification
-        status_endpoint = f"{BASE_URL}/api/document/status"
-        response = requests.get(status_endpoint, params={"app_id": APP_ID})
+        status_endpoint = f"{BASE_URL}/api/apps/{APP_ID}/status"
+        response = requests.get(status_endpoint)
         
         if response.status_code != 200:
             print("No verified document found, running verification test first...")
@@ -225,14 +226,14 @@ def test_get_compliance_status():
         verification_result = test_verify_compliance()
     
     # Now get status
-    status_endpoint = f"{BASE_URL}/api/document/status"
+    status_endpoint = f"{BASE_URL}/api/apps/{APP_ID}/status"
     
     try:
         # Allow some time for blockchain to process the verification
         print("Waiting 5 seconds before status check to allow for blockchain processing...")
         time.sleep(5)
         
-        response = requests.get(status_endpoint, params={"app_id": APP_ID})
+        response = requests.get(status_endpoint)
         result = response.json()
         
         print(f"Status Code: {response.status_code}")
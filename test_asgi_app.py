@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# test_asgi_app.py - The ASGI routes answer like app.py's, against a local algod stand-in
+
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+pytest.importorskip("quart")
+pytest.importorskip("httpx")
+
+from algod_standin import AlgodStandIn
+
+
+@pytest.fixture(scope="module")
+def servers():
+    algod = AlgodStandIn(latency=0.05).start()
+    indexer = AlgodStandIn(indexer=True).start()
+    os.environ["ALGOD_ADDRESS"], os.environ["INDEXER_ADDRESS"] = algod.address, indexer.address
+    import app as wsgi
+    from Compliance.lazy import Lazy
+
+    # app may already be imported (and its clients built) against another module's stand-in
+    saved_nodes = wsgi.algod_address, wsgi.indexer_address, wsgi.algod_client, wsgi.indexer_client
+    wsgi.algod_address, wsgi.indexer_address = algod.address, indexer.address
+    wsgi.algod_client, wsgi.indexer_client = Lazy(wsgi.build_algod_client), Lazy(wsgi.build_indexer_client)
+    wsgi.read_flights.forget()
+    import asgi_app
+    from Compliance.contract_store import open_contract_store
+
+    with tempfile.TemporaryDirectory() as tmp:
+        saved_store = wsgi.contract_store
+        wsgi.contract_store = open_contract_store(os.path.join(tmp, "contracts.db"))
+        yield wsgi, asgi_app
+        wsgi.contract_store.close()
+        wsgi.contract_store = saved_store
+    wsgi.algod_address, wsgi.indexer_address, wsgi.algod_client, wsgi.indexer_client = saved_nodes
+    algod.stop()
+    indexer.stop()
+
+
+def test_status_matches_the_wsgi_route(servers):
+    wsgi, asgi_app = servers
+
+    async def fetch():
+        async with asgi_app.app.test_app():
+            response = await asgi_app.app.test_client().get("/api/document/status")
+            return response.status_code, await response.get_json()
+
+    status_code, body = asyncio.run(fetch())
+    assert status_code == 200
+    assert body == wsgi.app.test_client().get("/api/document/status").get_json()
+
+
+def test_slow_algod_calls_overlap(servers, monkeypatch):
+    wsgi, asgi_app = servers
+    # Admit all 20 writes of the one admin account at once
+    monkeypatch.setattr(wsgi.admission, "per_signer", None)
+
+    async def assign_many(count):
+        async with asgi_app.app.test_app():
+            client = asgi_app.app.test_client()
+            body = {"role": "admin", "private_key": wsgi.admin_private_key,
+                    "verifier_address": wsgi.verifier_address}
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            responses = await asyncio.gather(*[client.post("/api/verifier/assign", json=body)
+                                               for _ in range(count)])
+            return loop.time() - start, [response.status_code for response in responses]
+
+    # Each assignment makes at least 4 algod calls of 50 ms; 20 in series would take 4 s
+    elapsed, codes = asyncio.run(assign_many(20))
+    assert codes == [200] * 20
+    assert elapsed < 2.0
+
+
+def test_writes_go_through_the_shared_bookkeeping(servers):
+    wsgi, asgi_app = servers
+    admin = {"role": "admin", "private_key": wsgi.admin_private_key}
+    digest = wsgi.generate_document_hash("asgi policy")
+
+    async def register_and_look_up():
+        async with asgi_app.app.test_app():
+            client = asgi_app.app.test_client()
+            before = await client.post("/api/document/verify-many", json={"digests": [digest]})
+            registered = await client.post(f"/api/apps/{wsgi.APP_ID}/documents",
+                                           json={**admin, "document_content": "asgi policy", "version": "2.0"})
+            after = await client.post("/api/document/verify-many", json={"digests": [digest]})
+            return [await response.get_json() for response in (before, registered, after)]
+
+    before, registered, after = asyncio.run(register_and_look_up())
+    assert before["registered"] == 0
+    assert registered["success"] and registered["app_id"] == wsgi.APP_ID
+    assert registered.keys() == wsgi.app.test_client().post(
+        f"/api/apps/{wsgi.APP_ID}/documents",
+        json={**admin, "document_content": "wsgi policy", "version": "2.0"}).get_json().keys()
+    assert wsgi.contract_store.find_documents_by_hash(digest)[0]["app_id"] == wsgi.APP_ID
+    # The write invalidated the document index, so the next lookup sees the new record
+    assert after["registered"] == 1
+
+
+def test_writes_beyond_the_admission_limit_are_shed(servers, monkeypatch):
+    wsgi, asgi_app = servers
+    from Compliance.admission import AdmissionController
+    from Compliance.metrics import MetricsRegistry
+
+    monkeypatch.setattr(wsgi, "admission", AdmissionController(per_signer=1))
+    monkeypatch.setattr(wsgi, "metrics", MetricsRegistry())
+    body = {"role": "admin", "private_key": wsgi.admin_private_key, "verifier_address": wsgi.verifier_address}
+
+    async def assign_twice():
+        async with asgi_app.app.test_app():
+            client = asgi_app.app.test_client()
+            responses = await asyncio.gather(*[client.post("/api/verifier/assign", json=body) for _ in range(2)])
+            return sorted((response.status_code, response.headers.get("Retry-After")) for response in responses)
+
+    (ok, _), (shed, retry_after) = asyncio.run(assign_twice())
+    assert (ok, shed) == (200, 429)
+    assert int(retry_after) >= 1
+    assert wsgi.admission.stats()["shed"] == {"signer": 1}
+
+
+def test_apps_are_served_by_id(servers):
+    wsgi, asgi_app = servers
+
+    async def fetch():
+        async with asgi_app.app.test_app():
+            client = asgi_app.app.test_client()
+            status = await client.get("/api/apps/900100/status")
+            apps = await client.get("/api/apps")
+            return await status.get_json(), await apps.get_json()
+
+    status, apps = asyncio.run(fetch())
+    assert status == wsgi.app.test_client().get("/api/apps/900100/status").get_json()
+    assert [entry["app_id"] for entry in apps["apps"]] == wsgi.known_app_ids()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# test_multi_app.py - app.py serves many compliance apps, spreads writes over shards and sheds excess writes
+
+import os
+import tempfile
+import threading
+
+import pytest
+
+from algod_standin import AlgodStandIn, compliance_state
+
+SHARDS = [900001, 900002, 900003]
+
+
+@pytest.fixture(scope="module")
+def wsgi():
+    algod = AlgodStandIn(latency=0.05).start()
+    indexer = AlgodStandIn(indexer=True).start()
+    os.environ["ALGOD_ADDRESS"], os.environ["INDEXER_ADDRESS"] = algod.address, indexer.address
+    import app as wsgi
+    from Compliance.lazy import Lazy
+
+    # app may already be imported (and its clients built) against another module's stand-in
+    saved_nodes = wsgi.algod_address, wsgi.indexer_address, wsgi.algod_client, wsgi.indexer_client
+    wsgi.algod_address, wsgi.indexer_address = algod.address, indexer.address
+    wsgi.algod_client, wsgi.indexer_client = Lazy(wsgi.build_algod_client), Lazy(wsgi.build_indexer_client)
+    wsgi.read_flights.forget()
+    from Compliance.app_shards import ShardSet
+    from Compliance.contract_store import open_contract_store
+
+    with tempfile.TemporaryDirectory() as tmp:
+        saved = wsgi.shards, wsgi.contract_store
+        wsgi.shards, wsgi.contract_store = ShardSet(SHARDS), open_contract_store(os.path.join(tmp, "contracts.db"))
+        wsgi.app_states.invalidate()
+        yield wsgi, algod
+        wsgi.contract_store.close()
+        wsgi.shards, wsgi.contract_store = saved
+        wsgi.app_states.invalidate()
+    wsgi.algod_address, wsgi.indexer_address, wsgi.algod_client, wsgi.indexer_client = saved_nodes
+    algod.stop()
+    indexer.stop()
+
+
+def test_concurrent_registrations_land_on_every_shard(wsgi):
+    wsgi, algod = wsgi
+    responses = []
+
+    def register(n):
+        body = {"role": "admin", "private_key": wsgi.admin_private_key,
+                "document_content": f"policy {n}", "version": "1.0"}
+        responses.append(wsgi.app.test_client().post("/api/document/register", json=body).get_json())
+
+    threads = [threading.Thread(target=register, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(response["success"] for response in responses)
+    assert sorted(response["app_id"] for response in responses) == sorted(SHARDS * 2)
+
+    # Reads aggregate over the shards: each one holds its own current document
+    for app_id, response in zip(SHARDS, responses):
+        algod.apps[app_id] = compliance_state(bytes.fromhex(response["document_hash"]))
+    for app_id in SHARDS:
+        wsgi.state_changed(app_id)
+    body = wsgi.app.test_client().post("/api/document/verify-many", json={
+        "digests": [response["document_hash"] for response in responses[:3]]}).get_json()
+    assert [result["app_id"] for result in body["results"]] == SHARDS
+    assert all(result["compliant"] for result in body["results"])
+
+    listed = wsgi.app.test_client().get("/api/apps").get_json()["apps"]
+    assert {entry["app_id"] for entry in listed if entry["shard"]} == set(SHARDS)
+
+
+def test_dashboard_lists_documents_registered_through_the_api(wsgi, monkeypatch):
+    wsgi, algod = wsgi
+    body = {"role": "admin", "private_key": wsgi.admin_private_key,
+            "document_content": "api only", "version": "1.0", "app_id": SHARDS[0]}
+    assert wsgi.app.test_client().post("/api/document/register", json=body).get_json()["success"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        monkeypatch.setenv("JOB_WORKERS", "0")
+        monkeypatch.setenv("JOBS_DB", os.path.join(tmp, "jobs.db"))
+        monkeypatch.setenv("CONTRACTS_DB", os.path.join(tmp, "contracts.db"))
+        monkeypatch.syspath_prepend(os.path.join(os.path.dirname(os.path.abspath(__file__)), "Compliance", "flask_app"))
+        import api as dashboard
+        monkeypatch.setattr(dashboard, "contract_store", wsgi.contract_store)
+
+        # These documents have no stored file, so the page must not link one
+        page = dashboard.app.test_client().get(f"/contracts/{SHARDS[0]}")
+        assert page.status_code == 200
+        assert "Registered through the API" in page.get_data(as_text=True)
+
+
+def test_any_app_is_served_by_id(wsgi):
+    wsgi, algod = wsgi
+    algod.apps[900042] = compliance_state(bytes(range(32)), b"2.1")
+    client = wsgi.app.test_client()
+
+    status = client.get("/api/apps/900042/status").get_json()["status"]
+    assert status["document_version"] == "2.1"
+    assert client.get("/api/document/status?app_id=900042").get_json()["status"] == status
+
+    body = {"role": "verifier", "private_key": wsgi.verifier_private_key, "document_hash": bytes(range(32)).hex()}
+    response = client.post("/api/apps/900042/verify", json=body).get_json()
+    assert response["success"] and response["app_id"] == 900042
+
+
+def test_writes_beyond_the_signer_limit_get_429(wsgi):
+    wsgi, algod = wsgi
+    from Compliance.admission import AdmissionController
+
+    saved = wsgi.admission
+    wsgi.admission = AdmissionController(max_in_flight=4, per_signer=1)
+    try:
+        with wsgi.admission.admit(wsgi.admin_address):
+            body = {"role": "admin", "private_key": wsgi.admin_private_key,
+                    "document_content": "policy", "version": "1.0"}
+            response = wsgi.app.test_client().post("/api/document/register", json=body)
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) >= 1
+        assert response.get_json()["success"] is False
+        stats = wsgi.app.test_client().get("/api/admission").get_json()["admission"]
+        assert stats["shed"] == {"signer": 1} and stats["in_flight"] == 0
+        assert 'write_requests_shed_total{reason="signer"} 1' in wsgi.app.test_client().get("/metrics").get_data(as_text=True)
+    finally:
+        wsgi.admission = saved
+
+
+def test_batch_verify_answers_503_when_the_node_fails(wsgi, monkeypatch):
+    wsgi, algod = wsgi
+    from algosdk.error import AlgodHTTPError
+    from Compliance.admission import AdmissionController
+
+    class FailingRegistry:
+        def verify_documents(self, app_id, document_hashes):
+            raise AlgodHTTPError("service unavailable", 503)
+
+    monkeypatch.setattr(wsgi, "registry_client", lambda private_key: FailingRegistry())
+    monkeypatch.setattr(wsgi, "admission", AdmissionController(cooldown=5))
+    body = {"role": "verifier", "private_key": wsgi.verifier_private_key,
+            "document_hashes": ["00" * 32], "app_id": 900500}
+    response = wsgi.app.test_client().post("/api/document/verify/batch", json=body)
+
+    assert response.status_code == 503 and int(response.headers["Retry-After"]) >= 4
+    assert wsgi.admission.stats()["cooling_down"]
+
+
+def test_single_writes_answer_503_when_the_node_is_rate_limited(wsgi, monkeypatch):
+    wsgi, algod = wsgi
+    from Compliance.admission import AdmissionController
+
+    monkeypatch.setattr(wsgi, "admission", AdmissionController(cooldown=5))
+    monkeypatch.setattr(algod, "max_concurrent", 0)   # Every algod call is answered 429
+    body = {"role": "admin", "private_key": wsgi.admin_private_key,
+            "document_content": "rate limited", "version": "1.0"}
+    response = wsgi.app.test_client().post("/api/document/register", json=body)
+
+    assert response.status_code == 503 and int(response.headers["Retry-After"]) >= 4
+    assert response.get_json()["success"] is False
+    assert wsgi.admission.stats()["cooling_down"]
+
+
+def test_direct_and_resumable_uploads_hash_the_same_bytes(wsgi, monkeypatch, tmp_path):
+    wsgi, algod = wsgi
+    import hashlib
+    import io
+    from Compliance.upload_sessions import UploadSessionStore
+
+    monkeypatch.setattr(wsgi, "UPLOAD_FOLDER", str(tmp_path))
+    monkeypatch.setattr(wsgi, "upload_sessions", UploadSessionStore(str(tmp_path / ".sessions")))
+    data = bytes(range(256)) * 64   # Not valid UTF-8
+    client = wsgi.app.test_client()
+    direct = client.post("/api/upload", data={"file": (io.BytesIO(data), "scan.bin")}).get_json()
+
+    session = client.post("/api/upload/sessions", json={"filename": "scan.bin", "total_size": len(data)}).get_json()
+    session_id = session["session"]["session_id"]
+    client.put(f"/api/upload/sessions/{session_id}/chunks/0", data=data)
+    committed = client.post(f"/api/upload/sessions/{session_id}/commit", json={}).get_json()
+
+    assert direct["hash"] == committed["hash"] == hashlib.sha256(data).hexdigest()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# test_teal_analyzer.py - Opcode-cost and size budgets for the generated TEAL programs
+#
+# Raise a budget only when a contract change needs it; the analyzer runs offline.
+
+import os
+
+import pytest
+
+from teal_analyzer import UnboundedCostError, analyze, check_budgets, _builtin_programs
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+BUDGETS = {
+    "compliance": {"size": 300, "max_cost": 49, "create": 10, "optin": 8,
+                   "register": 49, "assign_verifier": 29, "verify": 31},
+    "compliance-packed": {"size": 260, "max_cost": 45, "create": 7, "optin": 8,
+                          "register": 45, "assign_verifier": 29, "verify": 37},
+    "voting": {"size": 240, "max_cost": 61, "create": 35, "optin": 10, "vote": 61, "results": 18},
+    "registry": {"size": 500, "max_cost": 310, "register": 51, "assign_verifier": 31,
+                 "verify": 60, "expire": 53, "verify_batch": 310},
+}
+
+SAMPLE = """#pragma version 8
+txn ApplicationID
+int 0
+==
+bnz create
+txna ApplicationArgs 0
+byte "hash" // comment
+==
+bnz hash
+err
+create:
+int 1
+return
+hash:
+txna ApplicationArgs 1
+sha256
+callsub check
+int 1
+return
+check:
+len
+int 32
+==
+assert
+retsub
+"""
+
+
+def test_branch_costs_follow_the_most_expensive_path():
+    analysis = analyze(SAMPLE)
+
+    assert analysis["version"] == 8
+    # dispatch (4 or 8 ops) + body; sha256 costs 35, the subroutine 5
+    assert analysis["branches"] == {"create": 4 + 2, "hash": 8 + 1 + 35 + 1 + 5 + 2}
+    # version + intcblock [1] + 39 bytes of instructions ("hash" is used once: pushbytes)
+    assert analysis["size"] == 1 + 3 + 39
+
+
+def test_loops_have_no_static_bound():
+    with pytest.raises(UnboundedCostError):
+        analyze("#pragma version 8\nloop:\nint 1\nbnz loop\nint 1\n")
+
+
+@pytest.mark.parametrize("program, path", [("compliance", "compliance_approval.teal"),
+                                           ("compliance-packed", "compliance_approval_packed.teal")])
+def test_checked_in_compliance_teal_matches_source(program, path):
+    with open(os.path.join(ROOT, "Compliance", path)) as f:
+        assert analyze(f.read()) == analyze(_builtin_programs(program))
+
+
+def test_method_router_is_no_more_expensive_than_legacy_dispatch():
+    # compliance_approval_legacy.teal is the program apps deployed before the
+    # method router still run; every call must cost at most as much as there
+    with open(os.path.join(ROOT, "Compliance", "compliance_approval_legacy.teal")) as f:
+        legacy = analyze(f.read())
+    router = analyze(_builtin_programs("compliance"))
+
+    assert router["size"] < legacy["size"]
+    assert set(router["branches"]) == set(legacy["branches"])
+    for name, cost in router["branches"].items():
+        assert cost <= legacy["branches"][name], name
+    assert sum(router["branches"].values()) < sum(legacy["branches"].values())
+
+
+@pytest.mark.parametrize("program", sorted(BUDGETS))
+def test_programs_stay_within_budget(program):
+    analysis = analyze(_builtin_programs(program))
+
+    assert check_budgets(analysis, BUDGETS[program]) == []
+    assert set(BUDGETS[program]) - {"size", "max_cost"} <= set(analysis["branches"])
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# test_vote_tally.py - Test replaying, checkpointing and resuming vote tallies offline
+
+import base64
+
+import pytest
+
+from vote_tally import VoteTallyAggregator
+
+APP_ID = 42
+
+
+def app_call(txid, round_num, sender, *args, app_id=APP_ID, on_completion="noop"):
+    return {"id": txid, "confirmed-round": round_num, "round-time": 1700000000 + round_num, "sender": sender,
+            "tx-type": "appl", "application-transaction": {
+                "application-id": app_id, "on-completion": on_completion,
+                "application-args": [base64.b64encode(arg).decode() for arg in args]}}
+
+
+def vote(txid, round_num, sender, candidate):
+    return app_call(txid, round_num, sender, b"vote", candidate.to_bytes(8, "big"))
+
+
+class StubIndexer:
+    """Serves a growing transaction history in pages of `limit`, like search_transactions"""
+
+    def __init__(self, transactions, current_round):
+        self.transactions = transactions
+        self.current_round = current_round
+        self.requests = []
+        self.fail_on_page = None
+
+    def search_transactions(self, application_id, txn_type, min_round, limit, next_page=None):
+        offset = int(next_page or 0)
+        self.requests.append((min_round, offset))
+        if self.fail_on_page is not None and len(self.requests) == self.fail_on_page:
+            raise ConnectionError("indexer unavailable")
+        matching = [txn for txn in self.transactions if txn["confirmed-round"] >= min_round]
+        page = matching[offset:offset + limit]
+        response = {"current-round": self.current_round, "transactions": page}
+        if page:
+            response["next-token"] = str(offset + limit)
+        return response
+
+
+def history():
+    creation = app_call("create", 10, "CREATOR", (4).to_bytes(8, "big"), app_id=0)
+    creation["created-application-index"] = APP_ID
+    return [creation,
+            app_call("optin-a", 11, "A", on_completion="optin"),
+            vote("v1", 11, "A", 2), vote("v2", 11, "B", 2), vote("v3", 12, "C", 1),
+            app_call("results", 12, "A", b"results"),
+            vote("other-app", 12, "D", 3) | {"application-transaction": {
+                "application-id": 7, "on-completion": "noop",
+                "application-args": [base64.b64encode(b"vote").decode(), base64.b64encode(bytes(8)).decode()]}},
+            vote("v4", 14, "D", 4), vote("v5", 14, "E", 2)]
+
+
+def test_replays_votes_across_pages_into_round_checkpoints(tmp_path):
+    indexer = StubIndexer(history(), current_round=20)
+    aggregator = VoteTallyAggregator(indexer, APP_ID, str(tmp_path / "tally.db"), page_size=2)
+
+    assert aggregator.sync() == 5
+    assert aggregator.synced_round == 20
+    assert aggregator.results() == [{"candidate": 2, "votes": 3}, {"candidate": 1, "votes": 1},
+                                    {"candidate": 4, "votes": 1}, {"candidate": 3, "votes": 0}]
+    assert aggregator.tallies_at(13) == ({2: 2, 1: 1}, 3)
+    assert [(point["round"], point["votes"]) for point in aggregator.time_series(candidate=2)] == \
+        [(11, 2), (12, 2), (14, 3)]
+    assert aggregator.audit({"tallies": {1: 1, 2: 3, 4: 1}, "total_votes": 5}) == {}
+    assert aggregator.audit({"tallies": {1: 1, 2: 4, 4: 1}, "total_votes": 6}) == {
+        2: {"replayed": 3, "on_chain": 4}, "total_votes": {"replayed": 5, "on_chain": 6}}
+
+
+def test_restart_resumes_from_the_last_complete_round(tmp_path):
+    db_path = str(tmp_path / "tally.db")
+    indexer = StubIndexer(history(), current_round=20)
+    aggregator = VoteTallyAggregator(indexer, APP_ID, db_path, page_size=2)
+    aggregator.sync()
+    aggregator.close()
+
+    indexer.transactions.append(vote("v6", 25, "F", 1))
+    indexer.current_round = 30
+    indexer.requests.clear()
+    restarted = VoteTallyAggregator(indexer, APP_ID, db_path, page_size=2)
+
+    assert restarted.sync() == 1
+    assert indexer.requests[0] == (21, 0)
+    assert restarted.total == 6 and restarted.num_candidates == 4
+    assert restarted.sync() == 0
+
+
+def test_interrupted_scan_does_not_double_count(tmp_path):
+    db_path = str(tmp_path / "tally.db")
+    indexer = StubIndexer(history(), current_round=20)
+    indexer.fail_on_page = 3
+    aggregator = VoteTallyAggregator(indexer, APP_ID, db_path, page_size=2)
+    with pytest.raises(ConnectionError):
+        aggregator.sync()
+    aggregator.close()
+
+    indexer.fail_on_page = None
+    restarted = VoteTallyAggregator(indexer, APP_ID, db_path, page_size=2)
+    restarted.sync()
+
+    assert restarted.tallies == {2: 3, 1: 1, 4: 1} and restarted.total == 5
@@ -1,3 +1,4 @@
+import os
 import sys
 import json
 import time
@@ -116,8 +117,9 @@ def main():
     """Main test function for Voting Contract"""
     # Connect to Algorand TestNet
     print("Connecting to Algorand TestNet...")
-    algod_address = "https://testnet-api.algonode.cloud"
-    algod_token = ""  # No token needed for AlgoNode public API
+    # ALGOD_ADDRESS points at another node, e.g. the local stand-in (run_offline.py)
+    algod_address = os.environ.get("ALGOD_ADDRESS", "https://testnet-api.algonode.cloud")
+    algod_token = os.environ.get("ALGOD_TOKEN", "")  # No token needed for AlgoNode public API
     algod_client = algod.AlgodClient(algod_token, algod_address)
     
     # Check connection
@@ -211,15 +213,9 @@ def main():
     try:
         results = voting_client.display_results()
         
-        # Determine the winner
-        candidates = {
-            "candidate_1": results.get("candidate_1_votes", 0),
-            "candidate_2": results.get("candidate_2_votes", 0),
-            "candidate_3": results.get("candidate_3_votes", 0)
-        }
-        
-        max_votes = max(candidates.values())
-        winners = [c.split('_')[1] for c, v in candidates.items() if v == max_votes]
+        # Determine the winner (results are sorted, highest first)
+        max_votes = results[0]["votes"]
+        winners = [str(r["candidate"]) for r in results if r["votes"] == max_votes]
         
         if len(winners) > 1:
             print(f"It's a tie between candidates {', '.join(winners)}!")
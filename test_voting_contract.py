@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+# test_voting_contract.py - Test the N-candidate voting contract and result decoding offline
+
+import base64
+
+from algosdk import account
+
+from voting_client import VotingDAppClient
+from voting_contract import get_approval_program, tally_key
+
+
+class StubAlgod:
+    def __init__(self, tallies, num_candidates):
+        def uint(key, value):
+            return {"key": base64.b64encode(key).decode(), "value": {"type": 2, "uint": value, "bytes": ""}}
+
+        self.global_state = [uint(tally_key(c), votes) for c, votes in tallies.items()]
+        self.global_state += [uint(b"num_candidates", num_candidates), uint(b"total_votes", sum(tallies.values())),
+                              uint(b"voting_end", 1900000000)]
+
+    def application_info(self, app_id):
+        return {"params": {"global-state": self.global_state}}
+
+
+def test_vote_tally_key_is_computed_from_the_argument():
+    teal = get_approval_program()
+
+    # No per-candidate keys or comparisons: the tally key is "v" + args[1]
+    assert "candidate_" not in teal
+    assert 'byte "v"\ntxna ApplicationArgs 1\nconcat' in teal
+
+
+def test_get_results_is_sorted_and_includes_candidates_without_votes():
+    private_key, _ = account.generate_account()
+    client = VotingDAppClient(StubAlgod({1: 2, 2: 5, 4: 2, 12: 1}, num_candidates=12), private_key)
+    client.app_id = 1
+
+    results = client.get_results()
+
+    assert results[:4] == [{"candidate": 2, "votes": 5}, {"candidate": 1, "votes": 2},
+                           {"candidate": 4, "votes": 2}, {"candidate": 12, "votes": 1}]
+    assert len(results) == 12 and results[-1] == {"candidate": 11, "votes": 0}
+    assert client.get_state()["total_votes"] == 10
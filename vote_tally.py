@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# vote_tally.py - Event-sourced vote tallies replayed from indexer history
+#
+# Usage:
+#   python vote_tally.py <app_id> [--db vote_tally.db]            # catch up and print the results
+#   python vote_tally.py <app_id> --follow [--interval 4]         # keep following new rounds
+#   python vote_tally.py <app_id> --series                        # cumulative tallies per round
+#
+# Every confirmed `vote` call of the app is recorded with its txid, round and
+# sender, and the cumulative tallies after each round that had votes are kept
+# as a checkpoint. The scan position is persisted, so a restart resumes from
+# the last complete round instead of re-reading the whole history, and the
+# tallies can be audited against the contract's global counters.
+
+import argparse
+import base64
+import json
+import sqlite3
+import sys
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS votes (
+    txid TEXT PRIMARY KEY,
+    app_id INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    round_time INTEGER,
+    sender TEXT NOT NULL,
+    candidate INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS votes_app_round ON votes (app_id, round);
+CREATE TABLE IF NOT EXISTS tally_checkpoints (
+    app_id INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    round_time INTEGER,
+    tallies TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    PRIMARY KEY (app_id, round)
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    app_id INTEGER PRIMARY KEY,
+    synced_round INTEGER NOT NULL,
+    num_candidates INTEGER
+);
+"""
+
+PAGE_SIZE = 1000
+VOTE = base64.b64encode(b"vote").decode()
+
+
+def parse_vote(txn, app_id):
+    """(candidate, sender) of a confirmed vote call of the app, else None"""
+    call = txn.get("application-transaction") or {}
+    if call.get("application-id") != app_id or call.get("on-completion", "noop") != "noop":
+        return None
+    args = call.get("application-args") or []
+    if len(args) < 2 or args[0] != VOTE:
+        return None
+    candidate = base64.b64decode(args[1])
+    if len(candidate) != 8:
+        return None
+    return int.from_bytes(candidate, "big"), txn["sender"]
+
+
+def parse_creation(txn, app_id):
+    """Number of candidates from the app's creation call, else None"""
+    call = txn.get("application-transaction") or {}
+    if txn.get("created-application-index") != app_id or call.get("application-id", 0) != 0:
+        return None
+    args = call.get("application-args") or []
+    return int.from_bytes(base64.b64decode(args[0]), "big") if args else None
+
+
+class VoteTallyAggregator:
+    """
+    Tallies of one voting app, kept current from the indexer.
+
+    `sync()` pages through the app calls after the last complete round and
+    folds the votes into the tallies; `follow()` keeps doing so as rounds
+    are added. Reads (`results`, `tallies_at`, `time_series`) only touch the
+    local database.
+    """
+
+    def __init__(self, indexer_client, app_id, db_path="vote_tally.db", page_size=PAGE_SIZE):
+        self.indexer_client = indexer_client
+        self.app_id = int(app_id)
+        self.page_size = page_size
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(SCHEMA)
+        self._resume()
+
+    def close(self):
+        self.conn.close()
+
+    def _resume(self):
+        """Load the last checkpoint and drop anything recorded past the last complete round"""
+        row = self.conn.execute("SELECT synced_round, num_candidates FROM sync_state WHERE app_id = ?",
+                                (self.app_id,)).fetchone()
+        self.synced_round, self.num_candidates = row if row else (0, None)
+        with self.conn:
+            self.conn.execute("DELETE FROM votes WHERE app_id = ? AND round > ?", (self.app_id, self.synced_round))
+            self.conn.execute("DELETE FROM tally_checkpoints WHERE app_id = ? AND round > ?",
+                              (self.app_id, self.synced_round))
+        self.tallies, self.total = self.tallies_at(self.synced_round)
+
+    def sync(self):
+        """Replay the votes confirmed since the last sync; returns how many were new"""
+        new_votes = 0
+        min_round = self.synced_round + 1
+        next_page = None
+        while True:
+            response = self.indexer_client.search_transactions(
+                application_id=self.app_id, txn_type="appl", min_round=min_round,
+                limit=self.page_size, next_page=next_page)
+            transactions = response.get("transactions", [])
+            new_votes += self._apply(transactions)
+            next_page = response.get("next-token")
+
+            if not transactions or not next_page:
+                # Every round up to the indexer's current round has been seen
+                self._mark_synced(max(self.synced_round, response.get("current-round", 0),
+                                      *(txn["confirmed-round"] for txn in transactions)))
+                return new_votes
+            # The last round of a page may continue on the next one
+            self._mark_synced(max(self.synced_round, transactions[-1]["confirmed-round"] - 1))
+
+    def follow(self, interval=4.0, iterations=None, on_votes=None):
+        """Sync every `interval` seconds (forever, or `iterations` times); on_votes(aggregator, n) after new votes"""
+        count = 0
+        while iterations is None or count < iterations:
+            new_votes = self.sync()
+            if new_votes and on_votes:
+                on_votes(self, new_votes)
+            count += 1
+            if iterations is None or count < iterations:
+                time.sleep(interval)
+
+    def _apply(self, transactions):
+        new_votes = 0
+        rounds = {}
+        with self.conn:
+            for txn in transactions:
+                num_candidates = parse_creation(txn, self.app_id)
+                if num_candidates is not None:
+                    self.num_candidates = num_candidates
+                vote = parse_vote(txn, self.app_id)
+                if vote is None:
+                    continue
+                candidate, sender = vote
+                inserted = self.conn.execute(
+                    "INSERT OR IGNORE INTO votes (txid, app_id, round, round_time, sender, candidate) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (txn["id"], self.app_id, txn["confirmed-round"], txn.get("round-time"), sender, candidate))
+                if not inserted.rowcount:
+                    continue
+                self.tallies[candidate] = self.tallies.get(candidate, 0) + 1
+                self.total += 1
+                new_votes += 1
+                rounds[txn["confirmed-round"]] = (txn.get("round-time"), dict(self.tallies), self.total)
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO tally_checkpoints (app_id, round, round_time, tallies, total) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(self.app_id, round_num, round_time, json.dumps(tallies), total)
+                 for round_num, (round_time, tallies, total) in rounds.items()])
+        return new_votes
+
+    def _mark_synced(self, round_num):
+        self.synced_round = round_num
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO sync_state (app_id, synced_round, num_candidates) VALUES (?, ?, ?) "
+                "ON CONFLICT (app_id) DO UPDATE SET synced_round = excluded.synced_round, "
+                "num_candidates = excluded.num_candidates",
+                (self.app_id, round_num, self.num_candidates))
+
+    def tallies_at(self, round_num):
+        """({candidate: votes}, total) after `round_num`, from the nearest checkpoint"""
+        row = self.conn.execute(
+            "SELECT tallies, total FROM tally_checkpoints WHERE app_id = ? AND round <= ? "
+            "ORDER BY round DESC LIMIT 1", (self.app_id, round_num)).fetchone()
+        if not row:
+            return {}, 0
+        return {int(candidate): votes for candidate, votes in json.loads(row[0]).items()}, row[1]
+
+    def results(self):
+        """Tallies as VotingDAppClient.get_results returns them, highest first"""
+        num_candidates = self.num_candidates or max(self.tallies, default=0)
+        results = [{"candidate": candidate, "votes": self.tallies.get(candidate, 0)}
+                   for candidate in range(1, num_candidates + 1)]
+        results.sort(key=lambda result: (-result["votes"], result["candidate"]))
+        return results
+
+    def time_series(self, candidate=None):
+        """Cumulative tallies after every round with votes: [{"round", "round_time", "tallies"|"votes", "total"}]"""
+        series = []
+        for round_num, round_time, tallies, total in self.conn.execute(
+                "SELECT round, round_time, tallies, total FROM tally_checkpoints WHERE app_id = ? ORDER BY round",
+                (self.app_id,)):
+            tallies = {int(c): votes for c, votes in json.loads(tallies).items()}
+            point = {"round": round_num, "round_time": round_time, "total": total}
+            if candidate is None:
+                point["tallies"] = tallies
+            else:
+                point["votes"] = tallies.get(candidate, 0)
+            series.append(point)
+        return series
+
+    def audit(self, state):
+        """
+        Differences between the replayed tallies and the contract's counters
+        (VotingDAppClient.get_state()); empty when they agree. The contract
+        state must have been read at or after `synced_round`.
+        """
+        differences = {}
+        for candidate in set(self.tallies) | set(state.get("tallies", {})):
+            replayed = self.tallies.get(candidate, 0)
+            on_chain = state.get("tallies", {}).get(candidate, 0)
+            if replayed != on_chain:
+                differences[candidate] = {"replayed": replayed, "on_chain": on_chain}
+        if state.get("total_votes", self.total) != self.total:
+            differences["total_votes"] = {"replayed": self.total, "on_chain": state["total_votes"]}
+        return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay the votes of a voting app from the indexer")
+    parser.add_argument("app_id", type=int)
+    parser.add_argument("--db", default="vote_tally.db")
+    parser.add_argument("--indexer", default="https://testnet-idx.algonode.cloud")
+    parser.add_argument("--follow", action="store_true", help="keep following new rounds")
+    parser.add_argument("--interval", type=float, default=4.0)
+    parser.add_argument("--series", action="store_true", help="print cumulative tallies per round")
+    args = parser.parse_args()
+
+    from algosdk.v2client import indexer
+    aggregator = VoteTallyAggregator(indexer.IndexerClient("", args.indexer), args.app_id, args.db)
+
+    def show(aggregator, new_votes):
+        print(f"Round {aggregator.synced_round}: {aggregator.total} votes (+{new_votes})")
+        for result in aggregator.results():
+            print(f"  Candidate {result['candidate']}: {result['votes']} votes")
+
+    show(aggregator, aggregator.sync())
+    if args.series:
+        for point in aggregator.time_series():
+            print(json.dumps(point))
+    if args.follow:
+        try:
+            aggregator.follow(args.interval, on_votes=show)
+        except KeyboardInterrupt:
+            pass
+    aggregator.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,8 @@ from algosdk import account, mnemonic, transaction
 from algosdk.transaction import ApplicationCreateTxn, ApplicationCallTxn, ApplicationOptInTxn
 import time
 
+from Compliance.tracing import traced
+
 class VotingDAppClient:
     def __init__(self, algod_client, private_key):
         self.algod_client = algod_client
@@ -16,8 +18,9 @@ class VotingDAppClient:
         compile_response = self.algod_client.compile(source_code)
         return base64.b64decode(compile_response['result'])
     
-    def deploy_contract(self, approval_source, clear_source):
-        """Deploy the voting contract"""
+    @traced
+    def deploy_contract(self, approval_source, clear_source, num_candidates=3):
+        """Deploy the voting contract with `num_candidates` candidates"""
         print("Deploying voting contract...")
         
         # Compile programs
@@ -34,9 +37,10 @@ class VotingDAppClient:
             on_complete=transaction.OnComplete.NoOpOC,
             approval_program=approval_program,
             clear_program=clear_program,
-            # The contract stores both integers (vote counts) and byte-slices (keys)
-            global_schema=transaction.StateSchema(5, 6),  # 5 integers + 6 byte-slices
+            # One integer per tally plus total_votes, voting_end and num_candidates; creator is bytes
+            global_schema=transaction.StateSchema(num_candidates + 3, 1),
             local_schema=transaction.StateSchema(1, 1),   # 1 integer + 1 byte-slice
+            app_args=[int(num_candidates).to_bytes(8, 'big')]
         )
         
         # Sign and send transaction
@@ -50,6 +54,7 @@ class VotingDAppClient:
         print(f"Contract deployed! App ID: {self.app_id}")
         return self.app_id
     
+    @traced
     def opt_in(self, user_private_key=None):
         """Opt user into the application (required to vote)"""
         if user_private_key is None:
@@ -73,8 +78,9 @@ class VotingDAppClient:
         transaction.wait_for_confirmation(self.algod_client, tx_id, 4)
         print(f"User {user_address} opted in successfully")
     
+    @traced
     def vote(self, candidate_number, voter_private_key=None):
-        """Cast a vote for specified candidate (1, 2, or 3)"""
+        """Cast a vote for the specified candidate (1 to the number of candidates)"""
         if voter_private_key is None:
             voter_private_key = self.private_key
         
@@ -87,7 +93,7 @@ class VotingDAppClient:
             sp=params,
             index=self.app_id,
             on_complete=transaction.OnComplete.NoOpOC,
-            app_args=[b"vote", str(candidate_number).encode()]
+            app_args=[b"vote", int(candidate_number).to_bytes(8, 'big')]
         )
         
         # Sign and send
@@ -99,44 +105,51 @@ class VotingDAppClient:
         print(f"Vote cast successfully for candidate {candidate_number}")
         return confirmed_txn
     
-    def get_results(self):
-        """Get current voting results"""
+    @traced
+    def get_state(self):
+        """Global state of the app, with tallies under their candidate number"""
         app_info = self.algod_client.application_info(self.app_id)
-        global_state = app_info['params']['global-state']
+        global_state = app_info['params'].get('global-state', [])
         
-        results = {}
+        state = {"tallies": {}}
         for item in global_state:
             try:
-                # Decode key from base64
-                key = base64.b64decode(item['key']).decode('utf-8')
-                
-                # Process value based on its type
-                value_type = item['value']['type']
-                if value_type == 2:  # byte-slice type
-                    # Special case for vote counts stored as type 2 with uint values
-                    if key.endswith('_votes'):
-                        value = item['value']['uint']  # Use the uint field for vote counts
-                    else:
-                        value = base64.b64decode(item['value']['bytes']).decode('utf-8') if item['value']['bytes'] else ""
-                else:  # uint type
-                    value = item['value']['uint']
-                
-                results[key] = value
+                key = base64.b64decode(item['key'])
+                value = item['value']
+                if len(key) == 9 and key[:1] == b"v":
+                    state["tallies"][int.from_bytes(key[1:], 'big')] = value['uint']
+                elif value['type'] == 1:  # bytes
+                    state[key.decode('utf-8')] = base64.b64decode(value['bytes'])
+                else:  # uint
+                    state[key.decode('utf-8')] = value['uint']
             except Exception as e:
                 print(f"Error processing global state item: {e}")
         
+        return state
+    
+    def get_results(self):
+        """
+        Current tallies, highest first (ties by candidate number):
+        [{"candidate": 2, "votes": 5}, ...], including candidates without votes
+        """
+        state = self.get_state()
+        tallies = state["tallies"]
+        num_candidates = state.get("num_candidates") or max(tallies, default=0)
+        results = [{"candidate": candidate, "votes": tallies.get(candidate, 0)}
+                   for candidate in range(1, num_candidates + 1)]
+        results.sort(key=lambda result: (-result["votes"], result["candidate"]))
         return results
     
     def display_results(self):
         """Display formatted voting results"""
+        state = self.get_state()
         results = self.get_results()
         
         print("\n=== VOTING RESULTS ===")
-        print(f"Candidate 1: {results.get('candidate_1_votes', 0)} votes")
-        print(f"Candidate 2: {results.get('candidate_2_votes', 0)} votes") 
-        print(f"Candidate 3: {results.get('candidate_3_votes', 0)} votes")
-        print(f"Total votes: {results.get('total_votes', 0)}")
-        print(f"Voting ends at timestamp: {results.get('voting_end', 'N/A')}")
+        for result in results:
+            print(f"Candidate {result['candidate']}: {result['votes']} votes")
+        print(f"Total votes: {state.get('total_votes', 0)}")
+        print(f"Voting ends at timestamp: {state.get('voting_end', 'N/A')}")
         print("=====================\n")
         
         return results
@@ -1,15 +1,29 @@
 from pyteal import *
 
+# Global state holds the tallies plus total_votes, voting_end, num_candidates
+# and creator, within the 64-key limit
+MAX_CANDIDATES = 60
+
+
+def tally_key(candidate):
+    """Global state key of a candidate's tally: b"v" + the 8-byte candidate index"""
+    return b"v" + int(candidate).to_bytes(8, "big")
+
+
 class VotingContract:
     """
-    A simple voting smart contract with multiple candidates
+    A voting smart contract with a configurable number of candidates
+
+    The number of candidates (1 to MAX_CANDIDATES) is the first argument of
+    the creation call. A vote carries the candidate index (1-based) as an
+    8-byte uint, and the tally key is computed from it, so casting a vote
+    costs the same number of opcodes however many candidates there are.
     """
     
     def __init__(self):
-        # Global state keys - Changed to match integer storage
-        self.candidate_1_votes = Bytes("candidate_1_votes")
-        self.candidate_2_votes = Bytes("candidate_2_votes") 
-        self.candidate_3_votes = Bytes("candidate_3_votes")
+        # Global state keys; tallies are b"v" + candidate index
+        self.tally_prefix = Bytes("v")
+        self.num_candidates = Bytes("num_candidates")
         self.total_votes = Bytes("total_votes")
         self.voting_end = Bytes("voting_end")
         self.creator = Bytes("creator")
@@ -20,11 +34,13 @@ class VotingContract:
     def approval_program(self):
         """Main approval program"""
         
-        # Application creation
+        # Application creation: args[0] is the number of candidates
+        num_candidates = Btoi(Txn.application_args[0])
         on_creation = Seq([
-            App.globalPut(self.candidate_1_votes, Int(0)),
-            App.globalPut(self.candidate_2_votes, Int(0)),
-            App.globalPut(self.candidate_3_votes, Int(0)),
+            Assert(Txn.application_args.length() == Int(1)),
+            Assert(num_candidates >= Int(1)),
+            Assert(num_candidates <= Int(MAX_CANDIDATES)),
+            App.globalPut(self.num_candidates, num_candidates),
             App.globalPut(self.total_votes, Int(0)),
             App.globalPut(self.creator, Txn.sender()),
             # Set voting period (24 hours from creation)
@@ -32,7 +48,9 @@ class VotingContract:
             Return(Int(1))
         ])
         
-        # Vote for candidate
+        # Vote for candidate: args[1] is the 8-byte candidate index
+        candidate = Txn.application_args[1]
+        tally = Concat(self.tally_prefix, candidate)
         vote = Seq([
             # Check if voting period is still active
             Assert(Global.latest_timestamp() < App.globalGet(self.voting_end)),
@@ -40,29 +58,13 @@ class VotingContract:
             # Check if user hasn't voted before
             Assert(App.localGet(Txn.sender(), self.has_voted) == Int(0)),
             
-            # Get candidate choice from application args
-            If(Txn.application_args[1] == Bytes("1"))
-            .Then(
-                App.globalPut(
-                    self.candidate_1_votes,
-                    App.globalGet(self.candidate_1_votes) + Int(1)
-                )
-            )
-            .ElseIf(Txn.application_args[1] == Bytes("2"))
-            .Then(
-                App.globalPut(
-                    self.candidate_2_votes,
-                    App.globalGet(self.candidate_2_votes) + Int(1)
-                )
-            )
-            .ElseIf(Txn.application_args[1] == Bytes("3"))
-            .Then(
-                App.globalPut(
-                    self.candidate_3_votes,
-                    App.globalGet(self.candidate_3_votes) + Int(1)
-                )
-            )
-            .Else(Return(Int(0))),  # Invalid candidate
+            # Candidate must be 1..num_candidates
+            Assert(Len(candidate) == Int(8)),
+            Assert(Btoi(candidate) >= Int(1)),
+            Assert(Btoi(candidate) <= App.globalGet(self.num_candidates)),
+            
+            # Unset tallies read as 0
+            App.globalPut(tally, App.globalGet(tally) + Int(1)),
             
             # Mark user as voted and increment total
             App.localPut(Txn.sender(), self.has_voted, Int(1)),